@@ -16,3 +16,44 @@
 #     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 
+
+import logging
+
+# Diagnostics are written to the loggers of the modules (e.g. PyOphidia.client), children of this one
+_logger = logging.getLogger(__name__)
+_handler = None
+
+
+def log_to_console(level=logging.INFO, stream=None, fmt='%(message)s'):
+    """log_to_console(level=logging.INFO, stream=None, fmt='%(message)s') -> logging.Handler : Print the diagnostics of level or higher
+       (e.g. the current cwd and the new cubes at INFO level) to stream, as the print statements of the previous releases did
+    :param level: minimum level of the printed messages
+    :type level: int
+    :param stream: output stream (default is sys.stdout)
+    :type stream: file
+    :param fmt: format of the messages
+    :type fmt: str
+    :returns: handler added to the PyOphidia logger
+    :rtype: logging.Handler
+    """
+
+    global _handler
+    import sys
+    if _handler is not None:
+        _logger.removeHandler(_handler)
+    _handler = logging.StreamHandler(stream if stream is not None else sys.stdout)
+    _handler.setFormatter(logging.Formatter(fmt))
+    _logger.addHandler(_handler)
+    _logger.setLevel(level)
+    return _handler
+
+
+def quiet(enabled=True):
+    """quiet(enabled=True) -> None : Silence all the diagnostics of PyOphidia, errors included (or restore them with enabled=False)
+    :param enabled: if True no message is emitted
+    :type enabled: bool
+    :returns: None
+    :rtype: None
+    """
+
+    _logger.setLevel(logging.CRITICAL + 1 if enabled else logging.NOTSET)
@@ -0,0 +1,242 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import sys
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+import logging
+sys.path.append(os.path.dirname(__file__))
+
+
+_logger = logging.getLogger(__name__)
+
+
+# Arguments added by the Client to every request, which do not change the response of the catalog operators
+CONTEXT_ARGUMENTS = frozenset(['sessionid', 'cwd', 'cdd', 'cube', 'host_partition', 'exec_mode', 'ncores', 'nthreads'])
+
+# Configuration keys describing the state of the user (session, directories, last cube) rather than the server
+DYNAMIC_CONFIG_KEYS = frozenset(['all', 'oph_session_id', 'oph_cwd', 'oph_cdd', 'oph_datacube'])
+
+# Operators creating, moving or deleting containers, which change the grids listed by OPH_SHOWGRID
+CONTAINER_OPERATORS = frozenset(['oph_createcontainer', 'oph_deletecontainer', 'oph_restorecontainer', 'oph_folder'])
+
+
+def parse_query(query):
+    """parse_query(query) -> (str, dict) : Return the operator and the arguments of a query like 'operator=myoperator;param1=value1;' or 'myoperator param1=value1;'"""
+
+    request = str(query).strip()
+    if request.startswith('operator='):
+        operator, sep, request = request[len('operator='):].partition(';')
+    else:
+        parts = request.split(None, 1)
+        operator = parts[0] if parts else ''
+        request = parts[1] if len(parts) > 1 else ''
+    arguments = {}
+    for argument in request.split(';'):
+        key, sep, value = argument.strip().partition('=')
+        if sep:
+            arguments[key.strip().lower()] = value.strip()
+    return operator.rstrip(';').strip().lower(), arguments
+
+
+class ResponseCache():
+    """ResponseCache(ttls=None, maxsize=256, path=None) -> obj : client-side cache of the responses of the static catalog operators
+
+    Only successful synchronous requests of the operators listed in ttls are cached, each one for the number of seconds associated to its operator.
+    OPH_SHOWGRID responses are cached per session and working directory, and dropped when a request creating grids or changing containers succeeds.
+    The least recently used responses are evicted when the cache is full. When path is given the cache is loaded from that JSON file and saved to it
+    whenever a response is added, so that the catalogs survive the process.
+
+    Attributes:
+        ttls: dict mapping each cacheable operator to the time to live (seconds) of its responses
+        maxsize: maximum number of cached responses
+        path: JSON file the cache is persisted to or None
+        hits: number of requests served from the cache
+        misses: number of cacheable requests submitted to the server
+
+    Methods:
+        get(query, scope='') -> str or None : Return the cached response of a query or None.
+        put(query, response, scope='') -> bool : Cache the response of a query, if cacheable.
+        invalidate(operator=None) -> int : Drop the cached responses of an operator (all of them by default).
+        observe(query) -> int : Drop the cached responses made stale by a successful query.
+        save() -> self : Write the cache to path.
+    """
+
+    DEFAULT_TTLS = {'oph_man': 86400.0, 'oph_operators_list': 86400.0, 'oph_primitives_list': 86400.0, 'oph_hierarchy': 86400.0, 'oph_get_config': 300.0,
+                    'oph_showgrid': 60.0}
+
+    def __init__(self, ttls=None, maxsize=256, path=None):
+        """ResponseCache(ttls=None, maxsize=256, path=None) -> obj
+        :param ttls: dict mapping each cacheable operator to the time to live (seconds) of its responses (default is DEFAULT_TTLS)
+        :type ttls: dict
+        :param maxsize: maximum number of cached responses
+        :type maxsize: int
+        :param path: JSON file the cache is persisted to (default is memory only)
+        :type path: str
+        :returns: None
+        :rtype: None
+        """
+
+        self.ttls = dict(ResponseCache.DEFAULT_TTLS if ttls is None else ttls)
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if path and os.path.isfile(path):
+            self._load()
+
+    def _key(self, query, scope):
+        operator, arguments = parse_query(query)
+        if operator not in self.ttls or arguments.get('exec_mode', 'sync').lower() == 'async':
+            return None, None
+        if operator == 'oph_get_config' and arguments.get('key', 'all').lower() in DYNAMIC_CONFIG_KEYS:
+            return None, None
+        # The container of OPH_SHOWGRID is resolved relative to the working directory of the session
+        ignored = CONTEXT_ARGUMENTS - set(['cube', 'sessionid', 'cwd']) if operator == 'oph_showgrid' else CONTEXT_ARGUMENTS
+        normalized = ';'.join(key + '=' + arguments[key] for key in sorted(arguments) if key not in ignored)
+        return operator, scope + '|' + operator + ' ' + normalized
+
+    def get(self, query, scope=''):
+        """get(query, scope='') -> str or None : Return the cached response of a query or None
+        :param query: query like 'operator=myoperator;param1=value1;' or 'myoperator param1=value1;'
+        :type query: str
+        :param scope: string identifying the server and the user the query is submitted to
+        :type scope: str
+        :returns: response (JSON string) or None
+        :rtype: str or None
+        """
+
+        operator, key = self._key(query, scope)
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None or entry[0] <= time.time():
+                self.misses += 1
+                return None
+            self._entries[key] = entry
+            self.hits += 1
+            return entry[2]
+
+    def put(self, query, response, scope=''):
+        """put(query, response, scope='') -> bool : Cache the response of a query, if cacheable
+        :param query: query like 'operator=myoperator;param1=value1;' or 'myoperator param1=value1;'
+        :type query: str
+        :param response: response (JSON string) of the query
+        :type response: str
+        :param scope: string identifying the server and the user the query is submitted to
+        :type scope: str
+        :returns: True if the response has been cached
+        :rtype: bool
+        """
+
+        operator, key = self._key(query, scope)
+        if key is None or response is None:
+            return False
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.time() + float(self.ttls[operator]), operator, response)
+            while len(self._entries) > max(self.maxsize, 0):
+                self._entries.popitem(last=False)
+        if self.path:
+            self.save()
+        return True
+
+    def invalidate(self, operator=None):
+        """invalidate(operator=None) -> int : Drop the cached responses of an operator (all of them by default)
+        :param operator: operator name, e.g. 'oph_showgrid'
+        :type operator: str
+        :returns: number of dropped responses
+        :rtype: int
+        """
+
+        with self._lock:
+            if operator is None:
+                keys = list(self._entries.keys())
+            else:
+                keys = [key for key, entry in self._entries.items() if entry[1] == operator.lower()]
+            for key in keys:
+                del self._entries[key]
+        if self.path:
+            self.save()
+        return len(keys)
+
+    def observe(self, query):
+        """observe(query) -> int : Drop the cached responses made stale by a successful query (OPH_SHOWGRID ones after a request creating grids
+               or changing containers)
+        :param query: query like 'operator=myoperator;param1=value1;' or 'myoperator param1=value1;' or JSON workflow
+        :type query: str
+        :returns: number of dropped responses
+        :rtype: int
+        """
+
+        if 'oph_showgrid' not in self.ttls:
+            return 0
+        if str(query).lstrip().startswith('{'):
+            return self.invalidate('oph_showgrid')
+        operator, arguments = parse_query(query)
+        if operator in CONTAINER_OPERATORS or arguments.get('grid', '-') not in ('', '-') or arguments.get('create_container', 'no').lower() == 'yes':
+            return self.invalidate('oph_showgrid')
+        return 0
+
+    def save(self):
+        """save() -> self : Write the cache to path
+        :returns: self
+        :rtype: ResponseCache
+        :raises: RuntimeError
+        """
+
+        if not self.path:
+            raise RuntimeError('path is not set')
+        now = time.time()
+        with self._lock:
+            entries = [[key] + list(entry) for key, entry in self._entries.items() if entry[0] > now]
+        temporary = self.path + '.tmp'
+        try:
+            with open(temporary, 'w') as f:
+                json.dump(entries, f)
+            if hasattr(os, 'replace'):
+                os.replace(temporary, self.path)
+            else:
+                os.rename(temporary, self.path)
+        except (IOError, OSError) as e:
+            _logger.warning("Unable to save the response cache: %s", e)
+        return self
+
+    def _load(self):
+        now = time.time()
+        try:
+            with open(self.path, 'r') as f:
+                entries = json.load(f)
+        except (IOError, OSError, ValueError) as e:
+            _logger.warning("Unable to load the response cache: %s", e)
+            return
+        with self._lock:
+            for key, expiry, operator, response in entries:
+                if expiry > now:
+                    self._entries[key] = (expiry, operator, response)
+            while len(self._entries) > max(self.maxsize, 0):
+                self._entries.popitem(last=False)
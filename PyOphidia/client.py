@@ -23,16 +23,199 @@ import sys
 import os
 import json
 import re
-from inspect import currentframe
+import time
+import threading
+from collections import namedtuple
+import logging
 import PyOphidia.ophsubmit as _ophsubmit
+import PyOphidia.job as _job
+import PyOphidia.receiver as _receiver
+import PyOphidia.cache as _cache
+import PyOphidia.lifecycle as _lifecycle
+import PyOphidia.profiling as _profiling
 import traceback
 import shutil
 sys.path.append(os.path.dirname(__file__))
 
 
-def get_linenumber():
-    cf = currentframe()
-    return __file__, cf.f_back.f_lineno
+_logger = logging.getLogger(__name__)
+
+
+def set_argument(query, key, value):
+    """set_argument(query, key, value) -> str : Return a copy of query where the argument key is set to value"""
+
+    query = re.sub(r'(^|[\s;])' + re.escape(key) + r'=[^;]*;?', r'\g<1>', query).rstrip()
+    if len(query.split()) == 1 and '=' not in query:
+        query += ' '
+    elif not query.endswith(';'):
+        query += ';'
+    return query + key + '=' + str(value) + ';'
+
+
+def _absolute(deadline):
+    # Convert a deadline in seconds from now into an absolute time
+    if deadline is None:
+        return None
+    return time.time() + float(deadline)
+
+
+class ResponseIndex():
+    """ResponseIndex(response) -> obj : index over a deserialized Ophidia response, built in a single pass
+
+    Attributes:
+        response: deserialized response (dict) or None
+        objkeys: dict mapping each objkey to the list of response objects with that key
+        titles: dict mapping each title to the list of response objects with that title
+        extra: dict built from the 'extra' keys and values of the response
+
+    Methods:
+        find(objkey=None, title=None, objclass=None) -> dict or None : Return the first response object matching all the given filters.
+        find_all(objkey=None, title=None, objclass=None) -> list : Return all the response objects matching all the given filters.
+        message(title) -> str or None : Return the message of the first text object with the given title.
+        get_extra(key, default=None) -> str : Return the value associated to key in the 'extra' section of the response.
+    """
+
+    def __init__(self, response):
+        """ResponseIndex(response) -> obj
+        :param response: deserialized response
+        :type response: dict
+        :returns: None
+        :rtype: None
+        """
+
+        self.response = response
+        self.objkeys = {}
+        self.titles = {}
+        self.extra = {}
+        if response is None:
+            return
+        for response_i in response.get('response', []):
+            if 'objkey' in response_i:
+                self.objkeys.setdefault(response_i['objkey'], []).append(response_i)
+            try:
+                title = response_i['objcontent'][0]['title']
+            except (KeyError, IndexError, TypeError):
+                continue
+            self.titles.setdefault(title, []).append(response_i)
+        if 'extra' in response:
+            for key, value in zip(response['extra']['keys'], response['extra']['values']):
+                self.extra.setdefault(key, value)
+
+    def find_all(self, objkey=None, title=None, objclass=None):
+        """find_all(objkey=None, title=None, objclass=None) -> list : Return all the response objects matching all the given filters
+        :param objkey: objkey of the objects
+        :type objkey: str
+        :param title: title of the first objcontent of the objects
+        :type title: str
+        :param objclass: class of the objects (text, grid, digraph)
+        :type objclass: str
+        :returns: list of response objects
+        :rtype: list
+        """
+
+        if objkey is not None:
+            candidates = self.objkeys.get(objkey, [])
+        elif title is not None:
+            candidates = self.titles.get(title, [])
+        elif self.response is not None:
+            candidates = self.response.get('response', [])
+        else:
+            candidates = []
+        matches = []
+        for response_i in candidates:
+            if objclass is not None and response_i.get('objclass') != objclass:
+                continue
+            if title is not None and objkey is not None:
+                try:
+                    if response_i['objcontent'][0]['title'] != title:
+                        continue
+                except (KeyError, IndexError, TypeError):
+                    continue
+            matches.append(response_i)
+        return matches
+
+    def find(self, objkey=None, title=None, objclass=None):
+        """find(objkey=None, title=None, objclass=None) -> dict or None : Return the first response object matching all the given filters
+        :param objkey: objkey of the object
+        :type objkey: str
+        :param title: title of the first objcontent of the object
+        :type title: str
+        :param objclass: class of the object (text, grid, digraph)
+        :type objclass: str
+        :returns: response object or None
+        :rtype: dict or None
+        """
+
+        matches = self.find_all(objkey=objkey, title=title, objclass=objclass)
+        if matches:
+            return matches[0]
+        return None
+
+    def message(self, title):
+        """message(title) -> str or None : Return the message of the first text object with the given title
+        :param title: title of the text object
+        :type title: str
+        :returns: message or None
+        :rtype: str or None
+        """
+
+        response_i = self.find(title=title, objclass='text')
+        if response_i is None:
+            return None
+        return response_i['objcontent'][0]['message']
+
+    def get_extra(self, key, default=None):
+        """get_extra(key, default=None) -> str : Return the value associated to key in the 'extra' section of the response
+        :param key: name of the extra key
+        :type key: str
+        :param default: value returned when the key is not present
+        :type default: str
+        :returns: value or default
+        :rtype: str
+        """
+
+        return self.extra.get(key, default)
+
+
+class Result(namedtuple('Result', ['request', 'response', 'jobid', 'session', 'return_value', 'error', 'exec_time', 'cube', 'cwd', 'cdd', 'index', 'timings'])):
+    """Result(request, response, jobid, session, return_value, error, exec_time, cube, cwd, cdd, index, timings) -> obj : immutable outcome of a single request
+
+    Attributes:
+        request: submitted query or workflow
+        response: response received from the server (JSON string)
+        jobid: Job ID associated to the request
+        session: session the request has been executed in
+        return_value: return value associated to response
+        error: error value associated to response
+        exec_time: execution time associated to response or None
+        cube: PID of the cube produced by the request or None
+        cwd: Current Working Directory set by the request or None
+        cdd: Current Data Directory set by the request or None
+        index: ResponseIndex built on the response
+        timings: dict with the seconds spent in each phase of the request (ophsubmit.PHASES, 'decode' for the JSON decoding and 'total') and the
+            bytes sent and received ('sent' and 'received'); phases that did not occur are missing
+
+    Methods:
+        deserialize() -> dict : Return the response JSON string as a Python dictionary.
+    """
+
+    __slots__ = ()
+
+    def deserialize(self):
+        """deserialize() -> dict : Return the response JSON string as a Python dictionary
+        :returns: deserialized response or None
+        :rtype: dict or None
+        """
+
+        return self.index.response
+
+
+class _Flight():
+    # Request in flight shared by all the callers submitting the same read-only query
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.outcome = None
 
 
 class Client():
@@ -50,29 +233,55 @@ class Client():
         cube: Last produced cube PID
         host_partition: Name of default host partition
         exec_mode: Execution mode, 'sync' for synchronous mode (default),'async' for asynchronous mode
-        ncores: Number of cores for each operation (default is 1)
+        ncores: Number of cores for each operation not setting it, unless chosen by the tuner (default is 1)
         last_request: Last submitted query
         last_response: Last response received from the server (JSON string)
         last_jobid: Job ID associated to the last request
         last_return_value: Last return value associated to response
         last_error: Last error value associated to response
         last_exec_time: Last execution time associated to response
+        last_index: ResponseIndex built on the last response
+        last_result: Result of the last request
+        retry_policy: RetryPolicy (ophsubmit module) applied to the requests, None to disable retries and circuit breaking
+        connect_timeout: maximum number of seconds to establish a connection with the server (None for no limit)
+        read_timeout: maximum number of seconds to wait for the server between two reads (None for no limit)
+        coalesce: if True (default) identical read-only requests submitted while one of them is in flight share its response
+        cache: ResponseCache (cache module) serving the static catalog requests (oph_man, oph_operators_list, etc.), None (default) to disable it
+        memo: OperationMemo (memo module) reusing the cubes already produced by identical operations, None (default) to disable it
+        tuner: AutoTuner (tuning module) choosing ncores, nthreads, nfrag and nhost when left out of a request, None (default) to disable it
+        telemetry: TelemetryRecorder (telemetry module) recording operator, arguments, times and bytes of every request, None (default) to disable it
+        metrics: ClientMetrics (metrics module) exposing request rate, errors, latency, bytes and jobs in the Prometheus format, None (default) to disable it
+        tracer: Tracer (tracing module) recording a span for every request, with its phases and workflow tasks, None (default) to disable it
+        slow_log: SlowRequestLog (slowlog module) logging the requests slower than its thresholds, None (default) to disable it
+        hooks: list of callables invoked as hook(query, timings) after every request with the timings of its phases (e.g. telemetry.PhaseHistograms)
 
     Methods:
-        submit(query, display=False) -> self : Submit a query like 'operator=myoperator;param1=value1;' or 'myoperator param1=value1;' to the
+        submit(query, display=False, deadline=None) -> self : Submit a query like 'operator=myoperator;param1=value1;' or 'myoperator param1=value1;' to the
             Ophidia server according to all login parameters of the Client and its state.
+        execute(query, display=False, deadline=None) -> Result : Submit a query like submit and return the outcome of that request only; the shared state
+            is updated under a lock, so the same Client can be used by many threads.
         get_progress(id=None) -> dict : Get progress of a workflow, either specifying the id or from the last submitted one.
         deserialize_response() -> dict : Return the last_response JSON string attribute as a Python dictionary.
+        lookup(objkey=None, title=None, objclass=None) -> dict or None : Return the first object of the last response matching the given filters.
         get_base_path(display=False) -> self : Get base path for data from the Ophidia instance.
         resume_session(display=False) -> self : Resume the last session the user was connected to.
         resume_cdd(display=False) -> self : Resume the last cdd (current data directory) the user was located into.
         resume_cwd(display=False) -> self : Resume the last cwd (current working directory) the user was located into.
         resume_cube(display=False) -> self : Resume the last cube produced by the user.
-        wsubmit(workflow,*params) -> self : Submit an entire workflow passing a JSON string or the path of a JSON file and an optional series
+        wsubmit(workflow, *params, deadline=None) -> self : Submit an entire workflow passing a JSON string or the path of a JSON file and an optional series
             of parameters that will replace $1, $2 etc. in the workflow.
             The workflow will be validated against the Ophidia Workflow JSON Schema.
         wisvalid(workflow) -> bool : Return True if the workflow (a JSON string or a Python dict) is valid against the Ophidia Workflow JSON Schema or False.
         pretty_print(response, response_i) -> self : Prints the last_response JSON string attribute as a formatted response
+        submit_async(query, display=False, deadline=None) -> Job or None : Submit a query in asynchronous mode and return a handle resolving to the output Cube;
+            the job is cancelled if it is not completed within deadline seconds.
+        wsubmit_async(workflow, *params, deadline=None) -> Job or None : Submit a workflow in asynchronous mode and return a handle resolving to the output Cube;
+            the job is cancelled if it is not completed within deadline seconds.
+        enable_callbacks(host=None, port=0, advertised_host=None, fallback_interval=60.0) -> CallbackReceiver : Start a local listener completing
+            the asynchronous jobs when the server notifies them, polling being used only as a fallback.
+        disable_callbacks() -> self : Stop the local callback listener.
+        profile(measure=True, byte_unit='MB', path=None, log_report=True) -> Profile : Return a context manager recording all the requests submitted
+            within it and reporting where the time is spent.
     """
 
     def __init__(self, username='', password='', server='', port='11732', token='', read_env=False, api_mode=True):
@@ -139,6 +348,25 @@ class Client():
         self.last_return_value = 0
         self.last_error = ''
         self.last_exec_time = 0.0
+        self.last_index = ResponseIndex(None)
+        self.last_result = None
+        self.retry_policy = _ophsubmit.RetryPolicy()
+        self.connect_timeout = 30.0
+        self.read_timeout = None
+        self.coalesce = True
+        self._flights = {}
+        self.cache = None
+        self.memo = None
+        self.tuner = None
+        self.telemetry = None
+        self.metrics = None
+        self.tracer = None
+        self.slow_log = None
+        self.hooks = []
+        self._profiles = ()
+        self.poller = None
+        self.receiver = None
+        self._lock = threading.RLock()
 
         if not self.username and not self.password and access_token:
             self.password = access_token
@@ -155,17 +383,17 @@ class Client():
                     self.resume_cwd()
                     self.resume_cube()
         except Exception as e:
-            print(get_linenumber(), "Something went wrong in resuming last session, cwd or cube:", e)
+            _logger.error("Something went wrong in resuming last session, cwd or cube: %s", e)
         else:
             if self.api_mode:
                 if self.cdd:
-                    print("Current cdd is " + self.cdd)
+                    _logger.info("Current cdd is %s", self.cdd)
                 if self.session:
-                    print("Current session is " + self.session)
+                    _logger.info("Current session is %s", self.session)
                 if self.cwd:
-                    print("Current cwd is " + self.cwd)
+                    _logger.info("Current cwd is %s", self.cwd)
                 if self.cube:
-                    print("The last produced cube is " + self.cube)
+                    _logger.info("The last produced cube is %s", self.cube)
         finally:
             pass
 
@@ -188,19 +416,56 @@ class Client():
         del self.last_jobid
         del self.last_return_value
         del self.last_error
-
-    def submit(self, query, display=False):
-        """submit(query,display=False) -> self : Submit a query like 'operator=myoperator;param1=value1;' or 'myoperator param1=value1;' to the Ophidia server
+        del self.last_index
+        del self.last_result
+        del self.retry_policy
+        del self.connect_timeout
+        del self.read_timeout
+        del self.coalesce
+        del self.cache
+        del self.memo
+        del self.tuner
+        del self.telemetry
+        del self.metrics
+        del self.tracer
+        del self.slow_log
+        del self.hooks
+        del self.poller
+        del self.receiver
+
+    def submit(self, query, display=False, deadline=None):
+        """submit(query,display=False,deadline=None) -> self : Submit a query like 'operator=myoperator;param1=value1;' or 'myoperator param1=value1;' to the Ophidia server
                according to all login parameters of the Client and its state.
         :param query: query like 'operator=myoperator;param1=value1;' or 'myoperator param1=value1;'
         :type query: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: self or None
         :rtype: Client or None
         :raises: RuntimeError
         """
 
+        if self.execute(query, display, deadline) is None:
+            return None
+        return self
+
+    def execute(self, query, display=False, deadline=None):
+        """execute(query,display=False,deadline=None) -> Result : Submit a query like 'operator=myoperator;param1=value1;' or 'myoperator param1=value1;' to the Ophidia server
+               according to all login parameters of the Client and its state and return the outcome of that request only. The shared state of the Client
+               is updated under a lock, so that the same Client can be used by many threads.
+        :param query: query like 'operator=myoperator;param1=value1;' or 'myoperator param1=value1;'
+        :type query: str
+        :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
+        :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
+        :returns: result or None
+        :rtype: Result or None
+        :raises: RuntimeError
+        """
+
         if query is None:
             raise RuntimeError('query is not present')
         if self.username is None or self.password is None or self.server is None or self.port is None:
@@ -213,75 +478,228 @@ class Client():
                 query += ';'
         else:
             query += ' '
-        if self.session and 'sessionid' not in query:
-            query += 'sessionid=' + self.session + ';'
-        if self.cwd and 'cwd' not in query:
-            query += 'cwd=' + self.cwd + ';'
-        if self.cdd and 'cdd' not in query:
-            query += 'cdd=' + self.cdd + ';'
-        if self.cube and 'cube' not in query:
-            query += 'cube=' + self.cube + ';'
-        if self.host_partition and 'host_partition' not in query:
-            query += 'host_partition=' + self.host_partition + ';'
-        if self.exec_mode and 'exec_mode' not in query:
-            query += 'exec_mode=' + self.exec_mode + ';'
+        with self._lock:
+            if self.session and 'sessionid' not in query:
+                query += 'sessionid=' + self.session + ';'
+            if self.cwd and 'cwd' not in query:
+                query += 'cwd=' + self.cwd + ';'
+            if self.cdd and 'cdd' not in query:
+                query += 'cdd=' + self.cdd + ';'
+            if self.cube and 'cube' not in query:
+                query += 'cube=' + self.cube + ';'
+            if self.host_partition and 'host_partition' not in query:
+                query += 'host_partition=' + self.host_partition + ';'
+            if self.exec_mode and 'exec_mode' not in query:
+                query += 'exec_mode=' + self.exec_mode + ';'
+        tuner = self.tuner
+        if tuner is not None:
+            # Only the arguments left out of the request are tuned
+            try:
+                query = tuner.tune(self, query)
+            except Exception as e:
+                _logger.warning("Unable to tune the request: %s", e)
         if self.ncores and 'ncores' not in query:
             query += 'ncores=' + str(self.ncores) + ';'
-        self.last_request = query
+        result = None
+        try:
+            result = self._execute(query, self.api_mode and display is True, deadline=_absolute(deadline))
+        except Exception as e:
+            _logger.error("Something went wrong in submitting the request: %s", e)
+        if tuner is not None:
+            tuner.observe(query, result)
+        return result
+
+    def _transport(self, query, deadline=None, stats=None):
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.in_flight.inc()
+        try:
+            return _ophsubmit.submit(self.username, self.password, self.server, self.port, query, retry_policy=self.retry_policy,
+                                     connect_timeout=self.connect_timeout, read_timeout=self.read_timeout, deadline=deadline, stats=stats)
+        finally:
+            if metrics is not None:
+                metrics.in_flight.dec()
+
+    def _coalesced_transport(self, query, deadline=None, stats=None):
+        if not self.coalesce or 'exec_mode=async' in query or not _ophsubmit.is_read_only(query):
+            return self._transport(query, deadline, stats)
+        with self._lock:
+            flight = self._flights.get(query)
+            leader = flight is None
+            if leader:
+                flight = self._flights[query] = _Flight()
+        if not leader:
+            if flight.event.wait(None if deadline is None else max(deadline - time.time(), 0)):
+                return flight.outcome
+            return (None, None, None, 1, _ophsubmit.DeadlineExceeded("Deadline expired while waiting for an identical request"))
         try:
-            self.last_response, self.last_jobid, newsession, self.last_return_value, self.last_error = _ophsubmit.submit(self.username, self.password, self.server, self.port, query)
-            if self.last_return_value:
-                raise RuntimeError(self.last_error)
-            if self.api_mode and not self.last_return_value and self.last_error is not None:
-                raise RuntimeError(self.last_error)
-            if newsession is not None:
+            flight.outcome = self._transport(query, deadline, stats)
+        except Exception as e:
+            flight.outcome = (None, None, None, 1, e)
+            raise
+        finally:
+            with self._lock:
+                del self._flights[query]
+            flight.event.set()
+        return flight.outcome
+
+    def _execute(self, query, display=False, workflow=False, track_session=True, deadline=None):
+        start = time.time()
+        cache = self.cache
+        memo = self.memo
+        telemetry = self.telemetry
+        stats = {}
+        source = 'server'
+        scope = str(self.username) + '@' + str(self.server) + ':' + str(self.port)
+        memo_key = memo.key(query, scope) if memo is not None else None
+        reused = memo.lookup(memo_key) if memo_key is not None else None
+        if reused is not None:
+            # Check that the cube produced by the same operation still exists
+            check = 'oph_cubeschema exec_mode=sync;level=0;cube=' + reused + ';'
+            if self.session:
+                check += 'sessionid=' + self.session + ';'
+            response, jobid, newsession, return_value, error = self._coalesced_transport(check, deadline, stats)
+            if return_value or error is not None or response is None:
+                memo.forget(reused)
+                reused = None
+            else:
+                memo.hits += 1
+                source = 'memo'
+        if reused is None:
+            response = cache.get(query, scope) if cache is not None else None
+            if response is not None:
+                jobid, newsession, return_value, error = None, None, 0, None
+                source = 'cache'
+            else:
+                response, jobid, newsession, return_value, error = self._coalesced_transport(query, deadline, stats)
+                if cache is not None and not return_value and error is None and not cache.put(query, response, scope):
+                    cache.observe(query)
+        decoding = time.time()
+        index = ResponseIndex(json.loads(response) if response is not None else None)
+        stats['decode'] = time.time() - decoding
+        cube = index.message('Output Cube')
+        if cube is None:
+            cube = index.get_extra('cube')
+        cwd = index.message('Current Working Directory')
+        cdd = index.message('Current Data Directory')
+        if workflow:
+            cwd = index.get_extra('cwd', cwd)
+            cdd = index.get_extra('cdd', cdd)
+        if reused is not None:
+            cube = reused
+        exec_time = index.get_extra('execution_time')
+        if exec_time is not None:
+            exec_time = float(exec_time)
+        if telemetry is not None:
+            # Cached and reused responses carry the execution time of an earlier request
+            self._record(telemetry, query, start, exec_time if source == 'server' else None, stats, return_value, source, cube)
+        stats['total'] = time.time() - start
+        for hook in list(self.hooks):
+            try:
+                hook(query, stats)
+            except Exception as e:
+                _logger.error("Something went wrong in a request hook: %s", e)
+        metrics = self.metrics
+        if metrics is not None:
+            try:
+                metrics.observe(self, query, return_value, error, source, stats, index.message('Output Cube'))
+            except Exception as e:
+                _logger.warning("Unable to update the metrics: %s", e)
+        tracer = self.tracer
+        if tracer is not None:
+            try:
+                tracer.trace_request(self, query, start, stats, exec_time if source == 'server' else None, return_value, error, source, jobid, cube)
+            except Exception as e:
+                _logger.warning("Unable to trace the request: %s", e)
+        slow_log = self.slow_log
+        if slow_log is not None and source == 'server':
+            try:
+                slow_log.check(self, query, stats, exec_time, jobid, return_value)
+            except Exception as e:
+                _logger.warning("Unable to check the slow request log: %s", e)
+        for profile in self._profiles:
+            try:
+                profile._observe(query, stats, exec_time if source == 'server' else None, return_value, source, index.message('Output Cube'))
+            except Exception as e:
+                _logger.warning("Unable to profile the request: %s", e)
+        with self._lock:
+            session = self.session
+            if track_session and newsession is not None and not return_value:
+                session = newsession if len(newsession) > 0 else None
+            result = Result(query, response, jobid, session, return_value, error, exec_time, cube, cwd, cdd, index, stats)
+            self.last_request = query
+            self.last_response = response
+            self.last_jobid = jobid
+            self.last_return_value = return_value
+            self.last_error = error
+            if return_value:
+                raise RuntimeError(error)
+            if self.api_mode and error is not None:
+                raise RuntimeError(error)
+            if track_session and newsession is not None:
                 if len(newsession) == 0:
                     self.session = None
                 else:
-                    if self.session != newsession:
+                    if workflow or self.session != newsession:
                         self.cwd = '/'
                     self.session = newsession
-            response = self.deserialize_response()
-            if response is not None:
-                for response_i in response['response']:
-                    if response_i['objclass'] == 'text' and response_i['objcontent'][0]['title'] == 'Output Cube':
-                        self.cube = response_i['objcontent'][0]['message']
-                        break
-                else:
-                    index = 0
-                    if 'extra' in response:
-                        for response_i in response['extra']['keys']:
-                            if response_i == 'cube':
-                                self.cube = response['extra']['values'][index]
-                                break
-                            index += 1
-
-                for response_i in response['response']:
-                    if response_i['objclass'] == 'text' and response_i['objcontent'][0]['title'] == 'Current Working Directory':
-                        self.cwd = response_i['objcontent'][0]['message']
-                        break
-
-                for response_i in response['response']:
-                    if response_i['objclass'] == 'text' and response_i['objcontent'][0]['title'] == 'Current Data Directory':
-                        self.cdd = response_i['objcontent'][0]['message']
-                        break
-
-                index = 0
-                if 'extra' in response:
-                    for response_i in response['extra']['keys']:
-                        if response_i == 'execution_time':
-                            self.last_exec_time = float(response['extra']['values'][index])
-                        elif response_i == 'access_token':
-                            self.password = response['extra']['values'][index]
-                        index += 1
-
-                if self.api_mode and display is True:
-                    self.pretty_print(response_i, response)
-
+            self.last_index = index
+            self.last_result = result
+            if index.response is not None:
+                self._update_state(result)
+                if display:
+                    self.pretty_print(index.response, None)
+        if memo is not None:
+            if memo_key is not None and reused is None and cube and '|' not in cube:
+                memo.record(memo_key, cube)
+            operator, arguments = _cache.parse_query(query)
+            if operator == 'oph_delete' and arguments.get('cube'):
+                memo.forget(arguments['cube'])
+        if _lifecycle.active():
+            _lifecycle.observe(self, query, cube if reused is None and index.message('Output Cube') is not None else None)
+        return result
+
+    def _record(self, telemetry, query, start, exec_time, stats, return_value, source, cube):
+        try:
+            operator, arguments = _cache.parse_query(query)
+            if query.lstrip().startswith('{'):
+                operator = 'workflow'
+            numbers = {}
+            for key in ('ncores', 'nthreads', 'nfrag', 'nhost'):
+                value = arguments.get(key)
+                numbers[key] = int(value) if value is not None and value.isdigit() else None
+            input_size = None
+            pid = arguments.get('cube') or arguments.get('cubes', '').split('|')[0]
+            if not pid and cube and '|' not in cube:
+                # Imports and other operators creating a cube from scratch are described by their output
+                pid = cube
+            if operator not in ('workflow', 'oph_delete') and pid and not pid.startswith('[') and not return_value and getattr(telemetry, 'describe_cubes', False):
+                facts = telemetry.describe(self, pid)
+                input_size = facts['size']
+                if facts['nfragments'] is not None:
+                    numbers['nfrag'] = facts['nfragments']
+            telemetry.record(timestamp=start, operator=operator, input_size=input_size, exec_time=exec_time, wall_time=time.time() - start,
+                             bytes_sent=stats.get('sent', 0), bytes_received=stats.get('received', 0), return_value=return_value, source=source,
+                             cube=cube, **numbers)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong in submitting the request:", e)
-            return None
-        return self
+            _logger.warning("Unable to record the request: %s", e)
+
+    def profile(self, measure=True, byte_unit='MB', path=None, log_report=True):
+        """profile(measure=True, byte_unit='MB', path=None, log_report=True) -> Profile : Return a context manager recording all the requests submitted
+               within it (operator, arguments, execution time, client overhead, bytes and output cube size) and reporting where the time is spent
+        :param measure: if True measure the output cubes with OPH_CUBESIZE on exit
+        :type measure: bool
+        :param byte_unit: KB|MB|GB|TB|PB
+        :type byte_unit: str
+        :param path: file the records are dumped to on exit (.csv for CSV, JSON otherwise)
+        :type path: str
+        :param log_report: if True log the ranked report on exit (INFO level)
+        :type log_report: bool
+        :returns: profile
+        :rtype: Profile
+        """
+
+        return _profiling.Profile(self, measure, byte_unit, path, log_report)
 
     def get_progress(self, id=None):
         """get_progress(id=None) -> dict : Get progress of a workflow, either specifying the id or from the last submitted one
@@ -307,21 +725,17 @@ class Client():
         progress_rate = 0
         submission_date = "0000-00-00 00:00:00"
         try:
-            if self.submit(query, display=False) is None:
+            result = self.execute(query, display=False)
+            if result is None:
                 raise RuntimeError()
 
-            if self.last_response is not None:
-                response = self.deserialize_response()
-
-            if response is not None:
-                for response_i in response['response']:
-                    if response_i['objclass'] == 'grid' and response_i['objcontent'][0]['title'] == 'Workflow Progress Ratio':
-                        submission_date = response_i['objcontent'][0]['rowvalues'][0][0]
-                        progress_rate = float(response_i['objcontent'][0]['rowvalues'][0][1])
-                        break
+            response_i = result.index.find(title='Workflow Progress Ratio', objclass='grid')
+            if response_i is not None:
+                submission_date = response_i['objcontent'][0]['rowvalues'][0][0]
+                progress_rate = float(response_i['objcontent'][0]['rowvalues'][0][1])
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             return None
 
         return {'submission date': submission_date, 'progress rate': progress_rate}
@@ -336,6 +750,33 @@ class Client():
             return None
         return json.loads(self.last_response)
 
+    def lookup(self, objkey=None, title=None, objclass=None):
+        """lookup(objkey=None, title=None, objclass=None) -> dict or None : Return the first object of the last response matching the given filters
+        :param objkey: objkey of the object
+        :type objkey: str
+        :param title: title of the first objcontent of the object
+        :type title: str
+        :param objclass: class of the object (text, grid, digraph)
+        :type objclass: str
+        :returns: response object or None
+        :rtype: dict or None
+        """
+
+        return self.last_index.find(objkey=objkey, title=title, objclass=objclass)
+
+    def _update_state(self, result):
+        if result.cube is not None:
+            self.cube = result.cube
+        if result.cwd is not None:
+            self.cwd = result.cwd
+        if result.cdd is not None:
+            self.cdd = result.cdd
+        if result.exec_time is not None:
+            self.last_exec_time = result.exec_time
+        access_token = result.index.get_extra('access_token')
+        if access_token is not None:
+            self.password = access_token
+
     def pretty_print(self, response, response_i):
         """pretty_print(response, response_i) -> self : Prints the last_response JSON string attribute as a formatted response
         :param response: Python dictionary derived from the last_response JSON string
@@ -511,7 +952,7 @@ class Client():
                         print("\n}\n")
 
                 except Exception as e:
-                    print(get_linenumber(), "Error in parsing json response:", e)
+                    _logger.error("Error in parsing json response: %s", e)
 
             print("Execution time: " + str(self.last_exec_time) + " seconds")
 
@@ -529,25 +970,14 @@ class Client():
         if self.username is None or self.password is None or self.server is None or self.port is None:
             raise RuntimeError('one or more login parameters are None')
         query = 'operator=oph_get_config;key=OPH_BASE_SRC_PATH;'
-        self.last_request = query
         try:
-            self.last_response, self.last_jobid, newsession, self.last_return_value, self.last_error = _ophsubmit.submit(self.username, self.password, self.server, self.port, query)
-            if self.last_return_value:
-                raise RuntimeError(self.last_error)
-            if self.api_mode and not self.last_return_value and self.last_error is not None:
-                raise RuntimeError(self.last_error)
-            response = self.deserialize_response()
-            if response is not None:
-                for response_i in response['response']:
-                    if response_i['objkey'] == 'get_config':
-                        self.base_src_path = response_i['objcontent'][0]['rowvalues'][0][1]
-
-                    if self.api_mode and display is True:
-                        self.pretty_print(response_i, response)
-
-                    break
+            result = self._execute(query, self.api_mode and display is True, track_session=False)
+            response_i = result.index.find(objkey='get_config')
+            if response_i is not None:
+                with self._lock:
+                    self.base_src_path = response_i['objcontent'][0]['rowvalues'][0][1]
         except Exception as e:
-            print(get_linenumber(), "Something went wrong in retrieving base data path:", e)
+            _logger.error("Something went wrong in retrieving base data path: %s", e)
             return None
         return self
 
@@ -563,25 +993,14 @@ class Client():
         if self.username is None or self.password is None or self.server is None or self.port is None:
             raise RuntimeError('one or more login parameters are None')
         query = 'operator=oph_get_config;key=OPH_SESSION_ID;'
-        self.last_request = query
         try:
-            self.last_response, self.last_jobid, newsession, self.last_return_value, self.last_error = _ophsubmit.submit(self.username, self.password, self.server, self.port, query)
-            if self.last_return_value:
-                raise RuntimeError(self.last_error)
-            if self.api_mode and not self.last_return_value and self.last_error is not None:
-                raise RuntimeError(self.last_error)
-            response = self.deserialize_response()
-            if response is not None:
-                for response_i in response['response']:
-                    if response_i['objkey'] == 'get_config':
-                        self.session = response_i['objcontent'][0]['rowvalues'][0][1]
-
-                    if self.api_mode and display is True:
-                        self.pretty_print(response_i, response)
-
-                    break
+            result = self._execute(query, self.api_mode and display is True, track_session=False)
+            response_i = result.index.find(objkey='get_config')
+            if response_i is not None:
+                with self._lock:
+                    self.session = response_i['objcontent'][0]['rowvalues'][0][1]
         except Exception as e:
-            print(get_linenumber(), "Something went wrong in resuming last session:", e)
+            _logger.error("Something went wrong in resuming last session: %s", e)
             return None
         return self
 
@@ -597,25 +1016,14 @@ class Client():
         if self.username is None or self.password is None or self.server is None or self.port is None:
             raise RuntimeError('one or more login parameters are None')
         query = 'operator=oph_get_config;key=OPH_CDD;'
-        self.last_request = query
         try:
-            self.last_response, self.last_jobid, newsession, self.last_return_value, self.last_error = _ophsubmit.submit(self.username, self.password, self.server, self.port, query)
-            if self.last_return_value:
-                raise RuntimeError(self.last_error)
-            if self.api_mode and not self.last_return_value and self.last_error is not None:
-                raise RuntimeError(self.last_error)
-            response = self.deserialize_response()
-            if response is not None:
-                for response_i in response['response']:
-                    if response_i['objkey'] == 'get_config':
-                        self.cdd = response_i['objcontent'][0]['rowvalues'][0][1]
-
-                    if self.api_mode and display is True:
-                        self.pretty_print(response_i, response)
-
-                    break
+            result = self._execute(query, self.api_mode and display is True, track_session=False)
+            response_i = result.index.find(objkey='get_config')
+            if response_i is not None:
+                with self._lock:
+                    self.cdd = response_i['objcontent'][0]['rowvalues'][0][1]
         except Exception as e:
-            print(get_linenumber(), "Something went wrong in resuming last cdd:", e)
+            _logger.error("Something went wrong in resuming last cdd: %s", e)
             return None
         return self
 
@@ -631,25 +1039,14 @@ class Client():
         if self.username is None or self.password is None or self.server is None or self.port is None:
             raise RuntimeError('one or more login parameters are None')
         query = 'operator=oph_get_config;key=OPH_CWD;'
-        self.last_request = query
         try:
-            self.last_response, self.last_jobid, newsession, self.last_return_value, self.last_error = _ophsubmit.submit(self.username, self.password, self.server, self.port, query)
-            if self.last_return_value:
-                raise RuntimeError(self.last_error)
-            if self.api_mode and not self.last_return_value and self.last_error is not None:
-                raise RuntimeError(self.last_error)
-            response = self.deserialize_response()
-            if response is not None:
-                for response_i in response['response']:
-                    if response_i['objkey'] == 'get_config':
-                        self.cwd = response_i['objcontent'][0]['rowvalues'][0][1]
-
-                    if self.api_mode and display is True:
-                        self.pretty_print(response_i, response)
-
-                    break
+            result = self._execute(query, self.api_mode and display is True, track_session=False)
+            response_i = result.index.find(objkey='get_config')
+            if response_i is not None:
+                with self._lock:
+                    self.cwd = response_i['objcontent'][0]['rowvalues'][0][1]
         except Exception as e:
-            print(get_linenumber(), "Something went wrong in resuming last cwd:", e)
+            _logger.error("Something went wrong in resuming last cwd: %s", e)
             return None
         return self
 
@@ -665,40 +1062,36 @@ class Client():
         if self.username is None or self.password is None or self.server is None or self.port is None:
             raise RuntimeError('one or more login parameters are None')
         query = 'operator=oph_get_config;key=OPH_DATACUBE;'
-        self.last_request = query
         try:
-            self.last_response, self.last_jobid, newsession, self.last_return_value, self.last_error = _ophsubmit.submit(self.username, self.password, self.server, self.port, query)
-            if self.last_return_value:
-                raise RuntimeError(self.last_error)
-            if self.api_mode and not self.last_return_value and self.last_error is not None:
-                raise RuntimeError(self.last_error)
-            response = self.deserialize_response()
-            if response is not None:
-                for response_i in response['response']:
-                    if response_i['objkey'] == 'get_config':
-                        self.cube = response_i['objcontent'][0]['rowvalues'][0][1]
-
-                    if self.api_mode and display is True:
-                        self.pretty_print(response_i, response)
-
-                    break
+            result = self._execute(query, self.api_mode and display is True, track_session=False)
+            response_i = result.index.find(objkey='get_config')
+            if response_i is not None:
+                with self._lock:
+                    self.cube = response_i['objcontent'][0]['rowvalues'][0][1]
         except Exception as e:
-            print(get_linenumber(), "Something went wrong in resuming last cube:", e)
+            _logger.error("Something went wrong in resuming last cube: %s", e)
             return None
         return self
 
-    def wsubmit(self, workflow, *params):
-        """wsubmit(workflow,*params) -> self : Submit an entire workflow passing a JSON string or the path of a JSON file and an optional series of
+    def wsubmit(self, workflow, *params, **kwargs):
+        """wsubmit(workflow, *params, deadline=None) -> self : Submit an entire workflow passing a JSON string or the path of a JSON file and an optional series of
            parameters that will replace $1, $2 etc. in the workflow. The workflow will be validated against the Ophidia Workflow JSON Schema.
         :param workflow: JSON string or path of a JSON file containing an Ophidia workflow
         :type workflow: str
         :param params: list of positional parameters that will replace $1, $2 etc. in the workflow
         :type params: str
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: self or None
         :rtype: Client or None
         :raises: RuntimeError
         """
 
+        if self._wexecute(workflow, params, deadline=_absolute(kwargs.get('deadline'))) is None:
+            return None
+        return self
+
+    def _wexecute(self, workflow, params, exec_mode=None, callback_url=None, deadline=None, display=True):
         if workflow is None:
             raise RuntimeError('workflow is not present')
         if self.username is None or self.password is None or self.server is None or self.port is None:
@@ -719,7 +1112,7 @@ class Client():
                 request = json.loads(buffer)
 
             except Exception as e:
-                print(get_linenumber(), "Something went wrong in reading and/or parsing the file:", e)
+                _logger.error("Something went wrong in reading and/or parsing the file: %s", e)
                 return None
         else:
             try:
@@ -733,86 +1126,191 @@ class Client():
                 request = json.loads(buffer)
 
             except Exception as e:
-                print(get_linenumber(), "Something went wrong in parsing the string:", e)
+                _logger.error("Something went wrong in parsing the string: %s", e)
                 return None
 
-        if self.session and 'sessionid' not in request:
-            request['sessionid'] = self.session
-        if self.cwd and 'cwd' not in request:
-            request['cwd'] = self.cwd
-        if self.cdd and 'cdd' not in request:
-            request['cdd'] = self.cdd
-        if self.cube and 'cube' not in request:
-            request['cube'] = self.cube
-        if self.host_partition and 'host_partition' not in request:
-            request['host_partition'] = self.host_partition
-        if self.exec_mode and 'exec_mode' not in request:
-            request['exec_mode'] = self.exec_mode
-        if self.ncores and 'ncores' not in request:
-            request['ncores'] = str(self.ncores)
-        self.last_request = json.dumps(request)
+        with self._lock:
+            if self.session and 'sessionid' not in request:
+                request['sessionid'] = self.session
+            if self.cwd and 'cwd' not in request:
+                request['cwd'] = self.cwd
+            if self.cdd and 'cdd' not in request:
+                request['cdd'] = self.cdd
+            if self.cube and 'cube' not in request:
+                request['cube'] = self.cube
+            if self.host_partition and 'host_partition' not in request:
+                request['host_partition'] = self.host_partition
+            if self.exec_mode and 'exec_mode' not in request:
+                request['exec_mode'] = self.exec_mode
+            if self.ncores and 'ncores' not in request:
+                request['ncores'] = str(self.ncores)
+        if exec_mode is not None:
+            request['exec_mode'] = exec_mode
+        if callback_url is not None:
+            request['callback_url'] = callback_url
+        request = json.dumps(request)
         try:
-            err, err_msg = self.wisvalid(self.last_request)
+            err, err_msg = self.wisvalid(request)
             if not err:
-                print("The workflow is not valid: " + str(err_msg))
+                _logger.error("The workflow is not valid: %s", err_msg)
                 return None
-            self.last_response, self.last_jobid, newsession, self.last_return_value, self.last_error = _ophsubmit.submit(self.username, self.password, self.server, self.port, self.last_request)
-            if self.last_return_value:
-                raise RuntimeError(self.last_error)
-            if self.api_mode and not self.last_return_value and self.last_error is not None:
-                raise RuntimeError(self.last_error)
+            return self._execute(request, display, workflow=True, deadline=deadline)
+        except Exception as e:
+            _logger.error("Something went wrong in submitting the request: %s", e)
+            return None
 
-            if newsession is not None:
-                if len(newsession) == 0:
-                    self.session = None
-                else:
-                    self.session = newsession
-                    self.cwd = '/'
-            response = self.deserialize_response()
-            if response is not None:
-                for response_i in response['response']:
-                    if response_i['objclass'] == 'text' and response_i['objcontent'][0]['title'] == 'Output Cube':
-                        self.cube = response_i['objcontent'][0]['message']
-                        break
-                else:
-                    index = 0
-                    if 'extra' in response:
-                        for response_i in response['extra']['keys']:
-                            if response_i == 'cube':
-                                self.cube = response['extra']['values'][index]
-                                break
-                            index += 1
-
-                for response_i in response['response']:
-                    if response_i['objclass'] == 'text' and response_i['objcontent'][0]['title'] == 'Current Working Directory':
-                        self.cwd = response_i['objcontent'][0]['message']
-                        break
-
-                for response_i in response['response']:
-                    if response_i['objclass'] == 'text' and response_i['objcontent'][0]['title'] == 'Current Data Directory':
-                        self.cdd = response_i['objcontent'][0]['message']
-                        break
-
-                index = 0
-                if 'extra' in response:
-                    for response_i in response['extra']['keys']:
-                        if response_i == 'execution_time':
-                            self.last_exec_time = float(response['extra']['values'][index])
-                        elif response_i == 'access_token':
-                            self.password = response['extra']['values'][index]
-                        elif response_i == 'cwd':
-                            self.cwd = response['extra']['values'][index]
-                        elif response_i == 'cdd':
-                            self.cdd = response['extra']['values'][index]
-                        index += 1
-
-                self.pretty_print(response_i, response)
+    def submit_async(self, query, display=False, deadline=None):
+        """submit_async(query, display=False, deadline=None) -> Job or None : Submit a query in asynchronous mode and return a handle resolving to the output Cube
+        :param query: query like 'operator=myoperator;param1=value1;' or 'myoperator param1=value1;'
+        :type query: str
+        :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
+        :type display: bool
+        :param deadline: maximum number of seconds the job may take, after which it is cancelled (default is no limit)
+        :type deadline: float
+        :returns: job handle or None
+        :rtype: Job or None
+        :raises: RuntimeError
+        """
 
-        except Exception as e:
-            print(get_linenumber(), "Something went wrong in submitting the request:", e)
+        if query is None:
+            raise RuntimeError('query is not present')
+        query = set_argument(query, 'exec_mode', 'async')
+        if self.receiver is not None:
+            query = set_argument(query, 'callback_url', self.receiver.url)
+        expiry = _absolute(deadline)
+        result = self.execute(query, display, deadline)
+        if result is None:
+            return None
+        return self._track(result.jobid, expiry)
+
+    def wsubmit_async(self, workflow, *params, **kwargs):
+        """wsubmit_async(workflow, *params, deadline=None) -> Job or None : Submit a workflow in asynchronous mode and return a handle resolving to the output Cube
+        :param workflow: JSON string or path of a JSON file containing an Ophidia workflow
+        :type workflow: str
+        :param params: list of positional parameters that will replace $1, $2 etc. in the workflow
+        :type params: str
+        :param deadline: maximum number of seconds the job may take, after which it is cancelled (default is no limit)
+        :type deadline: float
+        :returns: job handle or None
+        :rtype: Job or None
+        :raises: RuntimeError
+        """
+
+        callback_url = self.receiver.url if self.receiver is not None else None
+        expiry = _absolute(kwargs.get('deadline'))
+        result = self._wexecute(workflow, params, exec_mode='async', callback_url=callback_url, deadline=expiry)
+        if result is None:
             return None
+        return self._track(result.jobid, expiry)
+
+    def enable_callbacks(self, host=None, port=0, advertised_host=None, fallback_interval=60.0):
+        """enable_callbacks(host=None, port=0, advertised_host=None, fallback_interval=60.0) -> CallbackReceiver : Start a local listener completing
+               the asynchronous jobs when the server notifies them, polling being used only as a fallback
+        :param host: address the listener binds to (default is 127.0.0.1, or all interfaces when advertised_host is given)
+        :type host: str
+        :param port: port the listener binds to (default is a free port)
+        :type port: int
+        :param advertised_host: host name the Ophidia server uses to reach the listener (default is the fully qualified domain name)
+        :type advertised_host: str
+        :param fallback_interval: number of seconds between two fallback polls
+        :type fallback_interval: float
+        :returns: the callback receiver
+        :rtype: CallbackReceiver
+        """
+
+        if self.receiver is not None:
+            return self.receiver
+        if self.poller is None:
+            self.poller = _job.JobMonitor(self)
+        self._polling_interval = self.poller.min_interval
+        self.poller.min_interval = fallback_interval
+        self.poller.max_interval = max(self.poller.max_interval, fallback_interval)
+        self.receiver = _receiver.CallbackReceiver(host, port, advertised_host, poller=self.poller)
+        return self.receiver
+
+    def disable_callbacks(self):
+        """disable_callbacks() -> self : Stop the local callback listener and go back to regular polling
+        :returns: self
+        :rtype: Client
+        """
+
+        if self.receiver is not None:
+            self.receiver.close()
+            self.receiver = None
+            if self.poller is not None:
+                self.poller.min_interval = self._polling_interval
         return self
 
+    def _track(self, jobid, deadline=None):
+        if not jobid:
+            raise RuntimeError('no jobid returned by the server')
+        if self.poller is None:
+            self.poller = _job.JobMonitor(self)
+        job = self.poller.add(_job.Job(self, jobid, deadline))
+        if self.receiver is not None:
+            self.receiver.register(job)
+        tracer = self.tracer
+        if tracer is not None and tracer.resume_tasks:
+            job.add_done_callback(tracer.trace_job)
+        return job
+
+    def _query(self, query):
+        response, jobid, newsession, return_value, error = self._transport(query)
+        if return_value:
+            raise RuntimeError(error)
+        if response is None:
+            return ResponseIndex(None), error
+        return ResponseIndex(json.loads(response)), error
+
+    def _job_status(self, job):
+        index, error = self._query('oph_resume id=' + str(job.workflow_id) + ';level=0;sessionid=' + str(job.session) + ';')
+        if error is not None:
+            return _job.OPH_STATUS_ERROR, None
+        progress = None
+        response_i = index.find(title='Workflow Progress Ratio', objclass='grid')
+        if response_i is not None:
+            progress = float(response_i['objcontent'][0]['rowvalues'][0][1])
+        status = index.message('Workflow Status')
+        if status is None and progress is not None:
+            status = _job.OPH_STATUS_COMPLETED if progress >= 1.0 else _job.OPH_STATUS_RUNNING
+        return status, progress
+
+    def _active_jobs(self, session, status_filter):
+        index, error = self._query('oph_resume id=0;level=1;status_filter=' + str(status_filter) + ';session=' + str(session) + ';sessionid=' + str(session) + ';')
+        if error is not None:
+            raise RuntimeError(error)
+        for response_i in index.find_all(objclass='grid'):
+            rowkeys = [str(key).upper() for key in response_i['objcontent'][0]['rowkeys']]
+            id_column = None
+            status_column = None
+            for position, key in enumerate(rowkeys):
+                if id_column is None and 'WORKFLOW' in key and 'ID' in key:
+                    id_column = position
+                elif status_column is None and 'STATUS' in key:
+                    status_column = position
+            if id_column is None:
+                continue
+            active = {}
+            for row in response_i['objcontent'][0]['rowvalues']:
+                active[str(row[id_column])] = row[status_column] if status_column is not None else None
+            return active
+        if not index.find_all():
+            # An empty listing means that no job is pending or running
+            return {}
+        return None
+
+    def _job_output(self, job):
+        index, error = self._query('oph_resume id=' + str(job.workflow_id) + ';level=1;sessionid=' + str(job.session) + ';')
+        if error is not None:
+            raise RuntimeError(error)
+        pid = index.message('Output Cube')
+        if pid is None:
+            pid = index.get_extra('cube')
+        if not pid:
+            return None
+        import PyOphidia.cube as _cube
+        return _cube.Cube(pid=pid, client=self)
+
     def wisvalid(self, workflow):
         """wisvalid(workflow) -> bool : Return True if the workflow (a JSON string or a Python dict) is valid against the Ophidia Workflow JSON Schema or False.
         :param workflow: a JSON string or a Python dict containing an Ophidia workflow
@@ -827,7 +1325,6 @@ class Client():
 
         # Remove comment blocks
         checked_workflow = re.sub(re.compile('/\*.*?\*/|//.*?\n', re.DOTALL), '\n', workflow)
-        print(checked_workflow)
         if isinstance(checked_workflow, str):
             try:
                 w = json.loads(checked_workflow)
@@ -0,0 +1,686 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import sys
+import os
+import re
+import json
+import time
+import itertools
+import threading
+from collections import OrderedDict
+import logging
+from PyOphidia.cube import Cube
+from PyOphidia.cache import parse_query
+from PyOphidia.lifecycle import massive_filter
+from PyOphidia.tracing import _parse_date
+try:
+    import contextvars
+except ImportError:
+    contextvars = None
+sys.path.append(os.path.dirname(__file__))
+
+
+_logger = logging.getLogger(__name__)
+
+
+# Cube PIDs have the form http://<server>/<prefix>/<container id>/<cube id>
+_PID = re.compile(r'https?://[^\s;"\'|,\]]+/[0-9]+/[0-9]+')
+
+# Operators producing a new cube for each input cube
+CUBE_OPERATORS = frozenset(['oph_aggregate', 'oph_aggregate2', 'oph_apply', 'oph_drilldown', 'oph_duplicate', 'oph_merge', 'oph_permute', 'oph_reduce',
+                            'oph_reduce2', 'oph_rollup', 'oph_subset', 'oph_subset2'])
+
+# Arguments set on the whole workflow rather than on its tasks
+_WORKFLOW_ARGUMENTS = ('exec_mode', 'sessionid')
+
+_workflow_ids = itertools.count(1)
+
+
+class ParallelError(RuntimeError):
+    """Raised by parallel when some of the calls fail, once all of them are completed: results holds the results in order (None for the failed
+    calls) and errors maps the index of each failed item to its exception, so that the outputs of the successful calls can be cleaned up"""
+
+    def __init__(self, results, errors):
+        RuntimeError.__init__(self, str(len(errors)) + ' of ' + str(len(results)) + ' calls failed: ' + str(errors[min(errors)]))
+        self.results = results
+        self.errors = errors
+
+
+def parallel(function, items, max_workers=8):
+    """parallel(function, items, max_workers=8) -> list : Call function on each item with up to max_workers threads and return the results in order.
+    The calls run in a copy of the current context, so that Cube.using and CubeLifecycle scopes still apply. If any call raises an exception,
+    ParallelError is raised after all the calls are completed"""
+
+    items = list(items)
+    results = [None] * len(items)
+    errors = {}
+    contexts = [contextvars.copy_context() for item in items] if contextvars is not None else None
+    pending = list(range(len(items)))
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                if not pending:
+                    return
+                i = pending.pop(0)
+            try:
+                if contexts is not None:
+                    results[i] = contexts[i].run(function, items[i])
+                else:
+                    results[i] = function(items[i])
+            except Exception as e:
+                with lock:
+                    errors[i] = e
+
+    threads = [threading.Thread(target=worker, name='PyOphidia-Collection') for i in range(max(min(int(max_workers), len(items)), 1))]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise ParallelError(results, errors)
+    return results
+
+
+def task(client, name, query, dependencies=None):
+    """task(client, name, query, dependencies=None) -> OrderedDict : Return a workflow task running query (e.g. 'oph_reduce operation=max;cube=...;').
+    When the client has a tuner, the parallelism arguments left out of query are chosen by it"""
+
+    tuner = client.tuner
+    if tuner is not None:
+        try:
+            query = tuner.tune(client, query)
+        except Exception as e:
+            _logger.warning("Unable to tune the task %s: %s", name, e)
+    operator, arguments = parse_query(query)
+    result = OrderedDict([('name', name), ('operator', operator),
+                          ('arguments', [key + '=' + value for key, value in sorted(arguments.items()) if key not in _WORKFLOW_ARGUMENTS])])
+    if dependencies:
+        result['dependencies'] = dependencies
+    return result
+
+
+def workflow(name, tasks, on_error='skip'):
+    """workflow(name, tasks, on_error='skip') -> OrderedDict : Return a synchronous workflow running tasks; a suffix makes its name unique, so that
+    run_workflow can find its job also when the submission fails"""
+
+    return OrderedDict([('name', str(name) + ' ' + str(os.getpid()) + '.' + str(int(time.time() * 1000)) + '.' + str(next(_workflow_ids))),
+                        ('author', 'PyOphidia'), ('abstract', 'Generated by PyOphidia'), ('exec_mode', 'sync'), ('on_error', on_error), ('tasks', tasks)])
+
+
+def run_workflow(client, request, display=False, deadline=None):
+    """run_workflow(client, request, display=False, deadline=None) -> tuple : Submit a workflow built by workflow() with one request and list its tasks
+    with one OPH_RESUME (level=2). Return the result of the submission (None if it failed) and an OrderedDict mapping the name of each task to a
+    dict with keys 'status', 'cubes' (PIDs found in the row of the task) and 'seconds' (execution time, None if not listed); the tasks are listed
+    also when the submission fails, as long as the server has assigned a job to the workflow"""
+
+    expiry = None if deadline is None else time.time() + float(deadline)
+    result = client._wexecute(json.dumps(request), (), deadline=expiry, display=display)
+    jobid = result.jobid if result is not None else None
+    if jobid is None:
+        with client._lock:
+            if request['name'] in (client.last_request or ''):
+                jobid = client.last_jobid
+    tasks = OrderedDict()
+    if not jobid:
+        return result, tasks
+    workflow_id = jobid.split('?')[-1].split('#')[0]
+    query = 'oph_resume exec_mode=sync;id=' + workflow_id + ';level=2;'
+    session = jobid.split('?')[0]
+    if session:
+        query += 'sessionid=' + session + ';'
+    try:
+        response, resume_jobid, newsession, return_value, error = client._coalesced_transport(query, expiry)
+        if return_value or response is None:
+            raise RuntimeError(error)
+        for obj in json.loads(response).get('response', []):
+            if obj.get('objclass') != 'grid':
+                continue
+            for content in obj.get('objcontent', []):
+                keys = [str(key).upper() for key in content.get('rowkeys', [])]
+                names = [i for i, key in enumerate(keys) if 'NAME' in key]
+                if not names:
+                    continue
+                statuses = [i for i, key in enumerate(keys) if 'STATUS' in key]
+                starts = [i for i, key in enumerate(keys) if 'START' in key or 'EXECUTION' in key or 'CREATION' in key]
+                ends = [i for i, key in enumerate(keys) if 'END' in key or 'EXIT' in key]
+                for row in content.get('rowvalues', []):
+                    start = _parse_date(row[starts[0]]) if starts else None
+                    end = _parse_date(row[ends[0]]) if ends else None
+                    tasks[str(row[names[0]])] = {'status': str(row[statuses[0]]) if statuses else None,
+                                                 'cubes': _PID.findall(' '.join(str(value) for value in row)),
+                                                 'seconds': end - start if start is not None and end is not None else None}
+    except Exception as e:
+        _logger.warning("Unable to list the tasks of workflow %s: %s", workflow_id, e)
+    return result, tasks
+
+
+def plan_merge_tree(pids, fan_in=8, mode='a'):
+    """plan_merge_tree(pids, fan_in=8, mode='a') -> list : Plan a balanced tree of OPH_MERGECUBES operations merging all the cubes in pids.
+    Return the list of levels, each one a list of groups of indexes of the outputs of the previous level (of pids for the first one).
+    Append mode merges contiguous groups of at most fan_in cubes (fan_in + 1 when fan_in is 2, since no cube is left alone in a group);
+    interlace mode merges strided groups, which gives the same result as a single merge only when the groups of each level have the same size"""
+
+    if int(fan_in) < 2:
+        raise RuntimeError('fan_in must be at least 2')
+    levels = []
+    n = len(pids)
+    while n > 1:
+        ngroups = (n + int(fan_in) - 1) // int(fan_in)
+        if mode == 'a':
+            ngroups = max(1, min(ngroups, n // 2))
+            size, larger = divmod(n, ngroups)
+            bounds = [i * size + min(i, larger) for i in range(ngroups + 1)]
+            groups = [list(range(bounds[i], bounds[i + 1])) for i in range(ngroups)]
+        else:
+            if n % ngroups:
+                raise RuntimeError('interlace mode requires groups of the same size: merge ' + str(len(pids)) + ' cubes with a different fan_in or in append mode')
+            groups = [list(range(i, n, ngroups)) for i in range(ngroups)]
+        levels.append(groups)
+        n = len(groups)
+    return levels
+
+
+class CubeCollection():
+    """CubeCollection(cubes=None, client=None, max_workers=8) -> obj : set of cubes processed together
+
+    The operators that do not produce cubes (e.g. OPH_DELETE, OPH_EXPORTNC2, OPH_METADATA) are executed as massive operations, one request
+    per server (cube=[path=/;recursive=yes;cube_filter=...], whatever the folder of the cubes). The operators producing a cube for each input
+    (e.g. OPH_REDUCE, OPH_SUBSET) are submitted as a single workflow with a task per cube, and each output is paired with its input through the
+    task list given by OPH_RESUME; mode='massive' executes them as massive operations as well and mode='parallel' as concurrent requests, one per
+    cube. When some of the requests or tasks fail, the cubes produced by the other ones are deleted and RuntimeError is raised.
+
+    Attributes:
+        pids: list of cube PIDs
+        client: instance of class Client the requests are submitted through
+        max_workers: maximum number of concurrent requests
+
+    Methods:
+        from_list(container_filter='all', path='-', cwd=None, recursive='no', measure_filter='all', ntransform='all', src_filter='all', client=None,
+            deadline=None) -> CubeCollection : Create a collection with the cubes listed by OPH_LIST.
+        from_search(container_filter='all', metadata_key_filter='all', metadata_value_filter='all', path='-', cwd=None, recursive='no', client=None,
+            deadline=None) -> CubeCollection : Create a collection with the cubes found by OPH_SEARCH.
+        execute(operator, arguments=None, mode='auto', display=False, deadline=None) -> CubeCollection or list : Apply an operator to all the cubes.
+        aggregate(operation=None, ...) -> CubeCollection : wrapper of the operator OPH_AGGREGATE
+        aggregate2(dim=None, operation=None, ...) -> CubeCollection : wrapper of the operator OPH_AGGREGATE2
+        apply(query='measure', ...) -> CubeCollection : wrapper of the operator OPH_APPLY
+        duplicate(...) -> CubeCollection : wrapper of the operator OPH_DUPLICATE
+        permute(dim_pos=None, ...) -> CubeCollection : wrapper of the operator OPH_PERMUTE
+        reduce(operation=None, ...) -> CubeCollection : wrapper of the operator OPH_REDUCE
+        reduce2(dim=None, operation=None, ...) -> CubeCollection : wrapper of the operator OPH_REDUCE2
+        subset(subset_dims='none', subset_filter='all', ...) -> CubeCollection : wrapper of the operator OPH_SUBSET
+        subset2(subset_dims='none', subset_filter='all', ...) -> CubeCollection : wrapper of the operator OPH_SUBSET2
+        delete(nthreads=1, ...) -> list : wrapper of the operator OPH_DELETE
+        exportnc2(output_path='default', ...) -> list : wrapper of the operator OPH_EXPORTNC2
+        metadata(mode='read', ...) -> list : wrapper of the operator OPH_METADATA
+        mergecubes(fan_in=8, mode='a', hold_values='no', ncores=None, ...) -> Cube : Merge all the cubes with a balanced tree of OPH_MERGECUBES operations.
+    """
+
+    def __init__(self, cubes=None, client=None, max_workers=8):
+        """CubeCollection(cubes=None, client=None, max_workers=8) -> obj
+        :param cubes: Cube objects or PIDs
+        :type cubes: list
+        :param client: instance of class Client (default is Cube.active_client())
+        :type client: Client
+        :param max_workers: maximum number of concurrent requests
+        :type max_workers: int
+        :returns: None
+        :rtype: None
+        :raises: RuntimeError
+        """
+
+        self.client = client if client is not None else Cube.active_client()
+        if self.client is None:
+            raise RuntimeError('Cube.client is None')
+        self.pids = []
+        for cube in cubes or []:
+            pid = str(getattr(cube, 'pid', cube))
+            if pid not in self.pids:
+                self.pids.append(pid)
+        self.max_workers = max_workers
+
+    def __len__(self):
+        return len(self.pids)
+
+    def __iter__(self):
+        for pid in self.pids:
+            yield Cube(pid=pid, client=self.client)
+
+    def __getitem__(self, i):
+        return Cube(pid=self.pids[i], client=self.client)
+
+    def __str__(self):
+        return 'CubeCollection(' + str(len(self.pids)) + ' cubes)'
+
+    @classmethod
+    def _discover(cls, query, client, deadline):
+        client = client if client is not None else Cube.active_client()
+        if client is None:
+            raise RuntimeError('Cube.client is None')
+        result = client.execute(query, deadline=deadline)
+        if result is None:
+            raise RuntimeError()
+        return cls(_PID.findall(result.response or ''), client)
+
+    @classmethod
+    def from_list(cls, container_filter='all', path='-', cwd=None, recursive='no', measure_filter='all', ntransform='all', src_filter='all', client=None,
+                  deadline=None):
+        """from_list(container_filter='all', path='-', cwd=None, recursive='no', measure_filter='all', ntransform='all', src_filter='all', client=None, deadline=None)
+             -> CubeCollection : Create a collection with the cubes listed by OPH_LIST
+
+        :param container_filter: filter on container name
+        :type container_filter: str
+        :param path: absolute or relative path
+        :type path: str
+        :param cwd: current working directory
+        :type cwd: str
+        :param recursive: yes|no
+        :type recursive: str
+        :param measure_filter: filter on measure
+        :type measure_filter: str
+        :param ntransform: filter on cube level
+        :type ntransform: int
+        :param src_filter: filter on source file
+        :type src_filter: str
+        :param client: instance of class Client (default is Cube.active_client())
+        :type client: Client
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
+        :returns: new collection
+        :rtype: CubeCollection
+        :raises: RuntimeError
+        """
+
+        query = 'oph_list level=2;exec_mode=sync;path=' + str(path) + ';container_filter=' + str(container_filter) + ';recursive=' + str(recursive) + ';'
+        query += 'measure_filter=' + str(measure_filter) + ';ntransform=' + str(ntransform) + ';src_filter=' + str(src_filter) + ';'
+        if cwd is not None:
+            query += 'cwd=' + str(cwd) + ';'
+        try:
+            return cls._discover(query, client, deadline)
+        except Exception as e:
+            _logger.error("Something went wrong: %s", e)
+            raise RuntimeError()
+
+    @classmethod
+    def from_search(cls, container_filter='all', metadata_key_filter='all', metadata_value_filter='all', path='-', cwd=None, recursive='no', client=None, deadline=None):
+        """from_search(container_filter='all', metadata_key_filter='all', metadata_value_filter='all', path='-', cwd=None, recursive='no', client=None, deadline=None)
+             -> CubeCollection : Create a collection with the cubes found by OPH_SEARCH
+
+        :param container_filter: filter on container name
+        :type container_filter: str
+        :param metadata_key_filter: filter on metadata key
+        :type metadata_key_filter: str
+        :param metadata_value_filter: filter on metadata value
+        :type metadata_value_filter: str
+        :param path: absolute or relative path
+        :type path: str
+        :param cwd: current working directory
+        :type cwd: str
+        :param recursive: yes|no
+        :type recursive: str
+        :param client: instance of class Client (default is Cube.active_client())
+        :type client: Client
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
+        :returns: new collection
+        :rtype: CubeCollection
+        :raises: RuntimeError
+        """
+
+        query = 'oph_search exec_mode=sync;container_filter=' + str(container_filter) + ';metadata_key_filter=' + str(metadata_key_filter) + ';'
+        query += 'metadata_value_filter=' + str(metadata_value_filter) + ';path=' + str(path) + ';recursive=' + str(recursive) + ';'
+        if cwd is not None:
+            query += 'cwd=' + str(cwd) + ';'
+        try:
+            return cls._discover(query, client, deadline)
+        except Exception as e:
+            _logger.error("Something went wrong: %s", e)
+            raise RuntimeError()
+
+    def execute(self, operator, arguments=None, mode='auto', display=False, deadline=None):
+        """execute(operator, arguments=None, mode='auto', display=False, deadline=None) -> CubeCollection or list : Apply an operator to all the cubes
+
+        :param operator: operator name, e.g. 'oph_reduce'
+        :type operator: str
+        :param arguments: dict mapping each argument of the operator (but cube) to its value
+        :type arguments: dict
+        :param mode: auto|massive|workflow|parallel, 'auto' runs the operators producing cubes as a workflow and the other ones as massive operations
+        :type mode: str
+        :param display: option for displaying the responses in a "pretty way" using the pretty_print function (default is False)
+        :type display: bool
+        :param deadline: maximum number of seconds all the requests may take (default is no limit)
+        :type deadline: float
+        :returns: collection of the output cubes for the operators producing cubes, list of responses otherwise
+        :rtype: CubeCollection or list
+        :raises: RuntimeError
+        """
+
+        operator = str(operator).lower()
+        if not operator.startswith('oph_'):
+            operator = 'oph_' + operator
+        if mode == 'auto':
+            mode = 'workflow' if operator in CUBE_OPERATORS else 'massive'
+        if mode not in ('massive', 'workflow', 'parallel'):
+            raise RuntimeError('mode must be auto, massive, workflow or parallel')
+        if mode == 'workflow' and operator not in CUBE_OPERATORS:
+            raise RuntimeError('workflow mode applies only to the operators producing cubes')
+        query = operator + ' exec_mode=sync;'
+        for key, value in (arguments or {}).items():
+            if value is not None and key not in ('cube', 'exec_mode'):
+                query += str(key) + '=' + str(value) + ';'
+        if mode == 'workflow':
+            return self._execute_workflow(operator, query, display, deadline)
+        if mode == 'massive':
+            groups = OrderedDict()
+            for pid in self.pids:
+                groups.setdefault(pid.rpartition('/')[0].rpartition('/')[0], []).append(pid)
+            targets = [pids[0] if len(pids) == 1 else massive_filter(pids) for pids in groups.values()]
+        else:
+            targets = list(self.pids)
+        expiry = None if deadline is None else time.time() + float(deadline)
+
+        def run(target):
+            remaining = None if expiry is None else max(expiry - time.time(), 0.0)
+            result = self.client.execute(query + 'cube=' + target + ';', display, deadline=remaining)
+            if result is None:
+                raise RuntimeError('request on ' + target + ' failed')
+            return result
+
+        try:
+            results = parallel(run, targets, self.max_workers)
+        except ParallelError as e:
+            _logger.error("Something went wrong in processing %s", ', '.join(targets[i] for i in sorted(e.errors)))
+            # Do not leave behind the cubes produced by the successful requests
+            partial = self._outputs([result for result in e.results if result is not None], mode) if operator in CUBE_OPERATORS else []
+            self._discard(partial)
+            raise RuntimeError()
+        if operator not in CUBE_OPERATORS:
+            return [result.deserialize() for result in results]
+        return CubeCollection(self._outputs(results, mode), self.client, self.max_workers)
+
+    def _execute_workflow(self, operator, query, display, deadline):
+        # One task per cube, named after the position of its input, so that the outputs listed by OPH_RESUME can be paired with the inputs
+        if not self.pids:
+            return CubeCollection([], self.client, self.max_workers)
+        tasks = [task(self.client, 'cube_' + str(i), query + 'cube=' + pid + ';') for i, pid in enumerate(self.pids)]
+        result, listed = run_workflow(self.client, workflow(operator, tasks), display, deadline)
+        outputs, failed = [], []
+        for i, pid in enumerate(self.pids):
+            cubes = [cube for cube in listed.get('cube_' + str(i), {}).get('cubes', []) if cube not in self.pids]
+            if cubes:
+                outputs.append(cubes[-1])
+            else:
+                failed.append(pid)
+        if result is None or failed:
+            _logger.error("Something went wrong in processing %s", ', '.join(failed) or 'the workflow')
+            # Do not leave behind the cubes produced by the successful tasks
+            self._discard(outputs)
+            raise RuntimeError()
+        return CubeCollection(outputs, self.client, self.max_workers)
+
+    def _discard(self, pids):
+        if pids:
+            try:
+                CubeCollection(pids, self.client, self.max_workers).delete()
+            except Exception:
+                _logger.warning("Unable to delete the cubes %s", ', '.join(pids))
+
+    def _outputs(self, results, mode):
+        outputs = []
+        for result in results:
+            if mode == 'massive':
+                messages = [obj['objcontent'][0].get('message', '') for obj in result.index.find_all(title='Output Cube', objclass='text')]
+                candidates = messages + str(result.cube or '').split('|')
+            else:
+                candidates = [result.cube]
+            for pid in candidates:
+                if pid and pid.strip() and pid.strip() not in outputs:
+                    outputs.append(pid.strip())
+        return outputs
+
+    def aggregate(self, operation=None, group_size='all', missingvalue='NAN', grid='-', container='-', description='-', check_grid='no', ncores=None, nthreads=None,
+                  mode='auto', display=False, deadline=None):
+        """aggregate(operation=None, group_size='all', missingvalue='NAN', grid='-', container='-', description='-', check_grid='no', ncores=None, nthreads=None,
+                     mode='auto', display=False, deadline=None) -> CubeCollection : wrapper of the operator OPH_AGGREGATE applied to each cube (see Cube.aggregate)
+
+        :returns: collection of the output cubes
+        :rtype: CubeCollection
+        :raises: RuntimeError
+        """
+
+        return self.execute('oph_aggregate', {'operation': operation, 'group_size': group_size, 'missingvalue': missingvalue, 'grid': grid, 'container': container,
+                                              'description': description, 'check_grid': check_grid, 'ncores': ncores, 'nthreads': nthreads}, mode, display, deadline)
+
+    def aggregate2(self, dim='-', operation=None, concept_level='A', midnight='24', missingvalue='NAN', grid='-', container='-', description='-', check_grid='no',
+                   ncores=None, nthreads=None, mode='auto', display=False, deadline=None):
+        """aggregate2(dim='-', operation=None, concept_level='A', midnight='24', missingvalue='NAN', grid='-', container='-', description='-', check_grid='no',
+                      ncores=None, nthreads=None, mode='auto', display=False, deadline=None) -> CubeCollection : wrapper of the operator OPH_AGGREGATE2 applied to each cube (see Cube.aggregate2)
+
+        :returns: collection of the output cubes
+        :rtype: CubeCollection
+        :raises: RuntimeError
+        """
+
+        return self.execute('oph_aggregate2', {'dim': dim, 'operation': operation, 'concept_level': concept_level, 'midnight': midnight, 'missingvalue': missingvalue,
+                                               'grid': grid, 'container': container, 'description': description, 'check_grid': check_grid, 'ncores': ncores,
+                                               'nthreads': nthreads}, mode, display, deadline)
+
+    def apply(self, query='measure', dim_query='null', measure='null', measure_type='manual', dim_type='manual', check_type='yes', on_reduce='skip', compressed='auto',
+              container='-', description='-', ncores=None, nthreads=None, mode='auto', display=False, deadline=None):
+        """apply(query='measure', dim_query='null', measure='null', measure_type='manual', dim_type='manual', check_type='yes', on_reduce='skip', compressed='auto',
+                 container='-', description='-', ncores=None, nthreads=None, mode='auto', display=False, deadline=None) -> CubeCollection : wrapper of the operator OPH_APPLY applied to each cube (see Cube.apply)
+
+        :returns: collection of the output cubes
+        :rtype: CubeCollection
+        :raises: RuntimeError
+        """
+
+        return self.execute('oph_apply', {'query': query, 'dim_query': dim_query, 'measure': measure, 'measure_type': measure_type, 'dim_type': dim_type,
+                                          'check_type': check_type, 'on_reduce': on_reduce, 'compressed': compressed, 'container': container, 'description': description,
+                                          'ncores': ncores, 'nthreads': nthreads}, mode, display, deadline)
+
+    def duplicate(self, container='-', description='-', ncores=None, nthreads=None, mode='auto', display=False, deadline=None):
+        """duplicate(container='-', description='-', ncores=None, nthreads=None, mode='auto', display=False, deadline=None) -> CubeCollection : wrapper of the operator OPH_DUPLICATE
+             applied to each cube (see Cube.duplicate)
+
+        :returns: collection of the output cubes
+        :rtype: CubeCollection
+        :raises: RuntimeError
+        """
+
+        return self.execute('oph_duplicate', {'container': container, 'description': description, 'ncores': ncores, 'nthreads': nthreads}, mode, display, deadline)
+
+    def permute(self, dim_pos=None, container='-', description='-', ncores=None, nthreads=None, mode='auto', display=False, deadline=None):
+        """permute(dim_pos=None, container='-', description='-', ncores=None, nthreads=None, mode='auto', display=False, deadline=None) -> CubeCollection : wrapper of the operator OPH_PERMUTE
+             applied to each cube (see Cube.permute)
+
+        :returns: collection of the output cubes
+        :rtype: CubeCollection
+        :raises: RuntimeError
+        """
+
+        return self.execute('oph_permute', {'dim_pos': dim_pos, 'container': container, 'description': description, 'ncores': ncores, 'nthreads': nthreads},
+                            mode, display, deadline)
+
+    def reduce(self, operation=None, group_size='all', order=2, missingvalue='NAN', grid='-', container='-', description='-', check_grid='no', ncores=None, nthreads=None,
+               mode='auto', display=False, deadline=None):
+        """reduce(operation=None, group_size='all', order=2, missingvalue='NAN', grid='-', container='-', description='-', check_grid='no', ncores=None, nthreads=None,
+                  mode='auto', display=False, deadline=None) -> CubeCollection : wrapper of the operator OPH_REDUCE applied to each cube (see Cube.reduce)
+
+        :returns: collection of the output cubes
+        :rtype: CubeCollection
+        :raises: RuntimeError
+        """
+
+        return self.execute('oph_reduce', {'operation': operation, 'group_size': group_size, 'order': order, 'missingvalue': missingvalue, 'grid': grid,
+                                           'container': container, 'description': description, 'check_grid': check_grid, 'ncores': ncores, 'nthreads': nthreads},
+                            mode, display, deadline)
+
+    def reduce2(self, dim=None, operation=None, concept_level='A', midnight='24', order=2, missingvalue='NAN', grid='-', container='-', description='-',
+                check_grid='no', ncores=None, nthreads=None, mode='auto', display=False, deadline=None):
+        """reduce2(dim=None, operation=None, concept_level='A', midnight='24', order=2, missingvalue='NAN', grid='-', container='-', description='-',
+                   check_grid='no', ncores=None, nthreads=None, mode='auto', display=False, deadline=None) -> CubeCollection : wrapper of the operator OPH_REDUCE2 applied to each cube (see Cube.reduce2)
+
+        :returns: collection of the output cubes
+        :rtype: CubeCollection
+        :raises: RuntimeError
+        """
+
+        return self.execute('oph_reduce2', {'dim': dim, 'operation': operation, 'concept_level': concept_level, 'midnight': midnight, 'order': order,
+                                            'missingvalue': missingvalue, 'grid': grid, 'container': container, 'description': description, 'check_grid': check_grid,
+                                            'ncores': ncores, 'nthreads': nthreads}, mode, display, deadline)
+
+    def subset(self, subset_dims='none', subset_filter='all', subset_type='index', time_filter='yes', offset=0, grid='-', container='-', description='-',
+               check_grid='no', ncores=None, nthreads=None, mode='auto', display=False, deadline=None):
+        """subset(subset_dims='none', subset_filter='all', subset_type='index', time_filter='yes', offset=0, grid='-', container='-', description='-',
+                  check_grid='no', ncores=None, nthreads=None, mode='auto', display=False, deadline=None) -> CubeCollection : wrapper of the operator OPH_SUBSET applied to each cube (see Cube.subset)
+
+        :returns: collection of the output cubes
+        :rtype: CubeCollection
+        :raises: RuntimeError
+        """
+
+        return self.execute('oph_subset', {'subset_dims': subset_dims, 'subset_filter': subset_filter, 'subset_type': subset_type, 'time_filter': time_filter,
+                                           'offset': offset, 'grid': grid, 'container': container, 'description': description, 'check_grid': check_grid,
+                                           'ncores': ncores, 'nthreads': nthreads}, mode, display, deadline)
+
+    def subset2(self, subset_dims='none', subset_filter='all', time_filter='yes', offset=0, grid='-', container='-', description='-', ncores=None, mode='auto',
+                display=False, deadline=None):
+        """subset2(subset_dims='none', subset_filter='all', time_filter='yes', offset=0, grid='-', container='-', description='-', ncores=None, mode='auto',
+                   display=False, deadline=None) -> CubeCollection : wrapper of the operator OPH_SUBSET2 applied to each cube (see Cube.subset2)
+
+        :returns: collection of the output cubes
+        :rtype: CubeCollection
+        :raises: RuntimeError
+        """
+
+        return self.execute('oph_subset2', {'subset_dims': subset_dims, 'subset_filter': subset_filter, 'time_filter': time_filter, 'offset': offset, 'grid': grid,
+                                            'container': container, 'description': description, 'ncores': ncores}, mode, display, deadline)
+
+    def delete(self, ncores=None, nthreads=None, mode='auto', display=False, deadline=None):
+        """delete(ncores=None, nthreads=None, mode='auto', display=False, deadline=None) -> list : wrapper of the operator OPH_DELETE applied to all the cubes
+
+        :returns: list of responses
+        :rtype: list
+        :raises: RuntimeError
+        """
+
+        return self.execute('oph_delete', {'ncores': ncores, 'nthreads': nthreads}, mode, display, deadline)
+
+    def exportnc2(self, misc='no', output_path='default', output_name='default', cdd=None, force='no', export_metadata='yes', ncores=None, mode='auto', display=False,
+                  deadline=None):
+        """exportnc2(misc='no', output_path='default', output_name='default', cdd=None, force='no', export_metadata='yes', ncores=None, mode='auto', display=False,
+                     deadline=None) -> list : wrapper of the operator OPH_EXPORTNC2 applied to all the cubes (see Cube.exportnc2)
+
+        :returns: list of responses
+        :rtype: list
+        :raises: RuntimeError
+        """
+
+        return self.execute('oph_exportnc2', {'misc': misc, 'output_path': output_path, 'output_name': output_name, 'cdd': cdd, 'force': force,
+                                              'export_metadata': export_metadata, 'ncores': ncores}, mode, display, deadline)
+
+    def metadata(self, mode='read', metadata_key='all', variable='global', metadata_id=0, metadata_type='text', metadata_value='-', variable_filter='all',
+                 metadata_type_filter='all', metadata_value_filter='all', force='no', execution='auto', display=False, deadline=None):
+        """metadata(mode='read', metadata_key='all', variable='global', metadata_id=0, metadata_type='text', metadata_value='-', variable_filter='all',
+                    metadata_type_filter='all', metadata_value_filter='all', force='no', execution='auto', display=False, deadline=None) -> list : wrapper of the operator OPH_METADATA
+             applied to all the cubes (see Cube.metadata); execution plays the role of the mode argument of the other methods
+
+        :returns: list of responses
+        :rtype: list
+        :raises: RuntimeError
+        """
+
+        return self.execute('oph_metadata', {'mode': mode, 'metadata_key': metadata_key, 'variable': variable, 'metadata_id': metadata_id,
+                                             'metadata_type': metadata_type, 'metadata_value': metadata_value, 'variable_filter': variable_filter,
+                                             'metadata_type_filter': metadata_type_filter, 'metadata_value_filter': metadata_value_filter, 'force': force},
+                            execution, display, deadline)
+
+    def mergecubes(self, fan_in=8, mode='a', hold_values='no', ncores=None, container='-', description='-', display=False, deadline=None):
+        """mergecubes(fan_in=8, mode='a', hold_values='no', ncores=None, container='-', description='-', display=False, deadline=None) -> Cube : Merge all the cubes with a
+             balanced tree of OPH_MERGECUBES operations
+
+        The whole tree is submitted as a single workflow: the operations of each level depend on those of the previous one, which pass their
+        outputs in the cubes argument (in the order of the dependencies), and each intermediate cube is deleted by an OPH_DELETE task as soon as
+        the operation merging it is completed. If the workflow fails, the cubes it has produced are deleted. OPH_MERGECUBES2 is not supported,
+        since each operation adds a new dimension: the outputs of a level could not be merged again by the next one.
+
+        :param fan_in: maximum number of cubes merged by each operation
+        :type fan_in: int
+        :param mode: append (a) or interlace (i) measures, the latter requiring groups of the same size at each level (see plan_merge_tree)
+        :type mode: str
+        :param hold_values: enables the copy of the original values of implicit dimension
+        :type hold_values: str
+        :param ncores: number of cores to use, either for all the operations or as a list with a value for each level (the last one is used for the next levels);
+            default is Client.ncores, or the value chosen by Client.tuner for the first level
+        :type ncores: int or list
+        :param container: optional container name of the output cube
+        :type container: str
+        :param description: additional description to be associated with the output cube
+        :type description: str
+        :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
+        :type display: bool
+        :param deadline: maximum number of seconds the whole merge may take (default is no limit)
+        :type deadline: float
+        :returns: merged cube
+        :rtype: Cube
+        :raises: RuntimeError
+        """
+
+        if not self.pids:
+            raise RuntimeError('the collection is empty')
+        levels = plan_merge_tree(self.pids, fan_in, mode)
+        if not levels:
+            return Cube(pid=self.pids[0], client=self.client)
+        tasks = []
+        # Inputs of the current level: PIDs for the first level, names of the tasks of the previous level for the other ones
+        current = list(self.pids)
+        for depth, groups in enumerate(levels):
+            cores = ncores[min(depth, len(ncores) - 1)] if isinstance(ncores, (list, tuple)) else ncores
+            query = 'oph_mergecubes mode=' + str(mode) + ';hold_values=' + str(hold_values) + ';'
+            if cores is not None:
+                query += 'ncores=' + str(cores) + ';'
+            if depth == len(levels) - 1:
+                query += 'container=' + str(container) + ';description=' + str(description) + ';'
+            outputs = []
+            for number, group in enumerate(groups):
+                name = 'merge_' + str(depth) + '_' + str(number)
+                if depth == 0:
+                    tasks.append(task(self.client, name, query + 'cubes=' + '|'.join(current[i] for i in group) + ';'))
+                else:
+                    tasks.append(task(self.client, name, query, [OrderedDict([('task', current[i]), ('type', 'all'), ('argument', 'cubes')]) for i in group]))
+                    for i in group:
+                        tasks.append(task(self.client, 'delete_' + current[i], 'oph_delete ',
+                                          [OrderedDict([('task', current[i]), ('type', 'all'), ('argument', 'cube')]), OrderedDict([('task', name), ('type', 'embedded')])]))
+                outputs.append(name)
+            current = outputs
+        result, listed = run_workflow(self.client, workflow('oph_mergecubes', tasks, 'break'), display, deadline)
+        produced = [pid for name, entry in listed.items() if name.startswith('merge_') for pid in entry['cubes'] if pid not in self.pids]
+        merged = [pid for pid in listed.get(current[0], {}).get('cubes', []) if pid not in self.pids]
+        if result is None or not merged:
+            _logger.error("Something went wrong in merging %d cubes", len(self.pids))
+            # Do not leave behind the intermediate cubes (those already deleted are simply not found)
+            self._discard(produced)
+            raise RuntimeError()
+        return Cube(pid=merged[-1], client=self.client)
@@ -21,26 +21,58 @@ from __future__ import print_function
 from __future__ import absolute_import
 import sys
 import os
+import logging
 import base64
 import struct
+import threading
+from contextlib import contextmanager
 import PyOphidia.client as _client
-from inspect import currentframe
+try:
+    import contextvars
+except ImportError:
+    contextvars = None
 sys.path.append(os.path.dirname(__file__))
 
 
-def get_linenumber():
-    cf = currentframe()
-    return __file__, cf.f_back.f_lineno
+_logger = logging.getLogger(__name__)
+
+
+# Client bound by Cube.using: a context variable when available (so that it also follows asyncio tasks), a thread-local otherwise
+if contextvars is not None:
+    _scope = contextvars.ContextVar('PyOphidia_client', default=None)
+else:
+    _scope = threading.local()
+
+
+def _scoped_client():
+    if contextvars is not None:
+        return _scope.get()
+    return getattr(_scope, 'client', None)
+
+
+def _enter_scope(client):
+    if contextvars is not None:
+        return _scope.set(client)
+    previous = getattr(_scope, 'client', None)
+    _scope.client = client
+    return previous
+
+
+def _exit_scope(token):
+    if contextvars is not None:
+        _scope.reset(token)
+    else:
+        _scope.client = token
 
 
 class Cube():
     """Cube(container='-', cwd=None, exp_dim='auto', host_partition='auto', imp_dim='auto', measure=None, src_path=None, cdd=None, compressed='no',
             exp_concept_level='c', grid='-', imp_concept_level='c', import_metadata='no', check_compliance='no', offset=0,
-            ioserver='mysql_table', ncores=1, nfrag=0, nhost=0, subset_dims='none', subset_filter='all', time_filter='yes'
+            ioserver='mysql_table', ncores=None, nfrag=None, nhost=None, subset_dims='none', subset_filter='all', time_filter='yes'
             subset_type='index', exec_mode='sync', base_time='1900-01-01 00:00:00', calendar='standard', hierarchy='oph_base', leap_month=2,
             leap_year=0, month_lengths='31,28,31,30,31,30,31,31,30,31,30,31', run='yes', units='d', vocabulary='-', description='-', schedule=0,
-            pid=None, check_grid='no', display=False) -> obj
-         or Cube(pid=None) -> obj
+            pid=None, check_grid='no', display=False, client=None, deadline=None) -> obj
+         or Cube(pid=None, client=None, deadline=None) -> obj
 
     Attributes:
         pid: cube PID
@@ -58,176 +90,181 @@ class Cube():
         size: size of the cube
         nelements: total number of elements
         dim_info: list of dict with information on each cube dimension
+        client: Client bound to the cube, inherited by the cubes derived from it (default is the Client of the active scope or the class attribute)
 
     Class Attributes:
         client: instance of class Client through which it is possible to submit all requests
 
     Methods:
-        aggregate(ncores=1, nthreads=1, exec_mode='sync', schedule=0, group_size='all', operation=None, missingvalue='NAN', grid='-', container='-',
-                  description='-', check_grid='no', display=False)
+        aggregate(ncores=None, nthreads=None, exec_mode='sync', schedule=0, group_size='all', operation=None, missingvalue='NAN', grid='-', container='-',
+                  description='-', check_grid='no', display=False, deadline=None)
           -> Cube or None : wrapper of the operator OPH_AGGREGATE
-        aggregate2(ncores=1, nthreads=1, exec_mode='sync', schedule=0, dim='-', concept_level='A', midnight='24', operation=None, grid='-', missingvalue='NAN',
-                   container='-', description='-', check_grid='no', display=False)
+        aggregate2(ncores=None, nthreads=None, exec_mode='sync', schedule=0, dim='-', concept_level='A', midnight='24', operation=None, grid='-', missingvalue='NAN',
+                   container='-', description='-', check_grid='no', display=False, deadline=None)
           -> Cube or None : wrapper of the operator OPH_AGGREGATE2
-        apply(ncores=1, nthreads=1, exec_mode='sync', query='measure', dim_query='null', measure='null', measure_type='manual', dim_type='manual', check_type='yes',
-              on_reduce='skip', compressed='auto', schedule=0,container='-', description='-', display=False)
+        apply(ncores=None, nthreads=None, exec_mode='sync', query='measure', dim_query='null', measure='null', measure_type='manual', dim_type='manual', check_type='yes',
+              on_reduce='skip', compressed='auto', schedule=0,container='-', description='-', display=False, deadline=None)
           -> Cube or None : wrapper of the operator OPH_APPLY
         concatnc(src_path=None, cdd=None, grid='-', check_exp_dim='yes', dim_offset='-', dim_continue='no', offset=0, description='-', subset_dims='none',
-                          subset_filter='all', subset_type='index', time_filter='yes', ncores=1, exec_mode='sync', schedule=0, display=False)
+                          subset_filter='all', subset_type='index', time_filter='yes', ncores=None, exec_mode='sync', schedule=0, display=False, deadline=None)
                   -> Cube or None : wrapper of the operator OPH_CONCATNC
         concatnc2(src_path=None, cdd=None, grid='-', check_exp_dim='yes', dim_offset='-', dim_continue='no', offset=0, description='-', subset_dims='none',
-                          subset_filter='all', subset_type='index', time_filter='yes', ncores=1, nthreads=1, exec_mode='sync', schedule=0, display=False)
+                          subset_filter='all', subset_type='index', time_filter='yes', ncores=None, nthreads=None, exec_mode='sync', schedule=0, display=False, deadline=None)
                   -> Cube or None : wrapper of the operator OPH_CONCATNC2
-        cubeelements( schedule=0, algorithm='dim_product', ncores=1, exec_mode='sync', objkey_filter='all', display=True)
+        cubeelements( schedule=0, algorithm='dim_product', ncores=None, exec_mode='sync', objkey_filter='all', display=True, deadline=None)
           -> dict or None : wrapper of the operator OPH_CUBEELEMENTS
         cubeschema( objkey_filter='all', exec_mode='sync', level=0, dim=None, show_index='no', show_time='no', base64='no', 'action=read', concept_level='c',
-              dim_level=1, dim_array='yes', display=True)
+              dim_level=1, dim_array='yes', display=True, deadline=None)
           -> dict or None : wrapper of the operator OPH_CUBESCHEMA
-        cubesize( schedule=0, ncores=1, byte_unit='MB', algorithm='euristic', objkey_filter='all', exec_mode='sync', display=True)
+        cubesize( schedule=0, ncores=None, byte_unit='MB', algorithm='euristic', objkey_filter='all', exec_mode='sync', display=True, deadline=None)
           -> dict or None : wrapper of the operator OPH_CUBESIZE
-        delete(ncores=1, nthreads=1, exec_mode='sync', schedule=0, display=False)
+        delete(ncores=None, nthreads=None, exec_mode='sync', schedule=0, display=False, deadline=None)
           -> dict or None : wrapper of the operator OPH_DELETE
-        drilldown(ndim=1, container='-', ncores=1, exec_mode='sync', schedule=0, description='-', display=False)
+        drilldown(ndim=1, container='-', ncores=None, exec_mode='sync', schedule=0, description='-', display=False, deadline=None)
           -> Cube or None : wrapper of the operator OPH_DRILLDOWN
-        duplicate(container='-', ncores=1, nthreads=1, exec_mode='sync', description='-', display=False)
+        duplicate(container='-', ncores=None, nthreads=None, exec_mode='sync', description='-', display=False, deadline=None)
           -> Cube or None : wrapper of the operator OPH_DUPLICATE
         explore(schedule=0, limit_filter=100, subset_dims=None, subset_filter='all', time_filter='yes', subset_type='index', show_index='no', show_id='no',
                 show_time='no', level=1, output_path='default', output_name='default', cdd=None, base64='no', ncores=1, exec_mode='sync', objkey_filter='all',
-                display=True)
+                display=True, deadline=None)
           -> dict or None : wrapper of the operator OPH_EXPLORECUBE
-        exportnc(misc='no', output_path='default', output_name='default', cdd=None, force='no', export_metadata='yes', schedule=0, exec_mode='sync', ncores=1,
-                 display=False)
+        exportnc(misc='no', output_path='default', output_name='default', cdd=None, force='no', export_metadata='yes', schedule=0, exec_mode='sync', ncores=None,
+                 display=False, deadline=None)
           -> None : wrapper of the operator OPH_EXPORTNC
-        exportnc2(misc='no', output_path='default', output_name='default', cdd=None, force='no', export_metadata='yes', schedule=0, exec_mode='sync', ncores=1,
-                  display=False)
+        exportnc2(misc='no', output_path='default', output_name='default', cdd=None, force='no', export_metadata='yes', schedule=0, exec_mode='sync', ncores=None,
+                  display=False, deadline=None)
           -> None : wrapper of the operator OPH_EXPORTNC2
-        export_array(show_id='no', show_time='no', subset_dims=None, subset_filter=None, time_filter='no')
+        export_array(show_id='no', show_time='no', subset_dims=None, subset_filter=None, time_filter='no', deadline=None)
           -> dict or None : wrapper of the operator OPH_EXPLORECUBE
-        info(display=True)
+        info(display=True, deadline=None)
           -> None : call OPH_CUBESIZE and OPH_CUBESCHEMA to fill all Cube attributes
-        intercube(cube2=None, operation='sub', container='-', exec_mode='sync', ncores=1, description='-', display=False)
+        intercube(cube2=None, operation='sub', container='-', exec_mode='sync', ncores=None, description='-', display=False, deadline=None)
           -> Cube or None : wrapper of the operator OPH_INTERCUBE
-        merge(nmerge=0, schedule=0, description='-', container='-', exec_mode='sync', ncores=1, display=False)
+        merge(nmerge=0, schedule=0, description='-', container='-', exec_mode='sync', ncores=None, display=False, deadline=None)
           -> Cube or None : wrapper of the operator OPH_MERGE
         metadata(mode='read', metadata_id=0, metadata_key='all', variable='global', metadata_type='text', metadata_value=None, variable_filter=None,
-                 metadata_type_filter=None, metadata_value_filter=None, force='no', exec_mode='sync', objkey_filter='all', display=True)
+                 metadata_type_filter=None, metadata_value_filter=None, force='no', exec_mode='sync', objkey_filter='all', display=True, deadline=None)
           -> dict or None : wrapper of the operator OPH_METADATA
-        permute(dim_pos=None, container='-', exec_mode='sync', ncores=1, nthreads=1, schedule=0, description='-', display=False)
+        permute(dim_pos=None, container='-', exec_mode='sync', ncores=None, nthreads=None, schedule=0, description='-', display=False, deadline=None)
           -> Cube or None : wrapper of the operator OPH_PERMUTE
-        provenance(branch='all', exec_mode='sync', objkey_filter='all', display=True)
+        provenance(branch='all', exec_mode='sync', objkey_filter='all', display=True, deadline=None)
           -> dict or None : wrapper of the operator OPH_CUBEIO
-        publish( ncores=1, content='all', exec_mode='sync', show_id= 'no', show_index='no', schedule=0, show_time='no', display=True)
+        publish( ncores=None, content='all', exec_mode='sync', show_id= 'no', show_index='no', schedule=0, show_time='no', display=True, deadline=None)
           -> dict or None : wrapper of the operator OPH_PUBLISH
-        reduce(operation=None, container=None, exec_mode='sync', grid='-', group_size='all', ncores=1, nthreads=1, schedule=0, order=2, description='-',
-               objkey_filter='all', check_grid='no', display=False)
+        reduce(operation=None, container=None, exec_mode='sync', grid='-', group_size='all', ncores=None, nthreads=None, schedule=0, order=2, description='-',
+               objkey_filter='all', check_grid='no', display=False, deadline=None)
           -> Cube or None : wrapper of the operator OPH_REDUCE
         reduce2(dim=None, operation=None, concept_level='A', container='-', exec_mode='sync', grid='-', midnight='24', order=2, description='-',
-                schedule=0, ncores=1, nthreads=1, check_grid='no', display=False)
+                schedule=0, ncores=None, nthreads=None, check_grid='no', display=False, deadline=None)
           -> Cube or None : wrapper of the operator OPH_REDUCE2
-        rollup(ndim=1, container='-', exec_mode='sync', ncores=1, nthreads=1, schedule=0, description='-', display=False)
+        rollup(ndim=1, container='-', exec_mode='sync', ncores=None, nthreads=None, schedule=0, description='-', display=False, deadline=None)
           -> Cube or None : wrapper of the operator OPH_ROLLUP
-        split(nsplit=2, container='-', exec_mode='sync', ncores=1, nthreads=1, schedule=0, description='-', display=False)
+        split(nsplit=2, container='-', exec_mode='sync', ncores=None, nthreads=None, schedule=0, description='-', display=False, deadline=None)
           -> Cube or None : wrapper of the operator OPH_SPLIT
         subset(subset_dims='none', subset_filter='all', container='-', exec_mode='sync', subset_type='index',
-               time_filter='yes', offset=0, grid='-', ncores=1, nthreads=1, schedule=0, description='-', check_grid='no', display=False)
+               time_filter='yes', offset=0, grid='-', ncores=None, nthreads=None, schedule=0, description='-', check_grid='no', display=False, deadline=None)
           -> Cube or None : wrapper of the operator OPH_SUBSET
-        subset2(subset_dims='none', subset_filter='all', grid='-', container='-', ncores=1, exec_mode='sync', schedule=0, time_filter='yes', offset=0,
-                description='-', check_grid='no', display=False)
+        subset2(subset_dims='none', subset_filter='all', grid='-', container='-', ncores=None, exec_mode='sync', schedule=0, time_filter='yes', offset=0,
+                description='-', check_grid='no', display=False, deadline=None)
           -> Cube or None : wrapper of the operator OPH_SUBSET2. (Deprecated since Ophidia v1.1)
-        to_b2drop(cdd=None, auth_path='-', dst_path='-', ncores=1, export_metadata='yes')
+        to_b2drop(cdd=None, auth_path='-', dst_path='-', ncores=None, export_metadata='yes', deadline=None)
           -> dict or None : method that integrates the features of OPH_EXPORTNC2 and OPH_B2DROP operators to upload a cube to B2DROP as a NetCDF file
-        unpublish( exec_mode='sync', display=False)
+        unpublish( exec_mode='sync', display=False, deadline=None)
           -> dict or None : wrapper of the operator OPH_UNPUBLISH
 
     Class Methods:
         setclient(username='', password='', server, port='11732', token='', read_env=False)
           -> None : Instantiate the Client, common for all Cube objects, for submitting requests
-        b2drop(auth_path='-', src_path=None, dst_path='-', cdd=None, exec_mode='sync', display=False)
+        active_client()
+          -> Client or None : Return the Client of the innermost scope opened with using or, if none, the common Client
+        using(client)
+          -> context manager : Bind the Cube objects created (and the class methods called) within its scope to client
+        b2drop(auth_path='-', src_path=None, dst_path='-', cdd=None, exec_mode='sync', display=False, deadline=None)
           -> dict or None : wrapper of the operator OPH_B2DROP
-        cancel(id=None, type='kill', objkey_filter='all', display=False)
+        cancel(id=None, type='kill', objkey_filter='all', display=False, deadline=None)
           -> dict or None : wrapper of the operator OPH_CANCEL
-        cluster(action='info', nhost=1, host_partition='all', user_filter='all', exec_mode='sync', display=False)
+        cluster(action='info', nhost=1, host_partition='all', user_filter='all', exec_mode='sync', display=False, deadline=None)
           -> dict or None : wrapper of the operator OPH_CLUSTER
-        containerschema(container=None, cwd=None, exec_mode='sync', objkey_filter='all', display=True) -> dict or None : wrapper of the operator OPH_CONTAINERSCHEMA
+        containerschema(container=None, cwd=None, exec_mode='sync', objkey_filter='all', display=True, deadline=None) -> dict or None : wrapper of the operator OPH_CONTAINERSCHEMA
         createcontainer(exec_mode='sync', container=None, cwd=None, dim=None, dim_type="double", hierarchy='oph_base', base_time='1900-01-01 00:00:00',
                         units='d', calendar='standard', month_lengths='31,28,31,30,31,30,31,31,30,31,30,31', leap_year=0, leap_month=2, vocabulary='CF',
-                        compressed='no', description='-', display=False)
+                        compressed='no', description='-', display=False, deadline=None)
           -> dict or None : wrapper of the operator OPH_CREATECONTAINER
-        deletecontainer(container=None, container_pid='-', force='no', cwd=None, nthreads=1, exec_mode='sync', objkey_filter='all', display=False)
+        deletecontainer(container=None, container_pid='-', force='no', cwd=None, nthreads=1, exec_mode='sync', objkey_filter='all', display=False, deadline=None)
           -> dict or None : wrapper of the operator OPH_DELETECONTAINER
         explorenc(exec_mode='sync', schedule=0, measure='-', src_path=None, cdd=None, exp_dim='-', imp_dim='-', subset_dims='none', subset_type='index',
                   subset_filter='all', limit_filter=100, show_index='no', show_id='no', show_time='no', show_stats='00000000000000', show_fit='no',
-                  level=0, imp_num_point=0, offset=50, operation='avg', wavelet='no', wavelet_ratio=0, wavelet_coeff='no', objkey_filter='all', display=True)
+                  level=0, imp_num_point=0, offset=50, operation='avg', wavelet='no', wavelet_ratio=0, wavelet_coeff='no', objkey_filter='all', display=True, deadline=None)
           -> None : wrapper of the operator OPH_EXPLORENC
-        folder(command=None, cwd=None, path=None, exec_mode='sync', display=False)
+        folder(command=None, cwd=None, path=None, exec_mode='sync', display=False, deadline=None)
           -> dict or None : wrapper of the operator OPH_FOLDER
-        fs(command='ls', dpath='-', file='-', cdd=None, recursive='no', depth=0, realpath='no', exec_mode='sync', display=False)
+        fs(command='ls', dpath='-', file='-', cdd=None, recursive='no', depth=0, realpath='no', exec_mode='sync', display=False, deadline=None)
           -> dict or None : wrapper of the operator OPH_FS
-        get_config(key='all', objkey_filter='all', display=True)
+        get_config(key='all', objkey_filter='all', display=True, deadline=None)
           -> dict or None : wrapper of the operator OPH_GET_CONFIG
-        hierarchy(hierarchy='all', hierarchy_version='latest', exec_mode='sync', objkey_filter='all', display=True)
+        hierarchy(hierarchy='all', hierarchy_version='latest', exec_mode='sync', objkey_filter='all', display=True, deadline=None)
           -> dict or None : wrapper of the operator OPH_HIERARCHY
         importnc(container='-', cwd=None, exp_dim='auto', host_partition='auto', imp_dim='auto', measure=None, src_path=None, cdd=None, compressed='no',
                  exp_concept_level='c', grid='-', imp_concept_level='c', import_metadata='yes', check_compliance='no', offset=0,
-                 ioserver='mysql_table', ncores=1, nfrag=0, nhost=0, subset_dims='none', subset_filter='all', time_filter='yes'
+                 ioserver='mysql_table', ncores=None, nfrag=None, nhost=None, subset_dims='none', subset_filter='all', time_filter='yes'
                  subset_type='index', exec_mode='sync', base_time='1900-01-01 00:00:00', calendar='standard', hierarchy='oph_base', leap_month=2,
-                 leap_year=0, month_lengths='31,28,31,30,31,30,31,31,30,31,30,31', run='yes', units='d', vocabulary='CF', description='-', schedule=0, check_grid='no')
+                 leap_year=0, month_lengths='31,28,31,30,31,30,31,31,30,31,30,31', run='yes', units='d', vocabulary='CF', description='-', schedule=0, check_grid='no', deadline=None)
           -> Cube or None : wrapper of the operator OPH_IMPORTNC
         importnc2(container='-', cwd=None, exp_dim='auto', host_partition='auto', imp_dim='auto', measure=None, src_path=None, cdd=None, compressed='no',
                  exp_concept_level='c', grid='-', imp_concept_level='c', import_metadata='yes', check_compliance='no', offset=0,
-                 ioserver='ophidiaio_memory', ncores=1, nthreads=1, nfrag=0, nhost=0, subset_dims='none', subset_filter='all', time_filter='yes'
+                 ioserver='ophidiaio_memory', ncores=None, nthreads=None, nfrag=None, nhost=None, subset_dims='none', subset_filter='all', time_filter='yes'
                  subset_type='index', exec_mode='sync', base_time='1900-01-01 00:00:00', calendar='standard', hierarchy='oph_base', leap_month=2,
-                 leap_year=0, month_lengths='31,28,31,30,31,30,31,31,30,31,30,31', run='yes', units='d', vocabulary='CF', description='-', schedule=0, check_grid='no')
+                 leap_year=0, month_lengths='31,28,31,30,31,30,31,31,30,31,30,31', run='yes', units='d', vocabulary='CF', description='-', schedule=0, check_grid='no', deadline=None)
           -> Cube or None : wrapper of the operator OPH_IMPORTNC2
         instances(action='read', level=1, host_filter='all', nhost=0, host_partition='all', ioserver_filter='all', host_status='all',
-                  exec_mode='sync', objkey_filter='all', display=True)
+                  exec_mode='sync', objkey_filter='all', display=True, deadline=None)
           -> dict or None : wrapper of the operator OPH_INSTANCES
         list(level=1, exec_mode='sync', path='-', cwd=None, container_filter='all', cube='all', host_filter='all', dbms_filter='all',
-             measure_filter='all', ntransform='all', src_filter='all', db_filter='all', recursive='no', objkey_filter='all', display=True)
+             measure_filter='all', ntransform='all', src_filter='all', db_filter='all', recursive='no', objkey_filter='all', display=True, deadline=None)
           -> dict or None : wrapper of the operator OPH_LIST
         loggingbk(session_level=0, job_level=0, mask=000, session_filter='all', session_label_filter='all',
                   session_creation_filter='1900-01-01 00:00:00,2100-01-01 00:00:00', workflowid_filter='all', markerid_filter='all',
                   parent_job_filter='all', job_creation_filter='1900-01-01 00:00:00,2100-01-01 00:00:00', job_status_filter='all',
                   submission_string_filter='all', job_start_filter='1900-01-01 00:00:00,2100-01-01 00:00:00',
-                  job_end_filter='1900-01-01 00:00:00,2100-01-01 00:00:00', nlines=100, objkey_filter='all', exec_mode='sync', display=True)
+                  job_end_filter='1900-01-01 00:00:00,2100-01-01 00:00:00', nlines=100, objkey_filter='all', exec_mode='sync', display=True, deadline=None)
           -> dict or None : wrapper of the operator OPH_LOGGINGBK
-        log_info(log_type='server', container_id=0, ioserver='mysql', nlines=10, exec_mode='sync', objkey_filter='all', display=True)
+        log_info(log_type='server', container_id=0, ioserver='mysql', nlines=10, exec_mode='sync', objkey_filter='all', display=True, deadline=None)
           -> dict or None : wrapper of the operator OPH_LOG_INFO
-        man(function=None, function_type='operator', function_version='latest', exec_mode='sync', display=True)
+        man(function=None, function_type='operator', function_version='latest', exec_mode='sync', display=True, deadline=None)
           -> dict or None : wrapper of the operator OPH_MAN
-        manage_session(action='list', session='this', key='user', value='null', objkey_filter='all', display=True)
+        manage_session(action='list', session='this', key='user', value='null', objkey_filter='all', display=True, deadline=None)
           -> dict or None : wrapper of the operator OPH_MANAGE_SESSION
-        mergecubes(ncores=1, exec_mode='sync', cubes=None, schedule=0, container='-', mode='i', hold_values='no', number=1, description='-', display=False)
+        mergecubes(ncores=None, exec_mode='sync', cubes=None, schedule=0, container='-', mode='i', hold_values='no', number=1, description='-', display=False, deadline=None)
           -> Cube : wrapper of the operator OPH_MERGECUBES
-        mergecubes2(ncores=1, exec_mode='sync', cubes=None, schedule=0, container='-', dim_type='long', number=1, description='-', dim='-', display=False)
+        mergecubes2(ncores=None, exec_mode='sync', cubes=None, schedule=0, container='-', dim_type='long', number=1, description='-', dim='-', display=False, deadline=None)
           -> Cube or None: wrapper of the operator OPH_MERGECUBES2
-        movecontainer(container=None, cwd=None, exec_mode='sync', display=False)
+        movecontainer(container=None, cwd=None, exec_mode='sync', display=False, deadline=None)
           -> dict or None : wrapper of the operator OPH_MOVECONTAINER
-        operators(operator_filter=None, limit_filter=0, exec_mode='sync', display=True)
+        operators(operator_filter=None, limit_filter=0, exec_mode='sync', display=True, deadline=None)
           -> dict or None : wrapper of the operator OPH_OPERATORS_LIST
         primitives(dbms_filter=None, level=1, limit_filter=0, primitive_filter=None, primitive_type=None, return_type=None, exec_mode='sync',
-                   objkey_filter='all', display=True)
+                   objkey_filter='all', display=True, deadline=None)
           -> dict or None : wrapper of the operator OPH_PRIMITIVES_LIST
-        randcube(ncores=1, exec_mode='sync', container=None, cwd=None, host_partition='auto', ioserver='mysql_table', schedule=0, algorithm='default',
-                 nhost=0, run='yes', nfrag=1, ntuple=1, measure=None, measure_type=None, exp_ndim=None, dim=None, concept_level='c',
-                 dim_size=None, compressed='no', grid='-', description='-', display=False)
+        randcube(ncores=None, exec_mode='sync', container=None, cwd=None, host_partition='auto', ioserver='mysql_table', schedule=0, algorithm='default',
+                 nhost=None, run='yes', nfrag=1, ntuple=1, measure=None, measure_type=None, exp_ndim=None, dim=None, concept_level='c',
+                 dim_size=None, compressed='no', grid='-', description='-', display=False, deadline=None)
           -> Cube or None : wrapper of the operator OPH_RANDCUBE
-        randcube2(ncores=1, nthreads=1, exec_mode='sync', container=None, cwd=None, host_partition='auto', ioserver='ophidiaio_memory', schedule=0, algorithm='default',
-                 nhost=0, run='yes', nfrag=1, ntuple=1, measure=None, measure_type=None, exp_ndim=None, dim=None, concept_level='c',
-                 dim_size=None, compressed='no', grid='-', description='-', display=False)
+        randcube2(ncores=None, nthreads=None, exec_mode='sync', container=None, cwd=None, host_partition='auto', ioserver='ophidiaio_memory', schedule=0, algorithm='default',
+                 nhost=None, run='yes', nfrag=1, ntuple=1, measure=None, measure_type=None, exp_ndim=None, dim=None, concept_level='c',
+                 dim_size=None, compressed='no', grid='-', description='-', display=False, deadline=None)
           -> Cube or None : wrapper of the operator OPH_RANDCUBE2
-        resume( id=0, id_type='workflow', document_type='response', level=1, save='no', session='this', objkey_filter='all', user='', display=True)
+        resume( id=0, id_type='workflow', document_type='response', level=1, save='no', session='this', objkey_filter='all', user='', display=True, deadline=None)
           -> dict or None : wrapper of the operator OPH_RESUME
-        script(script=':', args=' ', stdout='stdout', stderr='stderr', ncores=1, exec_mode='sync', list='no', display=False)
+        script(script=':', args=' ', stdout='stdout', stderr='stderr', ncores=1, exec_mode='sync', list='no', display=False, deadline=None)
           -> dict or None : wrapper of the operator OPH_SCRIPT
         search(path='-', metadata_value_filter='all', exec_mode='sync', metadata_key_filter='all', container_filter='all', objkey_filter='all',
-               cwd=None, recursive='no', display=True)
+               cwd=None, recursive='no', display=True, deadline=None)
           -> dict or None : wrapper of the operator OPH_SEARCH
-        service(status='', level=1, objkey_filter='all', display=False)
+        service(status='', level=1, objkey_filter='all', display=False, deadline=None)
           -> dict or None : wrapper of the operator OPH_SERVICE
-        showgrid(container=None, grid='all', dim='all', show_index='no', cwd=None, exec_mode='sync', objkey_filter='all', display=True)
+        showgrid(container=None, grid='all', dim='all', show_index='no', cwd=None, exec_mode='sync', objkey_filter='all', display=True, deadline=None)
           -> dict or None : wrapper of the operator OPH_SHOWGRID
-        tasks(cls, cube_filter='all', path='-', operator_filter='all', cwd=None, recursive='no', container='all', objkey_filter='all', exec_mode='sync', display=True)
+        tasks(cls, cube_filter='all', path='-', operator_filter='all', cwd=None, recursive='no', container='all', objkey_filter='all', exec_mode='sync', display=True, deadline=None)
           -> dict or None : wrapper of the operator OPH_tasks
     """
 
@@ -256,13 +293,44 @@ class Cube():
         try:
             cls.client = _client.Client(username, password, server, port, token, read_env)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong in setting the client:", e)
+            _logger.error("Something went wrong in setting the client: %s", e)
         finally:
             pass
 
     @classmethod
-    def b2drop(cls, auth_path='-', src_path=None, dst_path='-', cdd=None, exec_mode='sync', display=False):
-        """b2drop(auth_path='-', src_path=None, dst_path='-', cdd=None, exec_mode='sync', display=False)
+    def active_client(cls):
+        """active_client() -> Client or None : Return the Client of the innermost scope opened with using or, if none, the common Client
+
+        :returns: client or None
+        :rtype: Client or None
+        """
+
+        client = _scoped_client()
+        if client is not None:
+            return client
+        return cls.client
+
+    @classmethod
+    @contextmanager
+    def using(cls, client):
+        """using(client) -> context manager : Bind the Cube objects created (and the class methods called) within its scope to client.
+           Scopes can be nested and are local to the current thread (or asyncio task)
+
+        :param client: instance of class Client
+        :type client: Client
+        :returns: client
+        :rtype: Client
+        """
+
+        token = _enter_scope(client)
+        try:
+            yield client
+        finally:
+            _exit_scope(token)
+
+    @classmethod
+    def b2drop(cls, auth_path='-', src_path=None, dst_path='-', cdd=None, exec_mode='sync', display=False, deadline=None):
+        """b2drop(auth_path='-', src_path=None, dst_path='-', cdd=None, exec_mode='sync', display=False, deadline=None)
           -> dict or None : wrapper of the operator OPH_B2DROP
 
         :param auth_path: absolute path to the netrc file containing the B2DROP credentials
@@ -277,14 +345,17 @@ class Cube():
         :type exec_mode: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None or src_path is None:
+            if client is None or src_path is None:
                 raise RuntimeError('Cube.client or src_path is None')
 
             query = 'oph_b2drop '
@@ -300,18 +371,19 @@ class Cube():
             if exec_mode is not None:
                 query += 'exec_mode=' + str(exec_mode) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
-    def cluster(cls, action='info', nhost=1, host_partition='all', user_filter='all', exec_mode='sync', display=False):
-        """cluster(action='info', nhost=1, host_partition='all', user_filter='all', exec_mode='sync', display=False) -> dict or None : wrapper of the operator OPH_CLUSTER
+    def cluster(cls, action='info', nhost=1, host_partition='all', user_filter='all', exec_mode='sync', display=False, deadline=None):
+        """cluster(action='info', nhost=1, host_partition='all', user_filter='all', exec_mode='sync', display=False, deadline=None) -> dict or None : wrapper of the operator OPH_CLUSTER
 
         :param action: info|info_cluster|deploy|undeploy
         :type action: str
@@ -325,14 +397,17 @@ class Cube():
         :type exec_mode: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None or Cube.client.host_partition is None:
+            if client is None or client.host_partition is None:
                 raise RuntimeError('Cube.client is None')
 
             query = 'oph_cluster '
@@ -348,19 +423,20 @@ class Cube():
             if exec_mode is not None:
                 query += 'exec_mode=' + str(exec_mode) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
-    def containerschema(cls, container=None, cwd=None, exec_mode='sync', objkey_filter='all', display=True):
-        """containerschema(container=None, cwd=None, exec_mode='sync', objkey_filter='all', display=True) -> dict or None : wrapper of the operator OPH_CONTAINERSCHEMA
+    def containerschema(cls, container=None, cwd=None, exec_mode='sync', objkey_filter='all', display=True, deadline=None):
+        """containerschema(container=None, cwd=None, exec_mode='sync', objkey_filter='all', display=True, deadline=None) -> dict or None : wrapper of the operator OPH_CONTAINERSCHEMA
 
         :param container: container name
         :type container: str
@@ -372,14 +448,17 @@ class Cube():
         :type objkey_filter: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is True)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None or container is None or (cwd is None and Cube.client.cwd is None):
+            if client is None or container is None or (cwd is None and client.cwd is None):
                 raise RuntimeError('Cube.client, container or cwd is None')
 
             query = 'oph_containerschema '
@@ -393,23 +472,24 @@ class Cube():
             if objkey_filter is not None:
                 query += 'objkey_filter=' + str(objkey_filter) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
     def createcontainer(cls, exec_mode='sync', container=None, cwd=None, dim=None, dim_type="double", hierarchy='oph_base',
                         base_time='1900-01-01 00:00:00', units='d', calendar='standard', month_lengths='31,28,31,30,31,30,31,31,30,31,30,31',
-                        leap_year=0, leap_month=2, vocabulary='CF', compressed='no', description='-', display=False):
+                        leap_year=0, leap_month=2, vocabulary='CF', compressed='no', description='-', display=False, deadline=None):
         """createcontainer(exec_mode='sync', container=None, cwd=None, dim=None, dim_type="double", hierarchy='oph_base',
                         base_time='1900-01-01 00:00:00', units='d', calendar='standard', month_lengths='31,28,31,30,31,30,31,31,30,31,30,31',
-                        leap_year=0, leap_month=2, vocabulary='CF', compressed='no', description='-', display=False) -> dict or None : wrapper of the operator OPH_CREATECONTAINER
+                        leap_year=0, leap_month=2, vocabulary='CF', compressed='no', description='-', display=False, deadline=None) -> dict or None : wrapper of the operator OPH_CREATECONTAINER
 
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -443,14 +523,17 @@ class Cube():
         :type description: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is True)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None or container is None or dim is None or dim_type is None or (cwd is None and Cube.client.cwd is None):
+            if client is None or container is None or dim is None or dim_type is None or (cwd is None and client.cwd is None):
                 raise RuntimeError('Cube.client, container, dim, dim_type or cwd is None')
 
             query = 'oph_createcontainer '
@@ -486,19 +569,20 @@ class Cube():
             if description is not None:
                 query += 'description=' + str(description) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
-    def deletecontainer(cls, container=None, container_pid='-', force='no', cwd=None, nthreads=1, exec_mode='sync', objkey_filter='all', display=False):
-        """deletecontainer(container=None, container_pid='-', force='no', cwd=None, nthreads=1, exec_mode='sync', objkey_filter='all', display=False)
+    def deletecontainer(cls, container=None, container_pid='-', force='no', cwd=None, nthreads=1, exec_mode='sync', objkey_filter='all', display=False, deadline=None):
+        """deletecontainer(container=None, container_pid='-', force='no', cwd=None, nthreads=1, exec_mode='sync', objkey_filter='all', display=False, deadline=None)
              -> dict or None : wrapper of the operator OPH_DELETECONTAINER
 
         :param container: container name
@@ -515,14 +599,17 @@ class Cube():
         :type exec_mode: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None or ((container is None or (cwd is None and Cube.client.cwd is None)) and container_pid is "-"):
+            if client is None or ((container is None or (cwd is None and client.cwd is None)) and container_pid is "-"):
                 raise RuntimeError('Cube.client, container and container_pid or cwd is None')
 
             query = 'oph_deletecontainer '
@@ -542,19 +629,20 @@ class Cube():
             if objkey_filter is not None:
                 query += 'objkey_filter=' + str(objkey_filter) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
-    def cancel(cls, id=None, type='kill', objkey_filter='all', display=False):
-        """cancel(id=None, type='kill', objkey_filter='all', display=False) -> dict or None : wrapper of the operator OPH_CANCEL
+    def cancel(cls, id=None, type='kill', objkey_filter='all', display=False, deadline=None):
+        """cancel(id=None, type='kill', objkey_filter='all', display=False, deadline=None) -> dict or None : wrapper of the operator OPH_CANCEL
 
         :param id: identifier of the workflow to be stopped
         :type id: int
@@ -564,13 +652,17 @@ class Cube():
         :type objkey_filter: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
+
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None or id is None:
+            if client is None or id is None:
                 raise RuntimeError('Cube.client or id is None')
 
             query = 'oph_cancel '
@@ -582,19 +674,20 @@ class Cube():
             if objkey_filter is not None:
                 query += 'objkey_filter=' + str(objkey_filter) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
-    def service(cls, status='', level=1, objkey_filter='all', display=False):
-        """service(status='', level=1, objkey_filter='all', display=False) -> dict or None : wrapper of the operator OPH_SERVICE
+    def service(cls, status='', level=1, objkey_filter='all', display=False, deadline=None):
+        """service(status='', level=1, objkey_filter='all', display=False, deadline=None) -> dict or None : wrapper of the operator OPH_SERVICE
 
         :param status: up|down
         :type status: str
@@ -604,14 +697,17 @@ class Cube():
         :type objkey_filter: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None:
+            if client is None:
                 raise RuntimeError('Cube.client is None')
 
             query = 'oph_service '
@@ -623,19 +719,20 @@ class Cube():
             if objkey_filter is not None:
                 query += 'objkey_filter=' + str(objkey_filter) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
-    def get_config(cls, key='all', objkey_filter='all', display=True):
-        """get_config(key='all', objkey_filter='all', display=True) -> dict or None : wrapper of the operator OPH_GET_CONFIG
+    def get_config(cls, key='all', objkey_filter='all', display=True, deadline=None):
+        """get_config(key='all', objkey_filter='all', display=True, deadline=None) -> dict or None : wrapper of the operator OPH_GET_CONFIG
 
         :param key: all|OPH_XML_URL|OPH_SESSION_ID|OPH_EXEC_MODE|OPH_NCORES|OPH_DATACUBE|OPH_CWD|OPH_CDD|OPH_BASE_SRC_PATH
         :type key: str
@@ -643,14 +740,17 @@ class Cube():
         :type objkey_filter: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is True)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None:
+            if client is None:
                 raise RuntimeError('Cube.client is None')
 
             query = 'oph_get_config '
@@ -660,19 +760,20 @@ class Cube():
             if objkey_filter is not None:
                 query += 'objkey_filter=' + str(objkey_filter) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
-    def manage_session(cls, action='list', session='this', key='user', value='null', objkey_filter='all', display=True):
-        """manage_session(action='list', session='this', key='user', value='null', objkey_filter='all', display=True) -> dict or None : wrapper of the operator OPH_MANAGE_SESSION
+    def manage_session(cls, action='list', session='this', key='user', value='null', objkey_filter='all', display=True, deadline=None):
+        """manage_session(action='list', session='this', key='user', value='null', objkey_filter='all', display=True, deadline=None) -> dict or None : wrapper of the operator OPH_MANAGE_SESSION
 
         :param action: disable|enable|env|grant|list|listusers|new|remove|revoke|setenv
         :type action: str
@@ -686,14 +787,17 @@ class Cube():
         :type objkey_filter: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None:
+            if client is None:
                 raise RuntimeError('Cube.client or action is None')
 
             query = 'oph_manage_session '
@@ -709,21 +813,22 @@ class Cube():
             if objkey_filter is not None:
                 query += 'objkey_filter=' + str(objkey_filter) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
     def instances(cls, action='read', level=1, host_filter='all', nhost=0, host_partition='all', ioserver_filter='all', host_status='all',
-                  exec_mode='sync', objkey_filter='all', display=True):
+                  exec_mode='sync', objkey_filter='all', display=True, deadline=None):
         """instances(level=1, action='read', level=1, host_filter='all', nhost=0, host_partition='all', ioserver_filter='all', host_status='all',
-                     exec_mode='sync', objkey_filter='all', display=True) -> dict or None : wrapper of the operator OPH_INSTANCES
+                     exec_mode='sync', objkey_filter='all', display=True, deadline=None) -> dict or None : wrapper of the operator OPH_INSTANCES
 
         :param action: read|add|remove
         :type action: str
@@ -745,14 +850,17 @@ class Cube():
         :type objkey_filter: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is True)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None:
+            if client is None:
                 raise RuntimeError('Cube.client is None')
 
             query = 'oph_instances '
@@ -776,19 +884,20 @@ class Cube():
             if objkey_filter is not None:
                 query += 'objkey_filter=' + str(objkey_filter) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
-    def log_info(cls, log_type='server', container_id=0, ioserver='mysql', nlines=10, exec_mode='sync', objkey_filter='all', display=True):
-        """log_info(log_type='server', container_id=0, ioserver='mysql', nlines=10, exec_mode='sync', objkey_filter='all', display=True) -> dict or None : wrapper of the operator OPH_LOG_INFO
+    def log_info(cls, log_type='server', container_id=0, ioserver='mysql', nlines=10, exec_mode='sync', objkey_filter='all', display=True, deadline=None):
+        """log_info(log_type='server', container_id=0, ioserver='mysql', nlines=10, exec_mode='sync', objkey_filter='all', display=True, deadline=None) -> dict or None : wrapper of the operator OPH_LOG_INFO
 
         :param log_type: server|container|ioserver
         :type log_type: str
@@ -804,13 +913,17 @@ class Cube():
         :type exec_mode: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is True)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
+
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None:
+            if client is None:
                 raise RuntimeError('Cube.client is None')
 
             query = 'oph_log_info '
@@ -828,14 +941,15 @@ class Cube():
             if objkey_filter is not None:
                 query += 'objkey_filter=' + str(objkey_filter) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
@@ -843,12 +957,12 @@ class Cube():
                   session_creation_filter='1900-01-01 00:00:00,2100-01-01 00:00:00', workflowid_filter='all', markerid_filter='all',
                   parent_job_filter='all', job_creation_filter='1900-01-01 00:00:00,2100-01-01 00:00:00', job_status_filter='all',
                   submission_string_filter='all', job_start_filter='1900-01-01 00:00:00,2100-01-01 00:00:00',
-                  job_end_filter='1900-01-01 00:00:00,2100-01-01 00:00:00', nlines=100, objkey_filter='all', exec_mode='sync', display=True):
+                  job_end_filter='1900-01-01 00:00:00,2100-01-01 00:00:00', nlines=100, objkey_filter='all', exec_mode='sync', display=True, deadline=None):
         """loggingbk(session_level=0, job_level=0, mask=000, session_filter='all', session_label_filter='all',
                      session_creation_filter='1900-01-01 00:00:00,2100-01-01 00:00:00', workflowid_filter='all', markerid_filter='all',
                      parent_job_filter='all', job_creation_filter='1900-01-01 00:00:00,2100-01-01 00:00:00', job_status_filter='all',
                      submission_string_filter='all', job_start_filter='1900-01-01 00:00:00,2100-01-01 00:00:00',
-                     job_end_filter='1900-01-01 00:00:00,2100-01-01 00:00:00', nlines=100, objkey_filter='all', exec_mode='sync', display=True)
+                     job_end_filter='1900-01-01 00:00:00,2100-01-01 00:00:00', nlines=100, objkey_filter='all', exec_mode='sync', display=True, deadline=None)
              -> dict or None : wrapper of the operator OPH_LOGGINGBK
 
         :param session_level: 0|1
@@ -885,13 +999,17 @@ class Cube():
         :type exec_mode: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is True)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
+
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None:
+            if client is None:
                 raise RuntimeError('Cube.client is None')
 
             query = 'oph_loggingbk '
@@ -931,19 +1049,20 @@ class Cube():
             if exec_mode is not None:
                 query += 'exec_mode=' + str(exec_mode) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
-    def folder(cls, command=None, path='-', cwd=None, exec_mode='sync', objkey_filter='all', display=False):
-        """folder(command=None, cwd=None, path=None, exec_mode='sync', display=False) -> dict or None : wrapper of the operator OPH_FOLDER
+    def folder(cls, command=None, path='-', cwd=None, exec_mode='sync', objkey_filter='all', display=False, deadline=None):
+        """folder(command=None, cwd=None, path=None, exec_mode='sync', display=False, deadline=None) -> dict or None : wrapper of the operator OPH_FOLDER
 
         :param command: cd|mkdir|mv|rm
         :type command: str
@@ -955,14 +1074,17 @@ class Cube():
         :type exec_mode: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None or command is None or (cwd is None and Cube.client.cwd is None):
+            if client is None or command is None or (cwd is None and client.cwd is None):
                 raise RuntimeError('Cube.client, command or cwd is None')
 
             query = 'oph_folder '
@@ -978,19 +1100,20 @@ class Cube():
             if objkey_filter is not None:
                 query += 'objkey_filter=' + str(objkey_filter) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
-    def fs(cls, command='ls', dpath='-', file='-', cdd=None, recursive='no', depth=0, realpath='no', exec_mode='sync', objkey_filter='all', display=False):
-        """fs(command='ls', dpath='-', file='-', cdd=None, recursive='no', depth=0, realpath='no', exec_mode='sync', objkey_filter='all', display=False) -> dict or None : wrapper of the operator OPH_FS
+    def fs(cls, command='ls', dpath='-', file='-', cdd=None, recursive='no', depth=0, realpath='no', exec_mode='sync', objkey_filter='all', display=False, deadline=None):
+        """fs(command='ls', dpath='-', file='-', cdd=None, recursive='no', depth=0, realpath='no', exec_mode='sync', objkey_filter='all', display=False, deadline=None) -> dict or None : wrapper of the operator OPH_FS
 
         :param command: ls|cd|mkdir|rm|mv
         :type command: str
@@ -1010,14 +1133,17 @@ class Cube():
         :type exec_mode: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None:
+            if client is None:
                 raise RuntimeError('Cube.client, is None')
 
             query = 'oph_fs '
@@ -1041,19 +1167,20 @@ class Cube():
             if objkey_filter is not None:
                 query += 'objkey_filter=' + str(objkey_filter) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
-    def tasks(cls, cube_filter='all', operator_filter='all', path='-', cwd=None, recursive='no', container='all', exec_mode='sync', objkey_filter='all', display=True):
-        """tasks(cls, cube_filter='all', path='-', operator_filter='all', cwd=None, recursive='no',  container='all', objkey_filter='all', exec_mode='sync', display=True)
+    def tasks(cls, cube_filter='all', operator_filter='all', path='-', cwd=None, recursive='no', container='all', exec_mode='sync', objkey_filter='all', display=True, deadline=None):
+        """tasks(cls, cube_filter='all', path='-', operator_filter='all', cwd=None, recursive='no',  container='all', objkey_filter='all', exec_mode='sync', display=True, deadline=None)
              -> dict or None : wrapper of the operator OPH_tasks
 
         :param cube_filter: optional filter on cube
@@ -1072,13 +1199,17 @@ class Cube():
         :type exec_mode: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is True)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
+
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None:
+            if client is None:
                 raise RuntimeError('Cube.client is None')
 
             query = 'oph_tasks '
@@ -1100,19 +1231,20 @@ class Cube():
             if objkey_filter is not None:
                 query += 'objkey_filter=' + str(objkey_filter) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
-    def showgrid(cls, container=None, grid='all', dim='all', show_index='no', cwd=None, exec_mode='sync', objkey_filter='all', display=True):
-        """showgrid(container=None, grid='all', dim='all', show_index='no', cwd=None, exec_mode='sync', objkey_filter='all', display=True) -> dict or None : wrapper of the operator OPH_SHOWGRID
+    def showgrid(cls, container=None, grid='all', dim='all', show_index='no', cwd=None, exec_mode='sync', objkey_filter='all', display=True, deadline=None):
+        """showgrid(container=None, grid='all', dim='all', show_index='no', cwd=None, exec_mode='sync', objkey_filter='all', display=True, deadline=None) -> dict or None : wrapper of the operator OPH_SHOWGRID
 
         :param container: name of the input container
         :type container: str
@@ -1128,14 +1260,17 @@ class Cube():
         :type exec_mode: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is True)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None or container is None or (cwd is None and Cube.client.cwd is None):
+            if client is None or container is None or (cwd is None and client.cwd is None):
                 raise RuntimeError('Cube.client, container or cwd is None')
 
             query = 'oph_showgrid '
@@ -1155,19 +1290,20 @@ class Cube():
             if objkey_filter is not None:
                 query += 'objkey_filter=' + str(objkey_filter) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
-    def search(cls, container_filter='all', metadata_key_filter='all', metadata_value_filter='all', path='-', cwd=None, recursive='no', exec_mode='sync', objkey_filter='all', display=True):
-        """search(path='-', metadata_value_filter='all', exec_mode='sync', metadata_key_filter='all', container_filter='all', objkey_filter='all', cwd=None,  recursive='no', display=True)
+    def search(cls, container_filter='all', metadata_key_filter='all', metadata_value_filter='all', path='-', cwd=None, recursive='no', exec_mode='sync', objkey_filter='all', display=True, deadline=None):
+        """search(path='-', metadata_value_filter='all', exec_mode='sync', metadata_key_filter='all', container_filter='all', objkey_filter='all', cwd=None,  recursive='no', display=True, deadline=None)
              -> dict or None : wrapper of the operator OPH_SEARCH
 
         :param container_filter: filter on container name
@@ -1186,14 +1322,17 @@ class Cube():
         :type exec_mode: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is True)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None or (cwd is None and Cube.client.cwd is None):
+            if client is None or (cwd is None and client.cwd is None):
                 raise RuntimeError('Cube.client or cwd is None')
 
             query = 'oph_search '
@@ -1215,19 +1354,20 @@ class Cube():
             if objkey_filter is not None:
                 query += 'objkey_filter=' + str(objkey_filter) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
-    def hierarchy(cls, hierarchy='all', hierarchy_version='latest', exec_mode='sync', objkey_filter='all', display=True):
-        """hierarchy(hierarchy='all', hierarchy_version='latest', exec_mode='sync', objkey_filter='all', display=True) -> dict or None : wrapper of the operator OPH_HIERARCHY
+    def hierarchy(cls, hierarchy='all', hierarchy_version='latest', exec_mode='sync', objkey_filter='all', display=True, deadline=None):
+        """hierarchy(hierarchy='all', hierarchy_version='latest', exec_mode='sync', objkey_filter='all', display=True, deadline=None) -> dict or None : wrapper of the operator OPH_HIERARCHY
 
         :param hierarchy: name of the requested hierarchy
         :type hierarchy: str
@@ -1237,14 +1377,17 @@ class Cube():
         :type exec_mode: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is True)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None:
+            if client is None:
                 raise RuntimeError('Cube.client is None')
 
             query = 'oph_hierarchy '
@@ -1258,21 +1401,22 @@ class Cube():
             if objkey_filter is not None:
                 query += 'objkey_filter=' + str(objkey_filter) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
     def list(cls, level=1, exec_mode='sync', path='-', cwd=None, container_filter='all', cube='all', host_filter='all', dbms_filter='all',
-             measure_filter='all', ntransform='all', src_filter='all', db_filter='all', recursive='no', objkey_filter='all', display=True):
+             measure_filter='all', ntransform='all', src_filter='all', db_filter='all', recursive='no', objkey_filter='all', display=True, deadline=None):
         """list(level=1, exec_mode='sync', path='-', cwd=None, container_filter='all', cube='all', host_filter='all', dbms_filter='all', measure_filter='all',
-                ntransform='all', src_filter='all', db_filter='all', recursive='no', objkey_filter='all', display=True) -> dict or None : wrapper of the operator OPH_LIST
+                ntransform='all', src_filter='all', db_filter='all', recursive='no', objkey_filter='all', display=True, deadline=None) -> dict or None : wrapper of the operator OPH_LIST
 
         :param level: 0|1|2|3|4|5|6|7|8
         :type level: int
@@ -1302,14 +1446,17 @@ class Cube():
         :type exec_mode: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is True)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None or (cwd is None and Cube.client.cwd is None):
+            if client is None or (cwd is None and client.cwd is None):
                 raise RuntimeError('Cube.client or cwd is None')
 
             query = 'oph_list '
@@ -1343,25 +1490,26 @@ class Cube():
             if objkey_filter is not None:
                 query += 'objkey_filter=' + str(objkey_filter) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
-    def randcube(cls, ncores=1, exec_mode='sync', container=None, cwd=None, host_partition='auto', ioserver='mysql_table', schedule=0, algorithm='default',
-                 nhost=0, run='yes', nfrag=1, ntuple=1, measure=None, measure_type=None, exp_ndim=None, dim=None, concept_level='c',
-                 dim_size=None, compressed='no', grid='-', description='-', display=False):
-        """randcube(ncores=1, exec_mode='sync', container=None, cwd=None, host_partition='auto', ioserver='mysql_table', schedule=0, algorithm='default',
-                 nhost=0, run='yes', nfrag=1, ntuple=1, measure=None, measure_type=None, exp_ndim=None, dim=None, concept_level='c',
-                 dim_size=None, compressed='no', grid='-', description='-', display=False) -> Cube or None : wrapper of the operator OPH_RANDCUBE
-
-        :param ncores: number of cores to use
+    def randcube(cls, ncores=None, exec_mode='sync', container=None, cwd=None, host_partition='auto', ioserver='mysql_table', schedule=0, algorithm='default',
+                 nhost=None, run='yes', nfrag=1, ntuple=1, measure=None, measure_type=None, exp_ndim=None, dim=None, concept_level='c',
+                 dim_size=None, compressed='no', grid='-', description='-', display=False, deadline=None):
+        """randcube(ncores=None, exec_mode='sync', container=None, cwd=None, host_partition='auto', ioserver='mysql_table', schedule=0, algorithm='default',
+                 nhost=None, run='yes', nfrag=1, ntuple=1, measure=None, measure_type=None, exp_ndim=None, dim=None, concept_level='c',
+                 dim_size=None, compressed='no', grid='-', description='-', display=False, deadline=None) -> Cube or None : wrapper of the operator OPH_RANDCUBE
+
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -1377,7 +1525,7 @@ class Cube():
         :type ioserver: str
         :param schedule: 0
         :type schedule: int
-        :param nhost: number of hosts to use
+        :param nhost: number of hosts to use (default is the server default, or the value chosen by Client.tuner)
         :type nhost: int
         :param run: yes|no
         :type run: str
@@ -1405,12 +1553,15 @@ class Cube():
         :type description: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: obj or None
         :rtype: Cube or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or (cwd is None and Cube.client.cwd is None) or container is None or nfrag is None or ntuple is None or measure is None or measure_type is None or exp_ndim is None or\
+        client = cls.active_client()
+        if client is None or (cwd is None and client.cwd is None) or container is None or nfrag is None or ntuple is None or measure is None or measure_type is None or exp_ndim is None or\
                 dim is None or dim_size is None:
             raise RuntimeError('Cube.client, cwd, container, nfrag, ntuple, measure, measure_type, exp_ndim, dim or dim_size is None')
         newcube = None
@@ -1461,29 +1612,30 @@ class Cube():
             query += 'description=' + str(description) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                if Cube.client.cube:
-                    newcube = Cube(pid=Cube.client.cube)
+            if result.response is not None:
+                if result.cube:
+                    newcube = Cube(pid=result.cube, client=client)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
         else:
             return newcube
 
     @classmethod
-    def randcube2(cls, ncores=1, nthreads=1, exec_mode='sync', container=None, cwd=None, host_partition='auto', ioserver='ophidiaio_memory', schedule=0, algorithm='default',
-                 nhost=0, run='yes', nfrag=1, ntuple=1, measure=None, measure_type=None, exp_ndim=None, dim=None, concept_level='c',
-                 dim_size=None, compressed='no', grid='-', description='-', display=False):
-        """randcube(ncores=1, nthreads=1, exec_mode='sync', container=None, cwd=None, host_partition='auto', ioserver='ophidiaio_memory', schedule=0, algorithm='default',
-                 nhost=0, run='yes', nfrag=1, ntuple=1, measure=None, measure_type=None, exp_ndim=None, dim=None, concept_level='c',
-                 dim_size=None, compressed='no', grid='-', description='-', display=False) -> Cube or None : wrapper of the operator OPH_RANDCUBE2
-
-        :param ncores: number of cores to use
+    def randcube2(cls, ncores=None, nthreads=None, exec_mode='sync', container=None, cwd=None, host_partition='auto', ioserver='ophidiaio_memory', schedule=0, algorithm='default',
+                 nhost=None, run='yes', nfrag=1, ntuple=1, measure=None, measure_type=None, exp_ndim=None, dim=None, concept_level='c',
+                 dim_size=None, compressed='no', grid='-', description='-', display=False, deadline=None):
+        """randcube(ncores=None, nthreads=None, exec_mode='sync', container=None, cwd=None, host_partition='auto', ioserver='ophidiaio_memory', schedule=0, algorithm='default',
+                 nhost=None, run='yes', nfrag=1, ntuple=1, measure=None, measure_type=None, exp_ndim=None, dim=None, concept_level='c',
+                 dim_size=None, compressed='no', grid='-', description='-', display=False, deadline=None) -> Cube or None : wrapper of the operator OPH_RANDCUBE2
+
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
-        :param nthreads: number of threads to use
+        :param nthreads: number of threads to use (default is the server default, or the value chosen by Client.tuner)
         :type nthreads: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -1499,7 +1651,7 @@ class Cube():
         :type ioserver: str
         :param schedule: 0
         :type schedule: int
-        :param nhost: number of hosts to use
+        :param nhost: number of hosts to use (default is the server default, or the value chosen by Client.tuner)
         :type nhost: int
         :param run: yes|no
         :type run: str
@@ -1527,12 +1679,15 @@ class Cube():
         :type description: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: obj or None
         :rtype: Cube or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or (cwd is None and Cube.client.cwd is None) or container is None or nfrag is None or ntuple is None or measure is None or measure_type is None or exp_ndim is None or\
+        client = cls.active_client()
+        if client is None or (cwd is None and client.cwd is None) or container is None or nfrag is None or ntuple is None or measure is None or measure_type is None or exp_ndim is None or\
                 dim is None or dim_size is None:
             raise RuntimeError('Cube.client, cwd, container, nfrag, ntuple, measure, measure_type, exp_ndim, dim or dim_size is None')
         newcube = None
@@ -1585,14 +1740,15 @@ class Cube():
             query += 'description=' + str(description) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                if Cube.client.cube:
-                    newcube = Cube(pid=Cube.client.cube)
+            if result.response is not None:
+                if result.cube:
+                    newcube = Cube(pid=result.cube, client=client)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
         else:
             return newcube
@@ -1600,10 +1756,10 @@ class Cube():
     @classmethod
     def explorenc(cls, exec_mode='sync', schedule=0, measure='-', src_path=None, cdd=None, exp_dim='-', imp_dim='-', subset_dims='none', subset_type='index', subset_filter='all', limit_filter=100,
                   show_index='no', show_id='no', show_time='no', show_stats='00000000000000', show_fit='no', level=0, imp_num_point=0, offset=50, operation='avg', wavelet='no', wavelet_ratio=0,
-                  wavelet_coeff='no', objkey_filter='all', display=True):
+                  wavelet_coeff='no', objkey_filter='all', display=True, deadline=None):
         """explorenc(exec_mode='sync', schedule=0, measure='-', src_path=None, cdd=None, exp_dim='-', imp_dim='-', subset_dims='none', subset_type='index', subset_filter='all', limit_filter=100,
                      show_index='no', show_id='no', show_time='no', show_stats='00000000000000', show_fit='no', level=0, imp_num_point=0, offset=50, operation='avg', wavelet='no', wavelet_ratio=0,
-                     wavelet_coeff='no', objkey_filter='all', display=True)
+                     wavelet_coeff='no', objkey_filter='all', display=True, deadline=None)
              -> None : wrapper of the operator OPH_EXPLORENC
 
         :param exec_mode: async or sync
@@ -1654,14 +1810,17 @@ class Cube():
         :type wavelet_coeff: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None or src_path is None:
+            if client is None or src_path is None:
                 raise RuntimeError('Cube.client or src_path')
 
             query = 'oph_explorenc '
@@ -1715,32 +1874,33 @@ class Cube():
             if objkey_filter is not None:
                 query += 'objkey_filter=' + str(objkey_filter) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
     def importnc(cls, container='-', cwd=None, exp_dim='auto', host_partition='auto', imp_dim='auto', measure=None, src_path=None, cdd=None, compressed='no',
                  exp_concept_level='c', grid='-', imp_concept_level='c', import_metadata='yes', check_compliance='no', offset=0,
-                 ioserver='mysql_table', ncores=1, nfrag=0, nhost=0, subset_dims='none', subset_filter='all', time_filter='yes',
+                 ioserver='mysql_table', ncores=None, nfrag=None, nhost=None, subset_dims='none', subset_filter='all', time_filter='yes',
                  subset_type='index', exec_mode='sync', base_time='1900-01-01 00:00:00', calendar='standard', hierarchy='oph_base', leap_month=2,
                  leap_year=0, month_lengths='31,28,31,30,31,30,31,31,30,31,30,31', run='yes', units='d', vocabulary='CF', description='-', schedule=0,
-                 check_grid='no', display=False):
+                 check_grid='no', display=False, deadline=None):
         """importnc(container='-', cwd=None, exp_dim='auto', host_partition='auto', imp_dim='auto', measure=None, src_path=None,  cdd=None, compressed='no',
                     exp_concept_level='c', grid='-', imp_concept_level='c', import_metadata='yes', check_compliance='no', offset=0,
-                    ioserver='mysql_table', ncores=1, nfrag=0, nhost=0, subset_dims='none', subset_filter='all', time_filter='yes'
+                    ioserver='mysql_table', ncores=None, nfrag=None, nhost=None, subset_dims='none', subset_filter='all', time_filter='yes'
                     subset_type='index', exec_mode='sync', base_time='1900-01-01 00:00:00', calendar='standard', hierarchy='oph_base', leap_month=2,
                     leap_year=0, month_lengths='31,28,31,30,31,30,31,31,30,31,30,31', run='yes', units='d', vocabulary='CF', description='-', schedule=0,
-                    check_grid='no')
+                    check_grid='no', deadline=None)
              -> Cube or None : wrapper of the operator OPH_IMPORTNC
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -1778,9 +1938,9 @@ class Cube():
         :type offset: int
         :param ioserver: mysql_table|ophdiaio_memory
         :type ioserver: str
-        :param nfrag: number of fragments/db to use
+        :param nfrag: number of fragments/db to use (default is the server default, or the value chosen by Client.tuner)
         :type nfrag: int
-        :param nhost: number of hosts to use
+        :param nhost: number of hosts to use (default is the server default, or the value chosen by Client.tuner)
         :type nhost: int
         :param subset_dims: pipe (|) separated list of dimensions on which to apply the subsetting
         :type subset_dims: str
@@ -1814,12 +1974,15 @@ class Cube():
         :type check_grid: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: obj or None
         :rtype: Cube or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or measure is None or src_path is None:
+        client = cls.active_client()
+        if client is None or measure is None or src_path is None:
             raise RuntimeError('Cube.client, measure or src_path is None')
         newcube = None
 
@@ -1899,14 +2062,15 @@ class Cube():
             query += 'check_grid=' + str(check_grid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                if Cube.client.cube:
-                    newcube = Cube(pid=Cube.client.cube)
+            if result.response is not None:
+                if result.cube:
+                    newcube = Cube(pid=result.cube, client=client)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
         else:
             return newcube
@@ -1914,21 +2078,21 @@ class Cube():
     @classmethod
     def importnc2(cls, container='-', cwd=None, exp_dim='auto', host_partition='auto', imp_dim='auto', measure=None, src_path=None, cdd=None, compressed='no',
                  exp_concept_level='c', grid='-', imp_concept_level='c', import_metadata='yes', check_compliance='no', offset=0,
-                 ioserver='ophidiaio_memory', ncores=1, nthreads=1, nfrag=0, nhost=0, subset_dims='none', subset_filter='all', time_filter='yes',
+                 ioserver='ophidiaio_memory', ncores=None, nthreads=None, nfrag=None, nhost=None, subset_dims='none', subset_filter='all', time_filter='yes',
                  subset_type='index', exec_mode='sync', base_time='1900-01-01 00:00:00', calendar='standard', hierarchy='oph_base', leap_month=2,
                  leap_year=0, month_lengths='31,28,31,30,31,30,31,31,30,31,30,31', run='yes', units='d', vocabulary='CF', description='-', schedule=0,
-                 check_grid='no', display=False):
+                 check_grid='no', display=False, deadline=None):
         """importnc2(container='-', cwd=None, exp_dim='auto', host_partition='auto', imp_dim='auto', measure=None, src_path=None, cdd=None, compressed='no',
                  exp_concept_level='c', grid='-', imp_concept_level='c', import_metadata='yes', check_compliance='no', offset=0,
-                 ioserver='ophidiaio_memory', ncores=1, nthreads=1, nfrag=0, nhost=0, subset_dims='none', subset_filter='all', time_filter='yes'
+                 ioserver='ophidiaio_memory', ncores=None, nthreads=None, nfrag=None, nhost=None, subset_dims='none', subset_filter='all', time_filter='yes'
                  subset_type='index', exec_mode='sync', base_time='1900-01-01 00:00:00', calendar='standard', hierarchy='oph_base', leap_month=2,
-                 leap_year=0, month_lengths='31,28,31,30,31,30,31,31,30,31,30,31', run='yes', units='d', vocabulary='CF', description='-', schedule=0, check_grid='no')
+                 leap_year=0, month_lengths='31,28,31,30,31,30,31,31,30,31,30,31', run='yes', units='d', vocabulary='CF', description='-', schedule=0, check_grid='no', deadline=None)
           -> Cube or None : wrapper of the operator OPH_IMPORTNC2
 
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
-        :param nthreads: number of threads to use
+        :param nthreads: number of threads to use (default is the server default, or the value chosen by Client.tuner)
         :type nthreads: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -1966,9 +2130,9 @@ class Cube():
         :type offset: int
         :param ioserver: ophdiaio_memory
         :type ioserver: str
-        :param nfrag: number of fragments/db to use
+        :param nfrag: number of fragments/db to use (default is the server default, or the value chosen by Client.tuner)
         :type nfrag: int
-        :param nhost: number of hosts to use
+        :param nhost: number of hosts to use (default is the server default, or the value chosen by Client.tuner)
         :type nhost: int
         :param subset_dims: pipe (|) separated list of dimensions on which to apply the subsetting
         :type subset_dims: str
@@ -2002,12 +2166,15 @@ class Cube():
         :type check_grid: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: obj or None
         :rtype: Cube or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or measure is None or src_path is None:
+        client = cls.active_client()
+        if client is None or measure is None or src_path is None:
             raise RuntimeError('Cube.client, measure or src_path is None')
         newcube = None
 
@@ -2089,21 +2256,22 @@ class Cube():
             query += 'check_grid=' + str(check_grid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                if Cube.client.cube:
-                    newcube = Cube(pid=Cube.client.cube)
+            if result.response is not None:
+                if result.cube:
+                    newcube = Cube(pid=result.cube, client=client)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
         else:
             return newcube
 
     @classmethod
-    def man(cls, function=None, function_version='latest', function_type='operator', exec_mode='sync', objkey_filter='all', display=True):
-        """man(function=None, function_type='operator', function_version='latest', exec_mode='sync', display=True) -> dict or None : wrapper of the operator OPH_MAN
+    def man(cls, function=None, function_version='latest', function_type='operator', exec_mode='sync', objkey_filter='all', display=True, deadline=None):
+        """man(function=None, function_type='operator', function_version='latest', exec_mode='sync', display=True, deadline=None) -> dict or None : wrapper of the operator OPH_MAN
 
         :param function: operator or primitive name
         :type function: str
@@ -2115,14 +2283,17 @@ class Cube():
         :type exec_mode: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is True)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None or function is None:
+            if client is None or function is None:
                 raise RuntimeError('Cube.client or function is None')
 
             query = 'oph_man '
@@ -2138,19 +2309,20 @@ class Cube():
             if objkey_filter is not None:
                 query += 'objkey_filter=' + str(objkey_filter) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
-    def movecontainer(cls, container=None, cwd=None, exec_mode='sync', display=False):
-        """movecontainer(container=None, cwd=None, exec_mode='sync', display=False) -> dict or None : wrapper of the operator OPH_MOVECONTAINER
+    def movecontainer(cls, container=None, cwd=None, exec_mode='sync', display=False, deadline=None):
+        """movecontainer(container=None, cwd=None, exec_mode='sync', display=False, deadline=None) -> dict or None : wrapper of the operator OPH_MOVECONTAINER
 
         :param container: container name
         :type container: str
@@ -2160,14 +2332,17 @@ class Cube():
         :type exec_mode: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None or container is None or (cwd is None and Cube.client.cwd is None):
+            if client is None or container is None or (cwd is None and client.cwd is None):
                 raise RuntimeError('Cube.client, container or cwd is None')
 
             query = 'oph_movecontainer '
@@ -2179,19 +2354,20 @@ class Cube():
             if exec_mode is not None:
                 query += 'exec_mode=' + str(exec_mode) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
-    def operators(cls, operator_filter=None, limit_filter=0, exec_mode='sync', objkey_filter='all', display=True):
-        """operators(operator_filter=None, limit_filter=0, exec_mode='sync', display=True) -> dict or None : wrapper of the operator OPH_OPERATORS_LIST
+    def operators(cls, operator_filter=None, limit_filter=0, exec_mode='sync', objkey_filter='all', display=True, deadline=None):
+        """operators(operator_filter=None, limit_filter=0, exec_mode='sync', display=True, deadline=None) -> dict or None : wrapper of the operator OPH_OPERATORS_LIST
 
         :param operator_filter: filter on operator name
         :type operator_filter: str
@@ -2201,14 +2377,17 @@ class Cube():
         :type exec_mode: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is True)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None:
+            if client is None:
                 raise RuntimeError('Cube.client is None')
 
             query = 'oph_operators_list '
@@ -2222,19 +2401,20 @@ class Cube():
             if objkey_filter is not None:
                 query += 'objkey_filter=' + str(objkey_filter) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
-    def primitives(cls, level=1, dbms_filter=None, return_type='all', primitive_type='all', primitive_filter='', limit_filter=0, exec_mode='sync', objkey_filter='all', display=True):
-        """primitives(dbms_filter=None, level=1, limit_filter=0, primitive_filter=None, primitive_type=None, return_type=None, exec_mode='sync', objkey_filter='all', display=True) ->
+    def primitives(cls, level=1, dbms_filter=None, return_type='all', primitive_type='all', primitive_filter='', limit_filter=0, exec_mode='sync', objkey_filter='all', display=True, deadline=None):
+        """primitives(dbms_filter=None, level=1, limit_filter=0, primitive_filter=None, primitive_type=None, return_type=None, exec_mode='sync', objkey_filter='all', display=True, deadline=None) ->
            dict or None : wrapper of the operator OPH_PRIMITIVES_LIST
 
         :param dbms_filter: filter on DBMS
@@ -2253,14 +2433,17 @@ class Cube():
         :type exec_mode: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is True)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None:
+            if client is None:
                 raise RuntimeError('Cube.client is None')
 
             query = 'oph_primitives_list '
@@ -2282,18 +2465,19 @@ class Cube():
             if objkey_filter is not None:
                 query += 'objkey_filter=' + str(objkey_filter) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
-    def script(cls, script=':', args=' ', stdout='stdout', stderr='stderr', list='no', exec_mode='sync', ncores=1, display=False):
-        """script(script=':', args=' ', stdout='stdout', stderr='stderr', ncores=1, exec_mode='sync', list='no', display=False) -> dict or None : wrapper of the operator OPH_SCRIPT
+    def script(cls, script=':', args=' ', stdout='stdout', stderr='stderr', list='no', exec_mode='sync', ncores=1, display=False, deadline=None):
+        """script(script=':', args=' ', stdout='stdout', stderr='stderr', ncores=1, exec_mode='sync', list='no', display=False, deadline=None) -> dict or None : wrapper of the operator OPH_SCRIPT
 
         :param script: script/executable filename
         :type script: str
@@ -2311,14 +2495,17 @@ class Cube():
         :type exec_mode: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None:
+            if client is None:
                 raise RuntimeError('Cube.client is None')
 
             query = 'oph_script '
@@ -2338,18 +2525,19 @@ class Cube():
             if ncores is not None:
                 query += 'ncores=' + str(ncores) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
-    def resume(cls, session='this', id=0, id_type='workflow', document_type='response', level=1, user='', status_filter='11111111', save='no', objkey_filter='all', display=True):
-        """ resume( id=0, id_type='workflow', document_type='response', level=1, save='no', session='this', objkey_filter='all', user='', display=True)
+    def resume(cls, session='this', id=0, id_type='workflow', document_type='response', level=1, user='', status_filter='11111111', save='no', objkey_filter='all', display=True, deadline=None):
+        """ resume( id=0, id_type='workflow', document_type='response', level=1, save='no', session='this', objkey_filter='all', user='', display=True, deadline=None)
               -> dict or None : wrapper of the operator OPH_RESUME
 
         :param session: identifier of the intended session, by default it is the working session
@@ -2370,14 +2558,17 @@ class Cube():
         :type save: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is True)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
+        client = cls.active_client()
         response = None
         try:
-            if Cube.client is None:
+            if client is None:
                 raise RuntimeError('Cube.client is None')
 
             query = 'oph_resume '
@@ -2401,21 +2592,22 @@ class Cube():
             if objkey_filter is not None:
                 query += 'objkey_filter=' + str(objkey_filter) + ';'
 
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
     @classmethod
-    def mergecubes(cls, ncores=1, exec_mode='sync', cubes=None, schedule=0, container='-', mode='i', hold_values='no', number=1, description='-', display=False):
-        """mergecubes(ncores=1, exec_mode='sync', cubes=None, schedule=0, container='-', mode='i', hold_values='no', number=1, description='-', display=False) -> Cube : wrapper of the operator OPH_MERGECUBES
+    def mergecubes(cls, ncores=None, exec_mode='sync', cubes=None, schedule=0, container='-', mode='i', hold_values='no', number=1, description='-', display=False, deadline=None):
+        """mergecubes(ncores=None, exec_mode='sync', cubes=None, schedule=0, container='-', mode='i', hold_values='no', number=1, description='-', display=False, deadline=None) -> Cube : wrapper of the operator OPH_MERGECUBES
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -2435,12 +2627,15 @@ class Cube():
         :type description: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: new cube or None
         :rtype: Cube or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or cubes is None:
+        client = cls.active_client()
+        if client is None or cubes is None:
             raise RuntimeError('Cube.client or cubes is None')
         newcube = None
 
@@ -2466,23 +2661,24 @@ class Cube():
             query += 'description=' + str(description) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                if Cube.client.cube:
-                    newcube = Cube(pid=Cube.client.cube)
+            if result.response is not None:
+                if result.cube:
+                    newcube = Cube(pid=result.cube, client=client)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
         else:
             return newcube
 
     @classmethod
-    def mergecubes2(cls, ncores=1, exec_mode='sync', cubes=None, schedule=0, container='-', dim_type='long', number=1, description='-', dim='-', display=False):
-        """mergecubes2(ncores=1, exec_mode='sync', cubes=None, schedule=0, container='-', dim_type='long', number=1, description='-', dim='-', display=False) -> Cube or None: wrapper of the operator OPH_MERGECUBES2
+    def mergecubes2(cls, ncores=None, exec_mode='sync', cubes=None, schedule=0, container='-', dim_type='long', number=1, description='-', dim='-', display=False, deadline=None):
+        """mergecubes2(ncores=None, exec_mode='sync', cubes=None, schedule=0, container='-', dim_type='long', number=1, description='-', dim='-', display=False, deadline=None) -> Cube or None: wrapper of the operator OPH_MERGECUBES2
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -2502,12 +2698,15 @@ class Cube():
         :type dim: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: new cube or None
         :rtype: Cube or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or cubes is None:
+        client = cls.active_client()
+        if client is None or cubes is None:
             raise RuntimeError('Cube.client or cubes is None')
         newcube = None
 
@@ -2533,33 +2732,34 @@ class Cube():
             query += 'dim=' + str(dim) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                if Cube.client.cube:
-                    newcube = Cube(pid=Cube.client.cube)
+            if result.response is not None:
+                if result.cube:
+                    newcube = Cube(pid=result.cube, client=client)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
         else:
             return newcube
 
     def __init__(self, container='-', cwd=None, exp_dim='auto', host_partition='auto', imp_dim='auto', measure=None, src_path=None, cdd=None, compressed='no',
                  exp_concept_level='c', grid='-', imp_concept_level='c', import_metadata='no', check_compliance='no', offset=0,
-                 ioserver='mysql_table', ncores=1, nfrag=0, nhost=0, subset_dims='none', subset_filter='all', time_filter='yes',
+                 ioserver='mysql_table', ncores=None, nfrag=None, nhost=None, subset_dims='none', subset_filter='all', time_filter='yes',
                  subset_type='index', exec_mode='sync', base_time='1900-01-01 00:00:00', calendar='standard', hierarchy='oph_base', leap_month=2,
                  leap_year=0, month_lengths='31,28,31,30,31,30,31,31,30,31,30,31', run='yes', units='d', vocabulary='-', description='-', schedule=0,
-                 pid=None, check_grid='no', display=False):
+                 pid=None, check_grid='no', display=False, client=None, deadline=None):
         """Cube(container='-', cwd=None, exp_dim='auto', host_partition='auto', imp_dim='auto', measure=None, src_path=None, cdd=None, compressed='no',
                 exp_concept_level='c', grid='-', imp_concept_level='c', import_metadata='no', check_compliance='no', offset=0,
-                ioserver='mysql_table', ncores=1, nfrag=0, nhost=0, subset_dims='none', subset_filter='all', time_filter='yes'
+                ioserver='mysql_table', ncores=None, nfrag=None, nhost=None, subset_dims='none', subset_filter='all', time_filter='yes'
                 subset_type='index', exec_mode='sync', base_time='1900-01-01 00:00:00', calendar='standard', hierarchy='oph_base', leap_month=2,
                 leap_year=0, month_lengths='31,28,31,30,31,30,31,31,30,31,30,31', run='yes', units='d', vocabulary='-', description='-', schedule=0,
-                pid=None, check_grid='no', display=False) -> obj
+                pid=None, check_grid='no', display=False, client=None, deadline=None) -> obj
              or Cube(pid=None) -> obj
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -2597,9 +2797,9 @@ class Cube():
         :type offset: int
         :param ioserver: mysql_table|ophdiaio_memory
         :type ioserver: str
-        :param nfrag: number of fragments/db to use
+        :param nfrag: number of fragments/db to use (default is the server default, or the value chosen by Client.tuner)
         :type nfrag: int
-        :param nhost: number of hosts to use
+        :param nhost: number of hosts to use (default is the server default, or the value chosen by Client.tuner)
         :type nhost: int
         :param subset_dims: pipe (|) separated list of dimensions on which to apply the subsetting
         :type subset_dims: str
@@ -2635,11 +2835,19 @@ class Cube():
         :type check_grid: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param client: Client bound to the cube (default is the Client of the active scope or Cube.client)
+        :type client: Client
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: obj or None
         :rtype: Cube or None
         :raises: RuntimeError
         """
 
+        if client is None:
+            client = _scoped_client()
+        if client is not None:
+            self.client = client
         self.pid = None
         self.creation_date = None
         self.measure = None
@@ -2657,12 +2865,12 @@ class Cube():
         self.dim_info = None
 
         if pid is not None:
-            if Cube.client is None:
+            if self.client is None:
                 raise RuntimeError('Cube.client is None')
             self.pid = pid
         else:
-            if (Cube.client is not None) and (cwd is not None or measure is not None or src_path is not None):
-                if (cwd is None and Cube.client.cwd is None) or measure is None or src_path is None:
+            if (self.client is not None) and (cwd is not None or measure is not None or src_path is not None):
+                if (cwd is None and self.client.cwd is None) or measure is None or src_path is None:
                     raise RuntimeError('one or more required parameters are None')
 
                 else:
@@ -2742,18 +2950,19 @@ class Cube():
                         query += 'check_grid=' + str(check_grid) + ';'
 
                     try:
-                        if Cube.client.submit(query, display) is None:
+                        result = self.client.execute(query, display, deadline=deadline)
+                        if result is None:
                             raise RuntimeError()
 
-                        if Cube.client.last_response is not None:
-                            if Cube.client.cube:
-                                self.pid = Cube.client.cube
+                        if result.response is not None:
+                            if result.cube:
+                                self.pid = result.cube
                     except Exception as e:
-                        print(get_linenumber(), "Something went wrong in instantiating the cube", e)
+                        _logger.error("Something went wrong in instantiating the cube: %s", e)
                         raise RuntimeError()
                     else:
                         if self.pid:
-                            print("New cube is " + self.pid)
+                            _logger.info("New cube is %s", self.pid)
 
     def __del__(self):
         del self.pid
@@ -2772,62 +2981,66 @@ class Cube():
         del self.nelements
         del self.dim_info
 
-    def info(self, display=True):
-        """info(display=True) -> None : call OPH_CUBESIZE and OPH_CUBESCHEMA to fill all Cube attributes
+    def info(self, display=True, deadline=None):
+        """info(display=True, deadline=None) -> None : call OPH_CUBESIZE and OPH_CUBESCHEMA to fill all Cube attributes
 
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is True)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: None
         :rtype: None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None:
+        if self.client is None or self.pid is None:
             raise RuntimeError('Cube.client is None or pid is None')
         query = 'oph_cubesize exec_mode=sync;cube=' + str(self.pid) + ';'
-        if Cube.client.submit(query, display=False) is None:
+        result = self.client.execute(query, display=False, deadline=deadline)
+        if result is None:
             raise RuntimeError()
         query = 'oph_cubeschema exec_mode=sync;cube=' + str(self.pid) + ';'
-        if Cube.client.submit(query, display) is None:
+        result = self.client.execute(query, display, deadline=deadline)
+        if result is None:
             raise RuntimeError()
-        res = Cube.client.deserialize_response()
-        if res is not None:
-            for res_i in res['response']:
-                if res_i['objkey'] == 'cubeschema_cubeinfo':
-                    self.pid = res_i['objcontent'][0]['rowvalues'][0][0]
-                    self.creation_date = res_i['objcontent'][0]['rowvalues'][0][1]
-                    self.measure = res_i['objcontent'][0]['rowvalues'][0][2]
-                    self.measure_type = res_i['objcontent'][0]['rowvalues'][0][3]
-                    self.level = res_i['objcontent'][0]['rowvalues'][0][4]
-                    self.nfragments = res_i['objcontent'][0]['rowvalues'][0][5]
-                    self.source_file = res_i['objcontent'][0]['rowvalues'][0][6]
-                elif res_i['objkey'] == 'cubeschema_morecubeinfo':
-                    self.hostxcube = res_i['objcontent'][0]['rowvalues'][0][1]
-                    self.fragxdb = res_i['objcontent'][0]['rowvalues'][0][2]
-                    self.rowsxfrag = res_i['objcontent'][0]['rowvalues'][0][3]
-                    self.elementsxrow = res_i['objcontent'][0]['rowvalues'][0][4]
-                    self.compressed = res_i['objcontent'][0]['rowvalues'][0][5]
-                    self.size = res_i['objcontent'][0]['rowvalues'][0][6] + ' ' + res_i['objcontent'][0]['rowvalues'][0][7]
-                    self.nelements = res_i['objcontent'][0]['rowvalues'][0][8]
-                elif res_i['objkey'] == 'cubeschema_diminfo':
-                    self.dim_info = list()
-                    for row_i in res_i['objcontent'][0]['rowvalues']:
-                        element = dict()
-                        element['name'] = row_i[0]
-                        element['type'] = row_i[1]
-                        element['size'] = row_i[2]
-                        element['hierarchy'] = row_i[3]
-                        element['concept_level'] = row_i[4]
-                        element['array'] = row_i[5]
-                        element['level'] = row_i[6]
-                        element['lattice_name'] = row_i[7]
-                        self.dim_info.append(element)
-
-    def exportnc(self, misc='no', output_path='default', output_name='default', cdd=None, force='no', export_metadata='yes', schedule=0, exec_mode='sync', ncores=1, display=False):
-        """exportnc(misc='no', output_path='default', output_name='default', cdd=None, force='no', export_metadata='yes', schedule=0, exec_mode='sync', ncores=1, display=False)
+        index = result.index
+        res_i = index.find(objkey='cubeschema_cubeinfo')
+        if res_i is not None:
+            self.pid = res_i['objcontent'][0]['rowvalues'][0][0]
+            self.creation_date = res_i['objcontent'][0]['rowvalues'][0][1]
+            self.measure = res_i['objcontent'][0]['rowvalues'][0][2]
+            self.measure_type = res_i['objcontent'][0]['rowvalues'][0][3]
+            self.level = res_i['objcontent'][0]['rowvalues'][0][4]
+            self.nfragments = res_i['objcontent'][0]['rowvalues'][0][5]
+            self.source_file = res_i['objcontent'][0]['rowvalues'][0][6]
+        res_i = index.find(objkey='cubeschema_morecubeinfo')
+        if res_i is not None:
+            self.hostxcube = res_i['objcontent'][0]['rowvalues'][0][1]
+            self.fragxdb = res_i['objcontent'][0]['rowvalues'][0][2]
+            self.rowsxfrag = res_i['objcontent'][0]['rowvalues'][0][3]
+            self.elementsxrow = res_i['objcontent'][0]['rowvalues'][0][4]
+            self.compressed = res_i['objcontent'][0]['rowvalues'][0][5]
+            self.size = res_i['objcontent'][0]['rowvalues'][0][6] + ' ' + res_i['objcontent'][0]['rowvalues'][0][7]
+            self.nelements = res_i['objcontent'][0]['rowvalues'][0][8]
+        for res_i in index.find_all(objkey='cubeschema_diminfo'):
+            self.dim_info = list()
+            for row_i in res_i['objcontent'][0]['rowvalues']:
+                element = dict()
+                element['name'] = row_i[0]
+                element['type'] = row_i[1]
+                element['size'] = row_i[2]
+                element['hierarchy'] = row_i[3]
+                element['concept_level'] = row_i[4]
+                element['array'] = row_i[5]
+                element['level'] = row_i[6]
+                element['lattice_name'] = row_i[7]
+                self.dim_info.append(element)
+
+    def exportnc(self, misc='no', output_path='default', output_name='default', cdd=None, force='no', export_metadata='yes', schedule=0, exec_mode='sync', ncores=None, display=False, deadline=None):
+        """exportnc(misc='no', output_path='default', output_name='default', cdd=None, force='no', export_metadata='yes', schedule=0, exec_mode='sync', ncores=None, display=False, deadline=None)
              -> None : wrapper of the operator OPH_EXPORTNC
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -2847,12 +3060,14 @@ class Cube():
         :type output_name: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: None
         :rtype: None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None:
+        if self.client is None or self.pid is None:
             raise RuntimeError('Cube.client or pid is None')
 
         query = 'oph_exportnc '
@@ -2879,17 +3094,18 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
-    def exportnc2(self, misc='no', output_path='default', output_name='default', cdd=None, force='no', export_metadata='yes', schedule=0, exec_mode='sync', ncores=1, display=False):
-        """exportnc2(misc='no', output_path='default', output_name='default', cdd=None, force='no', export_metadata='yes', schedule=0, exec_mode='sync', ncores=1, display=False)
+    def exportnc2(self, misc='no', output_path='default', output_name='default', cdd=None, force='no', export_metadata='yes', schedule=0, exec_mode='sync', ncores=None, display=False, deadline=None):
+        """exportnc2(misc='no', output_path='default', output_name='default', cdd=None, force='no', export_metadata='yes', schedule=0, exec_mode='sync', ncores=None, display=False, deadline=None)
              -> None : wrapper of the operator OPH_EXPORTNC2
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -2909,12 +3125,14 @@ class Cube():
         :type output_name: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: None
         :rtype: None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None:
+        if self.client is None or self.pid is None:
             raise RuntimeError('Cube.client or pid is None')
 
         query = 'oph_exportnc2 '
@@ -2941,19 +3159,20 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
-    def aggregate(self, ncores=1, nthreads=1, exec_mode='sync', schedule=0, group_size='all', operation=None, missingvalue='NAN', grid='-', container='-', description='-', check_grid='no', display=False):
-        """aggregate( ncores=1, nthreads=1, exec_mode='sync', schedule=0, group_size='all', operation=None, missingvalue='NAN', grid='-', container='-', description='-', check_grid='no', display=False)
+    def aggregate(self, ncores=None, nthreads=None, exec_mode='sync', schedule=0, group_size='all', operation=None, missingvalue='NAN', grid='-', container='-', description='-', check_grid='no', display=False, deadline=None):
+        """aggregate( ncores=None, nthreads=None, exec_mode='sync', schedule=0, group_size='all', operation=None, missingvalue='NAN', grid='-', container='-', description='-', check_grid='no', display=False, deadline=None)
              -> Cube or None : wrapper of the operator OPH_AGGREGATE
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
-        :param nthreads: number of threads to use
+        :param nthreads: number of threads to use (default is the server default, or the value chosen by Client.tuner)
         :type nthreads: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -2975,12 +3194,14 @@ class Cube():
         :type check_grid: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: new cube or None
         :rtype: Cube or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None or operation is None:
+        if self.client is None or self.pid is None or operation is None:
             raise RuntimeError('Cube.client, pid or operation is None')
         newcube = None
 
@@ -3012,27 +3233,28 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                if Cube.client.cube:
-                    newcube = Cube(pid=Cube.client.cube)
+            if result.response is not None:
+                if result.cube:
+                    newcube = Cube(pid=result.cube, client=self.client)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
         else:
             return newcube
 
-    def aggregate2(self, ncores=1, nthreads=1, exec_mode='sync', schedule=0, dim='-', concept_level='A', midnight='24', operation=None, grid='-', missingvalue='NAN', container='-', description='-',
-                   check_grid='no', display=False):
-        """aggregate2(ncores=1, nthreads=1, exec_mode='sync', schedule=0, dim='-', concept_level='A', midnight='24', operation=None, grid='-', missingvalue='NAN', container='-', description='-',
-                      check_grid='no', display=False)
+    def aggregate2(self, ncores=None, nthreads=None, exec_mode='sync', schedule=0, dim='-', concept_level='A', midnight='24', operation=None, grid='-', missingvalue='NAN', container='-', description='-',
+                   check_grid='no', display=False, deadline=None):
+        """aggregate2(ncores=None, nthreads=None, exec_mode='sync', schedule=0, dim='-', concept_level='A', midnight='24', operation=None, grid='-', missingvalue='NAN', container='-', description='-',
+                      check_grid='no', display=False, deadline=None)
              -> Cube or None : wrapper of the operator OPH_AGGREGATE2
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
-        :param nthreads: number of threads to use
+        :param nthreads: number of threads to use (default is the server default, or the value chosen by Client.tuner)
         :type nthreads: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -3058,12 +3280,14 @@ class Cube():
         :type check_grid: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: new cube or None
         :rtype: Cube or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None or operation is None:
+        if self.client is None or self.pid is None or operation is None:
             raise RuntimeError('Cube.client, pid, dim or operation is None')
         newcube = None
 
@@ -3099,26 +3323,27 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                if Cube.client.cube:
-                    newcube = Cube(pid=Cube.client.cube)
+            if result.response is not None:
+                if result.cube:
+                    newcube = Cube(pid=result.cube, client=self.client)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
         else:
             return newcube
 
-    def apply(self, ncores=1, nthreads=1, exec_mode='sync', query='measure', dim_query='null', measure='null', measure_type='manual', dim_type='manual', check_type='yes', on_reduce='skip', compressed='auto',
-              schedule=0, container='-', description='-', display=False):
-        """apply(ncores=1, nthreads=1, exec_mode='sync', query='measure', dim_query='null', measure='null', measure_type='manual', dim_type='manual', check_type='yes', on_reduce='skip', compressed='auto',
-                 schedule=0, container='-', description='-', display=False) -> Cube or None : wrapper of the operator OPH_APPLY
+    def apply(self, ncores=None, nthreads=None, exec_mode='sync', query='measure', dim_query='null', measure='null', measure_type='manual', dim_type='manual', check_type='yes', on_reduce='skip', compressed='auto',
+              schedule=0, container='-', description='-', display=False, deadline=None):
+        """apply(ncores=None, nthreads=None, exec_mode='sync', query='measure', dim_query='null', measure='null', measure_type='manual', dim_type='manual', check_type='yes', on_reduce='skip', compressed='auto',
+                 schedule=0, container='-', description='-', display=False, deadline=None) -> Cube or None : wrapper of the operator OPH_APPLY
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
-        :param nthreads: number of threads to use
+        :param nthreads: number of threads to use (default is the server default, or the value chosen by Client.tuner)
         :type nthreads: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -3146,12 +3371,14 @@ class Cube():
         :type description: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: new cube or None
         :rtype: Cube or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None:
+        if self.client is None or self.pid is None:
             raise RuntimeError('Cube.client, pid or query is None')
         newcube = None
 
@@ -3189,22 +3416,23 @@ class Cube():
         internal_query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(internal_query, display) is None:
+            result = self.client.execute(internal_query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                if Cube.client.cube:
-                    newcube = Cube(pid=Cube.client.cube)
+            if result.response is not None:
+                if result.cube:
+                    newcube = Cube(pid=result.cube, client=self.client)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
         else:
             return newcube
 
-    def concatnc(src_path=None, cdd=None, grid='-', check_exp_dim='yes', dim_offset='-', dim_continue='no', offset=0, description='-', subset_dims='none',
- subset_filter='all', subset_type='index', time_filter='yes', ncores=1, exec_mode='sync', schedule=0, display=False):
+    def concatnc(self, src_path=None, cdd=None, grid='-', check_exp_dim='yes', dim_offset='-', dim_continue='no', offset=0, description='-', subset_dims='none',
+ subset_filter='all', subset_type='index', time_filter='yes', ncores=None, exec_mode='sync', schedule=0, display=False, deadline=None):
         """concatnc(src_path=None, cdd=None, grid='-', check_exp_dim='yes', dim_offset='-', dim_continue='no', offset=0, description='-', subset_dims='none',
- subset_filter='all', subset_type='index', time_filter='yes', ncores=1, exec_mode='sync', schedule=0, display=False)
+ subset_filter='all', subset_type='index', time_filter='yes', ncores=None, exec_mode='sync', schedule=0, display=False, deadline=None)
  -> Cube or None : wrapper of the operator OPH_CONCATNC
 
         :param src_path: path of file to be imported
@@ -3221,7 +3449,7 @@ class Cube():
         :type time_filter: str
         :param subset_type: index|coord
         :type subset_type: str
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -3239,12 +3467,14 @@ class Cube():
         :type description: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: new cube or None
         :rtype: Cube or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None or src_path is None:
+        if self.client is None or self.pid is None or src_path is None:
             raise RuntimeError('Cube.client, pid or src_path is None')
         newcube = None
 
@@ -3284,22 +3514,23 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                if Cube.client.cube:
-                    newcube = Cube(pid=Cube.client.cube)
+            if result.response is not None:
+                if result.cube:
+                    newcube = Cube(pid=result.cube, client=self.client)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
         else:
             return newcube
 
-    def concatnc2(src_path=None, cdd=None, grid='-', check_exp_dim='yes', dim_offset='-', dim_continue='no', offset=0, description='-', subset_dims='none',
- subset_filter='all', subset_type='index', time_filter='yes', ncores=1, nthreads=1, exec_mode='sync', schedule=0, display=False):
-        """concatnc(src_path=None, cdd=None, grid='-', check_exp_dim='yes', dim_offset='-', dim_continue='no', offset=0, description='-', subset_dims='none',
- subset_filter='all', subset_type='index', time_filter='yes', ncores=1, nthreads=1, exec_mode='sync', schedule=0, display=False)
+    def concatnc2(self, src_path=None, cdd=None, grid='-', check_exp_dim='yes', dim_offset='-', dim_continue='no', offset=0, description='-', subset_dims='none',
+ subset_filter='all', subset_type='index', time_filter='yes', ncores=None, nthreads=None, exec_mode='sync', schedule=0, display=False, deadline=None):
+        """concatnc2(src_path=None, cdd=None, grid='-', check_exp_dim='yes', dim_offset='-', dim_continue='no', offset=0, description='-', subset_dims='none',
+ subset_filter='all', subset_type='index', time_filter='yes', ncores=None, nthreads=None, exec_mode='sync', schedule=0, display=False, deadline=None)
  -> Cube or None : wrapper of the operator OPH_CONCATNC2
 
         :param src_path: path of file to be imported
@@ -3316,9 +3547,9 @@ class Cube():
         :type time_filter: str
         :param subset_type: index|coord
         :type subset_type: str
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
-        :param nthreads: number of threads to use
+        :param nthreads: number of threads to use (default is the server default, or the value chosen by Client.tuner)
         :type nthreads: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -3336,12 +3567,14 @@ class Cube():
         :type description: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: new cube or None
         :rtype: Cube or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None or src_path is None:
+        if self.client is None or self.pid is None or src_path is None:
             raise RuntimeError('Cube.client, pid or src_path is None')
         newcube = None
 
@@ -3365,7 +3598,7 @@ class Cube():
             query += 'offset=' + str(offset) + ';'
         if ncores is not None:
             query += 'ncores=' + str(ncores) + ';'
-        if nthreds is not None:
+        if nthreads is not None:
             query += 'nthreads=' + str(nthreads) + ';'
         if exec_mode is not None:
             query += 'exec_mode=' + str(exec_mode) + ';'
@@ -3383,20 +3616,21 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                if Cube.client.cube:
-                    newcube = Cube(pid=Cube.client.cube)
+            if result.response is not None:
+                if result.cube:
+                    newcube = Cube(pid=result.cube, client=self.client)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
         else:
             return newcube
 
-    def provenance(self, branch='all', exec_mode='sync', objkey_filter='all', display=True):
-        """provenance(branch='all', exec_mode='sync', objkey_filter='all', display=True) -> dict or None : wrapper of the operator OPH_CUBEIO
+    def provenance(self, branch='all', exec_mode='sync', objkey_filter='all', display=True, deadline=None):
+        """provenance(branch='all', exec_mode='sync', objkey_filter='all', display=True, deadline=None) -> dict or None : wrapper of the operator OPH_CUBEIO
 
         :param branch: parent|children|all
         :type branch: str
@@ -3404,12 +3638,14 @@ class Cube():
         :type exec_mode: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is True)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None:
+        if self.client is None or self.pid is None:
             raise RuntimeError('Cube.client or pid is None')
         response = None
 
@@ -3425,22 +3661,23 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
-    def delete(self, ncores=1, nthreads=1, exec_mode='sync', schedule=0, display=False):
-        """delete(ncores=1, nthreads=1, exec_mode='sync', schedule=0, display=False) -> dict or None : wrapper of the operator OPH_DELETE
+    def delete(self, ncores=None, nthreads=None, exec_mode='sync', schedule=0, display=False, deadline=None):
+        """delete(ncores=None, nthreads=None, exec_mode='sync', schedule=0, display=False, deadline=None) -> dict or None : wrapper of the operator OPH_DELETE
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
-        :param nthreads: number of threads to use
+        :param nthreads: number of threads to use (default is the server default, or the value chosen by Client.tuner)
         :type nthreads: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -3448,12 +3685,14 @@ class Cube():
         :type schedule: int
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None:
+        if self.client is None or self.pid is None:
             raise RuntimeError('Cube.client or pid is None')
 
         query = 'oph_delete '
@@ -3470,16 +3709,17 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
-    def drilldown(self, ncores=1, exec_mode='sync', schedule=0, ndim=1, container='-', description='-', display=False):
-        """drilldown(ndim=1, container='-', ncores=1, exec_mode='sync', schedule=0, description='-', display=False) -> Cube or None : wrapper of the operator OPH_DRILLDOWN
+    def drilldown(self, ncores=None, exec_mode='sync', schedule=0, ndim=1, container='-', description='-', display=False, deadline=None):
+        """drilldown(ndim=1, container='-', ncores=None, exec_mode='sync', schedule=0, description='-', display=False, deadline=None) -> Cube or None : wrapper of the operator OPH_DRILLDOWN
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -3493,12 +3733,14 @@ class Cube():
         :type description: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: new cube or None
         :rtype: Cube or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None:
+        if self.client is None or self.pid is None:
             raise RuntimeError('Cube.client or pid is None')
         newcube = None
 
@@ -3520,24 +3762,25 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                if Cube.client.cube:
-                    newcube = Cube(pid=Cube.client.cube)
+            if result.response is not None:
+                if result.cube:
+                    newcube = Cube(pid=result.cube, client=self.client)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
         else:
             return newcube
 
-    def duplicate(self, ncores=1, nthreads=1, exec_mode='sync', schedule=0, container='-', description='-', display=False):
-        """duplicate(container='-', ncores=1, nthreads=1, exec_mode='sync', description='-', display=False) -> Cube or None : wrapper of the operator OPH_DUPLICATE
+    def duplicate(self, ncores=None, nthreads=None, exec_mode='sync', schedule=0, container='-', description='-', display=False, deadline=None):
+        """duplicate(container='-', ncores=None, nthreads=None, exec_mode='sync', description='-', display=False, deadline=None) -> Cube or None : wrapper of the operator OPH_DUPLICATE
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
-        :param nthreads: number of threads to use
+        :param nthreads: number of threads to use (default is the server default, or the value chosen by Client.tuner)
         :type nthreads: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -3549,12 +3792,14 @@ class Cube():
         :type description: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: new cube or None
         :rtype: Cube or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None:
+        if self.client is None or self.pid is None:
             raise RuntimeError('Cube.client or pid is None')
         newcube = None
 
@@ -3576,22 +3821,23 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                if Cube.client.cube:
-                    newcube = Cube(pid=Cube.client.cube)
+            if result.response is not None:
+                if result.cube:
+                    newcube = Cube(pid=result.cube, client=self.client)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
         else:
             return newcube
 
     def explore(self, schedule=0, limit_filter=100, subset_dims=None, subset_filter='all', time_filter='yes', subset_type='index', show_index='no', show_id='no', show_time='no', level=1,
-                output_path='default', output_name='default', cdd=None, base64='no', ncores=1, exec_mode='sync', objkey_filter='all', display=True):
+                output_path='default', output_name='default', cdd=None, base64='no', ncores=1, exec_mode='sync', objkey_filter='all', display=True, deadline=None):
         """explore(schedule=0, limit_filter=100, subset_dims=None, subset_filter='all', time_filter='yes', subset_type='index', show_index='no', show_id='no', show_time='no', level=1, output_path='default',
-                   output_name='default', cdd=None, base64='no', ncores=1, exec_mode='sync', objkey_filter='all', display=True) -> dict or None : wrapper of the operator OPH_EXPLORECUBE
+                   output_name='default', cdd=None, base64='no', ncores=1, exec_mode='sync', objkey_filter='all', display=True, deadline=None) -> dict or None : wrapper of the operator OPH_EXPLORECUBE
 
         :param ncores: number of cores to use
         :type ncores: int
@@ -3627,12 +3873,14 @@ class Cube():
         :type subset_filter: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is True)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None:
+        if self.client is None or self.pid is None:
             raise RuntimeError('Cube.client or pid is None')
         response = None
 
@@ -3676,20 +3924,21 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
-    def publish(self, content='all', schedule=0, show_index='no', show_id='no', show_time='no', ncores=1, exec_mode='sync', display=True):
-        """ publish( ncores=1, content='all', exec_mode='sync', show_id= 'no', show_index='no', schedule=0, show_time='no', display=True) -> dict or None : wrapper of the operator OPH_PUBLISH
+    def publish(self, content='all', schedule=0, show_index='no', show_id='no', show_time='no', ncores=None, exec_mode='sync', display=True, deadline=None):
+        """ publish( ncores=None, content='all', exec_mode='sync', show_id= 'no', show_index='no', schedule=0, show_time='no', display=True, deadline=None) -> dict or None : wrapper of the operator OPH_PUBLISH
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -3705,12 +3954,14 @@ class Cube():
         :type content: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is True)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None:
+        if self.client is None or self.pid is None:
             raise RuntimeError('Cube.client or pid is None')
         response = None
 
@@ -3734,29 +3985,32 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
-    def unpublish(self, exec_mode='sync', display=False):
-        """ unpublish( exec_mode='sync', display=False) -> dict or None : wrapper of the operator OPH_UNPUBLISH
+    def unpublish(self, exec_mode='sync', display=False, deadline=None):
+        """ unpublish( exec_mode='sync', display=False, deadline=None) -> dict or None : wrapper of the operator OPH_UNPUBLISH
 
         :param exec_mode: async or sync
         :type exec_mode: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None:
+        if self.client is None or self.pid is None:
             raise RuntimeError('Cube.client or pid is None')
         response = None
 
@@ -3767,18 +4021,19 @@ class Cube():
 
         query += 'cube=' + str(self.pid) + ';'
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
-    def cubeschema(self, level=0, dim='all', show_index='no', show_time='no', base64='no', action='read', concept_level='c', dim_level=1, dim_array='yes', exec_mode='sync', objkey_filter='all', display=True):
-        """ cubeschema( objkey_filter='all', exec_mode='sync', level=0, dim=None, show_index='no', show_time='no', base64='no', action='read', concept_level='c', dim_level=1, dim_array='yes', display=True) -> dict or None : wrapper of the operator OPH_CUBESCHEMA
+    def cubeschema(self, level=0, dim='all', show_index='no', show_time='no', base64='no', action='read', concept_level='c', dim_level=1, dim_array='yes', exec_mode='sync', objkey_filter='all', display=True, deadline=None):
+        """ cubeschema( objkey_filter='all', exec_mode='sync', level=0, dim=None, show_index='no', show_time='no', base64='no', action='read', concept_level='c', dim_level=1, dim_array='yes', display=True, deadline=None) -> dict or None : wrapper of the operator OPH_CUBESCHEMA
 
         :param level: 0|1|2
         :type level: int
@@ -3802,12 +4057,14 @@ class Cube():
         :type exec_mode: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is True)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None:
+        if self.client is None or self.pid is None:
             raise RuntimeError('Cube.client or pid is None')
         response = None
 
@@ -3839,20 +4096,21 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
-    def cubesize(self, schedule=0, exec_mode='sync', byte_unit='MB', algorithm='euristic', ncores=1, objkey_filter='all', display=True):
-        """ cubesize( schedule=0, ncores=1, byte_unit='MB', algorithm='euristic', objkey_filter='all', exec_mode='sync', display=True) -> dict or None : wrapper of the operator OPH_CUBESIZE
+    def cubesize(self, schedule=0, exec_mode='sync', byte_unit='MB', algorithm='euristic', ncores=None, objkey_filter='all', display=True, deadline=None):
+        """ cubesize( schedule=0, ncores=None, byte_unit='MB', algorithm='euristic', objkey_filter='all', exec_mode='sync', display=True, deadline=None) -> dict or None : wrapper of the operator OPH_CUBESIZE
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -3864,12 +4122,14 @@ class Cube():
         :type algorithm: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is True)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None:
+        if self.client is None or self.pid is None:
             raise RuntimeError('Cube.client or pid is None')
         response = None
 
@@ -3891,20 +4151,21 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
-    def cubeelements(self, schedule=0, exec_mode='sync', algorithm='dim_product', ncores=1, objkey_filter='all', display=True):
-        """ cubeelements( schedule=0, algorithm='dim_product', ncores=1, exec_mode='sync', objkey_filter='all', display=True) -> dict or None : wrapper of the operator OPH_CUBEELEMENTS
+    def cubeelements(self, schedule=0, exec_mode='sync', algorithm='dim_product', ncores=None, objkey_filter='all', display=True, deadline=None):
+        """ cubeelements( schedule=0, algorithm='dim_product', ncores=None, exec_mode='sync', objkey_filter='all', display=True, deadline=None) -> dict or None : wrapper of the operator OPH_CUBEELEMENTS
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -3914,12 +4175,14 @@ class Cube():
         :type algorithm: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is True)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None:
+        if self.client is None or self.pid is None:
             raise RuntimeError('Cube.client or pid is None')
         response = None
 
@@ -3939,20 +4202,21 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
-    def intercube(self, ncores=1, exec_mode='sync', cube2=None, operation='sub', missingvalue='NAN', measure='null', schedule=0, container='-', description='-', display=False):
-        """intercube(cube2=None, operation='sub', container='-', exec_mode='sync', ncores=1, description='-', display=False) -> Cube or None : wrapper of the operator OPH_INTERCUBE
+    def intercube(self, ncores=None, exec_mode='sync', cube2=None, operation='sub', missingvalue='NAN', measure='null', schedule=0, container='-', description='-', display=False, deadline=None):
+        """intercube(cube2=None, operation='sub', container='-', exec_mode='sync', ncores=None, description='-', display=False, deadline=None) -> Cube or None : wrapper of the operator OPH_INTERCUBE
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -3972,12 +4236,14 @@ class Cube():
         :type description: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: new cube or None
         :rtype: Cube or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None or cube2 is None:
+        if self.client is None or self.pid is None or cube2 is None:
             raise RuntimeError('Cube.client, pid, cube2 or operation is None')
         newcube = None
 
@@ -4005,22 +4271,23 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                if Cube.client.cube:
-                    newcube = Cube(pid=Cube.client.cube)
+            if result.response is not None:
+                if result.cube:
+                    newcube = Cube(pid=result.cube, client=self.client)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
         else:
             return newcube
 
-    def merge(self, ncores=1, exec_mode='sync', schedule=0, nmerge=0, container='-', description='-', display=False):
-        """merge(nmerge=0, schedule=0, description='-', container='-', exec_mode='sync', ncores=1, display=False) -> Cube or None : wrapper of the operator OPH_MERGE
+    def merge(self, ncores=None, exec_mode='sync', schedule=0, nmerge=0, container='-', description='-', display=False, deadline=None):
+        """merge(nmerge=0, schedule=0, description='-', container='-', exec_mode='sync', ncores=None, display=False, deadline=None) -> Cube or None : wrapper of the operator OPH_MERGE
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -4034,12 +4301,14 @@ class Cube():
         :type description: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: new cube or None
         :rtype: Cube or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None:
+        if self.client is None or self.pid is None:
             raise RuntimeError('Cube.client or pid is None')
         newcube = None
 
@@ -4061,22 +4330,23 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                if Cube.client.cube:
-                    newcube = Cube(pid=Cube.client.cube)
+            if result.response is not None:
+                if result.cube:
+                    newcube = Cube(pid=result.cube, client=self.client)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
         else:
             return newcube
 
     def metadata(self, mode='read', metadata_key='all', variable='global', metadata_id=0, metadata_type='text', metadata_value='-', variable_filter='all', metadata_type_filter='all',
-                 metadata_value_filter='all', force='no', exec_mode='sync', objkey_filter='all', display=True):
+                 metadata_value_filter='all', force='no', exec_mode='sync', objkey_filter='all', display=True, deadline=None):
         """metadata(mode='read', metadata_id=0, metadata_key='all', variable='global', metadata_type='text', metadata_value=None, variable_filter=None, metadata_type_filter=None,
-                    metadata_value_filter=None, force='no', exec_mode='sync', objkey_filter='all', display=True) -> dict or None : wrapper of the operator OPH_METADATA
+                    metadata_value_filter=None, force='no', exec_mode='sync', objkey_filter='all', display=True, deadline=None) -> dict or None : wrapper of the operator OPH_METADATA
 
         :param mode: insert|read|update|delete
         :type mode: str
@@ -4102,12 +4372,14 @@ class Cube():
         :type exec_mode: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is Ture)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None:
+        if self.client is None or self.pid is None:
             raise RuntimeError('Cube.client or pid is None')
         response = None
 
@@ -4141,21 +4413,22 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            if result.response is not None:
+                response = result.deserialize()
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
-    def permute(self, ncores=1, nthreads=1, exec_mode='sync', schedule=0, dim_pos=None, container='-', description='-', display=False):
-        """permute(dim_pos=None, container='-', exec_mode='sync', ncores=1, nthreads=1, schedule=0, description='-', display=False) -> Cube or None : wrapper of the operator OPH_PERMUTE
+    def permute(self, ncores=None, nthreads=None, exec_mode='sync', schedule=0, dim_pos=None, container='-', description='-', display=False, deadline=None):
+        """permute(dim_pos=None, container='-', exec_mode='sync', ncores=None, nthreads=None, schedule=0, description='-', display=False, deadline=None) -> Cube or None : wrapper of the operator OPH_PERMUTE
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
-        :param nthreads: number of threads to use
+        :param nthreads: number of threads to use (default is the server default, or the value chosen by Client.tuner)
         :type nthreads: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -4169,12 +4442,14 @@ class Cube():
         :type description: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: new cube or None
         :rtype: Cube or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None or dim_pos is None:
+        if self.client is None or self.pid is None or dim_pos is None:
             raise RuntimeError('Cube.client, pid or dim_pos is None')
         newcube = None
 
@@ -4198,25 +4473,26 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                if Cube.client.cube:
-                    newcube = Cube(pid=Cube.client.cube)
+            if result.response is not None:
+                if result.cube:
+                    newcube = Cube(pid=result.cube, client=self.client)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
         else:
             return newcube
 
-    def reduce(self, ncores=1, nthreads=1, exec_mode='sync', schedule=0, group_size='all', operation=None, order=2, missingvalue='NAN', grid='-', container='-', description='-', check_grid='no', display=False):
-        """reduce(operation=None, container=None, exec_mode='sync', grid='-', group_size='all', ncores=1, nthreads=1, schedule=0, order=2, description='-', objkey_filter='all', check_grid='no', display=False)
+    def reduce(self, ncores=None, nthreads=None, exec_mode='sync', schedule=0, group_size='all', operation=None, order=2, missingvalue='NAN', grid='-', container='-', description='-', check_grid='no', display=False, deadline=None):
+        """reduce(operation=None, container=None, exec_mode='sync', grid='-', group_size='all', ncores=None, nthreads=None, schedule=0, order=2, description='-', objkey_filter='all', check_grid='no', display=False, deadline=None)
              -> Cube or None : wrapper of the operator OPH_REDUCE
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
-        :param nthreads: number of threads to use
+        :param nthreads: number of threads to use (default is the server default, or the value chosen by Client.tuner)
         :type nthreads: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -4240,12 +4516,14 @@ class Cube():
         :type check_grid: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: new cube or None
         :rtype: Cube or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None or operation is None:
+        if self.client is None or self.pid is None or operation is None:
             raise RuntimeError('Cube.client, pid or operation is None')
         newcube = None
 
@@ -4279,24 +4557,25 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                if Cube.client.cube:
-                    newcube = Cube(pid=Cube.client.cube)
+            if result.response is not None:
+                if result.cube:
+                    newcube = Cube(pid=result.cube, client=self.client)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
         else:
             return newcube
 
-    def reduce2(self, ncores=1, exec_mode='sync', schedule=0, dim=None, concept_level='A', midnight='24', operation=None, order=2, missingvalue='NAN', grid='-', container='-', description='-',
-                nthreads=1, check_grid='no', display=False):
-        """reduce2(dim=None, operation=None, concept_level='A', container='-', exec_mode='sync', grid='-', midnight='24', order=2, description='-', schedule=0, ncores=1, nthreads=1, check_grid='no', display=False)
+    def reduce2(self, ncores=None, exec_mode='sync', schedule=0, dim=None, concept_level='A', midnight='24', operation=None, order=2, missingvalue='NAN', grid='-', container='-', description='-',
+                nthreads=None, check_grid='no', display=False, deadline=None):
+        """reduce2(dim=None, operation=None, concept_level='A', container='-', exec_mode='sync', grid='-', midnight='24', order=2, description='-', schedule=0, ncores=None, nthreads=None, check_grid='no', display=False, deadline=None)
              -> Cube or None : wrapper of the operator OPH_REDUCE2
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -4320,18 +4599,20 @@ class Cube():
         :type missingvalue: float
         :param description: additional description to be associated with the output cube
         :type description: str
-        :param nthreads: number of threads to use
+        :param nthreads: number of threads to use (default is the server default, or the value chosen by Client.tuner)
         :type nthreads: int
         :param check_grid: yes|no
         :type check_grid: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: new cube or None
         :rtype: Cube or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None or dim is None or operation is None:
+        if self.client is None or self.pid is None or dim is None or operation is None:
             raise RuntimeError('Cube.client, pid, dim or operation is None')
         newcube = None
 
@@ -4369,24 +4650,25 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                if Cube.client.cube:
-                    newcube = Cube(pid=Cube.client.cube)
+            if result.response is not None:
+                if result.cube:
+                    newcube = Cube(pid=result.cube, client=self.client)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
         else:
             return newcube
 
-    def rollup(self, ncores=1, nthreads=1, exec_mode='sync', schedule=0, ndim=1, container='-', description='-', display=False):
-        """rollup(ndim=1, container='-', exec_mode='sync', ncores=1, nthreads=1, schedule=0, description='-', display=False) -> Cube or None : wrapper of the operator OPH_ROLLUP
+    def rollup(self, ncores=None, nthreads=None, exec_mode='sync', schedule=0, ndim=1, container='-', description='-', display=False, deadline=None):
+        """rollup(ndim=1, container='-', exec_mode='sync', ncores=None, nthreads=None, schedule=0, description='-', display=False, deadline=None) -> Cube or None : wrapper of the operator OPH_ROLLUP
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
-        :param nthreads: number of threads to use
+        :param nthreads: number of threads to use (default is the server default, or the value chosen by Client.tuner)
         :type nthreads: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -4400,12 +4682,14 @@ class Cube():
         :type description: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: new cube or None
         :rtype: Cube or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None:
+        if self.client is None or self.pid is None:
             raise RuntimeError('Cube.client or pid is None')
         newcube = None
 
@@ -4429,24 +4713,25 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                if Cube.client.cube:
-                    newcube = Cube(pid=Cube.client.cube)
+            if result.response is not None:
+                if result.cube:
+                    newcube = Cube(pid=result.cube, client=self.client)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
         else:
             return newcube
 
-    def split(self, ncores=1, nthreads=1, exec_mode='sync', schedule=0, nsplit=2, container='-', description='-', display=False):
-        """split(nsplit=2, container='-', exec_mode='sync', ncores=1, nthreads=1, schedule=0, description='-', display=False) -> Cube or None : wrapper of the operator OPH_SPLIT
+    def split(self, ncores=None, nthreads=None, exec_mode='sync', schedule=0, nsplit=2, container='-', description='-', display=False, deadline=None):
+        """split(nsplit=2, container='-', exec_mode='sync', ncores=None, nthreads=None, schedule=0, description='-', display=False, deadline=None) -> Cube or None : wrapper of the operator OPH_SPLIT
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
-        :param nthreads: number of threads to use
+        :param nthreads: number of threads to use (default is the server default, or the value chosen by Client.tuner)
         :type nthreads: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -4460,12 +4745,14 @@ class Cube():
         :type description: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: new cube or None
         :rtype: Cube or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None or nsplit is None:
+        if self.client is None or self.pid is None or nsplit is None:
             raise RuntimeError('Cube.client, pid or nsplit is None')
         newcube = None
 
@@ -4489,27 +4776,28 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                if Cube.client.cube:
-                    newcube = Cube(pid=Cube.client.cube)
+            if result.response is not None:
+                if result.cube:
+                    newcube = Cube(pid=result.cube, client=self.client)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
         else:
             return newcube
 
-    def subset(self, ncores=1, nthreads=1, exec_mode='sync', schedule=0, subset_dims='none', subset_filter='all', subset_type='index', time_filter='yes', offset=0, grid='-', container='-', description='-',
-               check_grid='no', display=False):
-        """subset(subset_dims='none', subset_filter='all', container='-', exec_mode='sync', subset_type='index', time_filter='yes', offset=0, grid='-', ncores=1, nthreads=1, schedule=0, description='-',
-                  check_grid='no', display=False)
+    def subset(self, ncores=None, nthreads=None, exec_mode='sync', schedule=0, subset_dims='none', subset_filter='all', subset_type='index', time_filter='yes', offset=0, grid='-', container='-', description='-',
+               check_grid='no', display=False, deadline=None):
+        """subset(subset_dims='none', subset_filter='all', container='-', exec_mode='sync', subset_type='index', time_filter='yes', offset=0, grid='-', ncores=None, nthreads=None, schedule=0, description='-',
+                  check_grid='no', display=False, deadline=None)
              -> Cube or None : wrapper of the operator OPH_SUBSET
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
-        :param nthreads: number of threads to use
+        :param nthreads: number of threads to use (default is the server default, or the value chosen by Client.tuner)
         :type nthreads: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -4535,12 +4823,14 @@ class Cube():
         :type check_grid: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: new cube or None
         :rtype: Cube or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None:
+        if self.client is None or self.pid is None:
             raise RuntimeError('Cube.client pid is None')
         newcube = None
 
@@ -4576,25 +4866,26 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                if Cube.client.cube:
-                    newcube = Cube(pid=Cube.client.cube)
+            if result.response is not None:
+                if result.cube:
+                    newcube = Cube(pid=result.cube, client=self.client)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
         else:
             return newcube
 
-    def subset2(self, ncores=1, exec_mode='sync', schedule=0, subset_dims='none', subset_filter='all', time_filter='yes', offset=0, grid='-', container='-', description='-',
-                check_grid='no', display=False):
-        """subset2(subset_dims='none', subset_filter='all', grid='-', container='-', ncores=1, exec_mode='sync', schedule=0, time_filter='yes', offset=0, description='-',
-                   check_grid='no', display=False)
+    def subset2(self, ncores=None, exec_mode='sync', schedule=0, subset_dims='none', subset_filter='all', time_filter='yes', offset=0, grid='-', container='-', description='-',
+                check_grid='no', display=False, deadline=None):
+        """subset2(subset_dims='none', subset_filter='all', grid='-', container='-', ncores=None, exec_mode='sync', schedule=0, time_filter='yes', offset=0, description='-',
+                   check_grid='no', display=False, deadline=None)
              -> Cube or None : wrapper of the operator OPH_SUBSET2 (Deprecated since Ophidia v1.1)
 
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
         :param exec_mode: async or sync
         :type exec_mode: str
@@ -4618,12 +4909,14 @@ class Cube():
         :type check_grid: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: new cube or None
         :rtype: Cube or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None:
+        if self.client is None or self.pid is None:
             raise RuntimeError('Cube.client or pid is None')
         newcube = None
 
@@ -4655,20 +4948,21 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display) is None:
+            result = self.client.execute(query, display, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                if Cube.client.cube:
-                    newcube = Cube(pid=Cube.client.cube)
+            if result.response is not None:
+                if result.cube:
+                    newcube = Cube(pid=result.cube, client=self.client)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
         else:
             return newcube
 
-    def to_b2drop(self, cdd=None, auth_path='-', dst_path='-', ncores=1, export_metadata='yes'):
-        """to_b2drop(cdd=None, auth_path='-', dst_path='-', ncores=1, export_metadata='yes')
+    def to_b2drop(self, cdd=None, auth_path='-', dst_path='-', ncores=None, export_metadata='yes', deadline=None):
+        """to_b2drop(cdd=None, auth_path='-', dst_path='-', ncores=None, export_metadata='yes', deadline=None)
           -> dict or None : method that integrates the features of OPH_EXPORTNC2 and OPH_B2DROP operators to upload a cube to B2DROP as a NetCDF file
 
         :param cdd: absolute path corresponding to the current directory on data repository
@@ -4677,46 +4971,50 @@ class Cube():
         :type auth_path: str
         :param dst_path: path where the file will be uploaded on B2DROP
         :type dst_path: str
-        :param ncores: number of cores to use
+        :param ncores: number of cores to use (default is Client.ncores, or the value chosen by Client.tuner)
         :type ncores: int
         :param export_metadata: yes|no
         :type export_metadata: str
         :param display: option for displaying the response in a "pretty way" using the pretty_print function (default is False)
         :type display: bool
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: response or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None:
+        if self.client is None or self.pid is None:
             raise RuntimeError('Cube.client or pid is None')
         response = None
 
         try:
-            self.exportnc2(cdd=cdd, force='yes', output_path='local', export_metadata=export_metadata, ncores=ncores, display=False)
-
-            file_path = ""
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            query = 'oph_exportnc2 exec_mode=sync;output_path=local;force=yes;export_metadata=' + str(export_metadata) + ';'
+            if ncores is not None:
+                query += 'ncores=' + str(ncores) + ';'
+            if cdd is not None:
+                query += 'cdd=' + str(cdd) + ';'
+            query += 'cube=' + str(self.pid) + ';'
+            result = self.client.execute(query, display=False, deadline=deadline)
+            if result is None:
+                raise RuntimeError()
 
-                for response_i in response['response']:
-                    if response_i['objclass'] == 'text' and 'title' in response_i['objcontent'][0] and response_i['objcontent'][0]['title'] == 'Output File':
-                        file_path = response_i["objcontent"][0]["message"]
-                        break
+            file_path = result.index.message('Output File')
 
             if not file_path:
                 raise RuntimeError('Unable to export NetCDF file')
 
-            Cube.b2drop(auth_path=auth_path, src_path=file_path, dst_path=dst_path, cdd='/', display=False)
+            with Cube.using(self.client):
+                Cube.b2drop(auth_path=auth_path, src_path=file_path, dst_path=dst_path, cdd='/', display=False, deadline=deadline)
 
-            Cube.fs(command='rm', dpath=file_path, cdd='/', display=False)
+                Cube.fs(command='rm', dpath=file_path, cdd='/', display=False, deadline=deadline)
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
-    def export_array(self, show_id='no', show_time='no', subset_dims=None, subset_filter=None, time_filter='no'):
-        """export_array(show_id='no', show_time='no', subset_dims=None, subset_filter=None, time_filter='no') -> dict or None : wrapper of the operator OPH_EXPLORECUBE
+    def export_array(self, show_id='no', show_time='no', subset_dims=None, subset_filter=None, time_filter='no', deadline=None):
+        """export_array(show_id='no', show_time='no', subset_dims=None, subset_filter=None, time_filter='no', deadline=None) -> dict or None : wrapper of the operator OPH_EXPLORECUBE
 
         :param show_id: yes|no
         :type show_id: str
@@ -4728,19 +5026,21 @@ class Cube():
         :type subset_filter: str
         :param time_filter: yes|no
         :type time_filter: str
+        :param deadline: maximum number of seconds the request may take (default is no limit)
+        :type deadline: float
         :returns: data_values or None
         :rtype: dict or None
         :raises: RuntimeError
         """
 
-        if Cube.client is None or self.pid is None:
+        if self.client is None or self.pid is None:
             raise RuntimeError('Cube.client or pid is None')
         response = None
 
         try:
             self.info(display=False)
         except Exception as e:
-            print(get_linenumber(), "Something went wrong in instantiating the cube", e)
+            _logger.error("Something went wrong in instantiating the cube: %s", e)
         finally:
             pass
 
@@ -4771,14 +5071,14 @@ class Cube():
         query += 'cube=' + str(self.pid) + ';'
 
         try:
-            if Cube.client.submit(query, display=False) is None:
+            result = self.client.execute(query, display=False, deadline=deadline)
+            if result is None:
                 raise RuntimeError()
 
-            if Cube.client.last_response is not None:
-                response = Cube.client.deserialize_response()
+            index = result.index
 
         except Exception as e:
-            print(get_linenumber(), "Something went wrong:", e)
+            _logger.error("Something went wrong: %s", e)
             raise RuntimeError()
 
         def get_unpack_format(element_num, output_type):
@@ -4812,39 +5112,37 @@ class Cube():
             # Get dimensions
             try:
                 dimensions = []
-                for response_i in response['response']:
-                    if response_i['objkey'] == 'explorecube_dimvalues':
-
-                        for response_j in response_i['objcontent']:
-                            if response_j['title'] and response_j['rowfieldtypes'] and response_j['rowfieldtypes'][1] and response_j['rowvalues']:
-                                curr_dim = {}
-                                curr_dim['name'] = response_j['title']
-
-                                # Append actual values
-                                dim_array = []
-
-                                # Special case for time
-                                if show_time == 'yes' and response_j['title'] == 'time':
-                                    for val in response_j['rowvalues']:
-                                        dims = [s.strip() for s in val[1].split(',')]
-                                        for v in dims:
-                                            dim_array.append(v)
-                                else:
-                                    for val in response_j['rowvalues']:
-                                        decoded_bin = base64.b64decode(val[1])
-                                        length = calculate_decoded_length(decoded_bin, response_j['rowfieldtypes'][1])
-                                        format = get_unpack_format(length, response_j['rowfieldtypes'][1])
-                                        dims = struct.unpack(format, decoded_bin)
-                                        for v in dims:
-                                            dim_array.append(v)
-
-                                curr_dim['values'] = dim_array
-                                dimensions.append(curr_dim)
+                response_i = index.find(objkey='explorecube_dimvalues')
+                if response_i is not None:
 
+                    for response_j in response_i['objcontent']:
+                        if response_j['title'] and response_j['rowfieldtypes'] and response_j['rowfieldtypes'][1] and response_j['rowvalues']:
+                            curr_dim = {}
+                            curr_dim['name'] = response_j['title']
+
+                            # Append actual values
+                            dim_array = []
+
+                            # Special case for time
+                            if show_time == 'yes' and response_j['title'] == 'time':
+                                for val in response_j['rowvalues']:
+                                    dims = [s.strip() for s in val[1].split(',')]
+                                    for v in dims:
+                                        dim_array.append(v)
                             else:
-                                raise RuntimeError("Unable to get dimension name or values in response")
+                                for val in response_j['rowvalues']:
+                                    decoded_bin = base64.b64decode(val[1])
+                                    length = calculate_decoded_length(decoded_bin, response_j['rowfieldtypes'][1])
+                                    format = get_unpack_format(length, response_j['rowfieldtypes'][1])
+                                    dims = struct.unpack(format, decoded_bin)
+                                    for v in dims:
+                                        dim_array.append(v)
 
-                        break
+                            curr_dim['values'] = dim_array
+                            dimensions.append(curr_dim)
+
+                        else:
+                            raise RuntimeError("Unable to get dimension name or values in response")
 
                 dim_num = len(dimensions)
                 if dim_num == 0:
@@ -4853,7 +5151,7 @@ class Cube():
                 data_values["dimension"] = dimensions
 
             except Exception as e:
-                print(get_linenumber(), "Unable to get dimensions from response:", e)
+                _logger.warning("Unable to get dimensions from response: %s", e)
                 return None
         else:
             data_values["measure"] = {}
@@ -4861,51 +5159,49 @@ class Cube():
         # Read values
         try:
             measures = []
-            for response_i in response['response']:
-                if response_i['objkey'] == 'explorecube_data':
-
-                    for response_j in response_i['objcontent']:
-                        if response_j['title'] and response_j['rowkeys'] and response_j['rowfieldtypes'] and response_j['rowvalues']:
-                            curr_mes = {}
-                            measure_name = ""
-                            measure_index = 0
-
-                            if not adimCube:
-                                # Check that implicit dimension is just one
-                                if dim_num - (len(response_j['rowkeys']) - 1) / 2.0 > 1:
-                                    raise RuntimeError("More than one implicit dimension")
-
-                            for i, t in enumerate(response_j['rowkeys']):
-                                if response_j['title'] == t:
-                                    measure_name = t
-                                    measure_index = i
-                                    break
-
-                            if measure_index == 0:
-                                raise RuntimeError("Unable to get measure name in response")
-
-                            curr_mes['name'] = measure_name
-
-                            # Append actual values
-                            measure_value = []
-                            for val in response_j['rowvalues']:
-                                decoded_bin = base64.b64decode(val[measure_index])
-                                length = calculate_decoded_length(decoded_bin, response_j['rowfieldtypes'][measure_index])
-                                format = get_unpack_format(length, response_j['rowfieldtypes'][measure_index])
-                                measure = struct.unpack(format, decoded_bin)
-                                curr_line = []
-                                for v in measure:
-                                    curr_line.append(v)
-
-                                measure_value.append(curr_line)
-
-                            curr_mes['values'] = measure_value
-                            measures.append(curr_mes)
+            response_i = index.find(objkey='explorecube_data')
+            if response_i is not None:
+
+                for response_j in response_i['objcontent']:
+                    if response_j['title'] and response_j['rowkeys'] and response_j['rowfieldtypes'] and response_j['rowvalues']:
+                        curr_mes = {}
+                        measure_name = ""
+                        measure_index = 0
+
+                        if not adimCube:
+                            # Check that implicit dimension is just one
+                            if dim_num - (len(response_j['rowkeys']) - 1) / 2.0 > 1:
+                                raise RuntimeError("More than one implicit dimension")
+
+                        for i, t in enumerate(response_j['rowkeys']):
+                            if response_j['title'] == t:
+                                measure_name = t
+                                measure_index = i
+                                break
+
+                        if measure_index == 0:
+                            raise RuntimeError("Unable to get measure name in response")
+
+                        curr_mes['name'] = measure_name
+
+                        # Append actual values
+                        measure_value = []
+                        for val in response_j['rowvalues']:
+                            decoded_bin = base64.b64decode(val[measure_index])
+                            length = calculate_decoded_length(decoded_bin, response_j['rowfieldtypes'][measure_index])
+                            format = get_unpack_format(length, response_j['rowfieldtypes'][measure_index])
+                            measure = struct.unpack(format, decoded_bin)
+                            curr_line = []
+                            for v in measure:
+                                curr_line.append(v)
+
+                            measure_value.append(curr_line)
+
+                        curr_mes['values'] = measure_value
+                        measures.append(curr_mes)
 
-                        else:
-                            raise RuntimeError("Unable to get measure values in response")
-
-                        break
+                    else:
+                        raise RuntimeError("Unable to get measure values in response")
 
                     break
 
@@ -4916,7 +5212,7 @@ class Cube():
             data_values["measure"] = measures
 
         except Exception as e:
-            print(get_linenumber(), "Unable to get measure from response:", e)
+            _logger.warning("Unable to get measure from response: %s", e)
             return None
         else:
             return data_values
@@ -0,0 +1,252 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import sys
+import os
+import time
+import fnmatch
+import posixpath
+from collections import OrderedDict
+import logging
+import PyOphidia.client as _client
+from PyOphidia.cube import Cube
+from PyOphidia.cache import parse_query
+from PyOphidia.collection import CubeCollection, parallel, run_workflow, task, workflow
+from PyOphidia.tuning import AutoTuner
+sys.path.append(os.path.dirname(__file__))
+
+
+_logger = logging.getLogger(__name__)
+
+if sys.version_info < (3, 0):
+    _string_types = basestring  # noqa: F821
+else:
+    _string_types = str
+
+
+def resolve(src_paths, cdd=None, client=None, deadline=None):
+    """resolve(src_paths, cdd=None, client=None, deadline=None) -> list : Expand the glob patterns in src_paths (a path or a list of paths) with OPH_FS listings
+    of the data repository and return the sorted list of the matching files
+    :param src_paths: paths or glob patterns (e.g. '/data/tas_*.nc'), relative paths refer to cdd
+    :type src_paths: str or list
+    :param cdd: absolute path corresponding to the current directory on data repository
+    :type cdd: str
+    :param client: instance of class Client (default is Cube.active_client())
+    :type client: Client
+    :param deadline: maximum number of seconds each listing may take (default is no limit)
+    :type deadline: float
+    :returns: list of paths
+    :rtype: list
+    :raises: RuntimeError
+    """
+
+    if isinstance(src_paths, _string_types):
+        src_paths = [src_paths]
+    client = client if client is not None else Cube.active_client()
+    paths = []
+    for src_path in src_paths:
+        src_path = str(src_path)
+        if not any(c in src_path for c in '*?['):
+            paths.append(src_path)
+            continue
+        if client is None:
+            raise RuntimeError('Cube.client is None')
+        dpath, pattern = posixpath.split(src_path)
+        query = 'oph_fs command=ls;exec_mode=sync;dpath=' + (dpath or '-') + ';file=' + pattern + ';'
+        if cdd is not None:
+            query += 'cdd=' + str(cdd) + ';'
+        result = client.execute(query, deadline=deadline)
+        if result is None:
+            raise RuntimeError('unable to list ' + src_path)
+        for obj in result.index.find_all(objclass='grid'):
+            for content in obj.get('objcontent', []):
+                keys = [str(key).upper() for key in content.get('rowkeys', [])]
+                column = keys.index('OBJECT') if 'OBJECT' in keys else -1
+                for row in content.get('rowvalues', []):
+                    name = str(row[column]) if row else ''
+                    if name and not name.endswith('/') and fnmatch.fnmatch(posixpath.basename(name), pattern):
+                        paths.append(posixpath.join(dpath, posixpath.basename(name)) if dpath else name)
+    unique = []
+    for path in sorted(paths):
+        if path not in unique:
+            unique.append(path)
+    return unique
+
+
+def _number(value):
+    return int(value) if value is not None and value.isdigit() else None
+
+
+class IngestReport():
+    """IngestReport() -> obj : outcome of a bulk ingestion
+
+    Attributes:
+        files: list of dicts, one per file, with keys 'src_path', 'cube', 'exec_time' (seconds of the import task on the server or None),
+            'size' (MB of the imported cube, measured with OPH_CUBESIZE), 'throughput' (MB/s or None), 'ncores', 'nthreads' and 'nfrag'
+        cubes: CubeCollection of the imported cubes (empty when they have been concatenated)
+        cube: concatenated Cube or None
+        elapsed: total number of seconds (on the client)
+
+    Methods:
+        failed() -> list : Return the paths of the files that could not be imported.
+    """
+
+    def __init__(self):
+        self.files = []
+        self.cubes = None
+        self.cube = None
+        self.elapsed = 0.0
+
+    def failed(self):
+        """failed() -> list : Return the paths of the files that could not be imported
+        :returns: list of paths
+        :rtype: list
+        """
+
+        return [entry['src_path'] for entry in self.files if entry['cube'] is None]
+
+    def __str__(self):
+        lines = ['%-60s %10s %12s  %s' % ('SRC_PATH', 'EXEC_TIME', 'MB/S', 'CUBE')]
+        for entry in self.files:
+            lines.append('%-60s %10s %12s  %s' % (entry['src_path'], '-' if entry['exec_time'] is None else '%.2f' % entry['exec_time'],
+                                                 '-' if entry['throughput'] is None else '%.2f' % entry['throughput'], entry['cube'] or 'FAILED'))
+        lines.append('%d files in %.2f s' % (len(self.files), self.elapsed))
+        return '\n'.join(lines)
+
+
+def ingest(src_paths, measure=None, imp_dim='auto', exp_dim='auto', container='-', cwd=None, cdd=None, operator='oph_importnc2', ncores=None, nthreads=None, nfrag=None,
+           tuner=None, arguments=None, concat=False, fan_in=8, description='-', max_workers=8, client=None, deadline=None):
+    """ingest(src_paths, measure=None, imp_dim='auto', exp_dim='auto', container='-', cwd=None, cdd=None, operator='oph_importnc2', ncores=None, nthreads=None, nfrag=None,
+              tuner=None, arguments=None, concat=False, fan_in=8, description='-', max_workers=8, client=None, deadline=None) -> IngestReport : Import many NetCDF files with a single workflow
+
+    Glob patterns are resolved with OPH_FS listings; all the files are then imported by a single workflow, with a task per file followed by an
+    OPH_CUBESIZE task computing the size of the imported cube. The parallelism arguments left out (ncores, nthreads, nfrag and nhost) are chosen
+    for each task by tuner, which shares the cluster evenly among the imports. The outputs and the execution time of each task are read with
+    OPH_RESUME; since Ophidia reports the size of a cube only through OPH_CUBESCHEMA, the sizes are read with up to max_workers concurrent requests.
+    With concat=True the imported cubes are appended along the implicit dimension (imp_dim, e.g. time) with a tree of OPH_MERGECUBES operations
+    keeping the original dimension values, and the single cubes are deleted.
+
+    :param src_paths: paths or glob patterns of the files (see resolve)
+    :type src_paths: str or list
+    :param measure: name of the measure
+    :type measure: str
+    :param imp_dim: names of implicit dimensions
+    :type imp_dim: str
+    :param exp_dim: names of explicit dimensions
+    :type exp_dim: str
+    :param container: container name
+    :type container: str
+    :param cwd: current working directory
+    :type cwd: str
+    :param cdd: absolute path corresponding to the current directory on data repository
+    :type cdd: str
+    :param operator: oph_importnc|oph_importnc2
+    :type operator: str
+    :param ncores: number of cores of each import (default is the value chosen by tuner)
+    :type ncores: int
+    :param nthreads: number of threads of each import (default is the value chosen by tuner)
+    :type nthreads: int
+    :param nfrag: number of fragments per database of each import (default is the value chosen by tuner)
+    :type nfrag: int
+    :param tuner: AutoTuner choosing the parallelism of each import (default is Client.tuner, or a new AutoTuner)
+    :type tuner: AutoTuner
+    :param arguments: additional arguments of the import operator (e.g. {'ioserver': 'ophidiaio_memory'})
+    :type arguments: dict
+    :param concat: if True, append all the cubes along the implicit dimension
+    :type concat: bool
+    :param fan_in: maximum number of cubes merged by each operation when concat is True
+    :type fan_in: int
+    :param description: additional description to be associated with the output cubes
+    :type description: str
+    :param max_workers: maximum number of concurrent requests
+    :type max_workers: int
+    :param client: instance of class Client (default is Cube.active_client())
+    :type client: Client
+    :param deadline: maximum number of seconds the whole ingestion may take (default is no limit)
+    :type deadline: float
+    :returns: report
+    :rtype: IngestReport
+    :raises: RuntimeError
+    """
+
+    client = client if client is not None else Cube.active_client()
+    if client is None:
+        raise RuntimeError('Cube.client is None')
+    if measure is None:
+        raise RuntimeError('measure is not present')
+    start = time.time()
+    expiry = None if deadline is None else start + float(deadline)
+    paths = resolve(src_paths, cdd, client, deadline)
+    if not paths:
+        raise RuntimeError('no file matches ' + str(src_paths))
+    if tuner is None:
+        tuner = client.tuner if client.tuner is not None else AutoTuner()
+    report = IngestReport()
+    queries = []
+    for path in paths:
+        query = str(operator) + ' exec_mode=sync;measure=' + str(measure) + ';src_path=' + path + ';imp_dim=' + str(imp_dim) + ';exp_dim=' + str(exp_dim) + ';'
+        query += 'container=' + str(container) + ';description=' + str(description) + ';'
+        if cwd is not None:
+            query += 'cwd=' + str(cwd) + ';'
+        if cdd is not None:
+            query += 'cdd=' + str(cdd) + ';'
+        for key, value in list((arguments or {}).items()) + [('ncores', ncores), ('nthreads', nthreads), ('nfrag', nfrag)]:
+            if value is not None:
+                query += str(key) + '=' + str(value) + ';'
+        queries.append(query)
+    try:
+        queries = tuner.tune_all(client, queries)
+    except Exception as e:
+        _logger.warning("Unable to tune the imports: %s", e)
+    tasks = []
+    for i, query in enumerate(queries):
+        tasks.append(task(client, 'import_' + str(i), query))
+        tasks.append(task(client, 'size_' + str(i), 'oph_cubesize byte_unit=MB;', [OrderedDict([('task', 'import_' + str(i)), ('type', 'all'), ('argument', 'cube')])]))
+    result, listed = run_workflow(client, workflow(operator, tasks), deadline=None if expiry is None else max(expiry - time.time(), 0.0))
+    entries = [listed.get('import_' + str(i), {}) for i in range(len(paths))]
+    cubes = [entry['cubes'][-1] if entry.get('cubes') else None for entry in entries]
+    sizes = parallel(lambda pid: tuner.describe(client, pid)['size'] if pid else None, cubes, max_workers)
+    for path, query, entry, cube, size in zip(paths, queries, entries, cubes, sizes):
+        exec_time = entry.get('seconds')
+        # The tuner learns from the imports as from single requests
+        tuner.observe(query, _client.Result(query, None, None, None, 0, None, exec_time, cube, None, None, None, {}) if cube else None)
+        options = parse_query(query)[1]
+        report.files.append({'src_path': path, 'cube': cube, 'exec_time': exec_time, 'size': size,
+                             'throughput': size / exec_time if size is not None and exec_time else None,
+                             'ncores': _number(options.get('ncores')), 'nthreads': _number(options.get('nthreads')), 'nfrag': _number(options.get('nfrag'))})
+    report.cubes = CubeCollection([cube for cube in cubes if cube], client, max_workers)
+    failed = report.failed()
+    if failed:
+        _logger.warning("Unable to import %s", ', '.join(failed))
+    if concat and len(report.cubes) > 0:
+        if failed:
+            # Do not leave behind the cubes of the files imported for the concatenation
+            report.cubes.delete()
+            raise RuntimeError('the files cannot be concatenated since some of them have not been imported')
+        if len(report.cubes) == 1:
+            report.cube = report.cubes[0]
+        else:
+            report.cube = report.cubes.mergecubes(fan_in=fan_in, mode='a', hold_values='yes', ncores=ncores, container=container, description=description,
+                                                  deadline=None if expiry is None else max(expiry - time.time(), 0.0))
+            report.cubes.delete()
+            report.cubes = CubeCollection([], client, max_workers)
+    report.elapsed = time.time() - start
+    return report
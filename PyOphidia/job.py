@@ -0,0 +1,437 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import sys
+import os
+import time
+import threading
+import logging
+try:
+    from concurrent.futures import TimeoutError, CancelledError
+except ImportError:
+    class TimeoutError(Exception):
+        pass
+
+    class CancelledError(Exception):
+        pass
+sys.path.append(os.path.dirname(__file__))
+
+
+_logger = logging.getLogger(__name__)
+
+
+OPH_STATUS_PENDING = 'OPH_STATUS_PENDING'
+OPH_STATUS_RUNNING = 'OPH_STATUS_RUNNING'
+OPH_STATUS_COMPLETED = 'OPH_STATUS_COMPLETED'
+OPH_STATUS_ERROR = 'OPH_STATUS_ERROR'
+OPH_STATUS_ABORTED = 'OPH_STATUS_ABORTED'
+
+TERMINAL_STATUSES = frozenset([OPH_STATUS_COMPLETED, OPH_STATUS_ERROR, OPH_STATUS_ABORTED, 'OPH_STATUS_EXPIRED', 'OPH_STATUS_SKIPPED'])
+
+
+def parse_jobid(jobid):
+    """parse_jobid(jobid) -> tuple : Split a job ID like 'session?workflow#marker' into its session, workflow and marker parts"""
+
+    session, workflow_id, marker_id = jobid, None, None
+    if '?' in jobid:
+        session, workflow_id = jobid.split('?', 1)
+        if '#' in workflow_id:
+            workflow_id, marker_id = workflow_id.split('#', 1)
+    return session, workflow_id, marker_id
+
+
+class Job():
+    """Job(client, jobid, deadline=None) -> obj : handle of an asynchronous Ophidia job, with the same interface as concurrent.futures.Future
+
+    Attributes:
+        client: Client used to submit the job
+        jobid: Job ID returned by the server
+        session: session the job belongs to
+        workflow_id: workflow identifier inside the session
+        status: last known status of the job
+        progress: last known progress rate of the job (between 0 and 1)
+        deadline: absolute time (as given by time.time()) after which the job is cancelled, or None
+
+    Methods:
+        done() -> bool : Return True if the job is completed, failed or cancelled.
+        running() -> bool : Return True if the job is still being executed.
+        cancelled() -> bool : Return True if the job was cancelled.
+        cancel() -> bool : Cancel the job on the server with OPH_CANCEL.
+        result(timeout=None) -> Cube or None : Wait for the job and return its output cube.
+        exception(timeout=None) -> Exception or None : Wait for the job and return the error it raised, if any.
+        add_done_callback(fn) -> None : Call fn(job) once the job is done.
+    """
+
+    def __init__(self, client, jobid, deadline=None):
+        """Job(client, jobid, deadline=None) -> obj
+        :param client: Client used to submit the job
+        :type client: Client
+        :param jobid: Job ID returned by the server
+        :type jobid: str
+        :param deadline: absolute time (as given by time.time()) after which the job is cancelled (default is no limit)
+        :type deadline: float
+        :returns: None
+        :rtype: None
+        """
+
+        self.client = client
+        self.jobid = jobid
+        self.session, self.workflow_id, self.marker_id = parse_jobid(jobid)
+        self.status = OPH_STATUS_PENDING
+        self.progress = 0.0
+        self.deadline = deadline
+        self._result = None
+        self._exception = None
+        self._cancelled = False
+        self._callbacks = []
+        self._condition = threading.Condition()
+        self._event = threading.Event()
+
+    def __repr__(self):
+        return "<Job %s: %s>" % (self.jobid, self.status)
+
+    def done(self):
+        return self._event.is_set()
+
+    def running(self):
+        return not self._event.is_set() and self.status == OPH_STATUS_RUNNING
+
+    def cancelled(self):
+        return self._cancelled
+
+    def cancel(self):
+        """cancel() -> bool : Cancel the job on the server with OPH_CANCEL
+        :returns: True if the job has been cancelled, False if it was already done
+        :rtype: bool
+        """
+
+        if self.done() or not self._kill():
+            return False
+        self._cancelled = True
+        self._finish(OPH_STATUS_ABORTED, exception=CancelledError(self.jobid))
+        return True
+
+    def _kill(self):
+        try:
+            self.client._query('oph_cancel id=' + str(self.workflow_id) + ';type=kill;sessionid=' + str(self.session) + ';')
+        except Exception as e:
+            _logger.error("Something went wrong in cancelling the job: %s", e)
+            return False
+        return True
+
+    def result(self, timeout=None):
+        """result(timeout=None) -> Cube or None : Wait for the job and return its output cube
+        :param timeout: maximum number of seconds to wait (default is no limit)
+        :type timeout: float
+        :returns: output cube or None
+        :rtype: Cube or None
+        :raises: TimeoutError, CancelledError, RuntimeError
+        """
+
+        if not self._event.wait(timeout):
+            raise TimeoutError(self.jobid)
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+    def exception(self, timeout=None):
+        """exception(timeout=None) -> Exception or None : Wait for the job and return the error it raised, if any
+        :param timeout: maximum number of seconds to wait (default is no limit)
+        :type timeout: float
+        :returns: error or None
+        :rtype: Exception or None
+        :raises: TimeoutError
+        """
+
+        if not self._event.wait(timeout):
+            raise TimeoutError(self.jobid)
+        return self._exception
+
+    def add_done_callback(self, fn):
+        """add_done_callback(fn) -> None : Call fn(job) once the job is done, immediately if it is already done
+        :param fn: callable taking the job as its only argument
+        :type fn: callable
+        :returns: None
+        :rtype: None
+        """
+
+        with self._condition:
+            if not self._event.is_set():
+                self._callbacks.append(fn)
+                return
+        self._invoke(fn)
+
+    def _invoke(self, fn):
+        try:
+            fn(self)
+        except Exception as e:
+            _logger.error("Something went wrong in the job callback: %s", e)
+
+    def _finish(self, status, result=None, exception=None):
+        with self._condition:
+            if self._event.is_set():
+                return
+            self.status = status
+            self._result = result
+            self._exception = exception
+            callbacks, self._callbacks = self._callbacks, []
+            self._event.set()
+        for fn in callbacks:
+            self._invoke(fn)
+
+
+class JobPoller():
+    """JobPoller(client, min_interval=0.5, max_interval=30.0, factor=2.0) -> obj : background thread resolving asynchronous jobs
+
+    Each job is polled with OPH_RESUME on its own schedule: the interval grows exponentially while the job makes no progress
+    and shrinks towards the estimated time to completion when it does. Completed jobs are resolved to their output Cube,
+    while jobs still running at their deadline are cancelled with OPH_CANCEL and fail with TimeoutError.
+
+    Methods:
+        add(job) -> Job : Start monitoring a job.
+        poll_now(job) -> None : Schedule the job for an immediate status check.
+        outstanding() -> int : Return the number of jobs still monitored.
+        stop() -> None : Stop the background thread.
+    """
+
+    def __init__(self, client, min_interval=0.5, max_interval=30.0, factor=2.0):
+        """JobPoller(client, min_interval=0.5, max_interval=30.0, factor=2.0) -> obj
+        :param client: Client used to query the jobs
+        :type client: Client
+        :param min_interval: minimum number of seconds between two checks of the same job
+        :type min_interval: float
+        :param max_interval: maximum number of seconds between two checks of the same job
+        :type max_interval: float
+        :param factor: growth factor of the interval while a job makes no progress
+        :type factor: float
+        :returns: None
+        :rtype: None
+        """
+
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.factor = factor
+        self._jobs = {}
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+    def add(self, job):
+        """add(job) -> Job : Start monitoring a job
+        :param job: job to be monitored
+        :type job: Job
+        :returns: the same job
+        :rtype: Job
+        """
+
+        with self._condition:
+            self._jobs[job.jobid] = {'job': job, 'due': time.time() + self.min_interval, 'interval': self.min_interval, 'start': time.time()}
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped = False
+                self._thread = threading.Thread(target=self._run, name='PyOphidia-JobPoller')
+                self._thread.daemon = True
+                self._thread.start()
+            self._condition.notify()
+        return job
+
+    def poll_now(self, job):
+        """poll_now(job) -> None : Schedule the job for an immediate status check
+        :param job: job to be checked
+        :type job: Job
+        :returns: None
+        :rtype: None
+        """
+
+        with self._condition:
+            if job.jobid in self._jobs:
+                self._jobs[job.jobid]['due'] = 0
+                self._condition.notify()
+
+    def outstanding(self):
+        """outstanding() -> int : Return the number of jobs still monitored
+        :returns: number of jobs
+        :rtype: int
+        """
+
+        with self._condition:
+            return len(self._jobs)
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    now = time.time()
+                    expired = [entry for entry in self._jobs.values() if entry['job'].deadline is not None and entry['job'].deadline <= now]
+                    due = [entry for entry in self._jobs.values() if entry['due'] <= now and (entry['job'].deadline is None or entry['job'].deadline > now)]
+                    if due or expired:
+                        break
+                    if self._jobs:
+                        self._condition.wait(min(min(entry['due'], entry['job'].deadline or entry['due']) for entry in self._jobs.values()) - now)
+                    else:
+                        self._condition.wait()
+                if self._stopped:
+                    return
+            self._expire(expired)
+            if due:
+                self._poll(due)
+
+    def _poll(self, entries):
+        for entry in entries:
+            self._check(entry)
+
+    def _check(self, entry):
+        job = entry['job']
+        if job.done():
+            self._forget(job)
+            return
+        try:
+            status, progress = self.client._job_status(job)
+        except Exception as e:
+            _logger.error("Something went wrong in polling the job: %s", e)
+            self._reschedule(entry, job.progress)
+            return
+        self._update(entry, status, progress)
+
+    def _update(self, entry, status, progress):
+        job = entry['job']
+        if status in TERMINAL_STATUSES:
+            self._forget(job)
+            self._resolve(job, status)
+            return
+        if status is not None:
+            job.status = status
+        self._reschedule(entry, progress)
+
+    def _reschedule(self, entry, progress):
+        job = entry['job']
+        now = time.time()
+        if progress is not None and progress > job.progress:
+            # Aim at half of the estimated remaining time
+            elapsed = now - entry['start']
+            remaining = elapsed * (1.0 - progress) / progress
+            interval = remaining / 2
+            job.progress = progress
+        else:
+            interval = entry['interval'] * self.factor
+        entry['interval'] = max(self.min_interval, min(self.max_interval, interval))
+        with self._condition:
+            entry['due'] = now + entry['interval']
+
+    def _expire(self, entries):
+        for entry in entries:
+            job = entry['job']
+            self._forget(job)
+            if not job.done():
+                job._kill()
+                job._finish(OPH_STATUS_ABORTED, exception=TimeoutError("Deadline of job " + job.jobid + " expired"))
+
+    def _forget(self, job):
+        with self._condition:
+            self._jobs.pop(job.jobid, None)
+
+    def _resolve(self, job, status):
+        if status != OPH_STATUS_COMPLETED:
+            job._finish(status, exception=RuntimeError("Job " + job.jobid + " ended with status " + str(status)))
+            return
+        job.progress = 1.0
+        try:
+            job._finish(status, result=self.client._job_output(job))
+        except Exception as e:
+            job._finish(OPH_STATUS_ERROR, exception=e)
+
+
+class JobMonitor(JobPoller):
+    """JobMonitor(client, min_interval=0.5, max_interval=30.0, factor=2.0, status_filter='11100000') -> obj : background thread resolving many asynchronous jobs
+
+    At each tick the status of all the outstanding jobs of a session is fetched with a single OPH_RESUME listing filtered with
+    status_filter, so that the polling cost does not depend on the number of jobs. Only the jobs that left the listing
+    are queried individually, once, to get their final status and output. The tick interval grows exponentially while
+    nothing changes and is reset to min_interval as soon as a job changes state.
+
+    Methods:
+        add(job) -> Job : Start monitoring a job.
+        poll_now(job) -> None : Schedule an immediate status check.
+        stop() -> None : Stop the background thread.
+    """
+
+    def __init__(self, client, min_interval=0.5, max_interval=30.0, factor=2.0, status_filter='11100000'):
+        """JobMonitor(client, min_interval=0.5, max_interval=30.0, factor=2.0, status_filter='11100000') -> obj
+        :param client: Client used to query the jobs
+        :type client: Client
+        :param min_interval: minimum number of seconds between two ticks
+        :type min_interval: float
+        :param max_interval: maximum number of seconds between two ticks
+        :type max_interval: float
+        :param factor: growth factor of the interval while no job changes state
+        :type factor: float
+        :param status_filter: OPH_RESUME status bitmap selecting the jobs still pending or running
+        :type status_filter: str
+        :returns: None
+        :rtype: None
+        """
+
+        JobPoller.__init__(self, client, min_interval=min_interval, max_interval=max_interval, factor=factor)
+        self.status_filter = status_filter
+        self._interval = min_interval
+
+    def _poll(self, entries):
+        with self._condition:
+            sessions = {}
+            for entry in self._jobs.values():
+                sessions.setdefault(entry['job'].session, []).append(entry)
+        due = set(id(entry) for entry in entries)
+        changed = False
+        for session, session_entries in sessions.items():
+            try:
+                active = self.client._active_jobs(session, self.status_filter)
+            except Exception as e:
+                _logger.error("Something went wrong in listing the jobs: %s", e)
+                active = None
+            if active is None:
+                # Listing not available: fall back to one request per due job
+                for entry in session_entries:
+                    if id(entry) in due:
+                        self._check(entry)
+                continue
+            for entry in session_entries:
+                job = entry['job']
+                if job.workflow_id in active:
+                    status = active[job.workflow_id]
+                    if status and status != job.status:
+                        job.status = status
+                        changed = True
+                else:
+                    changed = True
+                    self._check(entry)
+        if changed:
+            self._interval = self.min_interval
+        else:
+            self._interval = min(self.max_interval, self._interval * self.factor)
+        with self._condition:
+            due = time.time() + self._interval
+            for entry in self._jobs.values():
+                entry['due'] = due
@@ -0,0 +1,304 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import sys
+import os
+import re
+import json
+import threading
+from collections import OrderedDict
+import logging
+try:
+    import contextvars
+except ImportError:
+    contextvars = None
+sys.path.append(os.path.dirname(__file__))
+
+
+_logger = logging.getLogger(__name__)
+
+
+_PID = re.compile(r'https?://[^\s;"\'|,\]]+/[0-9]+/[0-9]+')
+
+_UNITS = {'B': 0, 'BYTE': 0, 'KB': 1, 'MB': 2, 'GB': 3, 'TB': 4, 'PB': 5}
+
+# Stack of the open CubeLifecycle scopes: a context variable when available (as for Cube.using), a thread-local otherwise
+if contextvars is not None:
+    _scopes = contextvars.ContextVar('PyOphidia_lifecycle', default=())
+else:
+    _scopes = threading.local()
+
+
+def _active_scopes():
+    if contextvars is not None:
+        return _scopes.get()
+    return getattr(_scopes, 'stack', ())
+
+
+def _set_scopes(stack):
+    if contextvars is not None:
+        _scopes.set(stack)
+    else:
+        _scopes.stack = stack
+
+
+def active():
+    """active() -> bool : Return True if a CubeLifecycle scope is open in the current thread (or asyncio task)"""
+
+    return len(_active_scopes()) > 0
+
+
+def observe(client, query, output=None):
+    """observe(client, query, output=None) -> None : Notify the innermost open scope of a request that used the cubes in query and produced output"""
+
+    stack = _active_scopes()
+    if not stack:
+        return
+    scope = stack[-1]
+    scope._used(_PID.findall(str(query)))
+    if output:
+        for pid in str(output).split('|'):
+            if pid.strip():
+                scope._created(client, pid.strip())
+
+
+def massive_filter(pids):
+    """massive_filter(pids) -> str : Return the filter of a massive operation selecting the given cubes of a server in any folder of the session"""
+
+    # Cube identifiers are unique on a server, so the whole virtual file system can be searched
+    return '[path=/;recursive=yes;cube_filter=' + ','.join(pid.rpartition('/')[2] for pid in pids) + ']'
+
+
+def _convert(size, unit, byte_unit):
+    return float(size) * 1024 ** (_UNITS.get(str(unit).upper(), 0) - _UNITS.get(str(byte_unit).upper(), 0))
+
+
+def _request(client, query):
+    # Housekeeping requests do not change the state of client nor fire its hooks, metrics and telemetry
+    if client.session:
+        query += 'sessionid=' + client.session + ';'
+    try:
+        response, jobid, newsession, return_value, error = client._coalesced_transport(query)
+    except Exception as e:
+        _logger.warning("Something went wrong in submitting the request: %s", e)
+        return False
+    return not return_value and error is None
+
+
+def measure(client, pid, byte_unit='MB'):
+    """measure(client, pid, byte_unit='MB') -> float or None : Return the size of a cube computed with OPH_CUBESIZE, without changing the state of client"""
+
+    # Compute the size with OPH_CUBESIZE, then read it from the cube schema as Cube.info does
+    suffix = 'cube=' + pid + ';' + ('sessionid=' + client.session + ';' if client.session else '')
+    try:
+        client._coalesced_transport('oph_cubesize exec_mode=sync;byte_unit=' + str(byte_unit) + ';' + suffix)
+        response, jobid, newsession, return_value, error = client._coalesced_transport('oph_cubeschema exec_mode=sync;level=0;' + suffix)
+        if not return_value and response is not None:
+            for obj in json.loads(response).get('response', []):
+                if obj.get('objkey') == 'cubeschema_morecubeinfo':
+                    row = obj['objcontent'][0]['rowvalues'][0]
+                    return _convert(row[6], row[7], byte_unit)
+    except Exception as e:
+        _logger.warning("Unable to measure the size of %s: %s", pid, e)
+    return None
+
+
+def describe(client, pid, byte_unit='MB'):
+    """describe(client, pid, byte_unit='MB') -> dict : Return size (in byte_unit), nfragments, fragxdb and hostxcube of a cube (None if unknown),
+    read from OPH_CUBESCHEMA after computing the size with OPH_CUBESIZE if needed, without changing the state of client"""
+
+    facts = {'size': None, 'nfragments': None, 'fragxdb': None, 'hostxcube': None}
+    suffix = 'cube=' + pid + ';' + ('sessionid=' + client.session + ';' if client.session else '')
+    try:
+        for attempt in range(2):
+            response, jobid, newsession, return_value, error = client._coalesced_transport('oph_cubeschema exec_mode=sync;level=0;' + suffix)
+            if return_value or response is None:
+                break
+            for obj in json.loads(response).get('response', []):
+                if obj.get('objkey') == 'cubeschema_cubeinfo':
+                    facts['nfragments'] = int(obj['objcontent'][0]['rowvalues'][0][5])
+                elif obj.get('objkey') == 'cubeschema_morecubeinfo':
+                    row = obj['objcontent'][0]['rowvalues'][0]
+                    facts['hostxcube'] = int(row[1])
+                    facts['fragxdb'] = int(row[2])
+                    try:
+                        facts['size'] = _convert(row[6], row[7], byte_unit)
+                    except ValueError:
+                        pass
+            if facts['size'] is not None or attempt:
+                break
+            # The size is known only after OPH_CUBESIZE has been executed on the cube
+            client._coalesced_transport('oph_cubesize exec_mode=sync;byte_unit=' + str(byte_unit) + ';' + suffix)
+    except Exception as e:
+        _logger.warning("Unable to describe %s: %s", pid, e)
+    return facts
+
+
+class CubeLifecycle():
+    """CubeLifecycle(nthreads=1, quota=None, byte_unit='MB') -> obj : scope deleting the intermediate cubes created within it
+
+    Used as a context manager, it tracks all the cubes produced by the requests submitted in the current thread (or asyncio task) while it is open.
+    On exit, the cubes that have not been retained are deleted with one massive OPH_DELETE per server; a cube is reported as deleted only once
+    OPH_CUBESCHEMA confirms it is gone, the others being deleted one by one. These requests do not change the state of the client. When quota
+    is set, the size of each new cube is measured with OPH_CUBESIZE and, whenever the tracked cubes exceed the quota, the least recently used
+    ones are evicted.
+    Scopes can be nested: cubes are tracked by the innermost one and retained cubes are never deleted.
+
+    Example:
+        with CubeLifecycle(nthreads=4) as scope:
+            result = cube.subset(subset_dims='lat', subset_filter='1:10').reduce(operation='avg')
+            scope.retain(result)
+
+    Attributes:
+        nthreads: number of threads of the OPH_DELETE requests
+        quota: maximum size of the tracked cubes (in byte_unit) or None
+        byte_unit: unit of quota and sizes
+        cubes: PIDs of the tracked cubes, from the least to the most recently used
+        sizes: dict mapping each tracked cube to its size (quota mode only)
+        retained: set of the retained PIDs
+        deleted: list of the PIDs deleted by the scope
+
+    Methods:
+        retain(*cubes) -> self : Keep the given cubes (Cube objects or PIDs) when the scope is closed.
+        release() -> list : Delete all the tracked cubes that have not been retained.
+        usage() -> float : Return the size of the tracked cubes (quota mode only).
+    """
+
+    def __init__(self, nthreads=1, quota=None, byte_unit='MB'):
+        """CubeLifecycle(nthreads=1, quota=None, byte_unit='MB') -> obj
+        :param nthreads: number of threads of the OPH_DELETE requests
+        :type nthreads: int
+        :param quota: maximum size of the tracked cubes, in byte_unit (default is no limit)
+        :type quota: float
+        :param byte_unit: KB|MB|GB|TB|PB
+        :type byte_unit: str
+        :returns: None
+        :rtype: None
+        """
+
+        self.nthreads = nthreads
+        self.quota = quota
+        self.byte_unit = byte_unit
+        self.sizes = {}
+        self.retained = set()
+        self.deleted = []
+        self._cubes = OrderedDict()
+        self._lock = threading.RLock()
+
+    @property
+    def cubes(self):
+        with self._lock:
+            return list(self._cubes.keys())
+
+    def __enter__(self):
+        _set_scopes(_active_scopes() + (self,))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _set_scopes(tuple(scope for scope in _active_scopes() if scope is not self))
+        self.release()
+        return False
+
+    def retain(self, *cubes):
+        """retain(*cubes) -> self : Keep the given cubes when the scope is closed
+        :param cubes: Cube objects or PIDs
+        :type cubes: Cube or str
+        :returns: self
+        :rtype: CubeLifecycle
+        """
+
+        with self._lock:
+            for cube in cubes:
+                self.retained.add(str(getattr(cube, 'pid', cube)))
+        return self
+
+    def release(self):
+        """release() -> list : Delete all the tracked cubes that have not been retained
+        :returns: PIDs of the deleted cubes
+        :rtype: list
+        """
+
+        with self._lock:
+            victims = [(pid, client) for pid, client in self._cubes.items() if pid not in self.retained]
+        return self._delete(victims)
+
+    def usage(self):
+        """usage() -> float : Return the size of the tracked cubes, in byte_unit (quota mode only)
+        :returns: size
+        :rtype: float
+        """
+
+        with self._lock:
+            return sum(size for pid, size in self.sizes.items() if pid in self._cubes)
+
+    def _used(self, pids):
+        with self._lock:
+            for pid in pids:
+                client = self._cubes.pop(pid, None)
+                if client is not None:
+                    self._cubes[pid] = client
+
+    def _created(self, client, pid):
+        with self._lock:
+            self._cubes.pop(pid, None)
+            self._cubes[pid] = client
+        if self.quota is None:
+            return
+        self.sizes[pid] = measure(client, pid, self.byte_unit) or 0.0
+        victims = []
+        with self._lock:
+            excess = self.usage() - float(self.quota)
+            for candidate, candidate_client in self._cubes.items():
+                if excess <= 0:
+                    break
+                if candidate == pid or candidate in self.retained:
+                    continue
+                victims.append((candidate, candidate_client))
+                excess -= self.sizes.get(candidate, 0.0)
+        if victims:
+            self._delete(victims)
+
+    def _delete(self, victims):
+        groups = OrderedDict()
+        for pid, client in victims:
+            server = pid.rpartition('/')[0].rpartition('/')[0]
+            groups.setdefault((id(client), server), (client, []))[1].append(pid)
+        deleted = []
+        for client, pids in groups.values():
+            remaining = pids
+            if len(pids) > 1 and _request(client, 'oph_delete exec_mode=sync;nthreads=' + str(self.nthreads) + ';cube=' + massive_filter(pids) + ';'):
+                # The massive operation succeeds even when some cubes are not matched: check which ones are still there
+                remaining = [pid for pid in pids if _request(client, 'oph_cubeschema exec_mode=sync;level=0;cube=' + pid + ';')]
+                deleted.extend(pid for pid in pids if pid not in remaining)
+            # Single deletions for the cubes not removed by the massive operation
+            deleted.extend(pid for pid in remaining if _request(client, 'oph_delete exec_mode=sync;nthreads=' + str(self.nthreads) + ';cube=' + pid + ';'))
+        confirmed = set(deleted)
+        for pid, client in victims:
+            if pid in confirmed:
+                memo = getattr(client, 'memo', None)
+                if memo is not None:
+                    memo.forget(pid)
+        with self._lock:
+            for pid in deleted:
+                self._cubes.pop(pid, None)
+                self.sizes.pop(pid, None)
+            self.deleted.extend(deleted)
+        return deleted
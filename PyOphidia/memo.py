@@ -0,0 +1,190 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import sys
+import os
+import json
+import threading
+from collections import OrderedDict
+import logging
+from PyOphidia.cache import parse_query
+sys.path.append(os.path.dirname(__file__))
+
+
+_logger = logging.getLogger(__name__)
+
+
+# Arguments affecting how an operation is executed, but not its output
+EXECUTION_ARGUMENTS = frozenset(['sessionid', 'exec_mode', 'ncores', 'nthreads', 'host_partition', 'schedule'])
+
+
+class OperationMemo():
+    """OperationMemo(operators=None, maxsize=1024, path=None) -> obj : memo of the cubes produced by deterministic operators
+
+    Each successful synchronous execution of one of the operators is recorded with its input cubes and its normalized arguments. When the same operation
+    is submitted again, the Client checks with OPH_CUBESCHEMA that the recorded output cube still exists and returns it instead of computing a new one.
+    Cubes deleted with OPH_DELETE through the Client are forgotten. When path is given the memo is loaded from that JSON file and saved to it on every
+    change, so that repeated pipelines reuse the cubes produced by previous runs.
+
+    Attributes:
+        operators: set of memoized operators
+        maxsize: maximum number of recorded operations
+        path: JSON file the memo is persisted to or None
+        hits: number of operations answered with an existing cube
+
+    Methods:
+        key(query, scope='') -> str or None : Return the key of a memoizable query or None.
+        lookup(key) -> str or None : Return the PID of the cube recorded for key or None.
+        record(key, pid) -> self : Record the output cube of an operation.
+        forget(pid) -> int : Drop the operations whose output is the given cube.
+        invalidate() -> int : Drop all the recorded operations.
+        save() -> self : Write the memo to path.
+    """
+
+    DEFAULT_OPERATORS = frozenset(['oph_aggregate', 'oph_aggregate2', 'oph_apply', 'oph_drilldown', 'oph_intercube', 'oph_merge', 'oph_mergecubes',
+                                   'oph_mergecubes2', 'oph_permute', 'oph_reduce', 'oph_reduce2', 'oph_rollup', 'oph_subset', 'oph_subset2'])
+
+    def __init__(self, operators=None, maxsize=1024, path=None):
+        """OperationMemo(operators=None, maxsize=1024, path=None) -> obj
+        :param operators: operators whose output can be reused (default is DEFAULT_OPERATORS)
+        :type operators: set
+        :param maxsize: maximum number of recorded operations
+        :type maxsize: int
+        :param path: JSON file the memo is persisted to (default is memory only)
+        :type path: str
+        :returns: None
+        :rtype: None
+        """
+
+        self.operators = set(OperationMemo.DEFAULT_OPERATORS if operators is None else [operator.lower() for operator in operators])
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if path and os.path.isfile(path):
+            try:
+                with open(path, 'r') as f:
+                    for key, pid in json.load(f):
+                        self._entries[key] = pid
+            except (IOError, OSError, ValueError) as e:
+                _logger.warning("Unable to load the operation memo: %s", e)
+
+    def key(self, query, scope=''):
+        """key(query, scope='') -> str or None : Return the key of a memoizable query or None
+        :param query: query like 'operator=myoperator;param1=value1;' or 'myoperator param1=value1;'
+        :type query: str
+        :param scope: string identifying the server and the user the query is submitted to
+        :type scope: str
+        :returns: key or None
+        :rtype: str or None
+        """
+
+        operator, arguments = parse_query(query)
+        if operator not in self.operators or arguments.get('exec_mode', 'sync').lower() == 'async':
+            return None
+        normalized = ';'.join(key + '=' + arguments[key] for key in sorted(arguments) if key not in EXECUTION_ARGUMENTS)
+        return scope + '|' + operator + ' ' + normalized
+
+    def lookup(self, key):
+        """lookup(key) -> str or None : Return the PID of the cube recorded for key or None
+        :param key: key returned by the key method
+        :type key: str
+        :returns: PID or None
+        :rtype: str or None
+        """
+
+        with self._lock:
+            pid = self._entries.pop(key, None)
+            if pid is not None:
+                self._entries[key] = pid
+            return pid
+
+    def record(self, key, pid):
+        """record(key, pid) -> self : Record the output cube of an operation
+        :param key: key returned by the key method
+        :type key: str
+        :param pid: PID of the output cube
+        :type pid: str
+        :returns: self
+        :rtype: OperationMemo
+        """
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = pid
+            while len(self._entries) > max(self.maxsize, 0):
+                self._entries.popitem(last=False)
+        if self.path:
+            self.save()
+        return self
+
+    def forget(self, pid):
+        """forget(pid) -> int : Drop the operations whose output is the given cube
+        :param pid: PID of the cube
+        :type pid: str
+        :returns: number of dropped operations
+        :rtype: int
+        """
+
+        with self._lock:
+            keys = [key for key, value in self._entries.items() if value == pid]
+            for key in keys:
+                del self._entries[key]
+        if keys and self.path:
+            self.save()
+        return len(keys)
+
+    def invalidate(self):
+        """invalidate() -> int : Drop all the recorded operations
+        :returns: number of dropped operations
+        :rtype: int
+        """
+
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+        if self.path:
+            self.save()
+        return count
+
+    def save(self):
+        """save() -> self : Write the memo to path
+        :returns: self
+        :rtype: OperationMemo
+        :raises: RuntimeError
+        """
+
+        if not self.path:
+            raise RuntimeError('path is not set')
+        with self._lock:
+            entries = [[key, pid] for key, pid in self._entries.items()]
+        temporary = self.path + '.tmp'
+        try:
+            with open(temporary, 'w') as f:
+                json.dump(entries, f)
+            if hasattr(os, 'replace'):
+                os.replace(temporary, self.path)
+            else:
+                os.rename(temporary, self.path)
+        except (IOError, OSError) as e:
+            _logger.warning("Unable to save the operation memo: %s", e)
+        return self
@@ -0,0 +1,431 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import sys
+import os
+import math
+import threading
+import weakref
+import logging
+import PyOphidia.ophsubmit as _ophsubmit
+from PyOphidia.cache import parse_query
+if sys.version_info < (3, 0):
+    import BaseHTTPServer as _http_server
+    import SocketServer as _socketserver
+else:
+    import http.server as _http_server
+    import socketserver as _socketserver
+sys.path.append(os.path.dirname(__file__))
+
+
+_logger = logging.getLogger(__name__)
+
+
+# Default latency buckets (seconds), extended beyond the usual web service values since operators can run for minutes
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Names of the OPH_SERVER_* return values
+_CODES = dict((getattr(_ophsubmit, name), name) for name in dir(_ophsubmit) if name.startswith('OPH_SERVER_'))
+
+
+def _format(value):
+    value = float(value)
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if math.isnan(value):
+        return 'NaN'
+    return repr(value)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + (extra or [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(name + '="' + _escape(value) + '"' for name, value in pairs) + '}'
+
+
+class Metric():
+    """Metric(name, documentation, labelnames=()) -> obj : base class of the metrics of a MetricsRegistry"""
+
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise RuntimeError('labels of ' + self.name + ' must be ' + ', '.join(self.labelnames))
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        """samples() -> list : Return the (suffix, label string, value) tuples of the metric"""
+
+        with self._lock:
+            return [('', _labels(self.labelnames, key), value) for key, value in sorted(self._values.items())]
+
+    def render(self):
+        """render() -> str : Return the metric in the Prometheus text exposition format"""
+
+        lines = ['# HELP ' + self.name + ' ' + self.documentation.replace('\\', '\\\\').replace('\n', '\\n'), '# TYPE ' + self.name + ' ' + self.kind]
+        for suffix, labels, value in self.samples():
+            lines.append(self.name + suffix + labels + ' ' + _format(value))
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    """Counter(name, documentation, labelnames=()) -> obj : monotonically increasing value"""
+
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        """inc(amount=1, **labels) -> None : Increase the counter of the given labels"""
+
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        """value(**labels) -> float : Return the counter of the given labels"""
+
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(Metric):
+    """Gauge(name, documentation, labelnames=(), function=None) -> obj : value that can go up and down, or computed by function when rendered"""
+
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(), function=None):
+        Metric.__init__(self, name, documentation, labelnames)
+        self.function = function
+
+    def set(self, value, **labels):
+        """set(value, **labels) -> None : Set the gauge of the given labels"""
+
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        """inc(amount=1, **labels) -> None : Increase the gauge of the given labels"""
+
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        """dec(amount=1, **labels) -> None : Decrease the gauge of the given labels"""
+
+        self.inc(-amount, **labels)
+
+    def value(self, **labels):
+        """value(**labels) -> float : Return the gauge of the given labels"""
+
+        if self.function is not None and not labels:
+            return self.function()
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        if self.function is not None:
+            try:
+                return [('', '', self.function())]
+            except Exception as e:
+                _logger.warning("Unable to compute %s: %s", self.name, e)
+                return []
+        return Metric.samples(self)
+
+
+class Histogram(Metric):
+    """Histogram(name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS) -> obj : distribution of observed values in cumulative buckets"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        Metric.__init__(self, name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+
+    def observe(self, value, **labels):
+        """observe(value, **labels) -> None : Add a value to the histogram of the given labels"""
+
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            bucket = 0
+            while bucket < len(self.buckets) and value > self.buckets[bucket]:
+                bucket += 1
+            counts[bucket] += 1
+            self._values[key] = (counts, total + value)
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            entries = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        for key, (counts, total) in entries:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                samples.append(('_bucket', _labels(self.labelnames, key, [('le', _format(bound))]), cumulative))
+            samples.append(('_sum', _labels(self.labelnames, key), total))
+            samples.append(('_count', _labels(self.labelnames, key), cumulative))
+        return samples
+
+
+class _MetricsHandler(_http_server.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        body = self.server.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _ThreadingHTTPServer(_socketserver.ThreadingMixIn, _http_server.HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class MetricsRegistry():
+    """MetricsRegistry() -> obj : set of metrics rendered in the Prometheus text exposition format
+
+    Attributes:
+        url: URL the metrics are served at, or None if serve has not been called
+
+    Methods:
+        counter(name, documentation, labelnames=()) -> Counter : Register a counter.
+        gauge(name, documentation, labelnames=(), function=None) -> Gauge : Register a gauge.
+        histogram(name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram : Register a histogram.
+        render() -> str : Return all the metrics in the Prometheus text exposition format.
+        serve(host='127.0.0.1', port=0) -> str : Serve the metrics over HTTP from a background thread and return their URL.
+        close() -> None : Stop the HTTP listener.
+    """
+
+    def __init__(self):
+        self.url = None
+        self._metrics = []
+        self._server = None
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            if any(other.name == metric.name for other in self._metrics):
+                raise RuntimeError('metric ' + metric.name + ' is already registered')
+            self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        """counter(name, documentation, labelnames=()) -> Counter : Register a counter
+        :param name: metric name
+        :type name: str
+        :param documentation: help text
+        :type documentation: str
+        :param labelnames: names of the labels
+        :type labelnames: tuple
+        :returns: counter
+        :rtype: Counter
+        :raises: RuntimeError
+        """
+
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=(), function=None):
+        """gauge(name, documentation, labelnames=(), function=None) -> Gauge : Register a gauge
+        :param name: metric name
+        :type name: str
+        :param documentation: help text
+        :type documentation: str
+        :param labelnames: names of the labels
+        :type labelnames: tuple
+        :param function: callable returning the value when the metrics are rendered (unlabelled gauges only)
+        :type function: callable
+        :returns: gauge
+        :rtype: Gauge
+        :raises: RuntimeError
+        """
+
+        return self._register(Gauge(name, documentation, labelnames, function))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """histogram(name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram : Register a histogram
+        :param name: metric name
+        :type name: str
+        :param documentation: help text
+        :type documentation: str
+        :param labelnames: names of the labels
+        :type labelnames: tuple
+        :param buckets: upper bounds of the buckets
+        :type buckets: tuple
+        :returns: histogram
+        :rtype: Histogram
+        :raises: RuntimeError
+        """
+
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        """render() -> str : Return all the metrics in the Prometheus text exposition format
+        :returns: exposition
+        :rtype: str
+        """
+
+        with self._lock:
+            metrics = list(self._metrics)
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+    def serve(self, host='127.0.0.1', port=0):
+        """serve(host='127.0.0.1', port=0) -> str : Serve the metrics over HTTP from a background thread
+        :param host: address the listener binds to (default is the loopback interface)
+        :type host: str
+        :param port: port the listener binds to (default is a free port)
+        :type port: int
+        :returns: URL of the metrics
+        :rtype: str
+        """
+
+        if self._server is None:
+            self._server = _ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+            self._server.registry = self
+            thread = threading.Thread(target=self._server.serve_forever, name='PyOphidia-Metrics')
+            thread.daemon = True
+            thread.start()
+            self.url = 'http://' + (host or '127.0.0.1') + ':' + str(self._server.server_address[1]) + '/metrics'
+        return self.url
+
+    def close(self):
+        """close() -> None : Stop the HTTP listener"""
+
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self.url = None
+
+
+class ClientMetrics(MetricsRegistry):
+    """ClientMetrics(prefix='pyophidia', buckets=DEFAULT_BUCKETS) -> obj : registry of the standard metrics of the Ophidia clients
+
+    When set as Client.metrics (the same instance can be shared by several clients), every request updates:
+        <prefix>_requests_total{operator,source}: requests by operator and source of the response (server, cache or memo)
+        <prefix>_request_errors_total{operator,code}: failed requests by OPH_SERVER_* code (CONNECT_ERROR, DEADLINE_EXCEEDED and OPH_TASK_ERROR
+            for connection failures, expired deadlines and errors reported in the response)
+        <prefix>_request_duration_seconds{operator}: latency histogram of the requests submitted to the server
+        <prefix>_request_phase_seconds_total{phase}: time spent in each phase of the requests (see ophsubmit.PHASES)
+        <prefix>_bytes_sent_total and <prefix>_bytes_received_total: bytes transferred
+        <prefix>_cubes_created_total{operator}: output cubes
+        <prefix>_requests_in_flight: requests waiting for the server
+        <prefix>_jobs_in_flight: asynchronous jobs still monitored by the pollers of the clients
+
+    Example:
+        client.metrics = ClientMetrics()
+        client.metrics.serve(port=9464)
+    """
+
+    def __init__(self, prefix='pyophidia', buckets=DEFAULT_BUCKETS):
+        """ClientMetrics(prefix='pyophidia', buckets=DEFAULT_BUCKETS) -> obj
+        :param prefix: prefix of the metric names
+        :type prefix: str
+        :param buckets: upper bounds (seconds) of the latency buckets
+        :type buckets: tuple
+        :returns: None
+        :rtype: None
+        """
+
+        MetricsRegistry.__init__(self)
+        self._clients = weakref.WeakValueDictionary()
+        self.requests = self.counter(prefix + '_requests_total', 'Requests submitted to Ophidia', ('operator', 'source'))
+        self.errors = self.counter(prefix + '_request_errors_total', 'Failed requests by error code', ('operator', 'code'))
+        self.duration = self.histogram(prefix + '_request_duration_seconds', 'Latency of the requests submitted to the server', ('operator',), buckets)
+        self.phases = self.counter(prefix + '_request_phase_seconds_total', 'Seconds spent in each phase of the requests', ('phase',))
+        self.sent = self.counter(prefix + '_bytes_sent_total', 'Bytes sent to the server')
+        self.received = self.counter(prefix + '_bytes_received_total', 'Bytes received from the server')
+        self.cubes = self.counter(prefix + '_cubes_created_total', 'Cubes produced by the requests', ('operator',))
+        self.in_flight = self.gauge(prefix + '_requests_in_flight', 'Requests waiting for the server')
+        self.jobs = self.gauge(prefix + '_jobs_in_flight', 'Asynchronous jobs not completed yet', function=self._outstanding_jobs)
+
+    def _outstanding_jobs(self):
+        total = 0
+        for client in list(self._clients.values()):
+            poller = getattr(client, 'poller', None)
+            if poller is not None:
+                total += poller.outstanding()
+        return total
+
+    def observe(self, client, query, return_value, error, source, timings, output=None):
+        """observe(client, query, return_value, error, source, timings, output=None) -> None : Update the metrics with the outcome of a request
+        :param client: Client that submitted the request
+        :type client: Client
+        :param query: submitted query or workflow
+        :type query: str
+        :param return_value: return value of the request
+        :type return_value: int
+        :param error: error of the request or None
+        :type error: str or Exception
+        :param source: server|cache|memo
+        :type source: str
+        :param timings: phase durations and bytes (see Result.timings)
+        :type timings: dict
+        :param output: PIDs of the output cubes separated by '|' or None
+        :type output: str
+        :returns: None
+        :rtype: None
+        """
+
+        self._clients[id(client)] = client
+        if str(query).lstrip().startswith('{'):
+            operator = 'workflow'
+        else:
+            operator = parse_query(query)[0]
+        self.requests.inc(operator=operator, source=source)
+        if return_value or error is not None:
+            if isinstance(error, _ophsubmit.ConnectError):
+                code = 'CONNECT_ERROR'
+            elif isinstance(error, _ophsubmit.DeadlineExceeded):
+                code = 'DEADLINE_EXCEEDED'
+            elif not return_value:
+                code = 'OPH_TASK_ERROR'
+            else:
+                code = _CODES.get(return_value, str(return_value))
+            self.errors.inc(operator=operator, code=code)
+        if source == 'server' and 'total' in timings:
+            self.duration.observe(timings['total'], operator=operator)
+        for phase in _ophsubmit.PHASES:
+            if phase in timings:
+                self.phases.inc(timings[phase], phase=phase)
+        self.sent.inc(timings.get('sent', 0))
+        self.received.inc(timings.get('received', 0))
+        if output:
+            self.cubes.inc(len([pid for pid in str(output).split('|') if pid.strip()]), operator=operator)
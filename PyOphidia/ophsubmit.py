@@ -19,17 +19,19 @@
 import sys
 import base64
 import re
+import json
+import time
+import random
+import threading
 from xml.dom import minidom
-from inspect import currentframe
+import logging
 if sys.version_info < (3, 0):
     import httplib
 else:
     import http.client as httplib
 
 
-def get_linenumber():
-    cf = currentframe()
-    return __file__, cf.f_back.f_lineno
+_logger = logging.getLogger(__name__)
 
 
 SOAP_MESSAGE_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
@@ -73,7 +75,237 @@ WRAPPING_WORKFLOW7 = ",\"%s\""
 WRAPPING_WORKFLOW8 = "]\n    }\n  ]\n}"
 
 
-def submit(username, password, server, port, query):
+# Operators that do not change the state of the server, so that their requests can be safely submitted again
+READ_ONLY_OPERATORS = frozenset(['oph_containerschema', 'oph_cubeelements', 'oph_cubeio', 'oph_cubeschema', 'oph_cubesize', 'oph_explorecube', 'oph_explorenc',
+                                 'oph_get_config', 'oph_hierarchy', 'oph_list', 'oph_log_info', 'oph_loggingbk', 'oph_man', 'oph_operators_list',
+                                 'oph_primitives_list', 'oph_resume', 'oph_search', 'oph_showgrid', 'oph_tasks'])
+
+# Phases of a request timed by submit: request building, TCP connection, TLS handshake, request upload, wait for the server (execution included),
+# response download, XML parsing and sleep between retries
+PHASES = ('build', 'connect', 'tls', 'upload', 'wait', 'download', 'parse', 'backoff')
+
+# Error classes of a failed request besides the OPH_SERVER_* codes
+CONNECT_ERROR = 'connect'
+CONNECTION_ERROR = 'connection'
+DEADLINE_EXCEEDED = 'deadline'
+
+
+class ConnectError(Exception):
+    """Raised (and returned as error) when the connection to the server cannot be established, i.e. the request never reached it"""
+    pass
+
+
+class DeadlineExceeded(Exception):
+    """Raised (and returned as error) when a request is not completed within its deadline"""
+    pass
+
+
+def operators_of(query):
+    """operators_of(query) -> list : Return the operators of a query or of a JSON workflow"""
+
+    request = str(query).lstrip(' \n\t')
+    if request.startswith('{'):
+        try:
+            return [str(task.get('operator', '')).lower() for task in json.loads(request).get('tasks', [])]
+        except Exception:
+            return []
+    if request.startswith('operator='):
+        return [request[len('operator='):].split(';', 1)[0].strip().lower()]
+    return [request.split(None, 1)[0].rstrip(';').lower()] if request else []
+
+
+def is_read_only(query):
+    """is_read_only(query) -> bool : Return True if all the operators of a query or of a JSON workflow are read-only"""
+
+    operators = operators_of(query)
+    return len(operators) > 0 and all(operator in READ_ONLY_OPERATORS for operator in operators)
+
+
+class RetryPolicy():
+    """RetryPolicy(retries=None, base_delay=0.5, max_delay=30.0, jitter=0.5, failure_threshold=5, reset_timeout=30.0) -> obj
+    Retry policy with jittered exponential backoff and per-endpoint circuit breaker
+
+    Requests including operators that are not read-only are retried only when the connection could not be established. Requests whose deadline
+    has expired are never retried.
+
+    Attributes:
+        retries: dict mapping each error class (CONNECT_ERROR, CONNECTION_ERROR or an OPH_SERVER_* code) to the maximum number of retries
+        base_delay: delay before the first retry (seconds)
+        max_delay: maximum delay between two attempts (seconds)
+        jitter: fraction of the delay that is randomized (between 0 and 1)
+        failure_threshold: number of consecutive failures opening the circuit breaker of an endpoint
+        reset_timeout: number of seconds after which an open circuit lets a probe request through
+    """
+
+    DEFAULT_RETRIES = {CONNECT_ERROR: 3, CONNECTION_ERROR: 2, OPH_SERVER_NO_RESPONSE: 3, OPH_SERVER_SYSTEM_ERROR: 2, OPH_SERVER_IO_ERROR: 1}
+
+    def __init__(self, retries=None, base_delay=0.5, max_delay=30.0, jitter=0.5, failure_threshold=5, reset_timeout=30.0):
+        self.retries = dict(RetryPolicy.DEFAULT_RETRIES if retries is None else retries)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+    @staticmethod
+    def classify(outcome):
+        """classify(outcome) -> str, int or None : Return the error class of the tuple returned by submit, None on success"""
+
+        response, jobid, newsession, return_value, error = outcome
+        if not return_value:
+            return None
+        if isinstance(error, DeadlineExceeded):
+            return DEADLINE_EXCEEDED
+        if isinstance(error, ConnectError):
+            return CONNECT_ERROR
+        if isinstance(error, Exception):
+            return CONNECTION_ERROR
+        return return_value
+
+    def should_retry(self, error_class, attempt, read_only):
+        """should_retry(error_class, attempt, read_only) -> bool : Return True if a request failed attempt times with error_class can be submitted again"""
+
+        if error_class in (None, DEADLINE_EXCEEDED) or attempt >= self.retries.get(error_class, 0):
+            return False
+        return read_only or error_class == CONNECT_ERROR
+
+    def delay(self, attempt):
+        """delay(attempt) -> float : Return the number of seconds to wait before the retry following attempt failures"""
+
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay * (1 - self.jitter * random.random())
+
+
+class CircuitBreaker():
+    """CircuitBreaker(failure_threshold=5, reset_timeout=30.0) -> obj : circuit breaker of an endpoint
+
+    The circuit opens after failure_threshold consecutive failures, so that requests fail fast; after reset_timeout seconds a single
+    probe request is let through (half-open state), closing the circuit if it succeeds.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitBreaker.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == CircuitBreaker.CLOSED:
+                return True
+            if self.state == CircuitBreaker.OPEN and time.time() - self.opened_at >= self.reset_timeout:
+                self.state = CircuitBreaker.HALF_OPEN
+                return True
+            return False
+
+    def success(self):
+        with self._lock:
+            self.state = CircuitBreaker.CLOSED
+            self.failures = 0
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == CircuitBreaker.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = CircuitBreaker.OPEN
+                self.opened_at = time.time()
+
+
+_circuit_breakers = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(server, port, failure_threshold=5, reset_timeout=30.0):
+    """get_circuit_breaker(server, port, failure_threshold=5, reset_timeout=30.0) -> CircuitBreaker : Return the circuit breaker of an endpoint"""
+
+    with _circuit_breakers_lock:
+        key = (str(server), str(port))
+        if key not in _circuit_breakers:
+            _circuit_breakers[key] = CircuitBreaker(failure_threshold, reset_timeout)
+        breaker = _circuit_breakers[key]
+        # The thresholds follow the policy currently in use
+        breaker.failure_threshold = failure_threshold
+        breaker.reset_timeout = reset_timeout
+        return breaker
+
+
+def submit(username, password, server, port, query, retry_policy=None, connect_timeout=None, read_timeout=None, deadline=None, stats=None):
+    """submit(username, password, server, port, query, retry_policy=None, connect_timeout=None, read_timeout=None, deadline=None, stats=None) -> tuple :
+       Submit a query or a JSON workflow and return the tuple (response, jobid, newsession, return_value, error)
+    :param retry_policy: RetryPolicy applied to the request (default is a single attempt)
+    :type retry_policy: RetryPolicy
+    :param connect_timeout: maximum number of seconds to establish the connection (default is no limit)
+    :type connect_timeout: float
+    :param read_timeout: maximum number of seconds to wait for the server between two reads (default is no limit)
+    :type read_timeout: float
+    :param deadline: absolute time, as given by time.time(), by which the request (retries included) must be completed (default is no limit)
+    :type deadline: float
+    :param stats: dict where the number of bytes sent and received (keys 'sent' and 'received') and the number of seconds spent in each phase
+                  (see PHASES) are accumulated, all attempts included
+    :type stats: dict
+    """
+
+    if retry_policy is None:
+        return _submit(username, password, server, port, query, connect_timeout, read_timeout, deadline, stats)
+    breaker = get_circuit_breaker(server, port, retry_policy.failure_threshold, retry_policy.reset_timeout)
+    read_only = is_read_only(query)
+    attempt = 0
+    while True:
+        if not breaker.allow():
+            # The request is not sent at all
+            return (None, None, None, OPH_SERVER_NO_RESPONSE, ConnectError("Error on serving request: circuit open for " + str(server) + ":" + str(port)))
+        sent = deadline is None or time.time() < deadline
+        outcome = _submit(username, password, server, port, query, connect_timeout, read_timeout, deadline, stats)
+        error_class = retry_policy.classify(outcome)
+        if error_class in (CONNECT_ERROR, CONNECTION_ERROR, OPH_SERVER_NO_RESPONSE):
+            breaker.failure()
+        elif error_class == DEADLINE_EXCEEDED:
+            # A server that only ever times out must open the circuit; a request never sent tells nothing about the server
+            if sent:
+                breaker.failure()
+        else:
+            breaker.success()
+        if not retry_policy.should_retry(error_class, attempt, read_only):
+            return outcome
+        delay = retry_policy.delay(attempt)
+        if deadline is not None and time.time() + delay >= deadline:
+            return outcome
+        attempt += 1
+        _logger.warning("Request failed (%s), retry %d in %.1f seconds", outcome[4], attempt, delay)
+        time.sleep(delay)
+        _count(stats, 'backoff', delay)
+
+
+def _remaining(timeout, deadline):
+    # Timeout bounded by the time left before the deadline
+    if deadline is None:
+        return timeout
+    left = max(deadline - time.time(), 0.001)
+    return left if timeout is None else min(timeout, left)
+
+
+def _count(stats, key, size):
+    if stats is not None:
+        stats[key] = stats.get(key, 0) + size
+
+
+def _lap(stats, phase, since):
+    # Charge the time elapsed since the previous lap to phase
+    now = time.time()
+    _count(stats, phase, now - since)
+    return now
+
+
+def _submit(username, password, server, port, query, connect_timeout=None, read_timeout=None, deadline=None, stats=None):
+    lap = time.time()
+    if deadline is not None and time.time() >= deadline:
+        return (None, None, None, 1, DeadlineExceeded("Deadline expired before submitting the request"))
     try:
         if sys.version_info < (2, 7, 9):
             client = httplib.HTTPS(str(server) + ":" + str(port))
@@ -81,12 +313,13 @@ def submit(username, password, server, port, query):
             import ssl
             context = ssl.SSLContext(ssl.PROTOCOL_SSLv23)
             context.verify_mode = ssl.CERT_NONE
-            client = httplib.HTTPSConnection(str(server), str(port), context=context)
+            # The TLS handshake is part of the connection setup
+            client = httplib.HTTPSConnection(str(server), str(port), context=context, timeout=_remaining(connect_timeout if connect_timeout is not None else read_timeout, deadline))
         client.putrequest("POST", "")
         client.putheader("User-Agent", "Ophidia Python client")
         client.putheader("Content-type", "text/xml; charset=\"UTF-8\"")
     except Exception as e:
-        print(get_linenumber(), "Something went wrong in connection setup:", e)
+        _logger.error("Something went wrong in connection setup: %s", e)
         return (None, None, None, 1, e)
     request = str(query)
     if not request.lstrip(' \n\t').startswith('{'):
@@ -143,7 +376,26 @@ def submit(username, password, server, port, query):
                     else:
                         request += WRAPPING_WORKFLOW7.replace('%s', element)
         request += WRAPPING_WORKFLOW8
+    lap = _lap(stats, 'build', lap)
+    try:
+        if sys.version_info < (2, 7, 9):
+            client.connect()
+            lap = _lap(stats, 'connect', lap)
+        else:
+            # Same steps as HTTPSConnection.connect, so that the TCP connection and the TLS handshake are timed separately
+            httplib.HTTPConnection.connect(client)
+            lap = _lap(stats, 'connect', lap)
+            client.sock = context.wrap_socket(client.sock, server_hostname=str(server))
+            lap = _lap(stats, 'tls', lap)
+    except Exception as e:
+        _logger.error("Something went wrong in connection setup: %s", e)
+        if deadline is not None and time.time() >= deadline:
+            return (None, None, None, 1, DeadlineExceeded(e))
+        return (None, None, None, 1, ConnectError(e))
     try:
+        sock = getattr(client, 'sock', None)
+        if sock is not None:
+            sock.settimeout(_remaining(read_timeout, deadline))
         # Escape &, <, > and \n chars for http
         request = request.replace("&", "&amp;")
         request = request.replace("<", "&lt;")
@@ -161,24 +413,36 @@ def submit(username, password, server, port, query):
 
         client.putheader('Authorization', auth)
         client.endheaders()
+        lap = _lap(stats, 'build', lap)
 
         if sys.version_info < (3, 0):
             client.send(soapMessage)
+            _count(stats, 'sent', len(soapMessage))
+            lap = _lap(stats, 'upload', lap)
             if sys.version_info < (2, 7, 9):
                 statuscode, statusmessage, header = client.getreply()
+                lap = _lap(stats, 'wait', lap)
                 reply = client.getfile().read()
             else:
                 _res = client.getresponse()
+                lap = _lap(stats, 'wait', lap)
                 statuscode, statusmessage = _res.status, _res.reason
                 reply = _res.read()
         else:
-            client.send(bytes(soapMessage, "utf-8"))
+            payload = bytes(soapMessage, "utf-8")
+            client.send(payload)
+            _count(stats, 'sent', len(payload))
+            lap = _lap(stats, 'upload', lap)
             _res = client.getresponse()
+            lap = _lap(stats, 'wait', lap)
             statuscode, statusmessage = _res.status, _res.reason
             reply = _res.read()
 
+        _count(stats, 'received', len(reply))
+        lap = _lap(stats, 'download', lap)
+
         if statuscode != 200:
-            print(get_linenumber(), "Something went wrong in submitting the request:", statuscode, statusmessage)
+            _logger.error("Something went wrong in submitting the request: %s %s", statuscode, statusmessage)
             return (None, None, None, 1, statusmessage)
 
         xmldoc = minidom.parseString(reply)
@@ -190,8 +454,11 @@ def submit(username, password, server, port, query):
             res_error = int(response.getElementsByTagName('error')[0].firstChild.data)
         if len(response.getElementsByTagName('response')) > 0 and response.getElementsByTagName('response')[0].firstChild is not None:
             res_response = response.getElementsByTagName('response')[0].firstChild.data
+        lap = _lap(stats, 'parse', lap)
     except Exception as e:
-        print(get_linenumber(), "Something went wrong in submitting the request:", e)
+        _logger.error("Something went wrong in submitting the request: %s", e)
+        if deadline is not None and time.time() >= deadline:
+            return (None, None, None, 1, DeadlineExceeded(e))
         return (None, None, None, 1, e)
     if res_error is None:
         return (None, None, None, 1, "Invalid response")
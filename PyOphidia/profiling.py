@@ -0,0 +1,229 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import sys
+import os
+import csv
+import json
+import time
+import threading
+import logging
+from PyOphidia.cache import parse_query
+from PyOphidia.lifecycle import measure
+sys.path.append(os.path.dirname(__file__))
+
+
+_logger = logging.getLogger(__name__)
+
+
+# Columns of the CSV dump, in order
+COLUMNS = ('timestamp', 'operator', 'arguments', 'exec_time', 'wall_time', 'overhead', 'bytes_sent', 'bytes_received', 'return_value', 'source', 'cube',
+           'cube_size')
+
+# Context arguments added by the Client to every request and left out of the profile
+_IGNORED = frozenset(['sessionid', 'cwd', 'cdd', 'host_partition', 'exec_mode'])
+
+
+class Profile():
+    """Profile(client, measure=True, byte_unit='MB', path=None, log_report=True) -> obj : profile of the requests submitted while it is open
+
+    Returned by Client.profile and used as a context manager: every request submitted through the client while the block is running (by any
+    thread) is recorded with its operator, arguments, execution time on the server, wall time and overhead on the client (wall time minus
+    execution time), bytes sent and received and output cube. On exit the size of the output cubes still available is measured with
+    OPH_CUBESIZE, the ranked report is logged (INFO level) and, when path is given, the records are dumped to that file (CSV if it ends with .csv, JSON otherwise).
+
+    Example:
+        with client.profile(path='pipeline.json') as p:
+            cube.subset(subset_dims='lat', subset_filter='1:10').reduce(operation='avg')
+        print(p.report(by='exec_time'))
+
+    Attributes:
+        records: list of dicts, one per request, with the keys in COLUMNS
+        elapsed: number of seconds the block has been running
+        measure: if True measure the output cubes on exit
+        byte_unit: unit of the cube sizes
+        path: file the records are dumped to on exit or None
+        log_report: if True log the report on exit
+
+    Methods:
+        summary(by='wall_time') -> list : Return per-operator totals, ranked by the given field.
+        report(by='wall_time', top=None) -> str : Return the ranked report as a table.
+        to_json(path=None) -> str : Return (and optionally write) the records as a JSON document.
+        to_csv(path=None) -> str : Return (and optionally write) the records as CSV.
+    """
+
+    def __init__(self, client, measure=True, byte_unit='MB', path=None, log_report=True):
+        """Profile(client, measure=True, byte_unit='MB', path=None, log_report=True) -> obj
+        :param client: instance of class Client
+        :type client: Client
+        :param measure: if True measure the output cubes with OPH_CUBESIZE on exit
+        :type measure: bool
+        :param byte_unit: KB|MB|GB|TB|PB
+        :type byte_unit: str
+        :param path: file the records are dumped to on exit (.csv for CSV, JSON otherwise)
+        :type path: str
+        :param log_report: if True log the report on exit (INFO level)
+        :type log_report: bool
+        :returns: None
+        :rtype: None
+        """
+
+        self.client = client
+        self.measure = measure
+        self.byte_unit = byte_unit
+        self.path = path
+        self.log_report = log_report
+        self.records = []
+        self.elapsed = 0.0
+        self._start = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self._start = time.time()
+        with self.client._lock:
+            self.client._profiles = self.client._profiles + (self,)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        with self.client._lock:
+            self.client._profiles = tuple(profile for profile in self.client._profiles if profile is not self)
+        self.elapsed = time.time() - self._start
+        if self.measure:
+            sizes = {}
+            for entry in self.records:
+                cube = entry['cube']
+                if cube and '|' not in cube:
+                    if cube not in sizes:
+                        sizes[cube] = measure(self.client, cube, self.byte_unit)
+                    entry['cube_size'] = sizes[cube]
+        if self.path:
+            try:
+                if str(self.path).lower().endswith('.csv'):
+                    self.to_csv(self.path)
+                else:
+                    self.to_json(self.path)
+            except (IOError, OSError) as e:
+                _logger.warning("Unable to save the profile: %s", e)
+        if self.log_report:
+            _logger.info("Profile of %d requests in %.2f seconds\n%s", len(self.records), self.elapsed, self.report())
+        return False
+
+    def _observe(self, query, timings, exec_time, return_value, source, cube):
+        operator, arguments = parse_query(query)
+        if str(query).lstrip().startswith('{'):
+            operator, arguments = 'workflow', {}
+        wall_time = timings.get('total', 0.0)
+        entry = {'timestamp': time.time() - wall_time, 'operator': operator,
+                 'arguments': dict((key, value) for key, value in arguments.items() if key not in _IGNORED),
+                 'exec_time': exec_time, 'wall_time': wall_time, 'overhead': wall_time - exec_time if exec_time is not None else None,
+                 'bytes_sent': timings.get('sent', 0), 'bytes_received': timings.get('received', 0), 'return_value': return_value, 'source': source,
+                 'cube': cube, 'cube_size': None}
+        with self._lock:
+            self.records.append(entry)
+
+    def summary(self, by='wall_time'):
+        """summary(by='wall_time') -> list : Return per-operator totals, ranked by the given field
+        :param by: wall_time|exec_time|overhead|bytes_received|bytes_sent|cube_size|count
+        :type by: str
+        :returns: list of dicts with keys 'operator', 'count', 'wall_time', 'exec_time', 'overhead', 'bytes_sent', 'bytes_received', 'cube_size'
+                  and 'share' (fraction of the total wall time)
+        :rtype: list
+        """
+
+        with self._lock:
+            entries = list(self.records)
+        fields = ('wall_time', 'exec_time', 'overhead', 'bytes_sent', 'bytes_received', 'cube_size')
+        totals = {}
+        for entry in entries:
+            total = totals.setdefault(entry['operator'], dict([('operator', entry['operator']), ('count', 0)] + [(field, 0.0) for field in fields]))
+            total['count'] += 1
+            for field in fields:
+                if entry[field] is not None:
+                    total[field] += entry[field]
+        overall = sum(entry['wall_time'] for entry in entries) or 1.0
+        for total in totals.values():
+            total['share'] = total['wall_time'] / overall
+        return sorted(totals.values(), key=lambda total: total.get(by) or 0, reverse=True)
+
+    def report(self, by='wall_time', top=None):
+        """report(by='wall_time', top=None) -> str : Return the ranked report as a table
+        :param by: field used to rank the operators (see summary)
+        :type by: str
+        :param top: maximum number of operators (default is all)
+        :type top: int
+        :returns: report
+        :rtype: str
+        """
+
+        lines = ['%-24s %6s %10s %10s %10s %7s %12s %12s' % ('OPERATOR', 'COUNT', 'WALL (s)', 'EXEC (s)', 'OVERHEAD', 'SHARE', 'RECEIVED (B)',
+                                                           'CUBES (' + str(self.byte_unit) + ')')]
+        for total in self.summary(by)[:top]:
+            lines.append('%-24s %6d %10.3f %10.3f %10.3f %6.1f%% %12d %12.3f' % (total['operator'], total['count'], total['wall_time'], total['exec_time'],
+                                                                              total['overhead'], 100.0 * total['share'], total['bytes_received'],
+                                                                              total['cube_size']))
+        lines.append('%d requests in %.3f s' % (len(self.records), self.elapsed))
+        return '\n'.join(lines)
+
+    def to_json(self, path=None):
+        """to_json(path=None) -> str : Return the records as a JSON document, writing it to path if given
+        :param path: output file
+        :type path: str
+        :returns: JSON string
+        :rtype: str
+        """
+
+        summary = self.summary()
+        with self._lock:
+            document = json.dumps({'elapsed': self.elapsed, 'byte_unit': self.byte_unit, 'records': self.records, 'summary': summary}, indent=2)
+        if path:
+            with open(path, 'w') as f:
+                f.write(document)
+        return document
+
+    def to_csv(self, path=None):
+        """to_csv(path=None) -> str : Return the records as CSV (arguments are serialized as JSON), writing them to path if given
+        :param path: output file
+        :type path: str
+        :returns: CSV string
+        :rtype: str
+        """
+
+        with self._lock:
+            rows = [[json.dumps(entry[column], sort_keys=True) if column == 'arguments' else entry[column] for column in COLUMNS] for entry in self.records]
+        lines = []
+        writer = csv.writer(_Lines(lines), lineterminator='\n')
+        writer.writerow(COLUMNS)
+        writer.writerows(rows)
+        document = ''.join(lines)
+        if path:
+            with open(path, 'w') as f:
+                f.write(document)
+        return document
+
+
+class _Lines():
+    # Minimal file-like object collecting the lines written by csv.writer (io.StringIO differs between Python 2 and 3)
+
+    def __init__(self, lines):
+        self.lines = lines
+
+    def write(self, line):
+        self.lines.append(line)
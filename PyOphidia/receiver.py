@@ -0,0 +1,203 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import sys
+import os
+import re
+import json
+import socket
+import threading
+from collections import deque
+import PyOphidia.job as _job
+if sys.version_info < (3, 0):
+    import BaseHTTPServer as _http_server
+    import SocketServer as _socketserver
+    from urlparse import urlparse, parse_qs
+else:
+    import http.server as _http_server
+    import socketserver as _socketserver
+    from urllib.parse import urlparse, parse_qs
+sys.path.append(os.path.dirname(__file__))
+
+
+# Job IDs look like 'http://host:port/ophidia/sessions/<session code>/experiment?<workflow>#<marker>'
+_JOBID = re.compile(r'^https?://[^?#\s]+\?\d+(#\d+)?$')
+
+# Notification fields carrying the session of a bare workflow identifier
+_SESSION_FIELDS = ('sessionid', 'session_id', 'session')
+
+
+class _ThreadingHTTPServer(_socketserver.ThreadingMixIn, _http_server.HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _CallbackHandler(_http_server.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        self._notify(parse_qs(urlparse(self.path).query))
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length > 0 else b''
+        if not isinstance(body, str):
+            body = body.decode('utf-8', 'replace')
+        fields = parse_qs(urlparse(self.path).query)
+        try:
+            document = json.loads(body)
+            if isinstance(document, dict):
+                for key, value in document.items():
+                    fields.setdefault(key, []).append(value)
+        except ValueError:
+            for key, values in parse_qs(body).items():
+                fields.setdefault(key, []).extend(values)
+        self._notify(fields)
+
+    def _notify(self, fields):
+        self.server.receiver.notify(fields)
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CallbackReceiver():
+    """CallbackReceiver(host=None, port=0, advertised_host=None) -> obj : embedded HTTP listener for Ophidia job notifications
+
+    The receiver URL is passed as callback_url to the asynchronous submissions; when the server notifies the end of a job,
+    the matching Job handle is checked immediately instead of waiting for the next poll. Notifications are only a hint: the status of the
+    job is always read back from the server. Unless advertised_host or host is given, the listener is reachable from the local host only.
+
+    Attributes:
+        url: URL to be used as callback_url
+        poller: JobPoller notified when a callback arrives
+
+    Methods:
+        register(job) -> Job : Associate a job to the receiver.
+        notify(fields) -> list : Dispatch the fields of a notification to the matching jobs.
+        close() -> None : Stop the listener.
+    """
+
+    def __init__(self, host=None, port=0, advertised_host=None, poller=None):
+        """CallbackReceiver(host=None, port=0, advertised_host=None, poller=None) -> obj
+        :param host: address the listener binds to (default is 127.0.0.1, or all interfaces when advertised_host is given)
+        :type host: str
+        :param port: port the listener binds to (default is a free port)
+        :type port: int
+        :param advertised_host: host name the Ophidia server uses to reach the listener (default is host, or the fully qualified domain name
+                                when bound to all interfaces)
+        :type advertised_host: str
+        :param poller: JobPoller resolving the notified jobs
+        :type poller: JobPoller
+        :returns: None
+        :rtype: None
+        """
+
+        self.poller = poller
+        self._jobs = {}
+        # Notifications that arrived before the job was registered
+        self._early = deque(maxlen=1024)
+        self._lock = threading.Lock()
+        if host is None:
+            host = '' if advertised_host else '127.0.0.1'
+        self._server = _ThreadingHTTPServer((host, int(port)), _CallbackHandler)
+        self._server.receiver = self
+        if not advertised_host:
+            advertised_host = host if host and host != '0.0.0.0' else socket.getfqdn()
+        self.url = 'http://' + str(advertised_host) + ':' + str(self._server.server_address[1]) + '/'
+        self._thread = threading.Thread(target=self._server.serve_forever, name='PyOphidia-CallbackReceiver')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def register(self, job):
+        """register(job) -> Job : Associate a job to the receiver
+        :param job: job whose completion is notified to the receiver
+        :type job: Job
+        :returns: the same job
+        :rtype: Job
+        """
+
+        with self._lock:
+            self._jobs[job.jobid] = job
+            self._jobs[(job.session, job.workflow_id)] = job
+            early = (job.session, job.workflow_id) in self._early
+        job.add_done_callback(self._unregister)
+        if early and self.poller is not None:
+            self.poller.poll_now(job)
+        return job
+
+    def _unregister(self, job):
+        with self._lock:
+            self._jobs.pop(job.jobid, None)
+            self._jobs.pop((job.session, job.workflow_id), None)
+
+    def notify(self, fields):
+        """notify(fields) -> list : Dispatch the fields of a notification to the matching jobs
+        :param fields: dict mapping each notification field to the list of its values
+        :type fields: dict
+        :returns: list of matched jobs
+        :rtype: list
+        """
+
+        matched = []
+        with self._lock:
+            for values in fields.values():
+                for value in values:
+                    value = str(value).strip()
+                    # Only job IDs are considered, any other value (status, timestamps, etc.) is ignored
+                    if not _JOBID.match(value):
+                        continue
+                    session, workflow_id, marker_id = _job.parse_jobid(value)
+                    job = self._jobs.get(value) or self._jobs.get((session, workflow_id))
+                    if job is None:
+                        self._early.append((session, workflow_id))
+                    elif job not in matched:
+                        matched.append(job)
+            if not matched:
+                # Fall back on bare workflow identifiers, within the notified session
+                sessions = set(str(value).strip() for key in _SESSION_FIELDS for value in fields.get(key, []))
+                for key in ('workflowid', 'workflow_id', 'wid', 'id'):
+                    for value in fields.get(key, []):
+                        value = str(value).strip()
+                        if not value.isdigit():
+                            continue
+                        if sessions:
+                            for session in sessions:
+                                job = self._jobs.get((session, value))
+                                if job is None:
+                                    self._early.append((session, value))
+                                elif job not in matched:
+                                    matched.append(job)
+                        else:
+                            # Without a session the identifier is used only if it is not ambiguous
+                            candidates = [job for key, job in self._jobs.items() if isinstance(key, tuple) and key[1] == value]
+                            if len(candidates) == 1 and candidates[0] not in matched:
+                                matched.append(candidates[0])
+        if self.poller is not None:
+            for job in matched:
+                self.poller.poll_now(job)
+        return matched
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
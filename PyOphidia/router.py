@@ -0,0 +1,299 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import sys
+import os
+import re
+import time
+import threading
+import logging
+from collections import OrderedDict
+import PyOphidia.ophsubmit as _ophsubmit
+from PyOphidia.client import Client
+sys.path.append(os.path.dirname(__file__))
+
+
+_logger = logging.getLogger(__name__)
+
+
+# Session IDs and cube PIDs are both URLs of the server that owns them
+_URL = re.compile(r'https?://[^\s;"\'|,\]]+')
+
+
+class Endpoint():
+    """Endpoint(server, port='11732') -> obj : an Ophidia server instance known to a RouterClient
+
+    Attributes:
+        server: Ophidia server address
+        port: Ophidia server port
+        healthy: False if the last request or health check failed
+        latency: exponentially weighted moving average of the request latency (seconds) or None
+        inflight: number of requests currently being served
+        failures: number of consecutive failures
+    """
+
+    def __init__(self, server, port='11732'):
+        self.server = server
+        self.port = str(port)
+        self.healthy = True
+        self.latency = None
+        self.inflight = 0
+        self.failures = 0
+        self.last_check = 0.0
+        self.checking = False
+
+    def __repr__(self):
+        return "<Endpoint %s:%s %s latency=%s inflight=%d>" % (self.server, self.port, 'up' if self.healthy else 'down', self.latency, self.inflight)
+
+    def score(self):
+        # Unmeasured endpoints are tried first, then the fastest among the least loaded
+        if self.latency is None:
+            return self.inflight
+        return self.latency * (self.inflight + 1)
+
+
+class RouterClient(Client):
+    """RouterClient(endpoints, username='', password='', token='', read_env=False, api_mode=True, alpha=0.3, health_interval=30.0, max_affinity=10000, check_timeout=10.0) -> obj
+    Client spreading the requests over several Ophidia server instances
+
+    Requests referring to a known session or cube are always sent to the server owning it. Any other request (e.g. the one opening a new session)
+    goes to the healthy endpoint with the best latency and load. When the connection to that endpoint cannot be established the request fails
+    over to the next one; requests that may have reached the server (read timeouts, OPH_SERVER_NO_RESPONSE, etc.) fail over only if all their
+    operators are read-only, as for RetryPolicy, so that no operation is executed twice. Endpoints found down are checked again with OPH_SERVICE
+    in background, each check taking at most check_timeout seconds. Only session IDs and output cubes are bound to their endpoint, the least
+    recently used bindings beyond max_affinity being dropped.
+
+    Attributes:
+        endpoints: list of Endpoint objects
+        alpha: smoothing factor of the latency moving average
+        health_interval: number of seconds between two health checks of an endpoint found down
+        max_affinity: maximum number of sessions and cubes bound to their endpoint
+        check_timeout: maximum number of seconds a health check may take
+
+    Methods:
+        health_check() -> list : Check all the endpoints with OPH_SERVICE and return the healthy ones.
+        endpoint_of(pid) -> Endpoint or None : Return the endpoint owning a session or a cube.
+        new_session() -> self : Forget the current session, so that the next request opens a new one on the best endpoint.
+    """
+
+    def __init__(self, endpoints, username='', password='', token='', read_env=False, api_mode=True, alpha=0.3, health_interval=30.0, max_affinity=10000,
+                 check_timeout=10.0):
+        """RouterClient(endpoints, username='', password='', token='', read_env=False, api_mode=True, alpha=0.3, health_interval=30.0, max_affinity=10000, check_timeout=10.0) -> obj
+        :param endpoints: list of Ophidia server instances, as 'server:port' strings, (server, port) tuples or Endpoint objects
+        :type endpoints: list
+        :param username: Ophidia username
+        :type username: str
+        :param password: Ophidia password
+        :type password: str
+        :param token: Ophidia token
+        :type token: str
+        :param read_env: If True read the client variables from the environment
+        :type read_env: bool
+        :param api_mode: If True, use the class as an API and catch also framework-level errors
+        :type api_mode: bool
+        :param alpha: smoothing factor of the latency moving average (between 0 and 1)
+        :type alpha: float
+        :param health_interval: number of seconds between two health checks of an endpoint found down
+        :type health_interval: float
+        :param max_affinity: maximum number of sessions and cubes bound to their endpoint
+        :type max_affinity: int
+        :param check_timeout: maximum number of seconds a health check may take
+        :type check_timeout: float
+        :returns: None
+        :rtype: None
+        :raises: RuntimeError
+        """
+
+        self.endpoints = []
+        for endpoint in endpoints:
+            if isinstance(endpoint, Endpoint):
+                self.endpoints.append(endpoint)
+            elif isinstance(endpoint, (tuple, list)):
+                self.endpoints.append(Endpoint(*endpoint))
+            else:
+                server, sep, port = str(endpoint).rpartition(':')
+                if not sep or not port.isdigit():
+                    server, port = str(endpoint), '11732'
+                self.endpoints.append(Endpoint(server, port))
+        if not self.endpoints:
+            raise RuntimeError('no endpoint specified')
+        self.alpha = alpha
+        self.health_interval = health_interval
+        self.max_affinity = max_affinity
+        self.check_timeout = check_timeout
+        self._affinity = OrderedDict()
+        # Endpoint that served the last request of each thread
+        self._served = threading.local()
+        self._router_lock = threading.Lock()
+        Client.__init__(self, username, password, self.endpoints[0].server, self.endpoints[0].port, token, read_env, api_mode)
+
+    def endpoint_of(self, pid):
+        """endpoint_of(pid) -> Endpoint or None : Return the endpoint owning a session or a cube
+        :param pid: session ID or cube PID
+        :type pid: str
+        :returns: endpoint or None
+        :rtype: Endpoint or None
+        """
+
+        with self._router_lock:
+            return self._affinity.get(pid)
+
+    def new_session(self):
+        """new_session() -> self : Forget the current session, so that the next request opens a new one on the best endpoint
+        :returns: self
+        :rtype: RouterClient
+        """
+
+        with self._lock:
+            self.session = ''
+            self.cwd = '/'
+            self.cdd = '/'
+            self.cube = ''
+        return self
+
+    def health_check(self):
+        """health_check() -> list : Check all the endpoints with OPH_SERVICE and return the healthy ones
+        :returns: list of healthy endpoints
+        :rtype: list
+        """
+
+        for endpoint in self.endpoints:
+            self._check(endpoint)
+        return [endpoint for endpoint in self.endpoints if endpoint.healthy]
+
+    def _check(self, endpoint):
+        start = time.time()
+        return_value = 1
+        try:
+            # A server that does not answer must not hold the check forever, or the endpoint would never be checked again
+            response, jobid, newsession, return_value, error = _ophsubmit.submit(self.username, self.password, endpoint.server, endpoint.port, 'operator=oph_service;',
+                                                                                 connect_timeout=self.check_timeout, read_timeout=self.check_timeout,
+                                                                                 deadline=start + float(self.check_timeout))
+        except Exception:
+            return_value = 1
+        finally:
+            with self._router_lock:
+                endpoint.last_check = time.time()
+                endpoint.checking = False
+                if return_value:
+                    endpoint.healthy = False
+                    endpoint.failures += 1
+                else:
+                    self._record(endpoint, endpoint.last_check - start)
+
+    def _record(self, endpoint, elapsed):
+        endpoint.healthy = True
+        endpoint.failures = 0
+        if endpoint.latency is None:
+            endpoint.latency = elapsed
+        else:
+            endpoint.latency = self.alpha * elapsed + (1 - self.alpha) * endpoint.latency
+
+    def _candidates(self):
+        now = time.time()
+        with self._router_lock:
+            for endpoint in self.endpoints:
+                if not endpoint.healthy and not endpoint.checking and now - endpoint.last_check >= self.health_interval:
+                    endpoint.checking = True
+                    thread = threading.Thread(target=self._check, args=(endpoint,), name='PyOphidia-HealthCheck')
+                    thread.daemon = True
+                    thread.start()
+            healthy = sorted([endpoint for endpoint in self.endpoints if endpoint.healthy], key=lambda endpoint: endpoint.score())
+            # Endpoints found down are still tried as a last resort
+            return healthy + [endpoint for endpoint in self.endpoints if not endpoint.healthy]
+
+    def _pinned(self, query):
+        with self._router_lock:
+            for pid in _URL.findall(str(query)):
+                endpoint = self._affinity.pop(pid, None)
+                if endpoint is not None:
+                    self._affinity[pid] = endpoint
+                    return endpoint
+        return None
+
+    def _bind(self, pid, endpoint):
+        # Called with _router_lock held
+        self._affinity.pop(pid, None)
+        self._affinity[pid] = endpoint
+        while len(self._affinity) > max(self.max_affinity, 0):
+            self._affinity.popitem(last=False)
+
+    def _execute(self, query, display=False, workflow=False, track_session=True, deadline=None):
+        self._served.endpoint = None
+        result = Client._execute(self, query, display, workflow, track_session, deadline)
+        endpoint = self._served.endpoint
+        if endpoint is not None and result is not None and not result.return_value and result.cube:
+            with self._router_lock:
+                for pid in str(result.cube).split('|'):
+                    if pid:
+                        self._bind(pid, endpoint)
+        return result
+
+    def _transport(self, query, deadline=None, stats=None):
+        pinned = self._pinned(query)
+        candidates = [pinned] if pinned is not None else self._candidates()
+        read_only = _ophsubmit.is_read_only(query)
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.in_flight.inc()
+        try:
+            return self._failover(query, candidates, pinned, read_only, deadline, stats)
+        finally:
+            if metrics is not None:
+                metrics.in_flight.dec()
+
+    def _failover(self, query, candidates, pinned, read_only, deadline, stats):
+        outcome = None
+        for endpoint in candidates:
+            with self._router_lock:
+                endpoint.inflight += 1
+            start = time.time()
+            try:
+                outcome = _ophsubmit.submit(self.username, self.password, endpoint.server, endpoint.port, query, retry_policy=self.retry_policy,
+                                            connect_timeout=self.connect_timeout, read_timeout=self.read_timeout, deadline=deadline,
+                                            stats=stats)
+            finally:
+                with self._router_lock:
+                    endpoint.inflight -= 1
+            response, jobid, newsession, return_value, error = outcome
+            error_class = _ophsubmit.RetryPolicy.classify(outcome)
+            if error_class in (_ophsubmit.CONNECT_ERROR, _ophsubmit.CONNECTION_ERROR, _ophsubmit.OPH_SERVER_NO_RESPONSE):
+                with self._router_lock:
+                    endpoint.healthy = False
+                    endpoint.failures += 1
+                    endpoint.last_check = time.time()
+                # A request that may have reached the server is submitted again only if it cannot change anything
+                if pinned is None and (error_class == _ophsubmit.CONNECT_ERROR or read_only):
+                    _logger.warning("Endpoint %s:%s is not responding, trying the next one", endpoint.server, endpoint.port)
+                    continue
+                break
+            if error_class == _ophsubmit.DEADLINE_EXCEEDED:
+                # Not a sign of health, and no time is left to try another endpoint
+                break
+            self._served.endpoint = endpoint
+            with self._router_lock:
+                self._record(endpoint, time.time() - start)
+                if newsession:
+                    self._bind(newsession, endpoint)
+                self.server = endpoint.server
+                self.port = endpoint.port
+            break
+        return outcome
@@ -0,0 +1,209 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import sys
+import os
+import json
+import time
+import threading
+import logging
+from PyOphidia.cube import Cube
+from PyOphidia.collection import CubeCollection
+sys.path.append(os.path.dirname(__file__))
+
+
+_logger = logging.getLogger(__name__)
+
+
+class AppendManager():
+    """AppendManager(head=None, measure=None, imp_dim='time', batch_size=8, max_delay=None, retire=True, path=None, client=None, ncores=1, nthreads=1,
+                     import_arguments=None, concat_arguments=None) -> obj : incremental ingestion of a time series of NetCDF files
+
+    The manager keeps the PID of the latest cube of the series (the head). New files are queued with add and appended in batches, when batch_size
+    files are pending or the oldest one has been waiting for max_delay seconds: each file is appended to the head with OPH_CONCATNC2 and
+    dim_continue=yes, and the superseded heads are retired with a single massive OPH_DELETE, so that the server keeps one cube per series.
+    If the series is empty, the first file is imported with OPH_IMPORTNC2. When path is given, the head and the pending files are saved to that
+    JSON file, so that ingestion can be resumed after a restart.
+
+    Attributes:
+        head: PID of the latest cube of the series or None
+        pending: list of the files waiting to be appended
+        retired: list of the PIDs of the retired cubes
+        batch_size: number of pending files triggering an append
+        max_delay: maximum number of seconds a file can be pending or None
+        retire: if True superseded heads are deleted (including the initial one)
+
+    Methods:
+        add(*src_paths) -> str or None : Queue new files and append them if a batch is ready; return the head PID.
+        flush(deadline=None) -> str or None : Append all the pending files; return the head PID.
+        cube() -> Cube or None : Return the head as a Cube object.
+    """
+
+    def __init__(self, head=None, measure=None, imp_dim='time', batch_size=8, max_delay=None, retire=True, path=None, client=None, ncores=1, nthreads=1,
+                 import_arguments=None, concat_arguments=None):
+        """AppendManager(head=None, measure=None, imp_dim='time', batch_size=8, max_delay=None, retire=True, path=None, client=None, ncores=1, nthreads=1,
+                         import_arguments=None, concat_arguments=None) -> obj
+        :param head: Cube or PID of the current cube of the series (default is an empty series, or the one saved in path)
+        :type head: Cube or str
+        :param measure: name of the measure, used to import the first file of an empty series
+        :type measure: str
+        :param imp_dim: implicit dimension along which files are appended
+        :type imp_dim: str
+        :param batch_size: number of pending files triggering an append
+        :type batch_size: int
+        :param max_delay: maximum number of seconds a file can be pending (default is no limit)
+        :type max_delay: float
+        :param retire: if True delete the superseded heads
+        :type retire: bool
+        :param path: JSON file the state of the series is saved to (default is memory only)
+        :type path: str
+        :param client: instance of class Client (default is Cube.active_client())
+        :type client: Client
+        :param ncores: number of cores of each operation
+        :type ncores: int
+        :param nthreads: number of threads of each operation
+        :type nthreads: int
+        :param import_arguments: additional arguments of OPH_IMPORTNC2 (e.g. {'exp_dim': 'lat|lon', 'container': 'tas'})
+        :type import_arguments: dict
+        :param concat_arguments: additional arguments of OPH_CONCATNC2 (e.g. {'check_exp_dim': 'no'})
+        :type concat_arguments: dict
+        :returns: None
+        :rtype: None
+        :raises: RuntimeError
+        """
+
+        self.client = client if client is not None else Cube.active_client()
+        if self.client is None:
+            raise RuntimeError('Cube.client is None')
+        self.head = str(getattr(head, 'pid', head)) if head is not None else None
+        self.measure = measure
+        self.imp_dim = imp_dim
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.retire = retire
+        self.path = path
+        self.ncores = ncores
+        self.nthreads = nthreads
+        self.import_arguments = dict(import_arguments or {})
+        self.concat_arguments = dict(concat_arguments or {})
+        self.pending = []
+        self.retired = []
+        self._since = None
+        self._lock = threading.RLock()
+        if path and os.path.isfile(path):
+            try:
+                with open(path, 'r') as f:
+                    state = json.load(f)
+                if self.head is None:
+                    self.head = state.get('head')
+                self.pending = list(state.get('pending', []))
+                if self.pending:
+                    self._since = time.time()
+            except (IOError, OSError, ValueError) as e:
+                _logger.warning("Unable to load the state of the series: %s", e)
+
+    def cube(self):
+        """cube() -> Cube or None : Return the head as a Cube object
+        :returns: head cube or None
+        :rtype: Cube or None
+        """
+
+        head = self.head
+        return Cube(pid=head, client=self.client) if head else None
+
+    def add(self, *src_paths):
+        """add(*src_paths) -> str or None : Queue new files and append them if a batch is ready
+        :param src_paths: paths of the new files
+        :type src_paths: str
+        :returns: PID of the head
+        :rtype: str or None
+        :raises: RuntimeError
+        """
+
+        with self._lock:
+            for src_path in src_paths:
+                if str(src_path) not in self.pending:
+                    self.pending.append(str(src_path))
+            if self.pending and self._since is None:
+                self._since = time.time()
+            self._save()
+            if len(self.pending) >= self.batch_size or (self.max_delay is not None and self._since is not None and time.time() - self._since >= self.max_delay):
+                return self.flush()
+            return self.head
+
+    def flush(self, deadline=None):
+        """flush(deadline=None) -> str or None : Append all the pending files to the series
+        :param deadline: maximum number of seconds the whole batch may take (default is no limit)
+        :type deadline: float
+        :returns: PID of the head
+        :rtype: str or None
+        :raises: RuntimeError
+        """
+
+        with self._lock:
+            expiry = None if deadline is None else time.time() + float(deadline)
+            superseded = []
+            try:
+                for src_path in sorted(self.pending):
+                    remaining = None if expiry is None else max(expiry - time.time(), 0.0)
+                    if self.head is None:
+                        if self.measure is None:
+                            raise RuntimeError('measure is needed to start a new series')
+                        query = 'oph_importnc2 exec_mode=sync;measure=' + str(self.measure) + ';imp_dim=' + str(self.imp_dim) + ';'
+                        arguments = self.import_arguments
+                    else:
+                        query = 'oph_concatnc2 exec_mode=sync;dim_continue=yes;cube=' + self.head + ';'
+                        arguments = self.concat_arguments
+                    query += 'src_path=' + src_path + ';ncores=' + str(self.ncores) + ';nthreads=' + str(self.nthreads) + ';'
+                    for key, value in arguments.items():
+                        if value is not None:
+                            query += str(key) + '=' + str(value) + ';'
+                    result = self.client.execute(query, deadline=remaining)
+                    if result is None or not result.cube:
+                        raise RuntimeError('unable to append ' + src_path)
+                    if self.head is not None:
+                        superseded.append(self.head)
+                    self.head = result.cube
+                    self.pending.remove(src_path)
+            finally:
+                if self.retire and superseded:
+                    try:
+                        CubeCollection(superseded, self.client).delete()
+                        self.retired.extend(superseded)
+                    except Exception as e:
+                        _logger.warning("Unable to retire the superseded cubes: %s", e)
+                self._since = time.time() if self.pending else None
+                self._save()
+            return self.head
+
+    def _save(self):
+        if not self.path:
+            return
+        temporary = self.path + '.tmp'
+        try:
+            with open(temporary, 'w') as f:
+                json.dump({'head': self.head, 'pending': self.pending}, f)
+            if hasattr(os, 'replace'):
+                os.replace(temporary, self.path)
+            else:
+                os.rename(temporary, self.path)
+        except (IOError, OSError) as e:
+            _logger.warning("Unable to save the state of the series: %s", e)
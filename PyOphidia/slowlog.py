@@ -0,0 +1,161 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import sys
+import os
+import re
+import time
+import logging
+import threading
+from PyOphidia.cache import parse_query
+sys.path.append(os.path.dirname(__file__))
+
+
+# Arguments whose values are never logged
+SECRET_ARGUMENTS = ('password', 'passwd', 'pwd', 'token', 'access_token', 'refresh_token', 'secret', 'credential', 'credentials', 'auth')
+
+_SECRET = re.compile(r'(?i)((?:^|[\s;"\[,{])(?:' + '|'.join(SECRET_ARGUMENTS) + r')\s*[=:]\s*"?)[^;"\]\s,}]*')
+_USERINFO = re.compile(r'(://[^/:@\s;"]+:)[^/@\s;"]+@')
+
+REDACTED = '***'
+
+
+def redact(text, secrets=()):
+    """redact(text, secrets=()) -> str : Return text with the values of the SECRET_ARGUMENTS, the passwords in URLs and the given secrets replaced by ***"""
+
+    text = _USERINFO.sub(r'\g<1>' + REDACTED + '@', _SECRET.sub(r'\g<1>' + REDACTED, str(text)))
+    for secret in secrets:
+        if secret and len(str(secret)) >= 4:
+            text = text.replace(str(secret), REDACTED)
+    return text
+
+
+class SlowRequestLog():
+    """SlowRequestLog(wall_threshold=30.0, exec_threshold=None, thresholds=None, rate=10, per=60.0, max_length=None, logger='PyOphidia.slow') -> obj :
+    log of the requests slower than a threshold
+
+    When set as Client.slow_log, every request (Client.submit, Client.wsubmit, Cube wrappers, etc.) whose wall time on the client exceeds
+    wall_threshold, or whose execution time reported by the server exceeds exec_threshold, is logged as a warning with the request (credentials
+    redacted), the job ID, the phase timings and the size of the response. At most rate messages are written every per seconds; the number of
+    slow requests suppressed in the meantime is reported with the next message.
+
+    Attributes:
+        wall_threshold: seconds of wall time above which a request is logged (None to disable)
+        exec_threshold: seconds of server execution time above which a request is logged (None to disable)
+        thresholds: dict mapping operators to their own wall and execution time threshold
+        rate: maximum number of messages per period
+        per: length of the period in seconds
+        max_length: maximum number of characters of the logged request (None for the full request)
+        logger: logging.Logger the messages are written to
+        logged: number of slow requests logged
+        suppressed: number of slow requests not logged because of the rate limit
+
+    Methods:
+        check(client, query, timings, exec_time=None, jobid=None, return_value=0) -> bool : Log the request if it is slow; return True if it is.
+    """
+
+    def __init__(self, wall_threshold=30.0, exec_threshold=None, thresholds=None, rate=10, per=60.0, max_length=None, logger='PyOphidia.slow'):
+        """SlowRequestLog(wall_threshold=30.0, exec_threshold=None, thresholds=None, rate=10, per=60.0, max_length=None, logger='PyOphidia.slow') -> obj
+        :param wall_threshold: seconds of wall time above which a request is logged (None to disable)
+        :type wall_threshold: float
+        :param exec_threshold: seconds of server execution time above which a request is logged (default is wall_threshold)
+        :type exec_threshold: float
+        :param thresholds: dict mapping operators (e.g. 'oph_importnc2') to their own threshold in seconds
+        :type thresholds: dict
+        :param rate: maximum number of messages per period
+        :type rate: int
+        :param per: length of the period in seconds
+        :type per: float
+        :param max_length: maximum number of characters of the logged request (default is the full request)
+        :type max_length: int
+        :param logger: logger or name of the logger
+        :type logger: logging.Logger or str
+        :returns: None
+        :rtype: None
+        """
+
+        self.wall_threshold = wall_threshold
+        self.exec_threshold = exec_threshold if exec_threshold is not None else wall_threshold
+        self.thresholds = dict((str(key).lower(), value) for key, value in (thresholds or {}).items())
+        self.rate = rate
+        self.per = per
+        self.max_length = max_length
+        self.logger = logging.getLogger(logger) if not isinstance(logger, logging.Logger) else logger
+        self.logged = 0
+        self.suppressed = 0
+        self._allowance = float(rate)
+        self._checked = time.time()
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        # Token bucket refilled at rate messages every per seconds
+        with self._lock:
+            now = time.time()
+            self._allowance = min(float(self.rate), self._allowance + (now - self._checked) * self.rate / float(self.per))
+            self._checked = now
+            if self._allowance < 1.0:
+                self._pending += 1
+                self.suppressed += 1
+                return None
+            self._allowance -= 1.0
+            self.logged += 1
+            pending, self._pending = self._pending, 0
+            return pending
+
+    def check(self, client, query, timings, exec_time=None, jobid=None, return_value=0):
+        """check(client, query, timings, exec_time=None, jobid=None, return_value=0) -> bool : Log the request if it is slow
+        :param client: Client that submitted the request
+        :type client: Client
+        :param query: submitted query or workflow
+        :type query: str
+        :param timings: phase durations and bytes (see Result.timings)
+        :type timings: dict
+        :param exec_time: execution time reported by the server
+        :type exec_time: float
+        :param jobid: job ID of the request
+        :type jobid: str
+        :param return_value: return value of the request
+        :type return_value: int
+        :returns: True if the request is slow
+        :rtype: bool
+        """
+
+        operator = 'workflow' if str(query).lstrip().startswith('{') else parse_query(query)[0]
+        wall_threshold = self.thresholds.get(operator, self.wall_threshold)
+        exec_threshold = self.thresholds.get(operator, self.exec_threshold)
+        wall_time = timings.get('total')
+        slow = (wall_threshold is not None and wall_time is not None and wall_time > wall_threshold) or \
+            (exec_threshold is not None and exec_time is not None and exec_time > exec_threshold)
+        if not slow:
+            return False
+        pending = self._acquire()
+        if pending is None:
+            return True
+        request = redact(query, (getattr(client, 'password', None),))
+        if self.max_length and len(request) > self.max_length:
+            request = request[:self.max_length] + '...'
+        phases = ' '.join('%s=%.3f' % (phase, value) for phase, value in sorted(timings.items()) if phase not in ('sent', 'received', 'total'))
+        self.logger.warning('Slow request %s: wall time %.3f s, execution time %s s, return value %s, job %s, %d bytes sent, %d bytes received, '
+                            'phases [%s]%s, request: %s', operator, wall_time or 0.0, '-' if exec_time is None else '%.3f' % exec_time, return_value,
+                            jobid, timings.get('sent', 0), timings.get('received', 0), phases,
+                            ' (%d slow requests not logged)' % pending if pending else '', request)
+        return True
@@ -0,0 +1,412 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import sys
+import os
+import time
+import threading
+from collections import deque, OrderedDict
+import logging
+from PyOphidia.lifecycle import describe as _describe
+try:
+    import sqlite3
+except ImportError:
+    sqlite3 = None
+sys.path.append(os.path.dirname(__file__))
+
+
+_logger = logging.getLogger(__name__)
+
+
+# Fields of each record, in the order of the columns of the SQLite table
+FIELDS = ('timestamp', 'operator', 'ncores', 'nthreads', 'nfrag', 'nhost', 'input_size', 'exec_time', 'wall_time', 'bytes_sent', 'bytes_received',
+          'return_value', 'source', 'cube')
+
+# Fields summarized by default
+METRICS = ('exec_time', 'wall_time', 'bytes_sent', 'bytes_received')
+
+_SCHEMA = ('CREATE TABLE IF NOT EXISTS requests (timestamp REAL, operator TEXT, ncores INTEGER, nthreads INTEGER, nfrag INTEGER, nhost INTEGER, '
+           'input_size REAL, exec_time REAL, wall_time REAL, bytes_sent INTEGER, bytes_received INTEGER, return_value INTEGER, source TEXT, cube TEXT)')
+
+
+def percentile(values, p):
+    """percentile(values, p) -> float or None : Return the p-th percentile (0-100) of values, interpolating between the closest ranks"""
+
+    values = sorted(values)
+    if not values:
+        return None
+    rank = (len(values) - 1) * float(p) / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (rank - lower)
+
+
+class TelemetryRecorder():
+    """TelemetryRecorder(capacity=10000, path=None, flush_every=1000, describe_cubes=True) -> obj : history of the requests submitted by a Client
+
+    When set as Client.telemetry, a record is added for every request with the operator, the parallelism arguments (ncores, nthreads, nhost),
+    the size (MB) and the number of fragments (nfrag) of the input cube, the execution time reported by the server, the wall time measured by
+    the client, the number of bytes sent and received, the return value and the source of the response ('server', 'cache' or 'memo').
+    The input cube of the operators creating a cube from scratch (e.g. OPH_IMPORTNC2) is their output cube. Cubes never change, so each one is
+    described only once, with OPH_CUBESCHEMA (and OPH_CUBESIZE the first time), and the descriptions of the most recent capacity cubes are kept.
+    The most recent records are kept in a bounded ring buffer; when path is given they are also appended to that SQLite file every
+    flush_every records (and on flush), so that the history outlives the process.
+
+    Attributes:
+        capacity: maximum number of records (and of cube descriptions) kept in memory
+        path: SQLite file the records are flushed to or None
+        flush_every: number of new records triggering a flush (0 to flush only on demand)
+        describe_cubes: if True look up the size and the number of fragments of the input cubes, otherwise record the nfrag argument
+
+    Methods:
+        record(**fields) -> dict : Add a record (missing fields are None).
+        describe(client, pid) -> dict : Return the size (MB) and the number of fragments of a cube.
+        records(operator=None, since=None, until=None, stored=False) -> list : Return the records matching the filters.
+        summary(field='exec_time', operator=None, since=None, until=None, percentiles=(50, 90, 99), stored=False) -> dict : Return per-operator
+            count, mean, max and percentiles of a field.
+        hot(n=10, field='exec_time', since=None, until=None, stored=False) -> list : Return the n operators with the highest total of a field.
+        flush() -> int : Append the records not yet flushed to the SQLite file.
+        clear() -> self : Drop the records kept in memory.
+    """
+
+    def __init__(self, capacity=10000, path=None, flush_every=1000, describe_cubes=True):
+        """TelemetryRecorder(capacity=10000, path=None, flush_every=1000, describe_cubes=True) -> obj
+        :param capacity: maximum number of records (and of cube descriptions) kept in memory
+        :type capacity: int
+        :param path: SQLite file the records are flushed to (default is memory only)
+        :type path: str
+        :param flush_every: number of new records triggering a flush (0 to flush only on demand)
+        :type flush_every: int
+        :param describe_cubes: if True look up the size and the number of fragments of the input cubes
+        :type describe_cubes: bool
+        :returns: None
+        :rtype: None
+        :raises: RuntimeError
+        """
+
+        if path and sqlite3 is None:
+            raise RuntimeError('sqlite3 module is not available')
+        self.capacity = capacity
+        self.path = path
+        self.flush_every = flush_every
+        self.describe_cubes = describe_cubes
+        self._records = deque(maxlen=int(capacity))
+        self._cubes = OrderedDict()
+        self._unflushed = []
+        self._lock = threading.Lock()
+        if path:
+            self._connect().close()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute(_SCHEMA)
+        return connection
+
+    def record(self, **fields):
+        """record(**fields) -> dict : Add a record
+        :param fields: values of the fields listed in FIELDS (timestamp defaults to the current time)
+        :type fields: dict
+        :returns: record
+        :rtype: dict
+        """
+
+        entry = dict((field, fields.get(field)) for field in FIELDS)
+        if entry['timestamp'] is None:
+            entry['timestamp'] = time.time()
+        with self._lock:
+            self._records.append(entry)
+            if self.path:
+                self._unflushed.append(entry)
+                full = self.flush_every and len(self._unflushed) >= self.flush_every
+            else:
+                full = False
+        if full:
+            self.flush()
+        return entry
+
+    def describe(self, client, pid):
+        """describe(client, pid) -> dict : Return the size (MB) and the number of fragments of a cube, looked up once with OPH_CUBESCHEMA
+        (and OPH_CUBESIZE) without changing the state of client
+        :param client: instance of class Client
+        :type client: Client
+        :param pid: PID of the cube
+        :type pid: str
+        :returns: dict with keys 'size' and 'nfragments' (None if unknown)
+        :rtype: dict
+        """
+
+        with self._lock:
+            facts = self._cubes.pop(pid, None)
+            if facts is not None:
+                self._cubes[pid] = facts
+                return facts
+        facts = _describe(client, pid, 'MB')
+        if facts['nfragments'] is None:
+            # The cube may be there later on (or the server may be reachable again)
+            return facts
+        with self._lock:
+            self._cubes[pid] = facts
+            while len(self._cubes) > int(self.capacity):
+                self._cubes.popitem(last=False)
+        return facts
+
+    def flush(self):
+        """flush() -> int : Append the records not yet flushed to the SQLite file
+        :returns: number of records written
+        :rtype: int
+        """
+
+        if not self.path:
+            return 0
+        with self._lock:
+            pending, self._unflushed = self._unflushed, []
+        if not pending:
+            return 0
+        try:
+            connection = self._connect()
+            try:
+                with connection:
+                    connection.executemany('INSERT INTO requests VALUES (' + ', '.join('?' * len(FIELDS)) + ')',
+                                           [tuple(entry[field] for field in FIELDS) for entry in pending])
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            _logger.warning("Unable to flush the telemetry records: %s", e)
+            with self._lock:
+                self._unflushed = pending + self._unflushed
+            return 0
+        return len(pending)
+
+    def clear(self):
+        """clear() -> self : Drop the records kept in memory (the ones already flushed stay in the SQLite file)
+        :returns: self
+        :rtype: TelemetryRecorder
+        """
+
+        with self._lock:
+            self._records.clear()
+        return self
+
+    def records(self, operator=None, since=None, until=None, stored=False):
+        """records(operator=None, since=None, until=None, stored=False) -> list : Return the records matching the filters, from the oldest
+        :param operator: name of the operator (default is all)
+        :type operator: str
+        :param since: minimum timestamp (as given by time.time())
+        :type since: float
+        :param until: maximum timestamp (excluded)
+        :type until: float
+        :param stored: if True read the whole history from the SQLite file (records not yet flushed included) instead of the ring buffer
+        :type stored: bool
+        :returns: list of dicts
+        :rtype: list
+        """
+
+        if stored and self.path:
+            self.flush()
+            conditions, parameters = [], []
+            for condition, value in (('operator = ?', operator), ('timestamp >= ?', since), ('timestamp < ?', until)):
+                if value is not None:
+                    conditions.append(condition)
+                    parameters.append(value.lower() if condition.startswith('operator') else value)
+            connection = self._connect()
+            try:
+                rows = connection.execute('SELECT ' + ', '.join(FIELDS) + ' FROM requests' + (' WHERE ' + ' AND '.join(conditions) if conditions else '') +
+                                          ' ORDER BY timestamp', parameters).fetchall()
+            finally:
+                connection.close()
+            return [dict(zip(FIELDS, row)) for row in rows]
+        with self._lock:
+            entries = list(self._records)
+        return [entry for entry in entries if (operator is None or entry['operator'] == operator.lower()) and (since is None or entry['timestamp'] >= since) and
+                (until is None or entry['timestamp'] < until)]
+
+    def summary(self, field='exec_time', operator=None, since=None, until=None, percentiles=(50, 90, 99), stored=False):
+        """summary(field='exec_time', operator=None, since=None, until=None, percentiles=(50, 90, 99), stored=False) -> dict : Return per-operator
+        statistics of a field; comparing the summaries of two time windows shows the regressions
+        :param field: one of METRICS or any numeric field
+        :type field: str
+        :param operator: name of the operator (default is all)
+        :type operator: str
+        :param since: minimum timestamp
+        :type since: float
+        :param until: maximum timestamp (excluded)
+        :type until: float
+        :param percentiles: percentiles (0-100) to compute
+        :type percentiles: tuple
+        :param stored: if True use the whole history in the SQLite file
+        :type stored: bool
+        :returns: dict mapping each operator to a dict with keys 'count', 'mean', 'max' and 'p50', 'p90', etc.
+        :rtype: dict
+        """
+
+        values = {}
+        for entry in self.records(operator, since, until, stored):
+            if entry.get(field) is not None:
+                values.setdefault(entry['operator'], []).append(float(entry[field]))
+        summary = {}
+        for name, series in values.items():
+            stats = {'count': len(series), 'mean': sum(series) / len(series), 'max': max(series)}
+            for p in percentiles:
+                stats['p' + ('%g' % p)] = percentile(series, p)
+            summary[name] = stats
+        return summary
+
+    def hot(self, n=10, field='exec_time', since=None, until=None, stored=False):
+        """hot(n=10, field='exec_time', since=None, until=None, stored=False) -> list : Return the n operators with the highest total of a field
+        :param n: number of operators
+        :type n: int
+        :param field: one of METRICS or any numeric field
+        :type field: str
+        :param since: minimum timestamp
+        :type since: float
+        :param until: maximum timestamp (excluded)
+        :type until: float
+        :param stored: if True use the whole history in the SQLite file
+        :type stored: bool
+        :returns: list of (operator, total, count) tuples, from the hottest
+        :rtype: list
+        """
+
+        totals = {}
+        for entry in self.records(None, since, until, stored):
+            if entry.get(field) is not None:
+                total, count = totals.get(entry['operator'], (0.0, 0))
+                totals[entry['operator']] = (total + float(entry[field]), count + 1)
+        ranking = sorted(((name, total, count) for name, (total, count) in totals.items()), key=lambda item: item[1], reverse=True)
+        return ranking[:n]
+
+
+class PhaseHistograms():
+    """PhaseHistograms(time_bounds=None, byte_bounds=None) -> obj : histograms of the phase durations and sizes of the requests
+
+    Instances are meant to be added to Client.hooks: each call adds the timings of a request (see Result.timings) to one histogram per phase,
+    with exponential buckets, so that the distribution of connection, upload, wait, download and decoding times can be compared.
+
+    Attributes:
+        time_bounds: upper bounds (seconds) of the duration buckets, the last bucket being unbounded
+        byte_bounds: upper bounds (bytes) of the size buckets used for 'sent' and 'received'
+        counts: dict mapping each phase to the list of the counts of its buckets
+        totals: dict mapping each phase to the sum of its values
+
+    Methods:
+        histogram(phase) -> list : Return the (upper bound, count) pairs of a phase.
+        percentile(phase, p) -> float or None : Return the upper bound of the bucket containing the p-th percentile of a phase.
+        summary(percentiles=(50, 90, 99)) -> dict : Return count, mean and percentiles of each phase.
+        reset() -> self : Drop all the values.
+    """
+
+    def __init__(self, time_bounds=None, byte_bounds=None):
+        """PhaseHistograms(time_bounds=None, byte_bounds=None) -> obj
+        :param time_bounds: upper bounds (seconds) of the duration buckets (default is powers of 2 from 1 ms to about 17 minutes)
+        :type time_bounds: list
+        :param byte_bounds: upper bounds (bytes) of the size buckets (default is powers of 4 from 1 KB to 1 GB)
+        :type byte_bounds: list
+        :returns: None
+        :rtype: None
+        """
+
+        self.time_bounds = sorted(time_bounds) if time_bounds else [0.001 * 2 ** k for k in range(21)]
+        self.byte_bounds = sorted(byte_bounds) if byte_bounds else [1024 * 4 ** k for k in range(11)]
+        self.counts = {}
+        self.totals = {}
+        self._lock = threading.Lock()
+
+    def _bounds(self, phase):
+        return self.byte_bounds if phase in ('sent', 'received') else self.time_bounds
+
+    def __call__(self, query, timings):
+        with self._lock:
+            for phase, value in timings.items():
+                bounds = self._bounds(phase)
+                counts = self.counts.setdefault(phase, [0] * (len(bounds) + 1))
+                bucket = 0
+                while bucket < len(bounds) and value > bounds[bucket]:
+                    bucket += 1
+                counts[bucket] += 1
+                self.totals[phase] = self.totals.get(phase, 0) + value
+
+    def histogram(self, phase):
+        """histogram(phase) -> list : Return the (upper bound, count) pairs of a phase, the last bound being None (unbounded)
+        :param phase: name of the phase (see ophsubmit.PHASES), 'decode', 'total', 'sent' or 'received'
+        :type phase: str
+        :returns: list of tuples
+        :rtype: list
+        """
+
+        with self._lock:
+            counts = list(self.counts.get(phase, []))
+        return list(zip(self._bounds(phase) + [None], counts))
+
+    def percentile(self, phase, p):
+        """percentile(phase, p) -> float or None : Return the upper bound of the bucket containing the p-th percentile (0-100) of a phase
+        :param phase: name of the phase
+        :type phase: str
+        :param p: percentile
+        :type p: float
+        :returns: upper bound (None if the phase has no values, or float('inf') for the unbounded bucket)
+        :rtype: float or None
+        """
+
+        buckets = self.histogram(phase)
+        total = sum(count for bound, count in buckets)
+        if not total:
+            return None
+        seen = 0
+        for bound, count in buckets:
+            seen += count
+            if seen >= total * float(p) / 100.0:
+                return bound if bound is not None else float('inf')
+        return float('inf')
+
+    def summary(self, percentiles=(50, 90, 99)):
+        """summary(percentiles=(50, 90, 99)) -> dict : Return count, mean and approximate percentiles of each phase
+        :param percentiles: percentiles (0-100) to compute
+        :type percentiles: tuple
+        :returns: dict mapping each phase to a dict with keys 'count', 'mean' and 'p50', 'p90', etc.
+        :rtype: dict
+        """
+
+        with self._lock:
+            phases = [(phase, sum(counts), self.totals.get(phase, 0)) for phase, counts in self.counts.items()]
+        summary = {}
+        for phase, count, total in phases:
+            stats = {'count': count, 'mean': total / count if count else None}
+            for p in percentiles:
+                stats['p' + ('%g' % p)] = self.percentile(phase, p)
+            summary[phase] = stats
+        return summary
+
+    def reset(self):
+        """reset() -> self : Drop all the values
+        :returns: self
+        :rtype: PhaseHistograms
+        """
+
+        with self._lock:
+            self.counts = {}
+            self.totals = {}
+        return self
+
+    def __str__(self):
+        lines = ['%-10s %8s %12s %12s %12s' % ('PHASE', 'COUNT', 'MEAN', 'P50', 'P99')]
+        for phase, stats in sorted(self.summary((50, 99)).items()):
+            lines.append('%-10s %8d %12.6g %12.6g %12.6g' % (phase, stats['count'], stats['mean'], stats['p50'], stats['p99']))
+        return '\n'.join(lines)
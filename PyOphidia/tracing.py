@@ -0,0 +1,381 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import sys
+import os
+import json
+import time
+import binascii
+import threading
+from collections import deque, OrderedDict
+import logging
+import PyOphidia.ophsubmit as _ophsubmit
+from PyOphidia.cache import parse_query
+try:
+    import contextvars
+except ImportError:
+    contextvars = None
+try:
+    from opentelemetry import trace as _otel
+except ImportError:
+    _otel = None
+sys.path.append(os.path.dirname(__file__))
+
+
+_logger = logging.getLogger(__name__)
+
+
+# Phases of a request in the order they occur (see ophsubmit.PHASES), followed by the JSON decoding on the client
+PHASES = tuple(phase for phase in _ophsubmit.PHASES if phase != 'backoff') + ('backoff', 'decode')
+
+# Date format used by the server in the task listings
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Innermost open span: a context variable when available (as for Cube.using), a thread-local otherwise
+if contextvars is not None:
+    _current = contextvars.ContextVar('PyOphidia_span', default=None)
+else:
+    _current = threading.local()
+
+
+def _get_current():
+    if contextvars is not None:
+        return _current.get()
+    return getattr(_current, 'span', None)
+
+
+def _set_current(span):
+    if contextvars is not None:
+        return _current.set(span)
+    previous = getattr(_current, 'span', None)
+    _current.span = span
+    return previous
+
+
+def _reset_current(token):
+    if contextvars is not None:
+        _current.reset(token)
+    else:
+        _current.span = token
+
+
+def _new_id(size):
+    return binascii.hexlify(os.urandom(size)).decode('ascii')
+
+
+def _parse_date(value):
+    try:
+        return time.mktime(time.strptime(str(value).strip()[:19], DATE_FORMAT))
+    except (ValueError, OverflowError):
+        return None
+
+
+class Span():
+    """Span(name, trace_id=None, parent_id=None, start=None, attributes=None) -> obj : timed operation of a trace
+
+    Attributes:
+        name: name of the span
+        trace_id: ID of the trace (32 hexadecimal digits)
+        span_id: ID of the span (16 hexadecimal digits)
+        parent_id: ID of the parent span or None
+        start: start time (as given by time.time())
+        end: end time or None while the span is open
+        attributes: dict of attributes
+        status: 'ok' or 'error'
+
+    Methods:
+        set_attribute(key, value) -> self : Set an attribute of the span.
+        to_dict() -> dict : Return the span as a dict.
+    """
+
+    def __init__(self, name, trace_id=None, parent_id=None, start=None, attributes=None):
+        self.name = name
+        self.trace_id = trace_id or _new_id(16)
+        self.span_id = _new_id(8)
+        self.parent_id = parent_id
+        self.start = time.time() if start is None else start
+        self.end = None
+        self.attributes = dict(attributes or {})
+        self.status = 'ok'
+        self._otel = None
+
+    def __repr__(self):
+        return 'Span(' + self.name + ', ' + self.span_id + ')'
+
+    def set_attribute(self, key, value):
+        """set_attribute(key, value) -> self : Set an attribute of the span
+        :param key: attribute name
+        :type key: str
+        :param value: attribute value (str, bool, int or float)
+        :type value: object
+        :returns: self
+        :rtype: Span
+        """
+
+        self.attributes[key] = value
+        return self
+
+    def to_dict(self):
+        """to_dict() -> dict : Return the span as a dict
+        :returns: span
+        :rtype: dict
+        """
+
+        return {'name': self.name, 'trace_id': self.trace_id, 'span_id': self.span_id, 'parent_id': self.parent_id, 'start': self.start, 'end': self.end,
+                'duration': self.end - self.start if self.end is not None else None, 'status': self.status, 'attributes': self.attributes}
+
+
+class Tracer():
+    """Tracer(path=None, opentelemetry=True, resume_tasks=False, capacity=1000) -> obj : span-based tracing of the requests
+
+    When set as Client.tracer, a span is created for every request (Client.submit, Client.wsubmit, Cube wrappers, etc.), child of the span
+    open in the current thread (or asyncio task), if any. Its children are the phases of the request (see Result.timings), laid out in order
+    from the start of the request; for workflows, when resume_tasks is True, a child span is also added for each task listed by OPH_RESUME,
+    with the dates reported by the server. The listing costs an additional request, submitted right after synchronous workflows and, for
+    asynchronous ones (Client.wsubmit_async), by the poller once the Job is done. Finished spans are kept in memory, appended to the JSON-lines file path and, when the
+    opentelemetry package is installed, forwarded to the OpenTelemetry tracer provider.
+
+    Example:
+        client.tracer = Tracer(path='trace.jsonl')
+        with client.tracer.span('pipeline', experiment='tas'):
+            cube.reduce(operation='avg')
+
+    Attributes:
+        path: JSON-lines file the spans are appended to or None
+        resume_tasks: if True reconstruct the task spans of the workflows
+        spans: most recent finished spans (up to capacity)
+
+    Methods:
+        span(name, **attributes) -> Span : Context manager opening a span in the current thread (or asyncio task).
+        current() -> Span or None : Return the innermost open span.
+        start_span(name, parent=None, start=None, **attributes) -> Span : Open a span without making it current.
+        end_span(span, end=None) -> Span : Close and export a span.
+        trace_job(job) -> None : Add the task spans of an asynchronous workflow once its Job is done.
+    """
+
+    def __init__(self, path=None, opentelemetry=True, resume_tasks=False, capacity=1000):
+        """Tracer(path=None, opentelemetry=True, resume_tasks=False, capacity=1000) -> obj
+        :param path: JSON-lines file the spans are appended to (default is memory only)
+        :type path: str
+        :param opentelemetry: if True forward the spans to OpenTelemetry when the package is installed
+        :type opentelemetry: bool
+        :param resume_tasks: if True add a span for each task of the workflows, listed with an additional OPH_RESUME request
+        :type resume_tasks: bool
+        :param capacity: number of finished spans kept in memory
+        :type capacity: int
+        :returns: None
+        :rtype: None
+        """
+
+        self.path = path
+        self.resume_tasks = resume_tasks
+        self.spans = deque(maxlen=int(capacity))
+        self.capacity = int(capacity)
+        # Spans of the asynchronous workflows whose tasks are added when their Job is done
+        self._jobs = OrderedDict()
+        self._otel = _otel.get_tracer('PyOphidia') if opentelemetry and _otel is not None else None
+        self._lock = threading.Lock()
+
+    def current(self):
+        """current() -> Span or None : Return the innermost open span of the current thread (or asyncio task)
+        :returns: span or None
+        :rtype: Span or None
+        """
+
+        return _get_current()
+
+    def start_span(self, name, parent=None, start=None, **attributes):
+        """start_span(name, parent=None, start=None, **attributes) -> Span : Open a span without making it current
+        :param name: name of the span
+        :type name: str
+        :param parent: parent span (default is the current span)
+        :type parent: Span
+        :param start: start time (default is now)
+        :type start: float
+        :param attributes: attributes of the span
+        :type attributes: dict
+        :returns: span
+        :rtype: Span
+        """
+
+        if parent is None:
+            parent = _get_current()
+        span = Span(name, parent.trace_id if parent is not None else None, parent.span_id if parent is not None else None, start, attributes)
+        if self._otel is not None:
+            try:
+                context = _otel.set_span_in_context(parent._otel) if parent is not None and parent._otel is not None else None
+                span._otel = self._otel.start_span(name, context=context, start_time=int(span.start * 1e9))
+            except Exception as e:
+                _logger.warning("Unable to start the OpenTelemetry span: %s", e)
+        return span
+
+    def end_span(self, span, end=None):
+        """end_span(span, end=None) -> Span : Close and export a span
+        :param span: span to be closed
+        :type span: Span
+        :param end: end time (default is now)
+        :type end: float
+        :returns: the same span
+        :rtype: Span
+        """
+
+        span.end = time.time() if end is None else end
+        if span._otel is not None:
+            try:
+                for key, value in span.attributes.items():
+                    if value is not None:
+                        span._otel.set_attribute(key, value if isinstance(value, (bool, int, float, str)) else str(value))
+                if span.status == 'error':
+                    span._otel.set_status(_otel.Status(_otel.StatusCode.ERROR))
+                span._otel.end(end_time=int(span.end * 1e9))
+            except Exception as e:
+                _logger.warning("Unable to export the OpenTelemetry span: %s", e)
+        with self._lock:
+            self.spans.append(span)
+            if self.path:
+                try:
+                    with open(self.path, 'a') as f:
+                        f.write(json.dumps(span.to_dict(), default=str) + '\n')
+                except (IOError, OSError) as e:
+                    _logger.warning("Unable to write the span: %s", e)
+        return span
+
+    def span(self, name, **attributes):
+        """span(name, **attributes) -> Span : Context manager opening a span in the current thread (or asyncio task)
+        :param name: name of the span
+        :type name: str
+        :param attributes: attributes of the span
+        :type attributes: dict
+        :returns: span
+        :rtype: Span
+        """
+
+        return _Scope(self, self.start_span(name, **attributes))
+
+    def trace_request(self, client, query, start, timings, exec_time, return_value, error, source, jobid, cube):
+        """trace_request(client, query, start, timings, exec_time, return_value, error, source, jobid, cube) -> Span : Record the spans of a
+        completed request (called by Client)"""
+
+        workflow = str(query).lstrip().startswith('{')
+        if workflow:
+            try:
+                name = 'workflow ' + str(json.loads(query).get('name', ''))
+            except ValueError:
+                name = 'workflow'
+            operator = 'workflow'
+        else:
+            operator = parse_query(query)[0]
+            name = operator
+        span = self.start_span(name, start=start)
+        span.attributes.update({'ophidia.operator': operator, 'ophidia.server': str(client.server) + ':' + str(client.port), 'ophidia.source': source,
+                                'ophidia.return_value': return_value, 'ophidia.exec_time': exec_time, 'ophidia.jobid': jobid, 'ophidia.cube': cube,
+                                'ophidia.bytes_sent': timings.get('sent', 0), 'ophidia.bytes_received': timings.get('received', 0)})
+        if return_value or error is not None:
+            span.status = 'error'
+            span.attributes['ophidia.error'] = str(error)
+        # Phase durations are accumulated over the retries, so the children are laid out one after the other
+        offset = start
+        for phase in PHASES:
+            if timings.get(phase):
+                child = self.start_span(phase, parent=span, start=offset)
+                offset += timings[phase]
+                self.end_span(child, offset)
+        end = start + timings['total'] if 'total' in timings else time.time()
+        if workflow and jobid and self.resume_tasks and source == 'server' and not return_value:
+            try:
+                asynchronous = str(json.loads(query).get('exec_mode', '')).lower() == 'async'
+            except ValueError:
+                asynchronous = False
+            if asynchronous:
+                # The workflow has not been executed yet: the tasks are listed by trace_job
+                with self._lock:
+                    self._jobs[jobid] = span
+                    while len(self._jobs) > self.capacity:
+                        self._jobs.popitem(last=False)
+            else:
+                self._trace_tasks(client, span, jobid, end)
+        return self.end_span(span, end)
+
+    def trace_job(self, job):
+        """trace_job(job) -> None : Add the task spans of an asynchronous workflow once its Job is done (registered by Client as a done callback)
+        :param job: completed job
+        :type job: Job
+        :returns: None
+        :rtype: None
+        """
+
+        with self._lock:
+            span = self._jobs.pop(job.jobid, None)
+        if span is not None:
+            self._trace_tasks(job.client, span, job.jobid, time.time())
+
+    def _trace_tasks(self, client, parent, jobid, end):
+        workflow_id = jobid.split('?')[-1].split('#')[0]
+        query = 'oph_resume exec_mode=sync;id=' + workflow_id + ';level=2;'
+        session = jobid.split('?')[0]
+        if session:
+            query += 'sessionid=' + session + ';'
+        try:
+            response, resume_jobid, newsession, return_value, error = client._coalesced_transport(query)
+            if return_value or response is None:
+                return
+            for obj in json.loads(response).get('response', []):
+                if obj.get('objclass') != 'grid':
+                    continue
+                for content in obj.get('objcontent', []):
+                    keys = [str(key).upper() for key in content.get('rowkeys', [])]
+                    names = [i for i, key in enumerate(keys) if 'NAME' in key]
+                    if not names:
+                        continue
+                    starts = [i for i, key in enumerate(keys) if 'START' in key or 'EXECUTION' in key or 'CREATION' in key]
+                    ends = [i for i, key in enumerate(keys) if 'END' in key or 'EXIT' in key]
+                    for row in content.get('rowvalues', []):
+                        task_start = _parse_date(row[starts[0]]) if starts else None
+                        task_end = _parse_date(row[ends[0]]) if ends else None
+                        child = self.start_span('task ' + str(row[names[0]]), parent=parent, start=task_start if task_start is not None else parent.start)
+                        for key, value in zip(keys, row):
+                            child.attributes['ophidia.task.' + key.lower().replace(' ', '_')] = value
+                        if 'ERROR' in ' '.join(str(value).upper() for value in row):
+                            child.status = 'error'
+                        self.end_span(child, task_end if task_end is not None else end)
+        except Exception as e:
+            _logger.warning("Unable to trace the tasks of workflow %s: %s", workflow_id, e)
+
+
+class _Scope():
+    # Context manager making a span current until it is closed
+
+    def __init__(self, tracer, span):
+        self.tracer = tracer
+        self.span = span
+        self._token = None
+
+    def __enter__(self):
+        self._token = _set_current(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _reset_current(self._token)
+        if exc_type is not None:
+            self.span.status = 'error'
+            self.span.attributes['error'] = str(exc_value)
+        self.tracer.end_span(self.span)
+        return False
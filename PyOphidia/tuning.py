@@ -0,0 +1,335 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import sys
+import os
+import json
+import math
+import time
+import threading
+import logging
+from PyOphidia.cache import parse_query
+from PyOphidia.client import set_argument
+import PyOphidia.lifecycle as _lifecycle
+sys.path.append(os.path.dirname(__file__))
+
+
+_logger = logging.getLogger(__name__)
+
+
+# Operators processing the fragments of their input cube in parallel
+FRAGMENT_OPERATORS = frozenset(['oph_aggregate', 'oph_aggregate2', 'oph_apply', 'oph_cubeelements', 'oph_cubesize', 'oph_delete', 'oph_drilldown', 'oph_duplicate',
+                                'oph_exportnc', 'oph_exportnc2', 'oph_intercube', 'oph_merge', 'oph_mergecubes', 'oph_mergecubes2', 'oph_permute', 'oph_publish',
+                                'oph_reduce', 'oph_reduce2', 'oph_rollup', 'oph_split', 'oph_subset', 'oph_subset2', 'oph_concatnc', 'oph_concatnc2'])
+
+# Operators creating a new cube from scratch
+IMPORT_OPERATORS = frozenset(['oph_importnc', 'oph_importnc2', 'oph_randcube', 'oph_randcube2'])
+
+# Parallelism arguments chosen by the tuner when they are left out of a request
+TUNABLE = ('ncores', 'nthreads', 'nfrag', 'nhost')
+
+
+class AutoTuner():
+    """AutoTuner(max_cores=None, max_threads=8, cores_per_host=4, small_size=64.0, alpha=0.3, explore_every=5, capacity_ttl=600.0) -> obj
+    Choice of ncores, nthreads, nfrag and nhost for each request
+
+    When a tuner is set as Client.tuner, the parallelism arguments left out of a request (the Cube wrappers leave them out unless they are
+    given) are chosen from the size and the fragmentation of the input cube (OPH_CUBESCHEMA, after OPH_CUBESIZE if needed) and from the
+    capacity of the cluster (OPH_INSTANCES); arguments set by hand, even to their default values, are left untouched. Imports share the cluster
+    with the other imports tuned at the same time and use a number of cores proportional to the size of the cubes already imported with the
+    same operator and measure (one host when it is not known yet). The execution times of the tuned requests are recorded for each operator and
+    size class: the number of cores with the best observed time is then preferred, and the neighbouring choices are tried every explore_every
+    requests.
+
+    Attributes:
+        max_cores: number of cores available to the user (default is the capacity of the cluster)
+        max_threads: maximum number of threads per core
+        cores_per_host: number of cores per host, used when the cluster does not report it
+        small_size: size (MB) below which a cube is processed by a single core
+        alpha: smoothing factor of the execution time moving averages
+        explore_every: number of requests between two attempts of a different number of cores (0 to disable)
+        history: dict mapping (operator, size class) to a dict mapping each tried number of cores to the average execution time
+
+    Methods:
+        tune(client, query) -> str : Return query with the parallelism arguments chosen for it.
+        tune_all(client, queries) -> list : Return the queries with the parallelism arguments chosen for them, as requests running at the same time.
+        observe(query, result) -> self : Record the execution time of a tuned request.
+        capacity(client) -> int : Return the number of cores available (discovered with OPH_INSTANCES).
+        describe(client, pid) -> dict : Return size (MB), nfragments, fragxdb and hostxcube of a cube.
+        known_size(pid) -> float or None : Return the size (MB) of a cube already described, without submitting any request.
+    """
+
+    def __init__(self, max_cores=None, max_threads=8, cores_per_host=4, small_size=64.0, alpha=0.3, explore_every=5, capacity_ttl=600.0):
+        """AutoTuner(max_cores=None, max_threads=8, cores_per_host=4, small_size=64.0, alpha=0.3, explore_every=5, capacity_ttl=600.0) -> obj
+        :param max_cores: number of cores available to the user (default is the capacity of the cluster)
+        :type max_cores: int
+        :param max_threads: maximum number of threads per core
+        :type max_threads: int
+        :param cores_per_host: number of cores per host, used when the cluster does not report it
+        :type cores_per_host: int
+        :param small_size: size (MB) below which a cube is processed by a single core
+        :type small_size: float
+        :param alpha: smoothing factor of the execution time moving averages
+        :type alpha: float
+        :param explore_every: number of requests between two attempts of a different number of cores (0 to disable)
+        :type explore_every: int
+        :param capacity_ttl: number of seconds the capacity of the cluster is cached
+        :type capacity_ttl: float
+        :returns: None
+        :rtype: None
+        """
+
+        self.max_cores = max_cores
+        self.max_threads = max_threads
+        self.cores_per_host = cores_per_host
+        self.small_size = small_size
+        self.alpha = alpha
+        self.explore_every = explore_every
+        self.capacity_ttl = capacity_ttl
+        self.history = {}
+        self._facts = {}
+        self._calls = {}
+        # Tuned imports still running and PIDs of the last cubes imported for each (operator, measure)
+        self._imports = {}
+        self._imported = {}
+        self._capacity = None
+        self._hosts = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def _request(self, client, query):
+        # Auxiliary requests do not change the state of the client
+        if client.session:
+            query += 'sessionid=' + client.session + ';'
+        response, jobid, newsession, return_value, error = client._coalesced_transport(query)
+        if return_value or response is None:
+            return None
+        return json.loads(response).get('response', [])
+
+    def capacity(self, client):
+        """capacity(client) -> int : Return the number of cores available, discovered with OPH_INSTANCES unless max_cores is set
+        :param client: instance of class Client
+        :type client: Client
+        :returns: number of cores
+        :rtype: int
+        """
+
+        if self.max_cores:
+            return int(self.max_cores)
+        with self._lock:
+            if self._capacity is not None and time.time() - self._checked < self.capacity_ttl:
+                return self._capacity
+        hosts, cores = 0, 0
+        try:
+            for obj in self._request(client, 'oph_instances exec_mode=sync;action=read;level=2;host_partition=all;') or []:
+                if obj.get('objclass') != 'grid':
+                    continue
+                for content in obj.get('objcontent', []):
+                    keys = [str(key).upper() for key in content.get('rowkeys', [])]
+                    rows = content.get('rowvalues', [])
+                    hosts = max(hosts, len(rows))
+                    for column, key in enumerate(keys):
+                        if 'CORE' in key:
+                            cores = max(cores, sum(int(row[column]) for row in rows if str(row[column]).isdigit()))
+        except Exception as e:
+            _logger.warning("Unable to read the capacity of the cluster: %s", e)
+        with self._lock:
+            self._hosts = max(hosts, 1)
+            self._capacity = cores if cores > 0 else self._hosts * int(self.cores_per_host)
+            self._checked = time.time()
+            return self._capacity
+
+    def describe(self, client, pid):
+        """describe(client, pid) -> dict : Return size (MB), nfragments, fragxdb and hostxcube of a cube (cubes never change, so they are cached)
+        :param client: instance of class Client
+        :type client: Client
+        :param pid: PID of the cube
+        :type pid: str
+        :returns: dict with keys 'size', 'nfragments', 'fragxdb' and 'hostxcube' (None if unknown)
+        :rtype: dict
+        """
+
+        with self._lock:
+            if pid in self._facts:
+                return self._facts[pid]
+        facts = _lifecycle.describe(client, pid, 'MB')
+        with self._lock:
+            self._facts[pid] = facts
+        return facts
+
+    def known_size(self, pid):
+        """known_size(pid) -> float or None : Return the size (MB) of a cube already described, without submitting any request
+        :param pid: PID of the cube
+        :type pid: str
+        :returns: size or None
+        :rtype: float or None
+        """
+
+        with self._lock:
+            return (self._facts.get(pid) or {}).get('size')
+
+    def _import_size(self, operator, measure):
+        # Average size of the cubes already imported with the same operator and measure, when known
+        with self._lock:
+            sizes = [(self._facts.get(pid) or {}).get('size') for pid in self._imported.get((operator, measure), [])]
+        sizes = [size for size in sizes if size is not None]
+        return sum(sizes) / len(sizes) if sizes else None
+
+    def _size_class(self, facts):
+        if facts is None or facts.get('size') is None:
+            return None
+        return int(math.log(facts['size'] + 1.0, 2))
+
+    def tune(self, client, query):
+        """tune(client, query) -> str : Return query with the parallelism arguments chosen for it
+        :param client: instance of class Client
+        :type client: Client
+        :param query: query like 'operator=myoperator;param1=value1;' or 'myoperator param1=value1;'
+        :type query: str
+        :returns: tuned query
+        :rtype: str
+        """
+
+        return self._tune(client, query, None)
+
+    def tune_all(self, client, queries):
+        """tune_all(client, queries) -> list : Return the queries with the parallelism arguments chosen for them, as requests running at the same time
+               (e.g. the tasks of a workflow): the imports share the cluster evenly; observe must be called for each tuned query
+        :param client: instance of class Client
+        :type client: Client
+        :param queries: queries like 'operator=myoperator;param1=value1;' or 'myoperator param1=value1;'
+        :type queries: list
+        :returns: tuned queries
+        :rtype: list
+        """
+
+        queries = list(queries)
+        with self._lock:
+            sharing = sum(self._imports.values()) + len([query for query in queries if parse_query(query)[0] in IMPORT_OPERATORS])
+        return [self._tune(client, query, sharing) for query in queries]
+
+    def _tune(self, client, query, sharing):
+        # sharing is the number of imports the cluster is shared with, including this one (by default the imports still running and this one)
+        operator, arguments = parse_query(query)
+        tunable = [key for key in TUNABLE if key not in arguments]
+        if not tunable or (operator not in FRAGMENT_OPERATORS and operator not in IMPORT_OPERATORS):
+            return query
+        capacity = self.capacity(client)
+        plan = {}
+        if operator in IMPORT_OPERATORS:
+            size = self._import_size(operator, arguments.get('measure'))
+            facts = {'size': size}
+            with self._lock:
+                # The cluster is shared with the imports still running
+                upper = max(1, capacity // (sharing if sharing else sum(self._imports.values()) + 1))
+            # Without a discovered cluster (e.g. max_cores set) the hosts have cores_per_host cores
+            per_host = max(1, capacity // self._hosts) if self._hosts else int(self.cores_per_host)
+            if size is None:
+                ncores = min(upper, per_host)
+            elif size < self.small_size:
+                ncores = 1
+            else:
+                ncores = min(upper, int(math.ceil(size / float(self.small_size))))
+        else:
+            pid = arguments.get('cube') or arguments.get('cubes', '').split('|')[0]
+            if not pid or pid.startswith('['):
+                return query
+            facts = self.describe(client, pid)
+            nfragments = facts['nfragments'] or 1
+            upper = max(1, min(capacity, nfragments))
+            if facts['size'] is not None and facts['size'] < self.small_size:
+                ncores = 1
+            else:
+                ncores = upper
+        key = (operator, self._size_class(facts))
+        with self._lock:
+            measured = self.history.get(key, {})
+            calls = self._calls[key] = self._calls.get(key, 0) + 1
+            if measured:
+                best = min(measured, key=measured.get)
+                ncores = min(best, upper)
+                candidates = [c for c in (max(1, best // 2), min(upper, best * 2)) if c not in measured]
+                if candidates and self.explore_every and calls % int(self.explore_every) == 0:
+                    ncores = candidates[0]
+        plan['ncores'] = ncores
+        if 'ncores' not in tunable and arguments['ncores'].isdigit():
+            # The other arguments follow the number of cores set by hand
+            ncores = max(1, int(arguments['ncores']))
+        if operator in IMPORT_OPERATORS:
+            plan['nthreads'] = min(int(self.max_threads), 2)
+            # About one fragment per core, spread over the fewest hosts
+            plan['nhost'] = int(math.ceil(ncores / float(per_host)))
+            plan['nfrag'] = max(1, int(math.ceil(ncores / float(plan['nhost']))))
+        else:
+            plan['nthreads'] = max(1, min(int(self.max_threads), int(math.ceil(nfragments / float(ncores)))))
+        for name in tunable:
+            if name in plan:
+                query = set_argument(query, name, plan[name])
+        if operator in IMPORT_OPERATORS:
+            # Released by observe
+            with self._lock:
+                self._imports[query] = self._imports.get(query, 0) + 1
+        return query
+
+    def observe(self, query, result):
+        """observe(query, result) -> self : Record the execution time of a tuned request
+        :param query: query as submitted (after tune)
+        :type query: str
+        :param result: outcome of the request (None if it failed)
+        :type result: Result
+        :returns: self
+        :rtype: AutoTuner
+        """
+
+        operator, arguments = parse_query(query)
+        if operator in IMPORT_OPERATORS:
+            with self._lock:
+                if query in self._imports:
+                    self._imports[query] -= 1
+                    if not self._imports[query]:
+                        del self._imports[query]
+                if result is not None and result.cube and not result.return_value:
+                    imported = self._imported.setdefault((operator, arguments.get('measure')), [])
+                    imported.append(result.cube)
+                    del imported[:-16]
+        if result is None or result.exec_time is None or result.return_value:
+            return self
+        if operator in IMPORT_OPERATORS:
+            facts = {'size': self._import_size(operator, arguments.get('measure'))}
+        elif operator in FRAGMENT_OPERATORS:
+            with self._lock:
+                facts = self._facts.get(arguments.get('cube') or arguments.get('cubes', '').split('|')[0])
+            if facts is None:
+                return self
+        else:
+            return self
+        try:
+            ncores = int(arguments.get('ncores', '1'))
+        except ValueError:
+            return self
+        key = (operator, self._size_class(facts))
+        with self._lock:
+            measured = self.history.setdefault(key, {})
+            if ncores in measured:
+                measured[ncores] = self.alpha * result.exec_time + (1 - self.alpha) * measured[ncores]
+            else:
+                measured[ncores] = result.exec_time
+        return self
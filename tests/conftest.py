@@ -0,0 +1,181 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import re
+import json
+import itertools
+import threading
+import pytest
+import PyOphidia.ophsubmit as _ophsubmit
+from PyOphidia.cache import parse_query
+from PyOphidia.client import Client
+
+SESSION = 'http://fake/ophidia/sessions/1/experiment'
+
+
+def text(title, message, objkey='text'):
+    return {'objclass': 'text', 'objkey': objkey, 'objcontent': [{'title': title, 'message': message}]}
+
+
+def grid(title, keys, rows, objkey='grid'):
+    return {'objclass': 'grid', 'objkey': objkey, 'objcontent': [{'title': title, 'rowkeys': keys, 'rowfieldtypes': ['string'] * len(keys), 'rowvalues': rows}]}
+
+
+class FakeServer():
+    """Stand-in for ophsubmit.submit keeping a catalog of cubes: OPH_CUBESCHEMA, OPH_CUBESIZE, OPH_DELETE (single and massive) and OPH_LIST act on
+    the catalog, any other operator produces a new cube. Handlers registered with on() and outcomes set in failures (per server) take precedence.
+    Workflows run their tasks in order (recorded in tasks) and OPH_RESUME level=2 lists the name, status, times and output of each task"""
+
+    def __init__(self):
+        self.queries = []
+        self.cubes = set()
+        # Size (MB) and number of fragments of every cube, the size being reported once OPH_CUBESIZE has been executed
+        self.size = 256.0
+        self.nfragments = 16
+        self.measured = set()
+        self.tasks = []
+        self.workflows = {}
+        self.handlers = {}
+        self.failures = {}
+        self._ids = itertools.count(1)
+        self._workflow_ids = itertools.count(100)
+        self._lock = threading.Lock()
+
+    def new_cube(self):
+        pid = 'http://fake/ophidia/1/' + str(next(self._ids))
+        self.cubes.add(pid)
+        return pid
+
+    def created(self):
+        # Reply of an operator producing a new cube
+        return self.reply([text('Output Cube', self.new_cube(), objkey='cube')])
+
+    def on(self, operator, handler):
+        self.handlers[operator] = handler
+
+    def sent(self, operator=None, server=None):
+        return [query for host, query in self.queries if (operator is None or parse_query(query)[0] == operator) and (server is None or host == server)]
+
+    @staticmethod
+    def reply(objects, exec_time='0.5', **extra):
+        keys = ['execution_time'] + list(extra.keys())
+        values = [exec_time] + list(extra.values())
+        return (json.dumps({'response': objects, 'extra': {'keys': keys, 'values': values}}), SESSION + '?1#1', SESSION, 0, None)
+
+    @staticmethod
+    def error(message='server error'):
+        return (None, None, None, _ophsubmit.OPH_SERVER_ERROR, message)
+
+    def __call__(self, username, password, server, port, query, *args, **kwargs):
+        with self._lock:
+            self.queries.append((server, query))
+        if server in self.failures:
+            return self.failures[server]
+        if query.lstrip().startswith('{'):
+            return self.run_workflow(server, json.loads(query))
+        return self.dispatch(server, query)
+
+    def run_workflow(self, server, workflow):
+        # The outputs of the dependencies are joined with '|' in their argument (cube by default), embedded dependencies only set the order
+        wid = str(next(self._workflow_ids))
+        outputs, rows, failed = {}, [], False
+        for task in workflow['tasks']:
+            passed, skipped = {}, failed and workflow.get('on_error') == 'break'
+            for dependency in task.get('dependencies', []):
+                if dependency['task'] not in outputs:
+                    skipped = True
+                elif dependency.get('type', 'all') != 'embedded':
+                    passed.setdefault(dependency.get('argument', 'cube'), []).append(outputs[dependency['task']])
+            if skipped:
+                rows.append([task['name'], 'OPH_STATUS_SKIPPED', '-', '-', '-'])
+                continue
+            query = task['operator'] + ' ' + ''.join(argument + ';' for argument in task.get('arguments', []))
+            query += ''.join(key + '=' + '|'.join(values) + ';' for key, values in passed.items())
+            with self._lock:
+                self.tasks.append(query)
+            response, jobid, session, return_value, error = self.dispatch(server, query)
+            if return_value:
+                failed = True
+                rows.append([task['name'], 'OPH_STATUS_ERROR', '2026-10-19 10:00:00', '2026-10-19 10:00:01', '-'])
+                continue
+            cubes = [obj['objcontent'][0]['message'] for obj in json.loads(response)['response'] if obj['objcontent'][0].get('title') == 'Output Cube']
+            outputs[task['name']] = cubes[0] if cubes else ''
+            rows.append([task['name'], 'OPH_STATUS_COMPLETED', '2026-10-19 10:00:00', '2026-10-19 10:00:02', cubes[0] if cubes else '-'])
+        with self._lock:
+            self.workflows[wid] = rows
+        jobid = SESSION + '?' + wid + '#1'
+        if failed:
+            return (None, jobid, None, 1, 'workflow failed')
+        return (json.dumps({'response': [text('Workflow Status', 'OPH_STATUS_COMPLETED')], 'extra': {'keys': ['execution_time'], 'values': ['2.0']}}),
+                jobid, SESSION, 0, None)
+
+    def dispatch(self, server, query):
+        operator, arguments = parse_query(query)
+        if operator in self.handlers:
+            return self.handlers[operator](server, query, arguments)
+        if operator == 'oph_cubeschema':
+            pid = arguments.get('cube')
+            if pid not in self.cubes:
+                return self.error('cube not found')
+            size = [str(self.size), 'MB'] if pid in self.measured else ['-', '-']
+            return self.reply([grid('Cube Information', ['PID', 'CREATION DATE', 'MEASURE', 'MEASURE TYPE', 'LEVEL', 'NUMBER OF FRAGMENTS', 'SOURCE FILE'],
+                                    [[pid, '-', 'tas', 'float', '1', str(self.nfragments), '-']], 'cubeschema_cubeinfo'),
+                               grid('Additional Information', ['COMPRESSED', 'NUMBER OF HOSTS', 'NUMBER OF FRAGMENTS PER DATABASE', 'NUMBER OF DATABASES',
+                                                               'NUMBER OF ROWS', 'NUMBER OF ELEMENTS', 'SIZE', 'UNIT'],
+                                    [['no', '1', str(self.nfragments), '1', '100', '1000'] + size], 'cubeschema_morecubeinfo')])
+        if operator == 'oph_cubesize':
+            if arguments.get('cube') not in self.cubes:
+                return self.error('cube not found')
+            self.measured.add(arguments.get('cube'))
+            return self.reply([])
+        if operator == 'oph_delete':
+            target = arguments.get('cube', '')
+            if target.startswith('['):
+                ids = re.search(r'cube_filter=([0-9,]+)', query).group(1).split(',')
+                with self._lock:
+                    self.cubes = set(pid for pid in self.cubes if pid.rpartition('/')[2] not in ids)
+                return self.reply([])
+            if target not in self.cubes:
+                return self.error('cube not found')
+            self.cubes.discard(target)
+            return self.reply([])
+        if operator == 'oph_resume':
+            rows = self.workflows.get(arguments.get('id'))
+            if rows is None:
+                return self.error('workflow not found')
+            return self.reply([grid('Workflow Task List', ['TASK NAME', 'STATUS', 'START DATE', 'END DATE', 'OUTPUT CUBE'], rows)])
+        if operator == 'oph_list':
+            return self.reply([grid('List', ['T', 'PID'], [['dc', pid] for pid in sorted(self.cubes)])])
+        return self.created()
+
+
+@pytest.fixture
+def server(monkeypatch):
+    fake = FakeServer()
+    monkeypatch.setattr(_ophsubmit, 'submit', fake)
+    return fake
+
+
+@pytest.fixture
+def client(server):
+    client = Client('user', 'secret-password', 'fake', '11732', api_mode=False)
+    client.session = SESSION
+    return client
@@ -0,0 +1,102 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import absolute_import
+import PyOphidia.cache as _cache
+from PyOphidia.cache import ResponseCache
+
+
+class Clock():
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+def test_context_arguments_do_not_change_the_key():
+    cache = ResponseCache()
+    cache.put('oph_man function=oph_reduce;sessionid=s1;cwd=/a;ncores=4;', 'man', 'user@server')
+    assert cache.get('oph_man function=oph_reduce;sessionid=s2;cwd=/b;', 'user@server') == 'man'
+    assert cache.get('oph_man function=oph_subset;', 'user@server') is None
+    assert cache.get('oph_man function=oph_reduce;', 'other@server') is None
+
+
+def test_uncacheable_queries():
+    cache = ResponseCache()
+    assert not cache.put('oph_reduce cube=http://fake/ophidia/1/1;operation=avg;', 'r')
+    assert not cache.put('oph_man function=oph_reduce;exec_mode=async;', 'r')
+    assert not cache.put('oph_get_config key=OPH_CWD;', 'r')
+    assert cache.put('oph_get_config key=OPH_VERSION;', 'r')
+
+
+def test_showgrid_is_keyed_by_session_and_cwd():
+    cache = ResponseCache()
+    query = 'oph_showgrid container=tas;sessionid=s1;cwd=/a;'
+    cache.put(query, 'grids')
+    assert cache.get(query) == 'grids'
+    assert cache.get('oph_showgrid container=tas;sessionid=s1;cwd=/b;') is None
+    assert cache.get('oph_showgrid container=tas;sessionid=s2;cwd=/a;') is None
+
+
+def test_showgrid_is_invalidated_by_grid_and_container_changes():
+    cache = ResponseCache()
+    query = 'oph_showgrid container=tas;sessionid=s1;cwd=/a;'
+    cache.put(query, 'grids')
+    cache.put('oph_man function=oph_reduce;', 'man')
+    assert cache.observe('oph_reduce operation=avg;cube=http://fake/ophidia/1/1;') == 0
+    assert cache.observe('oph_importnc2 src_path=/a.nc;grid=g1;') == 1
+    assert cache.get(query) is None
+    cache.put(query, 'grids')
+    assert cache.observe('oph_deletecontainer container=tas;') == 1
+    assert cache.get('oph_man function=oph_reduce;') == 'man'
+
+
+def test_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(_cache, 'time', clock)
+    cache = ResponseCache(ttls={'oph_man': 10.0})
+    cache.put('oph_man function=oph_reduce;', 'man')
+    clock.now += 9.0
+    assert cache.get('oph_man function=oph_reduce;') == 'man'
+    clock.now += 2.0
+    assert cache.get('oph_man function=oph_reduce;') is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lru_eviction():
+    cache = ResponseCache(maxsize=2)
+    for function in ('a', 'b'):
+        cache.put('oph_man function=' + function + ';', function)
+    cache.get('oph_man function=a;')
+    cache.put('oph_man function=c;', 'c')
+    assert cache.get('oph_man function=b;') is None
+    assert cache.get('oph_man function=a;') == 'a'
+
+
+def test_client_cache_is_opt_in(client, server):
+    assert client.cache is None
+    client.execute('oph_man function=oph_reduce;')
+    client.execute('oph_man function=oph_reduce;')
+    assert len(server.sent('oph_man')) == 2
+    client.cache = ResponseCache()
+    client.execute('oph_man function=oph_reduce;')
+    result = client.execute('oph_man function=oph_reduce;')
+    assert len(server.sent('oph_man')) == 3
+    assert result.return_value == 0 and client.cache.hits == 1
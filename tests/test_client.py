@@ -0,0 +1,48 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import absolute_import
+from PyOphidia.client import ResponseIndex
+from conftest import grid, text
+
+RESPONSE = {'response': [text('Output Cube', 'http://fake/ophidia/1/2', objkey='cube'), grid('List', ['T', 'PID'], [['dc', 'http://fake/ophidia/1/2']], objkey='list'),
+                         text('Output Cube', 'http://fake/ophidia/1/3', objkey='other')],
+            'extra': {'keys': ['execution_time', 'cwd'], 'values': ['1.5', '/tas']}}
+
+
+def test_response_index_lookups():
+    index = ResponseIndex(RESPONSE)
+    assert index.message('Output Cube') == 'http://fake/ophidia/1/2'
+    assert len(index.find_all(title='Output Cube')) == 2
+    assert index.find(objkey='other', title='Output Cube')['objkey'] == 'other'
+    assert index.find(objkey='list', objclass='text') is None
+    assert [obj['objkey'] for obj in index.find_all(objclass='grid')] == ['list']
+    assert index.get_extra('cwd') == '/tas' and index.get_extra('missing', '-') == '-'
+    assert ResponseIndex(None).find_all() == [] and ResponseIndex(None).message('Output Cube') is None
+
+
+def test_results_describe_single_requests(client, server):
+    pid = server.new_cube()
+    result = client.execute('oph_reduce cube=' + pid + ';operation=avg;')
+    assert result.return_value == 0 and result.exec_time == 0.5
+    assert result.cube == client.cube and result.cube != pid
+    assert result.deserialize() is result.index.response
+    assert result.index.message('Output Cube') == result.cube
+    server.on('oph_list', lambda host, query, arguments: server.error())
+    assert client.execute('oph_list level=2;') is None
+    assert client.cube == result.cube
@@ -0,0 +1,95 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import absolute_import
+import time
+import threading
+import pytest
+from PyOphidia.ophsubmit import DeadlineExceeded
+
+
+@pytest.fixture
+def slow(server):
+    """Hold the OPH_LIST and OPH_REDUCE requests until released is set"""
+
+    released = threading.Event()
+
+    def handler(host, query, arguments):
+        released.wait(5.0)
+        return server.created()
+
+    server.on('oph_list', handler)
+    server.on('oph_reduce', handler)
+    return released
+
+
+def concurrently(client, query, count=4, deadline=None):
+    results = [None] * count
+
+    def run(i):
+        results[i] = client.execute(query, deadline=deadline)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def settle(server, threads, released):
+    # Let the requests reach the server (or their flight) before releasing them
+    end = time.time() + 5.0
+    while not server.queries and time.time() < end:
+        time.sleep(0.01)
+    time.sleep(0.2)
+    released.set()
+    for thread in threads:
+        thread.join(5.0)
+
+
+def test_identical_read_only_requests_share_the_response(client, server, slow):
+    threads, results = concurrently(client, 'oph_list level=2;')
+    settle(server, threads, slow)
+    assert len(server.sent('oph_list')) == 1
+    assert len(set(result.cube for result in results)) == 1
+
+
+@pytest.mark.parametrize('query', ['oph_reduce cube=http://fake/ophidia/1/1;operation=avg;', 'oph_list level=2;exec_mode=async;'])
+def test_other_requests_are_not_coalesced(client, server, slow, query):
+    threads, results = concurrently(client, query)
+    settle(server, threads, slow)
+    assert len(server.queries) == 4
+
+
+def test_coalescing_can_be_disabled(client, server, slow):
+    client.coalesce = False
+    threads, results = concurrently(client, 'oph_list level=2;')
+    settle(server, threads, slow)
+    assert len(server.sent('oph_list')) == 4
+
+
+def test_waiting_requests_honour_their_deadline(client, server, slow):
+    leader = threading.Thread(target=client.execute, args=('oph_list level=2;',))
+    leader.start()
+    while not server.queries:
+        time.sleep(0.01)
+    start = time.time()
+    assert client.execute('oph_list level=2;', deadline=0.2) is None
+    assert isinstance(client.last_error, DeadlineExceeded)
+    assert time.time() - start < 2.0
+    slow.set()
+    leader.join(5.0)
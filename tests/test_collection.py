@@ -0,0 +1,108 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import absolute_import
+import json
+import pytest
+from PyOphidia.collection import CubeCollection, plan_merge_tree
+
+
+def failing(server, operator, calls):
+    # Make the given calls of operator (counted from 1) fail
+    count = []
+
+    def handler(host, query, arguments):
+        count.append(query)
+        if len(count) in calls:
+            return server.error()
+        return server.created()
+
+    server.on(operator, handler)
+
+
+def test_cube_operators_run_as_one_workflow(client, server):
+    inputs = [server.new_cube() for i in range(3)]
+    outputs = CubeCollection(inputs, client).reduce(operation='max')
+    # The workflow and the listing of its tasks
+    assert len(server.queries) == 2
+    tasks = json.loads(server.queries[0][1])['tasks']
+    assert [task['name'] for task in tasks] == ['cube_0', 'cube_1', 'cube_2']
+    assert all('operation=max' in task['arguments'] for task in tasks)
+    assert len(server.sent('oph_resume')) == 1
+    # Each output is paired with its input
+    assert [query.split('cube=')[1].split(';')[0] for query in server.tasks] == inputs
+    assert len(outputs) == 3 and not set(outputs.pids) & set(inputs)
+
+
+def test_partial_outputs_are_deleted(client, server):
+    inputs = [server.new_cube() for i in range(3)]
+    failing(server, 'oph_reduce', [2])
+    with pytest.raises(RuntimeError):
+        CubeCollection(inputs, client).reduce(operation='max')
+    assert server.cubes == set(inputs)
+
+
+def test_parallel_mode_sends_a_request_per_cube(client, server):
+    inputs = [server.new_cube() for i in range(3)]
+    outputs = CubeCollection(inputs, client).reduce(operation='max', mode='parallel')
+    assert len(server.sent('oph_reduce')) == 3
+    assert len(outputs) == 3
+
+
+def test_other_operators_run_as_massive_operations(client, server):
+    inputs = [server.new_cube() for i in range(3)]
+    CubeCollection(inputs, client).delete()
+    assert len(server.queries) == 1
+    assert 'cube_filter=' + ','.join(pid.rpartition('/')[2] for pid in inputs) in server.queries[0][1]
+    assert not server.cubes
+
+
+def test_workflow_mode_requires_cube_operators(client, server):
+    with pytest.raises(RuntimeError):
+        CubeCollection([server.new_cube()], client).execute('oph_delete', mode='workflow')
+
+
+def test_merge_tree_accepts_any_number_of_cubes():
+    for n in range(2, 40):
+        for fan_in in (2, 3, 8):
+            levels = plan_merge_tree(list(range(n)), fan_in)
+            assert len(levels[-1]) == 1
+            assert sorted(i for group in levels[0] for i in group) == list(range(n))
+            assert all(2 <= len(group) <= max(fan_in, 3) for groups in levels for group in groups)
+    assert plan_merge_tree(list(range(5)), 2)[0] == [[0, 1, 2], [3, 4]]
+    with pytest.raises(RuntimeError):
+        plan_merge_tree(list(range(5)), 2, 'i')
+
+
+def test_merge_tree_runs_as_one_workflow(client, server):
+    inputs = [server.new_cube() for i in range(5)]
+    merged = CubeCollection(inputs, client).mergecubes(fan_in=2, ncores=[4, 2])
+    assert len(server.queries) == 2
+    tasks = dict((task['name'], task) for task in json.loads(server.queries[0][1])['tasks'])
+    assert 'ncores=4' in tasks['merge_0_0']['arguments'] and 'ncores=2' in tasks['merge_1_0']['arguments']
+    assert [dependency['task'] for dependency in tasks['merge_1_0']['dependencies']] == ['merge_0_0', 'merge_0_1']
+    # The intermediate cubes are deleted by the workflow, the inputs are kept
+    assert server.cubes == set(inputs) | set([merged.pid])
+
+
+def test_failed_merges_leave_no_cube_behind(client, server):
+    inputs = [server.new_cube() for i in range(5)]
+    failing(server, 'oph_mergecubes', [3])
+    with pytest.raises(RuntimeError):
+        CubeCollection(inputs, client).mergecubes(fan_in=2)
+    assert server.cubes == set(inputs)
@@ -0,0 +1,74 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import absolute_import
+import threading
+import pytest
+from PyOphidia.client import Client
+from PyOphidia.cube import Cube
+from conftest import SESSION
+
+
+@pytest.fixture
+def other(server):
+    client = Client('user', 'secret-password', 'other', '11732', api_mode=False)
+    client.session = SESSION
+    client.cwd = '/'
+    return client
+
+
+@pytest.fixture(autouse=True)
+def unbound(monkeypatch):
+    monkeypatch.setattr(Cube, 'client', None)
+
+
+def test_cubes_use_their_own_client(client, other, server):
+    cube = Cube(pid=server.new_cube(), client=other)
+    assert cube.client is other
+    reduced = cube.reduce(operation='avg')
+    assert reduced.client is other
+    assert server.sent('oph_reduce', server='other') and not server.sent('oph_reduce', server='fake')
+
+
+def test_unbound_cubes_fall_back_to_the_common_client(client, server):
+    with pytest.raises(RuntimeError):
+        Cube(pid=server.new_cube())
+    Cube.client = client
+    assert Cube(pid=server.new_cube()).client is client
+
+
+def test_scopes_are_nested(client, other, server):
+    client.cwd = '/'
+    Cube.client = client
+    with Cube.using(other):
+        assert Cube.active_client() is other
+        with Cube.using(client):
+            assert Cube(pid=server.new_cube()).client is client
+        assert Cube(pid=server.new_cube()).client is other
+        Cube.list(display=False)
+    assert Cube.active_client() is client
+    assert server.sent('oph_list', server='other') and not server.sent('oph_list', server='fake')
+
+
+def test_scopes_are_local_to_the_thread(other):
+    seen = []
+    with Cube.using(other):
+        thread = threading.Thread(target=lambda: seen.append(Cube.active_client()))
+        thread.start()
+        thread.join()
+    assert seen == [None]
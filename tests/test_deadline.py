@@ -0,0 +1,99 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import absolute_import
+import time
+import socket
+import pytest
+import PyOphidia.ophsubmit as _ophsubmit
+from PyOphidia.cube import Cube
+from PyOphidia.ophsubmit import RetryPolicy, DeadlineExceeded
+
+
+@pytest.fixture
+def silent():
+    # Endpoint accepting connections and never answering
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(5)
+    yield str(listener.getsockname()[1])
+    listener.close()
+
+
+@pytest.fixture
+def closed():
+    # Port nobody is listening on
+    probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    probe.bind(('127.0.0.1', 0))
+    port = str(probe.getsockname()[1])
+    probe.close()
+    return port
+
+
+def test_unresponsive_servers_are_bounded_by_the_deadline(silent):
+    start = time.time()
+    outcome = _ophsubmit.submit('user', 'password', '127.0.0.1', silent, 'oph_list level=2;', deadline=start + 0.3)
+    assert isinstance(outcome[4], DeadlineExceeded)
+    assert time.time() - start < 5.0
+
+
+def test_connect_timeout(silent):
+    start = time.time()
+    outcome = _ophsubmit.submit('user', 'password', '127.0.0.1', silent, 'oph_list level=2;', connect_timeout=0.3)
+    assert outcome[3] and not isinstance(outcome[4], DeadlineExceeded)
+    assert time.time() - start < 5.0
+
+
+def test_expired_deadlines_are_not_submitted(monkeypatch):
+    monkeypatch.setattr(_ophsubmit.httplib, 'HTTPSConnection', None)
+    outcome = _ophsubmit.submit('user', 'password', '127.0.0.1', '11732', 'oph_list level=2;', deadline=time.time() - 1.0)
+    assert isinstance(outcome[4], DeadlineExceeded)
+
+
+def test_retries_are_not_scheduled_past_the_deadline(closed, monkeypatch):
+    monkeypatch.setattr(_ophsubmit, '_circuit_breakers', {})
+    start = time.time()
+    outcome = _ophsubmit.submit('user', 'password', '127.0.0.1', closed, 'oph_list level=2;', retry_policy=RetryPolicy(base_delay=10.0, jitter=0.0),
+                                deadline=start + 2.0)
+    assert isinstance(outcome[4], _ophsubmit.ConnectError)
+    assert time.time() - start < 2.0
+
+
+def test_deadlines_are_relative_to_the_call(client, server, monkeypatch):
+    calls = []
+
+    def submit(*args, **kwargs):
+        calls.append(kwargs)
+        return server(*args, **kwargs)
+
+    monkeypatch.setattr(_ophsubmit, 'submit', submit)
+    client.read_timeout = 60.0
+    before = time.time()
+    client.execute('oph_list level=2;', deadline=10)
+    Cube(pid=server.new_cube(), client=client).reduce(operation='avg', deadline=20)
+    client.execute('oph_list level=1;')
+    assert calls[0]['connect_timeout'] == 30.0 and calls[0]['read_timeout'] == 60.0
+    assert before + 10 <= calls[0]['deadline'] <= time.time() + 10
+    assert before + 20 <= calls[-2]['deadline'] <= time.time() + 20
+    assert calls[-1]['deadline'] is None
+
+
+def test_expired_requests_fail(client, server):
+    server.failures['fake'] = (None, None, None, 1, DeadlineExceeded('read timed out'))
+    assert client.execute('oph_list level=2;', deadline=1) is None
+    assert isinstance(client.last_error, DeadlineExceeded)
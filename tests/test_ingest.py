@@ -0,0 +1,67 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import absolute_import
+import json
+import pytest
+from PyOphidia.cache import parse_query
+from PyOphidia.ingest import ingest, resolve
+from PyOphidia.tuning import AutoTuner
+from conftest import grid
+
+
+def test_resolve_expands_patterns(client, server):
+    server.on('oph_fs', lambda host, query, arguments: server.reply([grid('Files', ['T', 'OBJECT'], [['f', 'tas_2.nc'], ['f', 'tas_1.nc'], ['d', 'old/']])]))
+    assert resolve(['/data/tas_*.nc', '/data/pr.nc'], client=client) == ['/data/pr.nc', '/data/tas_1.nc', '/data/tas_2.nc']
+    assert len(server.sent('oph_fs')) == 1
+
+
+def test_files_are_imported_by_one_tuned_workflow(client, server):
+    report = ingest(['/data/a.nc', '/data/b.nc'], measure='tas', client=client, tuner=AutoTuner(max_cores=8))
+    assert [query for host, query in server.queries if not query.startswith('{')] == server.sent('oph_resume') + server.sent('oph_cubeschema')
+    assert len(server.sent('oph_cubeschema')) == 2
+    imports = [parse_query(query)[1] for query in server.tasks if query.startswith('oph_importnc2')]
+    # The cluster is shared evenly by the imports
+    assert [arguments['ncores'] for arguments in imports] == ['4', '4']
+    assert [entry['src_path'] for entry in report.files] == ['/data/a.nc', '/data/b.nc']
+    assert [entry['cube'] for entry in report.files] == [parse_query(query)[1]['cube'] for query in server.sent('oph_cubeschema')]
+    assert all(entry['size'] == 256.0 and entry['exec_time'] == 2.0 and entry['throughput'] == 128.0 for entry in report.files)
+    assert report.files[0]['ncores'] == 4 and not report.failed()
+
+
+def test_explicit_arguments_are_kept(client, server):
+    ingest(['/data/a.nc', '/data/b.nc'], measure='tas', ncores=1, client=client, tuner=AutoTuner(max_cores=8))
+    tasks = json.loads(server.queries[0][1])['tasks']
+    assert all('ncores=1' in task['arguments'] for task in tasks if task['operator'] == 'oph_importnc2')
+
+
+def test_failed_files_are_reported(client, server):
+    server.on('oph_importnc2', lambda host, query, arguments: server.error() if arguments['src_path'] == '/data/b.nc' else server.created())
+    report = ingest(['/data/a.nc', '/data/b.nc'], measure='tas', client=client, tuner=AutoTuner(max_cores=8))
+    assert report.failed() == ['/data/b.nc']
+    assert report.files[0]['cube'] is not None
+    with pytest.raises(RuntimeError):
+        ingest(['/data/a.nc', '/data/b.nc'], measure='tas', concat=True, client=client, tuner=AutoTuner(max_cores=8))
+    # The cube imported for the concatenation is deleted, the one of the first ingestion is kept
+    assert server.cubes == set([report.files[0]['cube']])
+
+
+def test_concatenation_keeps_only_the_merged_cube(client, server):
+    report = ingest(['/data/a.nc', '/data/b.nc', '/data/c.nc'], measure='tas', concat=True, fan_in=2, client=client, tuner=AutoTuner(max_cores=8))
+    assert server.cubes == set([report.cube.pid])
+    assert len(report.cubes) == 0
@@ -0,0 +1,104 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import absolute_import
+import pytest
+from PyOphidia.job import JobMonitor, JobPoller, TimeoutError, parse_jobid
+from conftest import SESSION, grid, text
+
+
+class Jobs():
+    """Asynchronous jobs of the fake server: each one is running until it has been checked (level=0) twice, and listed as running twice at most"""
+
+    def __init__(self, server):
+        self.server = server
+        self.checks = {}
+        self.outputs = {}
+        self.listed = {}
+        server.on('oph_resume', self)
+
+    def __call__(self, host, query, arguments):
+        workflow_id = arguments.get('id')
+        if arguments.get('level') == '0':
+            self.checks[workflow_id] = self.checks.get(workflow_id, 0) + 1
+            if self.checks[workflow_id] < 2:
+                return self.server.reply([text('Workflow Status', 'OPH_STATUS_RUNNING'), grid('Workflow Progress Ratio', ['ID', 'RATIO'], [['1', '0.5']])])
+            return self.server.reply([text('Workflow Status', 'OPH_STATUS_COMPLETED')])
+        if workflow_id == '0':
+            # Listing of the jobs still running (JobMonitor)
+            running = [key for key in self.outputs if self.listed.get(key, 0) < 2]
+            for key in running:
+                self.listed[key] = self.listed.get(key, 0) + 1
+            return self.server.reply([grid('Jobs', ['WORKFLOW ID', 'STATUS'], [[key, 'OPH_STATUS_RUNNING'] for key in running])])
+        return self.server.reply([text('Output Cube', self.outputs[workflow_id], objkey='cube')])
+
+    def submit(self, host, query, arguments):
+        workflow_id = str(len(self.outputs) + 1)
+        self.outputs[workflow_id] = self.server.new_cube()
+        response = self.server.reply([text('Workflow Status', 'OPH_STATUS_PENDING')])
+        return (response[0], SESSION + '?' + workflow_id + '#1') + response[2:]
+
+
+@pytest.fixture
+def jobs(server):
+    jobs = Jobs(server)
+    server.on('oph_reduce', jobs.submit)
+    return jobs
+
+
+def test_parse_jobid():
+    assert parse_jobid(SESSION + '?7#3') == (SESSION, '7', '3')
+    assert parse_jobid(SESSION) == (SESSION, None, None)
+
+
+def test_jobs_resolve_to_their_output_cube(client, server, jobs):
+    client.poller = JobPoller(client, min_interval=0.01, max_interval=0.05)
+    job = client.submit_async('oph_reduce cube=' + server.new_cube() + ';operation=avg;')
+    assert 'exec_mode=async' in server.sent('oph_reduce')[0]
+    done = []
+    job.add_done_callback(done.append)
+    assert job.result(timeout=5).pid == jobs.outputs['1']
+    assert job.done() and not job.cancelled() and done == [job]
+    assert jobs.checks['1'] == 2
+
+
+def test_jobs_are_cancelled_at_their_deadline(client, server, jobs):
+    client.poller = JobPoller(client, min_interval=10.0)
+    job = client.submit_async('oph_reduce cube=' + server.new_cube() + ';operation=avg;', deadline=0.05)
+    with pytest.raises(TimeoutError):
+        job.result(timeout=5)
+    assert server.sent('oph_cancel')[0].startswith('oph_cancel id=1;type=kill;')
+
+
+def test_jobs_can_be_cancelled(client, server, jobs):
+    client.poller = JobPoller(client, min_interval=10.0)
+    job = client.submit_async('oph_reduce cube=' + server.new_cube() + ';operation=avg;')
+    assert job.cancel() and job.cancelled()
+    assert not job.cancel()
+    assert isinstance(job.exception(timeout=1), Exception)
+
+
+def test_monitor_lists_all_the_jobs_at_once(client, server, jobs):
+    client.poller = JobMonitor(client, min_interval=0.01, max_interval=0.05)
+    submitted = [client.submit_async('oph_reduce cube=' + server.new_cube() + ';operation=avg;') for i in range(3)]
+    assert sorted(job.result(timeout=5).pid for job in submitted) == sorted(jobs.outputs.values())
+    assert client.poller.outstanding() == 0
+    listings = [query for query in server.sent('oph_resume') if 'status_filter=' in query]
+    checks = [query for query in server.sent('oph_resume') if 'level=0' in query]
+    # Only the jobs that left the listing are queried one by one
+    assert listings and len(checks) <= 2 * len(submitted)
@@ -0,0 +1,98 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import absolute_import
+from PyOphidia.lifecycle import CubeLifecycle, massive_filter
+
+
+def create(client, source, operation='avg'):
+    return client.execute('oph_reduce cube=' + source + ';operation=' + operation + ';').cube
+
+
+def test_massive_filter_is_not_limited_to_the_cwd():
+    assert massive_filter(['http://fake/ophidia/1/7', 'http://fake/ophidia/3/12']) == '[path=/;recursive=yes;cube_filter=7,12]'
+
+
+def test_unretained_cubes_are_deleted_with_a_massive_operation(client, server):
+    source = server.new_cube()
+    with CubeLifecycle(nthreads=4) as scope:
+        first = create(client, source)
+        second = create(client, first)
+        kept = create(client, second)
+        scope.retain(kept)
+    assert sorted(scope.deleted) == sorted([first, second])
+    assert server.cubes == set([source, kept])
+    deletions = server.sent('oph_delete')
+    assert len(deletions) == 1
+    assert 'nthreads=4;cube=' + massive_filter([first, second]) + ';' in deletions[0]
+    assert scope.cubes == [kept]
+
+
+def test_cubes_not_matched_by_the_massive_operation_are_deleted_one_by_one(client, server):
+    source = server.new_cube()
+
+    def delete(host, query, arguments):
+        # The massive operation misses the second cube
+        pid = first if arguments['cube'].startswith('[') else arguments['cube']
+        if pid not in server.cubes:
+            return server.error()
+        server.cubes.discard(pid)
+        return server.reply([])
+
+    with CubeLifecycle() as scope:
+        first = create(client, source)
+        second = create(client, source, 'max')
+        server.on('oph_delete', delete)
+    assert sorted(scope.deleted) == sorted([first, second])
+    assert server.cubes == set([source])
+    assert not server.sent('oph_list')
+    # Only the cubes of the massive operation are checked
+    assert len(server.sent('oph_cubeschema')) == 2
+    assert server.sent('oph_delete')[1].startswith('oph_delete exec_mode=sync;nthreads=1;cube=' + second + ';')
+
+
+def test_cubes_still_there_are_not_reported_as_deleted(client, server):
+    source = server.new_cube()
+    with CubeLifecycle() as scope:
+        first = create(client, source)
+        second = create(client, source, 'max')
+        server.on('oph_delete', lambda host, query, arguments: server.reply([]) if arguments['cube'].startswith('[') else server.error())
+    assert scope.deleted == []
+    assert sorted(scope.cubes) == sorted([first, second])
+    assert len(server.sent('oph_delete')) == 3
+
+
+def test_single_cube_is_deleted_directly(client, server):
+    source = server.new_cube()
+    with CubeLifecycle() as scope:
+        output = create(client, source)
+    assert scope.deleted == [output]
+    assert server.sent('oph_delete')[0].startswith('oph_delete exec_mode=sync;nthreads=1;cube=' + output + ';')
+    assert not server.sent('oph_list')
+
+
+def test_deletions_do_not_change_the_state_of_the_client(client, server):
+    source = server.new_cube()
+    observed = []
+    client.hooks.append(lambda query, timings: observed.append(query))
+    with CubeLifecycle():
+        output = create(client, source)
+        create(client, output)
+    assert client.last_request.startswith('oph_reduce cube=' + output + ';')
+    assert len(observed) == 2
+    assert len(server.sent('oph_delete')) == 1
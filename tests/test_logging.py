@@ -0,0 +1,63 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import absolute_import
+import io
+import logging
+import pytest
+import PyOphidia
+from PyOphidia.cube import Cube
+
+
+@pytest.fixture
+def package_logger():
+    logger = logging.getLogger('PyOphidia')
+    level, handlers = logger.level, list(logger.handlers)
+    yield logger
+    logger.handlers = handlers
+    logger.setLevel(level)
+    PyOphidia._handler = None
+
+
+def test_diagnostics_are_not_printed_by_default(client, server, package_logger, capsys):
+    server.failures['fake'] = server.error('server down')
+    Cube(pid=server.new_cube(), client=client)
+    assert client.execute('oph_list level=2;') is None
+    assert capsys.readouterr().out == ''
+
+
+def test_log_to_console_prints_the_imported_cubes(client, server, package_logger):
+    stream = io.StringIO()
+    handler = PyOphidia.log_to_console(stream=stream)
+    # Calling it again replaces the handler
+    assert PyOphidia.log_to_console(stream=stream) is not handler
+    imported = Cube(src_path='/data/tas.nc', measure='tas', cwd='/', client=client)
+    assert stream.getvalue() == 'New cube is ' + imported.pid + '\n'
+    PyOphidia.log_to_console(level=logging.ERROR, stream=stream)
+    Cube(src_path='/data/tas.nc', measure='tas', cwd='/', client=client)
+    assert stream.getvalue().count('http://fake/ophidia/1/') == 1
+
+
+def test_quiet_silences_errors(client, server, package_logger, caplog):
+    server.failures['fake'] = server.error('server down')
+    PyOphidia.quiet()
+    client.execute('oph_list level=2;')
+    assert 'server down' not in caplog.text
+    PyOphidia.quiet(False)
+    client.execute('oph_list level=2;')
+    assert 'server down' in caplog.text
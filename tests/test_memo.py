@@ -0,0 +1,65 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import absolute_import
+from PyOphidia.memo import OperationMemo
+
+
+def reduce(client, pid):
+    return client.execute('oph_reduce cube=' + pid + ';operation=avg;ncores=1;')
+
+
+def test_key_ignores_execution_arguments():
+    memo = OperationMemo()
+    key = memo.key('oph_reduce cube=http://fake/ophidia/1/1;operation=avg;ncores=1;sessionid=s1;')
+    assert key == memo.key('oph_reduce operation=avg;cube=http://fake/ophidia/1/1;ncores=8;sessionid=s2;')
+    assert key != memo.key('oph_reduce cube=http://fake/ophidia/1/1;operation=max;')
+    assert memo.key('oph_reduce cube=http://fake/ophidia/1/1;operation=avg;exec_mode=async;') is None
+    assert memo.key('oph_delete cube=http://fake/ophidia/1/1;') is None
+
+
+def test_existing_output_is_reused_after_validation(client, server):
+    client.memo = OperationMemo()
+    source = server.new_cube()
+    first = reduce(client, source)
+    second = reduce(client, source)
+    assert second.cube == first.cube
+    assert len(server.sent('oph_reduce')) == 1
+    assert server.sent('oph_cubeschema')[-1].startswith('oph_cubeschema exec_mode=sync;level=0;cube=' + first.cube + ';')
+    assert client.memo.hits == 1
+
+
+def test_missing_output_is_recomputed(client, server):
+    client.memo = OperationMemo()
+    source = server.new_cube()
+    first = reduce(client, source)
+    server.cubes.discard(first.cube)
+    second = reduce(client, source)
+    assert second.cube != first.cube
+    assert len(server.sent('oph_reduce')) == 2
+    assert client.memo.lookup(client.memo.key(server.sent('oph_reduce')[-1], 'user@fake:11732')) == second.cube
+
+
+def test_deleted_output_is_forgotten(client, server):
+    client.memo = OperationMemo()
+    source = server.new_cube()
+    first = reduce(client, source)
+    client.execute('oph_delete cube=' + first.cube + ';')
+    reduce(client, source)
+    assert len(server.sent('oph_reduce')) == 2
+    assert not server.sent('oph_cubeschema')
@@ -0,0 +1,75 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import absolute_import
+import pytest
+from PyOphidia.metrics import ClientMetrics, Histogram, MetricsRegistry
+
+try:
+    from urllib.request import urlopen
+except ImportError:
+    from urllib2 import urlopen
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram('latency_seconds', 'Latency', ('operator',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, operator='oph_list')
+    samples = dict((suffix + labels, value) for suffix, labels, value in histogram.samples())
+    assert samples['_bucket{operator="oph_list",le="0.1"}'] == 1
+    assert samples['_bucket{operator="oph_list",le="1.0"}'] == 2
+    assert samples['_bucket{operator="oph_list",le="+Inf"}'] == 3
+    assert samples['_count{operator="oph_list"}'] == 3
+    assert samples['_sum{operator="oph_list"}'] == pytest.approx(5.55)
+
+
+def test_registry_renders_the_prometheus_text_format():
+    registry = MetricsRegistry()
+    requests = registry.counter('requests_total', 'Requests', ('operator',))
+    requests.inc(operator='oph_list')
+    requests.inc(2, operator='oph_list')
+    registry.gauge('answer', 'Answer', function=lambda: 42)
+    text = registry.render()
+    assert '# TYPE requests_total counter' in text
+    assert 'requests_total{operator="oph_list"} 3' in text
+    assert 'answer 42' in text
+    with pytest.raises(RuntimeError):
+        registry.counter('requests_total', 'Requests again')
+
+
+def test_client_requests_update_the_metrics(client, server):
+    client.metrics = ClientMetrics()
+    client.execute('oph_reduce cube=' + server.new_cube() + ';operation=avg;')
+    server.on('oph_list', lambda host, query, arguments: server.error())
+    client.execute('oph_list level=2;')
+    metrics = client.metrics
+    assert metrics.requests.value(operator='oph_reduce', source='server') == 1
+    assert metrics.cubes.value(operator='oph_reduce') == 1
+    assert metrics.errors.value(operator='oph_list', code='OPH_SERVER_ERROR') == 1
+    assert metrics.in_flight.value() == 0
+    assert 'pyophidia_request_duration_seconds_count{operator="oph_reduce"} 1' in metrics.render()
+
+
+def test_metrics_are_served_over_http():
+    registry = ClientMetrics()
+    url = registry.serve()
+    try:
+        assert url.startswith('http://127.0.0.1:')
+        assert 'pyophidia_requests_total' in urlopen(url, timeout=5).read().decode('utf-8')
+    finally:
+        registry.close()
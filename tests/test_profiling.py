@@ -0,0 +1,65 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import absolute_import
+import json
+import logging
+
+
+def test_requests_within_the_block_are_profiled(client, server, tmpdir):
+    path = str(tmpdir.join('profile.json'))
+    source = server.new_cube()
+    client.execute('oph_list level=2;')
+    with client.profile(path=path, log_report=False) as profile:
+        output = client.execute('oph_reduce cube=' + source + ';operation=avg;').cube
+        client.execute('oph_reduce cube=' + output + ';operation=max;')
+        client.execute('oph_list level=2;')
+    client.execute('oph_list level=2;')
+    assert [entry['operator'] for entry in profile.records] == ['oph_reduce', 'oph_reduce', 'oph_list']
+    assert profile.records[0]['arguments'] == {'cube': source, 'operation': 'avg', 'ncores': '1'}
+    assert profile.records[0]['exec_time'] == 0.5
+    # Output cubes are measured once, on exit
+    assert profile.records[0]['cube'] == output and profile.records[0]['cube_size'] == 256.0
+    assert len(server.sent('oph_cubesize')) == 2
+    summary = profile.summary(by='count')
+    assert (summary[0]['operator'], summary[0]['count'], summary[0]['exec_time']) == ('oph_reduce', 2, 1.0)
+    with open(path) as f:
+        assert len(json.load(f)['records']) == 3
+
+
+def test_csv_dump(client, server):
+    with client.profile(measure=False, log_report=False) as profile:
+        client.execute('oph_list level=2;')
+    lines = profile.to_csv().splitlines()
+    assert lines[0].startswith('timestamp,operator,arguments,exec_time')
+    assert ',oph_list,"{""level"": ""2"", ""ncores"": ""1""}",0.5,' in lines[1]
+
+
+def test_report_is_logged_on_exit(client, server, caplog):
+    with caplog.at_level(logging.INFO, logger='PyOphidia.profiling'):
+        with client.profile(measure=False):
+            client.execute('oph_list level=2;')
+    assert 'Profile of 1 requests' in caplog.text and 'oph_list' in caplog.text
+
+
+def test_failing_profiles_do_not_break_requests(client, server, monkeypatch):
+    with client.profile(measure=False, log_report=False) as profile:
+        def fail(*args):
+            raise ValueError('broken')
+        monkeypatch.setattr(profile, '_observe', fail)
+        assert client.execute('oph_list level=2;') is not None
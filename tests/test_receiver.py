@@ -0,0 +1,84 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import absolute_import
+import json
+import pytest
+from PyOphidia.job import Job
+from PyOphidia.receiver import CallbackReceiver
+from conftest import SESSION
+
+try:
+    from urllib.request import Request, urlopen
+except ImportError:
+    from urllib2 import Request, urlopen
+
+
+class Poller():
+    # Records the jobs to be checked right away
+
+    def __init__(self):
+        self.checked = []
+
+    def poll_now(self, job):
+        self.checked.append(job)
+
+
+@pytest.fixture
+def receiver():
+    receiver = CallbackReceiver(poller=Poller())
+    yield receiver
+    receiver.close()
+
+
+def test_notifications_are_matched_by_job_id(client, receiver):
+    job = receiver.register(Job(client, SESSION + '?5#1'))
+    other = receiver.register(Job(client, 'http://fake/ophidia/sessions/2/experiment?5#1'))
+    assert receiver.notify({'jobid': [SESSION + '?5#2'], 'status': ['OPH_STATUS_COMPLETED']}) == [job]
+    # Bare workflow identifiers are used within the notified session or when they are not ambiguous
+    assert receiver.notify({'workflowid': ['5'], 'sessionid': [SESSION]}) == [job]
+    assert receiver.notify({'workflowid': ['5']}) == []
+    assert receiver.notify({'note': ['http://evil/x'], 'id': ['abc']}) == []
+    assert receiver.poller.checked == [job, job]
+    assert other not in receiver.poller.checked
+
+
+def test_early_notifications_are_kept(client, receiver):
+    assert receiver.notify({'jobid': [SESSION + '?9#1']}) == []
+    job = receiver.register(Job(client, SESSION + '?9#1'))
+    assert receiver.poller.checked == [job]
+
+
+def test_listener_accepts_json_posts(client, receiver):
+    assert receiver.url.startswith('http://127.0.0.1:')
+    job = receiver.register(Job(client, SESSION + '?3#1'))
+    request = Request(receiver.url, json.dumps({'jobid': SESSION + '?3#1'}).encode('utf-8'), {'Content-Type': 'application/json'})
+    assert urlopen(request, timeout=5).getcode() == 200
+    assert receiver.poller.checked == [job]
+    urlopen(receiver.url + '?jobid=' + SESSION + '?3%231', timeout=5)
+    assert receiver.poller.checked == [job, job]
+
+
+def test_asynchronous_requests_carry_the_callback_url(client, server):
+    receiver = client.enable_callbacks()
+    try:
+        client.submit_async('oph_reduce cube=' + server.new_cube() + ';operation=avg;').cancel()
+        assert 'callback_url=' + receiver.url + ';' in server.sent('oph_reduce')[0]
+    finally:
+        client.disable_callbacks()
+    assert client.receiver is None
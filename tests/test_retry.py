@@ -0,0 +1,125 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import absolute_import
+import time
+import pytest
+import PyOphidia.ophsubmit as _ophsubmit
+from PyOphidia.ophsubmit import RetryPolicy, ConnectError
+
+OK = ('{"response": []}', 'job', None, 0, None)
+NO_RESPONSE = (None, None, None, _ophsubmit.OPH_SERVER_NO_RESPONSE, 'Error on serving request: server no response')
+TIMEOUT = (None, None, None, 1, Exception('read timed out'))
+REFUSED = (None, None, None, 1, ConnectError('connection refused'))
+LATE = (None, None, None, 1, _ophsubmit.DeadlineExceeded('read timed out'))
+
+
+@pytest.fixture
+def attempts(monkeypatch):
+    """Script the outcomes of the attempts: set outcomes, read calls"""
+
+    class Attempts():
+        outcomes = []
+        calls = []
+
+    def submit(username, password, server, port, query, *args, **kwargs):
+        Attempts.calls.append(query)
+        return Attempts.outcomes.pop(0) if Attempts.outcomes else OK
+
+    Attempts.outcomes, Attempts.calls = [], []
+    monkeypatch.setattr(_ophsubmit, '_submit', submit)
+    monkeypatch.setattr(_ophsubmit, '_circuit_breakers', {})
+    return Attempts
+
+
+def submit(query, policy=None):
+    policy = policy if policy is not None else RetryPolicy(base_delay=0.0, max_delay=0.0)
+    return _ophsubmit.submit('user', 'password', 'fake', '11732', query, retry_policy=policy)
+
+
+def test_classify():
+    assert RetryPolicy.classify(OK) is None
+    assert RetryPolicy.classify(REFUSED) == _ophsubmit.CONNECT_ERROR
+    assert RetryPolicy.classify(TIMEOUT) == _ophsubmit.CONNECTION_ERROR
+    assert RetryPolicy.classify(NO_RESPONSE) == _ophsubmit.OPH_SERVER_NO_RESPONSE
+    assert RetryPolicy.classify(LATE) == _ophsubmit.DEADLINE_EXCEEDED
+
+
+def test_read_only_operators_are_retried(attempts):
+    attempts.outcomes = [NO_RESPONSE, TIMEOUT]
+    assert submit('oph_cubeschema cube=http://fake/ophidia/1/1;') == OK
+    assert len(attempts.calls) == 3
+
+
+def test_workflows_of_read_only_operators_are_retried(attempts):
+    attempts.outcomes = [TIMEOUT]
+    assert submit('{"tasks": [{"operator": "oph_list"}, {"operator": "oph_cubesize"}]}') == OK
+    assert len(attempts.calls) == 2
+
+
+@pytest.mark.parametrize('outcome', [NO_RESPONSE, TIMEOUT])
+def test_other_operators_are_not_retried_once_sent(attempts, outcome):
+    attempts.outcomes = [outcome]
+    assert submit('oph_importnc2 src_path=/data/tas.nc;measure=tas;') == outcome
+    assert submit('{"tasks": [{"operator": "oph_list"}, {"operator": "oph_delete"}]}') == OK
+    assert len(attempts.calls) == 2
+
+
+def test_other_operators_are_retried_when_never_sent(attempts):
+    attempts.outcomes = [REFUSED, REFUSED]
+    assert submit('oph_delete cube=http://fake/ophidia/1/1;') == OK
+    assert len(attempts.calls) == 3
+
+
+def test_retries_are_limited_per_error_class(attempts):
+    attempts.outcomes = [TIMEOUT] * 5
+    assert submit('oph_list level=2;', RetryPolicy(retries={_ophsubmit.CONNECTION_ERROR: 1}, base_delay=0.0)) == TIMEOUT
+    assert len(attempts.calls) == 2
+
+
+def test_circuit_breaker_fails_fast(attempts):
+    policy = RetryPolicy(retries={}, failure_threshold=2, reset_timeout=3600.0)
+    attempts.outcomes = [REFUSED, REFUSED]
+    submit('oph_list level=2;', policy)
+    submit('oph_list level=2;', policy)
+    outcome = submit('oph_list level=2;', policy)
+    assert len(attempts.calls) == 2
+    assert isinstance(outcome[4], ConnectError)
+
+
+def test_expired_deadlines_are_not_retried(attempts):
+    attempts.outcomes = [LATE]
+    assert submit('oph_list level=2;') == LATE
+    assert len(attempts.calls) == 1
+
+
+def test_expired_deadlines_open_the_circuit(attempts):
+    policy = RetryPolicy(failure_threshold=2, reset_timeout=3600.0)
+    attempts.outcomes = [LATE, LATE]
+    deadline = time.time() + 3600.0
+    for i in range(3):
+        outcome = _ophsubmit.submit('user', 'password', 'fake', '11732', 'oph_list level=2;', retry_policy=policy, deadline=deadline)
+    assert len(attempts.calls) == 2
+    assert isinstance(outcome[4], ConnectError)
+
+
+def test_requests_never_sent_leave_the_circuit_closed(attempts):
+    policy = RetryPolicy(failure_threshold=1, reset_timeout=3600.0)
+    attempts.outcomes = [LATE]
+    _ophsubmit.submit('user', 'password', 'fake', '11732', 'oph_list level=2;', retry_policy=policy, deadline=time.time() - 1.0)
+    assert submit('oph_list level=2;', policy) == OK
@@ -0,0 +1,104 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import absolute_import
+import time
+import pytest
+import PyOphidia.ophsubmit as _ophsubmit
+from PyOphidia.ophsubmit import ConnectError
+from PyOphidia.router import RouterClient
+
+REFUSED = (None, None, None, 1, ConnectError('connection refused'))
+TIMEOUT = (None, None, None, 1, Exception('read timed out'))
+
+
+@pytest.fixture
+def router(server):
+    router = RouterClient(['a:11732', 'b:11732'], 'user', 'password', api_mode=False, health_interval=3600.0)
+    router.retry_policy = None
+    return router
+
+
+def test_failover_when_the_connection_cannot_be_established(router, server):
+    server.failures['a'] = REFUSED
+    result = router.execute('oph_importnc2 src_path=/data/tas.nc;measure=tas;')
+    assert result is not None and result.return_value == 0
+    assert len(server.sent('oph_importnc2', 'a')) == 1
+    assert len(server.sent('oph_importnc2', 'b')) == 1
+    assert not router.endpoints[0].healthy
+
+
+def test_no_failover_of_requests_that_may_have_been_executed(router, server):
+    server.failures['a'] = TIMEOUT
+    assert router.execute('oph_importnc2 src_path=/data/tas.nc;measure=tas;') is None
+    assert len(server.sent('oph_importnc2')) == 1
+    assert not server.sent(server='b')
+
+
+def test_failover_of_read_only_requests(router, server):
+    server.failures['a'] = TIMEOUT
+    result = router.execute('oph_list level=2;')
+    assert result is not None and result.return_value == 0
+    assert len(server.sent('oph_list', 'b')) == 1
+
+
+def test_session_and_cube_affinity(router, server):
+    server.failures['a'] = REFUSED
+    output = router.execute('oph_importnc2 src_path=/data/tas.nc;measure=tas;').cube
+    del server.failures['a']
+    assert router.endpoint_of(output) is router.endpoints[1]
+    assert router.endpoint_of(router.session) is router.endpoints[1]
+    # The failed endpoint looks better, but the cube lives on the other one
+    router.endpoints[0].healthy = True
+    router.endpoints[0].latency = 0.001
+    router.endpoints[1].latency = 1.0
+    router.execute('oph_reduce cube=' + output + ';operation=avg;')
+    assert len(server.sent('oph_reduce', 'b')) == 1
+
+
+def test_only_sessions_and_output_cubes_are_bound(router, server):
+    listed = [server.new_cube() for i in range(3)]
+    router.execute('oph_list level=2;')
+    assert all(router.endpoint_of(pid) is None for pid in listed)
+
+
+def test_affinity_map_is_bounded(router, server):
+    router.max_affinity = 3
+    outputs = [router.execute('oph_reduce cube=http://fake/ophidia/1/0;operation=avg;').cube for i in range(5)]
+    assert len(router._affinity) == 3
+    assert router.endpoint_of(outputs[0]) is None
+    assert router.endpoint_of(outputs[-1]) is not None
+
+
+def test_health_checks_are_bounded(router, monkeypatch):
+    calls = []
+
+    def submit(username, password, server, port, query, **kwargs):
+        calls.append(kwargs)
+        raise RuntimeError('server down')
+
+    monkeypatch.setattr(_ophsubmit, 'submit', submit)
+    router.check_timeout = 2.0
+    endpoint = router.endpoints[0]
+    endpoint.healthy = False
+    endpoint.checking = True
+    router._check(endpoint)
+    assert calls[0]['connect_timeout'] == 2.0 and calls[0]['read_timeout'] == 2.0
+    assert calls[0]['deadline'] <= time.time() + 2.0
+    assert not endpoint.checking and not endpoint.healthy
+    assert endpoint.failures == 1
@@ -0,0 +1,76 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import absolute_import
+import pytest
+from PyOphidia.series import AppendManager
+
+
+def test_files_are_appended_in_batches(client, server):
+    series = AppendManager(measure='tas', batch_size=3, client=client)
+    assert series.add('/data/tas_2.nc', '/data/tas_1.nc') is None
+    assert not server.queries
+    head = series.add('/data/tas_3.nc', '/data/tas_1.nc')
+    tasks = [query for query in server.sent() if query.startswith(('oph_importnc2', 'oph_concatnc2'))]
+    assert [query.split('src_path=')[1].split(';')[0] for query in tasks] == ['/data/tas_1.nc', '/data/tas_2.nc', '/data/tas_3.nc']
+    assert tasks[0].startswith('oph_importnc2') and 'measure=tas;' in tasks[0]
+    assert 'dim_continue=yes;' in tasks[1]
+    # The superseded heads are retired at once
+    assert series.pending == [] and len(series.retired) == 2
+    assert len(server.sent('oph_delete')) == 1
+    assert server.cubes == set([head]) and series.cube().pid == head
+
+
+def test_pending_files_are_flushed_after_max_delay(client, server):
+    first = server.new_cube()
+    series = AppendManager(head=first, batch_size=10, max_delay=0.0, retire=False, client=client)
+    assert series.add('/data/tas_1.nc') != first
+    assert len(server.sent('oph_concatnc2')) == 1
+    assert not server.sent('oph_delete')
+
+
+def test_new_series_need_the_measure(client, server):
+    series = AppendManager(client=client)
+    series.add('/data/tas_1.nc')
+    with pytest.raises(RuntimeError):
+        series.flush()
+    assert series.pending == ['/data/tas_1.nc']
+
+
+def test_failed_appends_stay_pending(client, server):
+    def concat(host, query, arguments):
+        return server.error() if arguments['src_path'] == '/data/tas_2.nc' else server.created()
+
+    server.on('oph_concatnc2', concat)
+    first = server.new_cube()
+    series = AppendManager(head=first, batch_size=10, client=client)
+    series.add('/data/tas_1.nc', '/data/tas_2.nc', '/data/tas_3.nc')
+    with pytest.raises(RuntimeError):
+        series.flush()
+    assert series.pending == ['/data/tas_2.nc', '/data/tas_3.nc']
+    assert series.retired == [first] and first not in server.cubes
+
+
+def test_state_is_saved(client, server, tmp_path):
+    path = str(tmp_path / 'series.json')
+    head = server.new_cube()
+    AppendManager(head=head, batch_size=10, path=path, client=client).add('/data/tas_1.nc')
+    resumed = AppendManager(path=path, batch_size=10, client=client)
+    assert resumed.head == head and resumed.pending == ['/data/tas_1.nc']
+    appended = resumed.flush()
+    assert AppendManager(path=path, client=client).head == appended
@@ -0,0 +1,97 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import absolute_import
+import pytest
+from PyOphidia.telemetry import percentile, PhaseHistograms, TelemetryRecorder
+
+
+def test_percentile():
+    assert percentile([], 50) is None
+    assert percentile([3.0], 90) == 3.0
+    assert percentile([5, 1, 4, 2, 3], 0) == 1
+    assert percentile([5, 1, 4, 2, 3], 50) == 3
+    assert percentile([5, 1, 4, 2, 3], 100) == 5
+    assert percentile([0.0, 10.0], 25) == pytest.approx(2.5)
+
+
+def test_phase_histograms():
+    histograms = PhaseHistograms(time_bounds=[0.1, 1.0], byte_bounds=[1024])
+    for wait in (0.05, 0.5, 0.5, 5.0):
+        histograms('oph_list level=2;', {'wait': wait, 'received': 2048})
+    assert histograms.histogram('wait') == [(0.1, 1), (1.0, 2), (None, 1)]
+    assert histograms.histogram('received') == [(1024, 0), (None, 4)]
+    assert histograms.percentile('wait', 25) == 0.1
+    assert histograms.percentile('wait', 75) == 1.0
+    assert histograms.percentile('wait', 100) == float('inf')
+    assert histograms.percentile('upload', 50) is None
+    assert histograms.totals['wait'] == pytest.approx(6.05)
+    histograms.reset()
+    assert histograms.histogram('wait') == []
+
+
+def test_hooks_receive_the_timings_of_each_request(client, server):
+    calls = []
+    client.hooks.append(lambda query, timings: calls.append((query, timings)))
+    result = client.execute('oph_list level=2;')
+    assert len(calls) == 1 and calls[0][0].startswith('oph_list level=2;')
+    assert calls[0][1] is result.timings
+    assert result.timings['total'] >= result.timings['decode'] >= 0
+
+
+def test_history_is_kept_in_sqlite(tmpdir):
+    path = str(tmpdir.join('telemetry.db'))
+    recorder = TelemetryRecorder(capacity=2, path=path, flush_every=2)
+    for i, exec_time in enumerate((1.0, 2.0, 3.0)):
+        recorder.record(timestamp=100.0 + i, operator='oph_reduce', exec_time=exec_time)
+    # The ring buffer keeps the last records, the file the whole history
+    assert [entry['exec_time'] for entry in recorder.records()] == [2.0, 3.0]
+    assert [entry['exec_time'] for entry in recorder.records(stored=True)] == [1.0, 2.0, 3.0]
+    assert recorder.summary(stored=True)['oph_reduce']['max'] == 3.0
+    assert recorder.hot(stored=True) == [('oph_reduce', 6.0, 3)]
+    assert [entry['exec_time'] for entry in TelemetryRecorder(path=path).records(since=101.0, stored=True)] == [2.0, 3.0]
+
+
+def test_records_describe_the_input_cube_once(client, server):
+    client.telemetry = TelemetryRecorder()
+    source = server.new_cube()
+    output = client.execute('oph_reduce cube=' + source + ';operation=avg;nfrag=3;').cube
+    client.execute('oph_reduce cube=' + source + ';operation=max;')
+    records = client.telemetry.records('oph_reduce')
+    assert [record['input_size'] for record in records] == [256.0, 256.0]
+    assert [record['nfrag'] for record in records] == [16, 16]
+    assert records[0]['cube'] == output
+    assert len(server.sent('oph_cubesize')) == 1
+    assert len(server.sent('oph_cubeschema')) == 2
+    assert client.last_request.startswith('oph_reduce cube=' + source + ';operation=max;')
+
+
+def test_imports_are_described_by_their_output(client, server):
+    client.telemetry = TelemetryRecorder()
+    output = client.execute('oph_importnc2 src_path=/data/tas.nc;measure=tas;nfrag=2;').cube
+    record = client.telemetry.records('oph_importnc2')[0]
+    assert record['input_size'] == 256.0 and record['nfrag'] == 16
+    assert record['cube'] == output
+
+
+def test_cubes_can_be_left_undescribed(client, server):
+    client.telemetry = TelemetryRecorder(describe_cubes=False)
+    client.execute('oph_reduce cube=' + server.new_cube() + ';operation=avg;nfrag=3;')
+    record = client.telemetry.records()[0]
+    assert record['input_size'] is None and record['nfrag'] == 3
+    assert not server.sent('oph_cubeschema')
@@ -0,0 +1,61 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import absolute_import
+import json
+from PyOphidia.tracing import Tracer
+
+
+def test_requests_are_children_of_the_current_span(client, server, tmpdir):
+    path = str(tmpdir.join('trace.jsonl'))
+    client.tracer = Tracer(path=path, opentelemetry=False)
+    with client.tracer.span('pipeline', experiment='tas') as parent:
+        assert client.tracer.current() is parent
+        client.execute('oph_reduce cube=' + server.new_cube() + ';operation=avg;')
+    assert client.tracer.current() is None
+    spans = dict((span.name, span) for span in client.tracer.spans)
+    request = spans['oph_reduce']
+    assert request.parent_id == parent.span_id and request.trace_id == parent.trace_id
+    assert request.attributes['ophidia.exec_time'] == 0.5 and request.status == 'ok'
+    assert parent.attributes['experiment'] == 'tas'
+    with open(path) as f:
+        assert [json.loads(line)['name'] for line in f][-1] == 'pipeline'
+
+
+def test_failed_requests_are_marked(client, server):
+    client.tracer = Tracer(opentelemetry=False)
+    server.on('oph_list', lambda host, query, arguments: server.error('boom'))
+    client.execute('oph_list level=2;')
+    span = client.tracer.spans[-1]
+    assert span.status == 'error' and span.attributes['ophidia.error'] == 'boom'
+
+
+def test_workflow_tasks_are_traced_on_demand(client, server):
+    workflow = json.dumps({'name': 'pipeline', 'author': 'me', 'abstract': 'test', 'exec_mode': 'sync',
+                           'tasks': [{'name': 'reduce', 'operator': 'oph_reduce', 'arguments': ['cube=' + server.new_cube(), 'operation=avg']}]})
+    client.tracer = Tracer(opentelemetry=False)
+    client.wsubmit(workflow)
+    assert not server.sent('oph_resume')
+    client.tracer = Tracer(opentelemetry=False, resume_tasks=True)
+    client.wsubmit(workflow)
+    assert len(server.sent('oph_resume')) == 1
+    spans = dict((span.name, span) for span in client.tracer.spans)
+    task = spans['task reduce']
+    assert task.parent_id == spans['workflow pipeline'].span_id
+    assert task.end - task.start == 2.0
+    assert task.attributes['ophidia.task.status'] == 'OPH_STATUS_COMPLETED'
@@ -0,0 +1,91 @@
+#
+#     PyOphidia - Python bindings for Ophidia
+#     Copyright (C) 2015-2019 CMCC Foundation
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import absolute_import
+from PyOphidia.cube import Cube
+from PyOphidia.cache import parse_query
+from PyOphidia.tuning import AutoTuner
+
+
+def arguments(query):
+    return parse_query(query)[1]
+
+
+def test_arguments_left_out_are_tuned(client, server):
+    client.tuner = AutoTuner(max_cores=8)
+    cube = Cube(pid=server.new_cube(), client=client)
+    cube.reduce(operation='avg')
+    sent = arguments(server.sent('oph_reduce')[0])
+    # 256 MB in 16 fragments on 8 cores
+    assert sent['ncores'] == '8' and sent['nthreads'] == '2'
+
+
+def test_arguments_set_by_hand_are_left_untouched(client, server):
+    client.tuner = AutoTuner(max_cores=8)
+    cube = Cube(pid=server.new_cube(), client=client)
+    cube.reduce(operation='avg', ncores=1)
+    sent = arguments(server.sent('oph_reduce')[0])
+    # The number of threads follows the cores set by hand
+    assert sent['ncores'] == '1' and sent['nthreads'] == '8'
+
+
+def test_client_ncores_applies_without_tuner(client, server):
+    cube = Cube(pid=server.new_cube(), client=client)
+    cube.reduce(operation='avg')
+    client.ncores = 4
+    cube.reduce(operation='max')
+    sent = [arguments(query) for query in server.sent('oph_reduce')]
+    assert [query['ncores'] for query in sent] == ['1', '4']
+    assert 'nthreads' not in sent[0]
+
+
+def test_small_cubes_use_a_single_core(client, server):
+    server.size = 1.0
+    client.tuner = AutoTuner(max_cores=8)
+    Cube(pid=server.new_cube(), client=client).reduce(operation='avg')
+    assert arguments(server.sent('oph_reduce')[0])['ncores'] == '1'
+
+
+def test_imports_are_sized_by_the_previous_imports(client, server):
+    client.tuner = AutoTuner(max_cores=16, cores_per_host=4, small_size=32.0)
+    first = client.execute('oph_importnc2 src_path=/data/tas_2000.nc;measure=tas;').cube
+    # The size of the first cube is known once it is used
+    client.execute('oph_reduce cube=' + first + ';operation=avg;')
+    client.execute('oph_importnc2 src_path=/data/tas_2001.nc;measure=tas;')
+    first, second = [arguments(query) for query in server.sent('oph_importnc2')]
+    # Nothing known yet: one host
+    assert (first['ncores'], first['nhost'], first['nfrag']) == ('4', '1', '4')
+    # 256 MB in parts of 32 MB over hosts of 4 cores
+    assert (second['ncores'], second['nhost'], second['nfrag']) == ('8', '2', '4')
+    assert client.tuner._imports == {}
+
+
+def test_execution_times_are_fed_back(client, server):
+    client.tuner = AutoTuner(max_cores=8, explore_every=0)
+    pid = server.new_cube()
+    client.execute('oph_reduce cube=' + pid + ';operation=avg;')
+    assert client.tuner.history[('oph_reduce', 8)] == {8: 0.5}
+
+
+def test_imports_tuned_together_share_the_cluster_evenly(client, server):
+    tuner = AutoTuner(max_cores=12, cores_per_host=8)
+    queries = tuner.tune_all(client, ['oph_importnc2 src_path=/data/tas_' + str(year) + '.nc;measure=tas;' for year in (2000, 2001, 2002)])
+    assert [arguments(query)['ncores'] for query in queries] == ['4', '4', '4']
+    for query in queries:
+        tuner.observe(query, None)
+    assert tuner._imports == {}